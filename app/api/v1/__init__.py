@@ -3,7 +3,7 @@
 from fastapi import APIRouter
 
 # 실제 파일명에 맞게 수정하세요 (예시는 kpi/equipment/anomaly/prediction/report/health)
-from . import kpi, equipment, anomaly, prediction, report, health
+from . import kpi, equipment, anomaly, prediction, report, health, admin
 
 api_router = APIRouter()
 api_router.include_router(kpi.router,        prefix="/kpi",        tags=["kpi"])
@@ -12,5 +12,6 @@ api_router.include_router(anomaly.router,    prefix="/anomaly",    tags=["anomal
 api_router.include_router(prediction.router, prefix="/prediction", tags=["prediction"])
 api_router.include_router(report.router,     prefix="/report",     tags=["report"])
 api_router.include_router(health.router, prefix="/health", tags=["system"]) 
+api_router.include_router(admin.router,      prefix="/admin",      tags=["admin"])
 
 __all__ = ["api_router"]
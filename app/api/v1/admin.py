@@ -0,0 +1,108 @@
+# 모델 교체 등 운영용 API
+# app/api/v1/admin.py
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from app.ml.bundle import is_bundle
+from app.executor import offload
+from app.ml.registry import registry, reload_models, watcher, ReloadInProgressError
+from app.services.detection_service import detection_scheduler, CycleInProgressError
+from app.services.rollup_service import rollup_compactor, CompactionInProgressError
+from app.services.chunk_service import chunk_sealer, ChunkSealInProgressError
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.post("/models/reload", status_code=202)
+async def reload_model_bundle(bundle_path: Optional[str] = None):
+    """
+    ✅ 무중단 모델 교체
+    - 새 번들을 백그라운드에서 로드 → 검증 배치 추론 → 참조 교체
+    - 진행 중인 요청은 이전 모델로 처리 완료
+    - **bundle_path**: 새 번들 경로 (생략 시 현재 경로 재로드)
+    """
+    if bundle_path and not is_bundle(bundle_path):
+        raise HTTPException(status_code=400, detail=f"모델 번들이 아닙니다: {bundle_path}")
+
+    try:
+        status = reload_models(bundle_path, background=True)
+    except ReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return {"reload": status}
+
+@router.get("/models/status")
+async def model_swap_status():
+    """
+    ✅ 서비스 중인 모델 버전 및 교체 상태
+    """
+    return {
+        "version": registry.version(),
+        "generation": registry.generation,
+        "bundle_path": registry.bundle_path,
+        "reload": registry.reload_status,
+        "watcher": watcher.status(),
+    }
+
+@router.get("/detection/status")
+async def detection_scheduler_status():
+    """
+    ✅ 주기 이상 탐지 상태
+    - 실행 여부, 주기/지연, 실행/건너뜀/실패 횟수
+    - 최근 주기의 단계별 소요 시간 (조립/채점/저장 ms)
+    """
+    return detection_scheduler.status()
+
+@router.post("/detection/run")
+@offload("inference")
+def run_detection_cycle():
+    """
+    ✅ 전체 설비 즉시 1회 탐지
+    - 주기 실행 중이면 409
+    """
+    try:
+        return detection_scheduler.run_once()
+    except CycleInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/rollups/status")
+@offload("db")
+def rollup_compactor_status():
+    """
+    ✅ 시계열 집계 테이블 상태
+    - 재계산 대기 series 수 (tag_series.dirty_from)
+    - 실행 여부, 마지막 실행 결과
+    """
+    return rollup_compactor.status()
+
+@router.post("/rollups/compact")
+@offload("db")
+def run_rollup_compaction():
+    """
+    ✅ 재계산 대기 구간을 즉시 집계 테이블에 반영
+    - 집계 실행 중이면 409
+    """
+    try:
+        return rollup_compactor.run_once()
+    except CompactionInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/chunks/status")
+@offload("db")
+def chunk_sealer_status():
+    """
+    ✅ 시계열 청크 저장 상태
+    - 봉인된 청크/관측 수, 압축 크기 (점당 바이트)
+    - 실행 여부, 마지막 실행 결과
+    """
+    return chunk_sealer.status()
+
+@router.post("/chunks/seal")
+@offload("db")
+def run_chunk_seal():
+    """
+    ✅ 닫힌 1시간 구간 원본 행을 즉시 청크로 봉인
+    - 봉인 실행 중이면 409
+    """
+    try:
+        return chunk_sealer.run_once()
+    except ChunkSealInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
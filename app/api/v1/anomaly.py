@@ -5,14 +5,17 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.database import get_db
-from app.schemas.anomaly import AnomalyResponse, AnomalyFilter
+from app.executor import offload
+from app.schemas.anomaly import AnomalyResponse, AnomalyFilter, BackfillRequest, BackfillJobResponse
 from app.services.anomaly_service import AnomalyService
+from app.services.backfill_service import BackfillService, backfill_runner
 from app.models.anomaly import AnomalyStatus
 
 router = APIRouter(prefix="/anomaly", tags=["anomaly"])
 
 @router.get("/list", response_model=List[AnomalyResponse])
-async def get_anomaly_list(
+@offload("db")
+def get_anomaly_list(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     eq_id: Optional[str] = None,
@@ -39,8 +42,89 @@ async def get_anomaly_list(
     
     return anomalies
 
+@router.post("/backfill", response_model=BackfillJobResponse, status_code=202)
+@offload("db")
+def create_backfill_job(
+    request: BackfillRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    과거 구간 이상 탐지 백필 (백그라운드 실행)
+    
+    - **eq_ids**: 설비 ID 목록 (생략 시 전체 설비)
+    - **start_time / end_time**: 윈도우 끝 시각 범위
+    - **step_seconds**: 윈도우 간격 (기본 BACKFILL_STEP_SEC)
+    - **chunk_seconds**: 청크 길이 (청크마다 커밋 + 체크포인트)
+    """
+    service = BackfillService(db)
+    try:
+        job = service.create_job(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    backfill_runner.submit(job.job_id)
+    return service.to_response(job)
+
+@router.get("/backfill", response_model=List[BackfillJobResponse])
+@offload("db")
+def get_backfill_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """백필 작업 목록"""
+    service = BackfillService(db)
+    return [service.to_response(job) for job in service.list_jobs(limit)]
+
+@router.get("/backfill/{job_id}", response_model=BackfillJobResponse)
+@offload("db")
+def get_backfill_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """백필 작업 진행 상황 조회"""
+    service = BackfillService(db)
+    job = service.get_job(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Backfill job not found")
+    
+    return service.to_response(job)
+
+@router.post("/backfill/{job_id}/cancel", response_model=BackfillJobResponse)
+@offload("db")
+def cancel_backfill_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """백필 작업 취소 (진행 중인 청크까지 반영 후 중단)"""
+    service = BackfillService(db)
+    try:
+        job = service.cancel_job(job_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return service.to_response(job)
+
+@router.post("/backfill/{job_id}/resume", response_model=BackfillJobResponse, status_code=202)
+@offload("db")
+def resume_backfill_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """중단/실패한 백필 작업을 체크포인트부터 재개"""
+    service = BackfillService(db)
+    try:
+        job = service.resume_job(job_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return service.to_response(job)
+
 @router.get("/{anomaly_id}", response_model=AnomalyResponse)
-async def get_anomaly_detail(
+@offload("db")
+def get_anomaly_detail(
     anomaly_id: int,
     db: Session = Depends(get_db)
 ):
@@ -54,7 +138,8 @@ async def get_anomaly_detail(
     return anomaly
 
 @router.post("/{anomaly_id}/status")
-async def update_anomaly_status(
+@offload("db")
+def update_anomaly_status(
     anomaly_id: int,
     status: str,
     db: Session = Depends(get_db)
@@ -71,7 +156,8 @@ async def update_anomaly_status(
     return {"message": "Status updated", "anomaly_id": anomaly.id}
 
 @router.post("/detect/{eq_id}")
-async def detect_realtime_anomaly(
+@offload("inference")
+def detect_realtime_anomaly(
     eq_id: str,
     db: Session = Depends(get_db)
 ):
@@ -91,7 +177,8 @@ async def detect_realtime_anomaly(
         }
 
 @router.get("/statistics/top-equipments")
-async def get_top_anomaly_equipments(
+@offload("db")
+def get_top_anomaly_equipments(
     top_k: int = Query(5, ge=1, le=20),
     db: Session = Depends(get_db)
 ):
@@ -102,7 +189,8 @@ async def get_top_anomaly_equipments(
     return {"top_equipments": result}
 
 @router.get("/statistics/heatmap")
-async def get_anomaly_heatmap(
+@offload("db")
+def get_anomaly_heatmap(
     days: int = Query(7, ge=1, le=30),
     db: Session = Depends(get_db)
 ):
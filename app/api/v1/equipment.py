@@ -1,20 +1,21 @@
 # 설비 모니터링 API
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from typing import List, Optional
-from datetime import datetime, timedelta, timezone
 import numpy as np  # ← 상단으로 이동
 
 from app.database import get_db
+from app.executor import execution, offload
 from app.models.equipment import Equipment
-from app.models.timeseries import TimeSeriesTag
+from app.services.equipment_service import EquipmentService
+from app.services.ingest_service import IngestService, IngestError
 
 # app/api/v1/equipment.py
 router = APIRouter(prefix="/equipment", tags=["equipment"])  # 소문자로 통일
 
 @router.get("/list")
-async def get_equipment_list(
+@offload("db")
+def get_equipment_list(
     type: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
@@ -37,53 +38,54 @@ async def get_equipment_list(
         ]
     }
 
+@router.post("/ingest")
+async def ingest_timeseries(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson, csv, json (생략 시 Content-Type)"),
+    strict: bool = Query(False, description="유효하지 않은 행이 있으면 전체 거부"),
+    db: Session = Depends(get_db)
+):
+    """
+    센서 데이터 일괄 적재 (tags_timeseries)
+    
+    - **ndjson** (application/x-ndjson): 한 줄에 {"eq_id", "tag_name", "timestamp", "value", "unit"?}
+    - **csv** (text/csv): eq_id, tag_name, timestamp, value[, unit] 헤더
+    - **json** (application/json): 컬럼형 {"eq_id": [...], "tag_name": [...], "timestamp": [...], "value": [...]}
+    - 이미 있는 (eq_id, tag_name, timestamp)는 건너뜀 (재전송해도 중복 저장되지 않음)
+    """
+    body = await request.body()
+    service = IngestService(db)
+    
+    try:
+        return await execution.run_db(service.ingest, body, format or request.headers.get("content-type"), strict)
+    except IngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{eq_id}/timeseries")
-async def get_equipment_timeseries(
+@offload("db")
+def get_equipment_timeseries(
     eq_id: str,
     tag_name: str = Query(..., description="temperature, pressure, flow, level"),
     hours: int = Query(24, ge=1, le=168),
+    max_points: Optional[int] = Query(None, ge=2, le=20000, description="응답 점 수 상한 (기본 TIMESERIES_MAX_POINTS)"),
+    downsample: str = Query("lttb", description="lttb (모양 보존), minmax (구간별 최소/최대/평균)"),
     db: Session = Depends(get_db)
 ):
-    """특정 설비의 시계열 태그 데이터"""
-    # DB가 UTC 저장이라고 가정 (로컬이면 timezone 변환 고려)
-    time_ago = datetime.now(timezone.utc) - timedelta(hours=hours)
+    """특정 설비의 시계열 태그 데이터 (max_points 이하로 다운샘플링, 정상 범위는 전체 데이터 기준)"""
+    service = EquipmentService(db)
+    try:
+        result = service.get_timeseries_data(eq_id, tag_name, hours, max_points, downsample)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    data = (
-        db.query(TimeSeriesTag)
-        .filter(
-            and_(
-                TimeSeriesTag.eq_id == eq_id,
-                TimeSeriesTag.tag_name == tag_name,
-                TimeSeriesTag.timestamp >= time_ago
-            )
-        )
-        .order_by(TimeSeriesTag.timestamp)
-        .all()
-    )
-
-    if not data:
+    if not result:
         raise HTTPException(status_code=404, detail="데이터가 없습니다.")
 
-    values = [d.value for d in data]
-    mean = float(np.mean(values))
-    std = float(np.std(values))
-
-    lower = mean - 3 * std
-    upper = mean + 3 * std
-    # std==0이면 정상범위 폭이 0 → 그대로 두거나 최소폭을 주고 싶으면 아래 주석 해제
-    # if std == 0:
-    #     lower = upper = mean
-
-    return {
-        "eq_id": eq_id,
-        "tag_name": tag_name,
-        "unit": data[0].unit or "",
-        "data": [{"timestamp": d.timestamp.isoformat(), "value": d.value} for d in data],
-        "normal_range": {"lower": lower, "upper": upper, "mean": mean, "std": std}
-    }
+    return result
 
 @router.get("/{eq_id}/health")
-async def get_equipment_health(
+@offload("db")
+def get_equipment_health(
     eq_id: str,
     db: Session = Depends(get_db)
 ):
@@ -101,13 +103,15 @@ async def get_equipment_health(
     }
 
 @router.post("/compare")
-async def compare_equipments(
+@offload("db")
+def compare_equipments(
     eq_ids: List[str],
     tag_name: str,
     hours: int = 24,
+    max_points: Optional[int] = Query(None, ge=2, le=20000, description="설비별 응답 점 수 상한 (기본 TIMESERIES_MAX_POINTS)"),
     db: Session = Depends(get_db),
 ):
-    """다중 설비 비교 (최대 3개)"""
+    """다중 설비 비교 (최대 3개, 설비별로 max_points 이하로 다운샘플링)"""
     if not eq_ids:
         raise HTTPException(status_code=400, detail="비교할 설비 ID를 1개 이상 입력하세요.")
     if len(eq_ids) > 3:
@@ -115,22 +119,11 @@ async def compare_equipments(
     if not tag_name:
         raise HTTPException(status_code=400, detail="tag_name을 입력하세요.")
 
-    time_ago = datetime.now(timezone.utc) - timedelta(hours=hours)
-
+    service = EquipmentService(db)
     result = {}
     for eq_id in eq_ids:
-        data = (
-            db.query(TimeSeriesTag)
-            .filter(
-                and_(
-                    TimeSeriesTag.eq_id == eq_id,
-                    TimeSeriesTag.tag_name == tag_name,
-                    TimeSeriesTag.timestamp >= time_ago
-                )
-            )
-            .order_by(TimeSeriesTag.timestamp)
-            .all()
-        )
-        result[eq_id] = [{"timestamp": d.timestamp.isoformat(), "value": d.value} for d in data]
+        # 점 수가 상한 이하면 원본 그대로, 넘으면 집계 테이블/LTTB로 축소
+        series = service.get_timeseries_data(eq_id, tag_name, hours, max_points)
+        result[eq_id] = series["data"] if series else []
 
     return {"tag_name": tag_name, "hours": hours, "series": result}
@@ -3,11 +3,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.executor import execution, offload
+from app.ml.registry import registry
 
 router = APIRouter(prefix="/health", tags=["system"])
 
 @router.get("/ping")
-async def health_check(db: Session = Depends(get_db)):
+@offload("db")
+def health_check(db: Session = Depends(get_db)):
     """
     ✅ 시스템 전체 헬스 체크 API
     - 서버 및 DB 연결 상태 확인
@@ -23,3 +26,39 @@ async def health_check(db: Session = Depends(get_db)):
         "db": db_status,
         "message": "TEP Dashboard Backend is running 🚀"
     }
+
+@router.get("/models")
+async def model_status():
+    """
+    ✅ ML 모델 로드 상태
+    - 모델별 로드 여부, 로드 시간(ms), 메모리 사용량(bytes)
+    - 모델 번들 버전 및 임계값 (번들 사용 시)
+    """
+    bundle = registry.get("bundle") if registry.is_loaded("bundle") else None
+    return {
+        "models": registry.stats(),
+        "bundle": bundle.info() if bundle is not None else None
+    }
+
+@router.get("/inference")
+async def inference_metrics():
+    """
+    ✅ 마이크로 배칭 추론 메트릭
+    - 배치 크기, 큐 대기 시간 (INFERENCE_BATCHING 활성 시)
+    """
+    if not registry.is_loaded("predictor"):
+        return {"batching": False, "metrics": {}}
+
+    scheduler = registry.get("predictor").scheduler
+    return {
+        "batching": scheduler is not None,
+        "metrics": scheduler.metrics() if scheduler else {}
+    }
+
+@router.get("/executor")
+async def executor_metrics():
+    """
+    ✅ 실행 풀 상태
+    - 풀별 활성 작업 수, 대기열 길이, 포화도, 평균 대기/실행 시간
+    """
+    return {"pools": execution.metrics()}
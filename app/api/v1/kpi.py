@@ -5,6 +5,7 @@ from sqlalchemy import func
 from typing import Dict, Any
 from datetime import datetime, timedelta
 from app.database import get_db
+from app.executor import offload
 from app.models.lot import Lot, LotStatus
 from app.models.equipment import Equipment
 from app.models.anomaly import Anomaly, Severity
@@ -12,7 +13,8 @@ from app.models.anomaly import Anomaly, Severity
 router = APIRouter(prefix="/kpi", tags=["kpi"])
 
 @router.get("/summary")
-async def get_kpi_summary(db: Session = Depends(get_db)) -> Dict[str, Any]:
+@offload("db")
+def get_kpi_summary(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
     홈 화면 KPI 카드 데이터 반환
     - 목표량, 양품량, 납기준수율, 생산수율, 불량량, 설비가동률
@@ -69,7 +71,8 @@ async def get_kpi_summary(db: Session = Depends(get_db)) -> Dict[str, Any]:
     }
 
 @router.get("/trend/{metric}")
-async def get_kpi_trend(
+@offload("db")
+def get_kpi_trend(
     metric: str,  # yield_rate, defect_quantity, utilization
     hours: int = 24,
     db: Session = Depends(get_db)
@@ -90,7 +93,8 @@ async def get_kpi_trend(
     }
 
 @router.get("/alerts")
-async def get_recent_alerts(
+@offload("db")
+def get_recent_alerts(
     limit: int = 10,
     db: Session = Depends(get_db)
 ):
@@ -117,7 +121,8 @@ async def get_recent_alerts(
     }
 
 @router.get("/lots/status")
-async def get_lot_status_distribution(db: Session = Depends(get_db)):
+@offload("db")
+def get_lot_status_distribution(db: Session = Depends(get_db)):
     """
     실시간 공정 현황 (진행/완료/실패/대기)
     """
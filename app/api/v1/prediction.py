@@ -3,13 +3,15 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
+from app.executor import offload
 from app.schemas.prediction import PredictionRequest, PredictionResponse
 from app.services.prediction_service import PredictionService
 
 router = APIRouter(prefix="/prediction", tags=["prediction"])
 
 @router.post("/create", response_model=PredictionResponse)
-async def create_prediction(
+@offload("inference")
+def create_prediction(
     request: PredictionRequest,
     db: Session = Depends(get_db)
 ):
@@ -40,6 +42,7 @@ async def create_prediction(
             "confidence_upper": prediction.confidence_upper,
             "feature_importance": feature_importance,
             "interpretation": prediction.interpretation,
+            "model_version": prediction.model_version,
             "created_at": prediction.created_at
         }
     except ValueError as e:
@@ -48,7 +51,8 @@ async def create_prediction(
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 @router.get("/{job_id}", response_model=PredictionResponse)
-async def get_prediction(
+@offload("db")
+def get_prediction(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -73,11 +77,13 @@ async def get_prediction(
         "confidence_upper": prediction.confidence_upper,
         "feature_importance": feature_importance,
         "interpretation": prediction.interpretation,
+        "model_version": prediction.model_version,
         "created_at": prediction.created_at
     }
 
 @router.get("/history/{eq_id}")
-async def get_prediction_history(
+@offload("db")
+def get_prediction_history(
     eq_id: str,
     limit: int = 10,
     db: Session = Depends(get_db)
@@ -94,6 +100,7 @@ async def get_prediction_history(
                 "job_id": p.job_id,
                 "prediction_target": p.prediction_target,
                 "probability": p.probability,
+                "model_version": p.model_version,
                 "created_at": p.created_at.isoformat()
             }
             for p in history
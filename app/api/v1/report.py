@@ -5,8 +5,9 @@ from typing import List
 import os
 
 from app.database import get_db
+from app.executor import execution, offload, PoolSaturatedError
 from app.schemas.report import ReportRequest, ReportResponse
-from app.services.report_service import ReportService
+from app.services.report_service import ReportService, render_report
 
 router = APIRouter(prefix="/report", tags=["report"])
 
@@ -25,7 +26,10 @@ async def generate_report(
     service = ReportService(db)
     
     try:
-        report = service.generate_report(request)
+        # DB 수집 → PDF 렌더링(프로세스 풀) → DB 저장
+        job_id, file_path, report_data = await execution.run_db(service.prepare_report, request)
+        await execution.run_report(render_report, request.role, file_path, report_data)
+        report = await execution.run_db(service.save_report, job_id, request, file_path, report_data)
         
         return {
             "job_id": report.job_id,
@@ -35,11 +39,14 @@ async def generate_report(
             "file_path": report.file_path,
             "created_at": report.created_at
         }
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
 
 @router.get("/{job_id}", response_model=ReportResponse)
-async def get_report_info(
+@offload("db")
+def get_report_info(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -60,7 +67,8 @@ async def get_report_info(
     }
 
 @router.get("/{job_id}/download")
-async def download_report(
+@offload("db")
+def download_report(
     job_id: str,
     db: Session = Depends(get_db)
 ):
@@ -81,7 +89,8 @@ async def download_report(
     )
 
 @router.get("/list/all")
-async def get_report_list(
+@offload("db")
+def get_report_list(
     limit: int = 20,
     db: Session = Depends(get_db)
 ):
@@ -1,5 +1,5 @@
 # app/config.py
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -18,6 +18,86 @@ class Settings(BaseSettings):
     # ML Models
     LSTM_MODEL_PATH: str = "./data/models/lstm_model.pt"
     ISOLATION_FOREST_PATH: str = "./data/models/isolation_forest.pkl"
+    ISOLATION_FOREST_ARRAYS_PATH: str = "./data/models/isolation_forest.npz"  # 있으면 pickle 대신 사용
+    LSTM_BACKEND: str = "eager"  # eager, inference_mode, torchscript, quantized
+    LSTM_NUM_THREADS: int = 0    # torch intra-op 스레드 수 (0이면 기본값)
+    LSTM_BACKEND_TOLERANCE: float = 1e-2  # eager 대비 허용 이상 점수 오차
+    LSTM_SEQUENCE_LENGTH: int = 60
+    LSTM_STREAM_MAX_STATES: int = 1024       # 스트리밍 추론 설비 상태 최대 개수 (LRU)
+    LSTM_STREAM_STATE_TTL_SEC: float = 3600  # 갱신 없는 상태 만료 시간
+    FEATURE_IMPORTANCE_MODE: str = "reconstruction"  # reconstruction (변수별 복원 오차), std (입력 표준편차)
+    MODEL_BUNDLE_PATH: str = "./data/models/bundle"  # 번들(manifest.json)이 있으면 위 개별 경로 대신 사용
+    WINDOW_INTERVAL_SEC: float = 120.0  # 모델 입력 윈도우 시간 격자 간격 (60 스텝 = 2시간)
+    WINDOW_AGGREGATION: str = "last"    # 격자 구간 집계: last (as-of), mean
+
+    # 설비 태그 → TEP 모델 변수 매핑 (TAG_FEATURE_MAP_PATH JSON이 있으면 설비별 덮어쓰기 포함 우선 사용)
+    # XMEAS_6: Reactor feed rate, XMEAS_7: Reactor pressure, XMEAS_8: Reactor level, XMEAS_9: Reactor temperature
+    TAG_FEATURE_MAP: Dict[str, str] = {
+        "temperature": "XMEAS_9",
+        "pressure": "XMEAS_7",
+        "flow": "XMEAS_6",
+        "level": "XMEAS_8",
+    }
+    TAG_FEATURE_MAP_PATH: str = ""
+    TEP_TRAIN_PATH: str = "./data/tep_train.csv"
+    TEP_TEST_PATH: str = "./data/tep_test.csv"
+    TEP_CACHE_DIR: str = "./data/cache"  # CSV → float32 memory-map 캐시 (CSV 파일별 하위 디렉토리)
+    MODEL_WARMUP_ON_STARTUP: bool = False  # True면 서버 시작 시 모델 사전 로드
+    MODEL_WATCH_ENABLED: bool = False      # True면 번들 manifest 변경 시 자동 교체
+    MODEL_WATCH_INTERVAL_SEC: float = 10.0
+    MODEL_SWAP_GRACE_SEC: float = 30.0     # 교체 후 이전 모델 정리까지 대기 (진행 중 요청 마무리)
+
+    # 주기 이상 탐지 (전체 설비 일괄 채점, DETECTION_SCHEDULER_ENABLED면 서버 시작 시 실행)
+    DETECTION_SCHEDULER_ENABLED: bool = False
+    DETECTION_INTERVAL_SEC: float = 60.0     # 주기 (이전 주기가 끝나지 않았으면 건너뜀)
+    DETECTION_JITTER_SEC: float = 5.0        # 주기마다 0~N초 무작위 지연 (여러 인스턴스 동시 조회 분산)
+    DETECTION_MIN_OBSERVATIONS: int = 10     # 윈도우 구간 최소 원본 관측 수 (실시간 탐지와 동일)
+    DETECTION_INACTIVE_STATUSES: List[str] = []  # 탐지 제외할 Equipment.status 값 (기본 "normal"만 쓰므로 기본은 제외 없음)
+    DETECTION_HISTORY: int = 100             # 상태 API에 남길 최근 주기 수
+
+    # 원본 시계열 저장 스키마
+    # - wide: tags_timeseries (행마다 eq_id/tag_name/unit 문자열 + 대리 키)
+    # - compact: tag_series 사전 + tag_points (series_id, timestamp, value), scripts/migrate_timeseries_compact.py로 전환
+    TIMESERIES_SCHEMA: str = "wide"
+
+    # 시계열 조회 응답 점 수 상한 (다운샘플링)
+    TIMESERIES_MAX_POINTS: int = 2000
+
+    # 시계열 구간 집계 (tags_rollup_1m/5m/1h, tag_series.dirty_from 이후 구간만 다시 계산)
+    ROLLUP_READS_ENABLED: bool = True          # 조회 범위/점 수 상한에 맞는 집계 테이블 사용
+    ROLLUP_COMPACTOR_ENABLED: bool = False     # True면 서버 시작 시 백그라운드 집계 실행
+    ROLLUP_COMPACT_INTERVAL_SEC: float = 30.0
+    ROLLUP_COMPACT_BATCH_ROWS: int = 200000    # 트랜잭션 1개당 원본 행 수
+
+    # 시계열 청크 봉인 (tag_chunks, 닫힌 1시간 구간 원본 행 → Gorilla 압축 BLOB 1개)
+    CHUNK_SEALER_ENABLED: bool = False     # True면 서버 시작 시 백그라운드 봉인 실행
+    CHUNK_SEAL_AFTER_SEC: float = 7200.0   # 구간이 끝난 뒤 이만큼 지나야 봉인 (늦게 도착하는 데이터 대기)
+    CHUNK_SEAL_INTERVAL_SEC: float = 300.0
+    CHUNK_SEAL_MAX_CHUNKS: int = 500       # seal_closed_hours 1회당 청크 수
+
+    # 센서 데이터 일괄 적재 (POST /equipment/ingest)
+    INGEST_BATCH_ROWS: int = 10000       # executemany 1회당 행 수
+    INGEST_COMMIT_ROWS: int = 200000     # 트랜잭션 1개당 최대 행 수
+    INGEST_MAX_ERRORS: int = 20          # 응답에 포함할 거부 사유 수
+
+    # 이상 탐지 백필 (과거 구간 재채점)
+    BACKFILL_CHUNK_SEC: float = 21600.0     # 청크 길이 (6시간, 청크마다 커밋 + 체크포인트)
+    BACKFILL_STEP_SEC: float = 120.0        # 기본 윈도우 간격 (WINDOW_INTERVAL_SEC의 배수로 맞춤)
+    BACKFILL_EQ_BATCH: int = 50             # 한 번에 조회/정렬할 설비 수
+    BACKFILL_INSERT_BATCH: int = 1000       # bulk insert 1회당 행 수
+    BACKFILL_MAX_JOBS: int = 1              # 동시 실행 작업 수 (초과분은 대기)
+    BACKFILL_STALE_SEC: float = 1800.0      # 하트비트가 이보다 오래된 RUNNING 작업만 재개 허용 (청크 1개 처리 시간보다 길게)
+
+    # 마이크로 배칭 (동시 추론 요청을 묶어서 1회 forward)
+    INFERENCE_BATCHING: bool = False
+    INFERENCE_MAX_BATCH_SIZE: int = 32
+    INFERENCE_MAX_WAIT_MS: float = 5.0
+
+    # 실행 계층 (이벤트 루프 밖 블로킹 작업용 풀)
+    EXECUTOR_INFERENCE_WORKERS: int = 2  # 모델 추론 스레드 (INFERENCE_BATCHING이면 최소 INFERENCE_MAX_BATCH_SIZE)
+    EXECUTOR_REPORT_WORKERS: int = 1     # PDF 렌더링 프로세스
+    EXECUTOR_DB_WORKERS: int = 10        # DB I/O 스레드 (DB 커넥션 풀 크기와 맞춤)
+    EXECUTOR_QUEUE_LIMIT: int = 100      # 풀별 최대 대기 작업 수 (초과 시 503)
 
     # pydantic-settings v2 방식
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
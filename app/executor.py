@@ -0,0 +1,219 @@
+# app/executor.py
+# 이벤트 루프 밖에서 블로킹 작업(DB, 모델 추론, PDF 렌더링)을 실행하는 실행 계층
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.config import settings
+
+
+class PoolSaturatedError(RuntimeError):
+    """풀의 대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class BoundedPool:
+    """
+    최대 동시 실행 수 + 대기열 길이가 제한된 스레드/프로세스 풀
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_queue: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"지원하지 않는 풀 종류입니다: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+
+        self._executor: Executor = None
+        self._lock = threading.Lock()
+
+        # 메트릭
+        self._in_flight = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_sum = 0.0
+        self._run_sum = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "thread":
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix=f"pool-{self.name}"
+                        )
+                    else:
+                        # torch가 로드된 프로세스의 fork를 피하기 위해 spawn 사용
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PoolSaturatedError(f"{self.name} 풀이 포화 상태입니다")
+            self._in_flight += 1
+            self._submitted += 1
+
+    def _release(self, ok: bool, wait: float, run: float):
+        with self._lock:
+            self._in_flight -= 1
+            if ok:
+                self._completed += 1
+            else:
+                self._failed += 1
+            self._wait_sum += wait
+            self._run_sum += run
+
+    def _tracked(self, fn: Callable, enqueued: float) -> Callable:
+        """스레드 풀용: 대기/실행 시간을 워커 안에서 측정"""
+        def runner():
+            started = time.perf_counter()
+            with self._lock:
+                self._active += 1
+            try:
+                return fn(), started - enqueued, time.perf_counter() - started
+            finally:
+                with self._lock:
+                    self._active -= 1
+        return runner
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """풀에서 fn(*args, **kwargs) 실행 후 결과 반환"""
+        self._acquire()
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        enqueued = time.perf_counter()
+        ok = False
+        wait = run = 0.0
+        try:
+            if self.kind == "thread":
+                result, wait, run = await loop.run_in_executor(
+                    self._get_executor(), self._tracked(call, enqueued)
+                )
+            else:
+                # 프로세스 풀은 대기/실행 구분 없이 전체 소요 시간만 측정
+                result = await loop.run_in_executor(self._get_executor(), call)
+                run = time.perf_counter() - enqueued
+            ok = True
+            return result
+        finally:
+            self._release(ok, wait, run)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            finished = self._completed + self._failed
+            capacity = self.max_workers + self.max_queue
+            active = self._active if self.kind == "thread" else min(self._in_flight, self.max_workers)
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": active,
+                "queue_depth": max(0, self._in_flight - active),
+                "saturation": round(self._in_flight / capacity, 3) if capacity else 0.0,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_sum / finished * 1000, 3) if finished else 0.0,
+                "avg_run_ms": round(self._run_sum / finished * 1000, 3) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def inference_workers() -> int:
+    """
+    추론 풀 스레드 수
+
+    마이크로 배칭을 쓰면 추론 스레드는 배처 결과(Future)를 기다리기만 하므로, 스레드 수가
+    배치 크기의 상한이 된다. 배치가 INFERENCE_MAX_BATCH_SIZE까지 찰 수 있도록 그만큼 늘린다
+    (실제 연산은 배처 워커 스레드 하나에서 실행).
+    """
+    workers = settings.EXECUTOR_INFERENCE_WORKERS
+    if settings.INFERENCE_BATCHING:
+        workers = max(workers, settings.INFERENCE_MAX_BATCH_SIZE)
+    return workers
+
+
+class ExecutionLayer:
+    """
+    용도별로 분리된 풀
+    - inference: CPU 모델 추론 (torch/numpy는 GIL을 놓으므로 스레드)
+    - report: ReportLab PDF 렌더링 (순수 파이썬이므로 프로세스)
+    - db: 동기 SQLAlchemy 세션 I/O (스레드)
+    """
+
+    def __init__(self):
+        self.pools: Dict[str, BoundedPool] = {
+            "inference": BoundedPool(
+                "inference", "thread",
+                inference_workers(),
+                settings.EXECUTOR_QUEUE_LIMIT
+            ),
+            "report": BoundedPool(
+                "report", "process",
+                settings.EXECUTOR_REPORT_WORKERS,
+                settings.EXECUTOR_QUEUE_LIMIT
+            ),
+            "db": BoundedPool(
+                "db", "thread",
+                settings.EXECUTOR_DB_WORKERS,
+                settings.EXECUTOR_QUEUE_LIMIT
+            ),
+        }
+
+    async def run(self, lane: str, fn: Callable, *args, **kwargs) -> Any:
+        return await self.pools[lane].run(fn, *args, **kwargs)
+
+    async def run_inference(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self.run("inference", fn, *args, **kwargs)
+
+    async def run_report(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self.run("report", fn, *args, **kwargs)
+
+    async def run_db(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self.run("db", fn, *args, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict]:
+        return {name: pool.metrics() for name, pool in self.pools.items()}
+
+    def shutdown(self, wait: bool = True):
+        for pool in self.pools.values():
+            pool.shutdown(wait=wait)
+
+
+execution = ExecutionLayer()
+
+
+def offload(lane: str):
+    """
+    동기 엔드포인트를 지정한 풀에서 실행하는 async 엔드포인트로 변환
+
+    @router.get(...)
+    @offload("db")
+    def handler(..., db: Session = Depends(get_db)): ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await execution.run(lane, fn, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,7 +1,15 @@
 # app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.database import engine, Base
 from app.api.v1 import api_router
+from app.config import settings
+from app.ml.registry import registry, watcher
+from app.executor import execution, PoolSaturatedError
+from app.services.backfill_service import backfill_runner
+from app.services.detection_service import detection_scheduler
+from app.services.rollup_service import rollup_compactor
+from app.services.chunk_service import chunk_sealer
 import logging
 
 log = logging.getLogger("uvicorn.error")
@@ -17,6 +25,49 @@ def on_startup():
         # DB가 아직 안 떠 있어도 서버는 구동되게 함
         log.error(f"DB init failed: {e}")
 
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        try:
+            registry.warmup()
+            log.info("ML models warmed up.")
+        except Exception as e:
+            # 모델 로드 실패 시에도 서버는 구동 (요청 시 재시도)
+            log.error(f"Model warmup failed: {e}")
+
+    if settings.MODEL_WATCH_ENABLED:
+        # 번들 manifest 변경 시 무중단 교체
+        watcher.start()
+        log.info("Model bundle watcher started.")
+
+    if settings.DETECTION_SCHEDULER_ENABLED:
+        # 전체 설비 주기 이상 탐지
+        detection_scheduler.start()
+        log.info("Detection scheduler started.")
+
+    if settings.ROLLUP_COMPACTOR_ENABLED:
+        # 새 원본 행을 1m/5m/1h 집계 테이블에 증분 반영
+        rollup_compactor.start()
+        log.info("Rollup compactor started.")
+
+    if settings.CHUNK_SEALER_ENABLED:
+        # 닫힌 1시간 구간 원본 행을 압축 청크로 봉인
+        chunk_sealer.start()
+        log.info("Chunk sealer started.")
+
+@app.on_event("shutdown")
+def on_shutdown():
+    watcher.stop()
+    detection_scheduler.stop()
+    rollup_compactor.stop()
+    chunk_sealer.stop()
+    # 진행 중인 백필은 현재 청크까지 커밋 후 중단 (resume으로 이어서 실행)
+    backfill_runner.shutdown()
+    execution.shutdown(wait=False)
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    # 실행 풀 대기열 초과 → 잠시 후 재시도 요청
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 app.include_router(api_router, prefix="/api/v1")
 
 # app/main.py
@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.data_processor import TEPDataProcessor
+from app.utils.tep_loader import TEPCache
+
+# TEP 데이터 샘플 간격 (3분)
+TEP_SAMPLE_SECONDS = 180.0
+
+# TEP 구간 내 고장 주입 행 (학습 데이터 1시간, 테스트 데이터 8시간 후)
+TEP_FAULT_ONSET = {"train": 20, "test": 160}
+
+# 워커 프로세스별 예측기 (initializer에서 1회 로드)
+_worker_predictor = None
+
+
+def _init_worker(bundle_path: Optional[str]):
+    global _worker_predictor
+    import torch
+    from app.ml.registry import registry
+
+    # 프로세스마다 코어 하나씩 사용
+    torch.set_num_threads(1)
+    _worker_predictor = registry.staged(bundle_path).get("predictor")
+
+
+def replay_run(
+    predictor,
+    cache: TEPCache,
+    segment: Sequence[int],
+    eq_id: Optional[str] = None,
+    fault_onset: int = 0,
+    stride: int = 1,
+    batch_size: int = 512
+) -> Dict:
+    """
+    한 구간 (TEP run 또는 설비 하나)의 모든 윈도우를 배치 채점해 탐지 결과 요약
+
+    윈도우 라벨은 윈도우 마지막 행이 고장 시작(fault_onset) 이후이면 고장 번호, 아니면 0.
+
+    Args:
+        segment: (fault, run, start, stop) TEPCache.runs 행
+        fault_onset: 구간 시작부터 고장이 주입되는 행 번호 (TEP 학습 데이터 20, 테스트 160)
+
+    Returns:
+        {"fault", "run", "eq_id", "windows", "tp", "fp", "fn", "tn", "first_alarm_delay"}
+        first_alarm_delay는 고장 시작 후 첫 경보까지 행 수 (고장 구간이 아니거나 미탐지면 None)
+    """
+    fault, run, start, stop = (int(v) for v in segment)
+    sequence_length = predictor.lstm.sequence_length
+
+    windows = TEPDataProcessor().create_sequences(cache.features[start:stop], sequence_length, stride)
+    # 윈도우 마지막 행의 구간 내 위치
+    end_rows = np.arange(len(windows)) * stride + sequence_length - 1
+
+    result = {
+        "fault": fault,
+        "run": run,
+        "eq_id": eq_id,
+        "windows": len(windows),
+        "tp": 0,
+        "fp": 0,
+        "fn": 0,
+        "tn": 0,
+        "first_alarm_delay": None
+    }
+    if len(windows) == 0:
+        return result
+
+    scores = predictor.score_windows(windows, [eq_id] * len(windows), batch_size=batch_size)
+    alarm = scores["is_anomaly"]
+    faulty = (end_rows >= fault_onset) if fault != 0 else np.zeros(len(windows), dtype=bool)
+
+    result["tp"] = int(np.count_nonzero(alarm & faulty))
+    result["fp"] = int(np.count_nonzero(alarm & ~faulty))
+    result["fn"] = int(np.count_nonzero(~alarm & faulty))
+    result["tn"] = int(np.count_nonzero(~alarm & ~faulty))
+
+    detected = np.flatnonzero(alarm & faulty)
+    if len(detected):
+        result["first_alarm_delay"] = int(end_rows[detected[0]] - max(fault_onset, 0))
+    return result
+
+
+def _replay_in_worker(cache_path: str, segment, eq_id, fault_onset, stride, batch_size) -> Dict:
+    return replay_run(_worker_predictor, TEPCache.open(cache_path), segment, eq_id, fault_onset, stride, batch_size)
+
+
+def summarize(results: List[Dict], sample_seconds: float) -> Dict:
+    """
+    구간별 결과 → 전체 지표
+
+    - precision / recall / false_alarm_rate: 윈도우 단위
+    - faults: 고장 번호별 탐지 구간 수와 탐지 지연 (초, 평균/중앙값/최대)
+    """
+    totals = {key: sum(r[key] for r in results) for key in ("windows", "tp", "fp", "fn", "tn")}
+    tp, fp, fn, tn = totals["tp"], totals["fp"], totals["fn"], totals["tn"]
+
+    faults: Dict[int, Dict] = {}
+    for fault in sorted({r["fault"] for r in results if r["fault"] != 0}):
+        runs = [r for r in results if r["fault"] == fault]
+        delays = np.asarray([r["first_alarm_delay"] for r in runs if r["first_alarm_delay"] is not None], dtype=np.float64)
+        delays *= sample_seconds
+        faults[fault] = {
+            "runs": len(runs),
+            "detected": int(len(delays)),
+            "detection_rate": len(delays) / len(runs),
+            "recall": sum(r["tp"] for r in runs) / max(sum(r["tp"] + r["fn"] for r in runs), 1),
+            "delay_mean_sec": float(delays.mean()) if len(delays) else None,
+            "delay_median_sec": float(np.median(delays)) if len(delays) else None,
+            "delay_max_sec": float(delays.max()) if len(delays) else None
+        }
+
+    return {
+        **totals,
+        "precision": tp / (tp + fp) if tp + fp else None,
+        "recall": tp / (tp + fn) if tp + fn else None,
+        "false_alarm_rate": fp / (fp + tn) if fp + tn else None,
+        "faults": faults
+    }
+
+
+def run_backtest(
+    cache: TEPCache,
+    bundle_path: Optional[str] = None,
+    faults: Optional[Iterable[int]] = None,
+    fault_onset: int = 0,
+    sample_seconds: Optional[float] = None,
+    stride: int = 1,
+    batch_size: int = 512,
+    workers: int = 0,
+    predictor=None
+) -> Dict:
+    """
+    캐시의 구간들을 예측기로 재생해 탐지 성능과 처리량 측정
+
+    요청 경로(윈도우 조립, 해석 생성, DB 저장)를 거치지 않고 구간별 슬라이딩 윈도우를
+    score_windows로 배치 채점한다. workers > 0이면 구간(설비/run) 단위로 프로세스 풀에 나눠
+    각 워커가 번들을 한 번만 로드하고 캐시를 memory-map으로 연다.
+
+    Args:
+        faults: 재생할 고장 번호 (None이면 전체)
+        sample_seconds: 행 간격 (None이면 캐시 manifest의 interval_seconds, 없으면 TEP 3분)
+        workers: 프로세스 수 (0이면 현재 프로세스에서 predictor 사용)
+        predictor: workers=0일 때 사용할 예측기 (None이면 bundle_path로 로드)
+
+    Returns:
+        summarize 결과 + 처리량 (windows_per_sec, replay_speedup)
+    """
+    segments = cache.select_runs(faults)
+    if sample_seconds is None:
+        sample_seconds = float(cache.manifest["source"].get("interval_seconds", TEP_SAMPLE_SECONDS))
+
+    # tags_timeseries export면 run 번호 = 설비 순번
+    eq_ids = cache.manifest["source"].get("eq_ids")
+
+    def eq_of(run: int) -> Optional[str]:
+        return eq_ids[run] if eq_ids is not None and 0 <= run < len(eq_ids) else None
+
+    started = time.perf_counter()
+    if workers > 0:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(bundle_path,)
+        ) as pool:
+            futures = [
+                pool.submit(_replay_in_worker, cache.path, segment.tolist(), eq_of(int(segment[1])), fault_onset, stride, batch_size)
+                for segment in segments
+            ]
+            results = [future.result() for future in futures]
+    else:
+        if predictor is None:
+            from app.ml.registry import registry
+            predictor = registry.staged(bundle_path).get("predictor")
+        results = [
+            replay_run(predictor, cache, segment, eq_of(int(segment[1])), fault_onset, stride, batch_size)
+            for segment in segments
+        ]
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(results, sample_seconds)
+    replayed_rows = int(sum(stop - start for _, _, start, stop in segments))
+    summary.update({
+        "segments": len(segments),
+        "rows": replayed_rows,
+        "seconds": elapsed,
+        "windows_per_sec": summary["windows"] / elapsed if elapsed > 0 else 0.0,
+        # 재생한 데이터 시간 / 소요 시간 (구간들은 같은 기간의 다른 설비일 수 있으므로 합산 기준)
+        "replay_speedup": replayed_rows * sample_seconds / elapsed if elapsed > 0 else 0.0,
+        "runs": results
+    })
+    return summary
@@ -0,0 +1,219 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    마이크로 배칭 스케줄러
+
+    동시에 들어온 단건 요청을 최대 max_wait_ms 동안(또는 max_batch_size까지) 모아
+    batch_fn을 한 번만 호출하고, 결과를 각 요청의 Future로 돌려준다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue[Tuple[Any, Future, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stopped = False
+
+        # 메트릭
+        self._batches = 0
+        self._requests = 0
+        self._max_batch = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+        self._batch_size_hist: Dict[int, int] = {}
+
+    def submit(self, item: Any) -> Future:
+        """
+        요청 등록 (결과는 Future로 반환)
+
+        종료 확인과 등록을 같은 잠금 안에서 하므로 shutdown의 종료 표시(None) 뒤에는 요청이 들어가지 않는다.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError(f"{self.name} 배처가 종료되었습니다")
+            self._ensure_worker()
+            self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item: Any) -> Any:
+        """요청 등록 후 결과까지 대기"""
+        return self.submit(item).result()
+
+    def _ensure_worker(self):
+        # self._lock을 잡은 상태에서 호출
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._run,
+                name=f"microbatch-{self.name}",
+                daemon=True
+            )
+            self._worker.start()
+
+    def _collect(self) -> Tuple[List[Tuple[Any, Future, float]], bool]:
+        """첫 요청 도착 후 max_wait 또는 max_batch_size까지 모으기"""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            items = [entry[0] for entry in batch]
+            try:
+                results = list(self.batch_fn(items))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name} 배치 결과 수가 요청 수와 다릅니다: {len(results)} != {len(batch)}")
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+            self._record(batch, started)
+
+        # 종료 후 남은 요청은 실패 처리 (호출자가 result()에서 무한 대기하지 않도록)
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None:
+                entry[1].set_exception(RuntimeError(f"{self.name} 배처가 종료되었습니다"))
+
+    def _record(self, batch: List[Tuple[Any, Future, float]], started: float):
+        waits = [started - entry[2] for entry in batch]
+        size = len(batch)
+        with self._lock:
+            self._batches += 1
+            self._requests += size
+            self._max_batch = max(self._max_batch, size)
+            self._wait_sum += sum(waits)
+            self._wait_max = max(self._wait_max, max(waits))
+            self._batch_size_hist[size] = self._batch_size_hist.get(size, 0) + 1
+
+    def metrics(self) -> Dict:
+        """배치 크기 및 큐 대기 시간 메트릭"""
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "avg_batch_size": round(self._requests / self._batches, 2) if self._batches else 0.0,
+                "max_batch_size": self._max_batch,
+                "avg_queue_wait_ms": round(self._wait_sum / self._requests * 1000, 3) if self._requests else 0.0,
+                "max_queue_wait_ms": round(self._wait_max * 1000, 3),
+                "queue_depth": self._queue.qsize(),
+                "batch_size_histogram": dict(sorted(self._batch_size_hist.items())),
+                "config": {
+                    "max_batch_size": self.max_batch_size,
+                    "max_wait_ms": self.max_wait * 1000,
+                },
+            }
+
+    def shutdown(self):
+        """워커 종료 (이미 등록된 요청은 처리 후 종료, 이후 submit은 RuntimeError)"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            if self._worker is not None:
+                self._queue.put(None)
+
+
+class InferenceScheduler:
+    """
+    LSTM / Isolation Forest 단건 추론 요청을 마이크로 배치로 묶어 실행
+    """
+
+    def __init__(self, lstm, isolation_forest, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.lstm = lstm
+        self.isolation_forest = isolation_forest
+
+        self.lstm_batcher = MicroBatcher(
+            "lstm", self._run_lstm, max_batch_size, max_wait_ms
+        )
+        self.isolation_forest_batcher = MicroBatcher(
+            "isolation_forest", self._run_isolation_forest, max_batch_size, max_wait_ms
+        )
+
+    def submit_lstm(self, window: np.ndarray) -> Future:
+        """LSTM 윈도우 (sequence_length, features) 추론 요청"""
+        return self.lstm_batcher.submit(window)
+
+    def submit_isolation_forest(self, row: np.ndarray) -> Future:
+        """Isolation Forest 단일 샘플 (features,) 추론 요청"""
+        return self.isolation_forest_batcher.submit(row)
+
+    def _run_lstm(self, windows: List[np.ndarray]) -> List[Dict]:
+        results: List[Dict] = [None] * len(windows)
+
+        # 윈도우 길이가 다른 요청은 따로 묶어서 실행
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i, window in enumerate(windows):
+            groups.setdefault(np.shape(window), []).append(i)
+
+        for indices in groups.values():
+            batch = np.stack([windows[i] for i in indices])
+            output = self.lstm.infer_batch(batch)
+            for j, i in enumerate(indices):
+                results[i] = {
+                    "reconstruction": output["reconstruction"][j],
+                    "predicted": output["predicted"][j],
+                    "timestep_errors": output["timestep_errors"][j],
+                    "feature_errors": output["feature_errors"][j],
+                    "confidence": float(output["confidence"][j]),
+                    "anomaly_score": float(output["anomaly_score"][j]),
+                    "is_anomaly": bool(output["is_anomaly"][j]),
+                }
+        return results
+
+    def _run_isolation_forest(self, rows: List[np.ndarray]) -> List[Tuple[bool, float]]:
+        is_anomaly, scores = self.isolation_forest.detect_rows(np.stack(rows))
+        return [(bool(a), float(s)) for a, s in zip(is_anomaly, scores)]
+
+    def metrics(self) -> Dict:
+        return {
+            "lstm": self.lstm_batcher.metrics(),
+            "isolation_forest": self.isolation_forest_batcher.metrics(),
+        }
+
+    def shutdown(self):
+        self.lstm_batcher.shutdown()
+        self.isolation_forest_batcher.shutdown()
@@ -0,0 +1,268 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+
+from app.ml.calibration import ScoreCalibration
+from app.ml.iforest_arrays import ForestArrays, load_npz_mmap
+
+# 번들 디렉토리 구성
+# bundle/
+#   manifest.json          버전, 변수 순서, 모델 구조, 임계값, 파일 목록
+#   lstm.pt                LSTMAutoencoder state_dict (torch.load(mmap=True))
+#   isolation_forest.npz   ForestArrays 노드 배열 (비압축, memory-map)
+#   scaler.npz             학습 시 정규화 통계 mean/std (비압축, memory-map)
+#   calibration.npz        (선택) 그룹별 임계값/점수 → 확률 매핑 (scripts/calibrate_models.py)
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+LSTM_FILE = "lstm.pt"
+ISOLATION_FOREST_FILE = "isolation_forest.npz"
+SCALER_FILE = "scaler.npz"
+CALIBRATION_FILE = "calibration.npz"
+
+# TEPDataProcessor.normalize_data와 동일한 분모 보정값
+SCALER_EPS = 1e-8
+
+# 번들 없이 개별 모델 파일로 로드한 경우의 버전 표기
+LEGACY_VERSION = "legacy"
+
+DEFAULT_THRESHOLDS = {
+    "lstm": 0.05,
+}
+
+
+def is_bundle(path: Optional[str]) -> bool:
+    """path가 모델 번들 디렉토리인지 확인"""
+    return bool(path) and os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+class ModelBundle:
+    """
+    버전이 붙은 모델 번들
+
+    학습 시 사용한 전처리(정규화 통계, 변수 순서)와 임계값을 가중치와 함께 묶어
+    서빙에서 재계산 없이 그대로 적용한다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        manifest: Dict,
+        scaler: Dict[str, np.ndarray],
+        calibration: Optional[ScoreCalibration] = None
+    ):
+        self.path = path
+        self.manifest = manifest
+
+        self.version: str = manifest["version"]
+        self.feature_names: List[str] = list(manifest["feature_names"])
+        self.sequence_length: int = int(manifest["sequence_length"])
+        self.lstm_config: Dict = manifest["lstm"]
+        self.thresholds: Dict[str, float] = {**DEFAULT_THRESHOLDS, **manifest.get("thresholds", {})}
+        self.calibration = calibration
+
+        self.mean = scaler["mean"]
+        self.std = scaler["std"]
+        # 분모를 미리 계산해 두고 요청마다 재사용
+        self._scale = (np.asarray(self.std, dtype=np.float64) + SCALER_EPS).astype(np.float32)
+        self._mean = np.asarray(self.mean, dtype=np.float32)
+
+    @classmethod
+    def load(cls, path: str) -> "ModelBundle":
+        """manifest와 정규화 통계 로드 (가중치는 각 모델이 memory-map으로 로드)"""
+        with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"지원하지 않는 번들 형식입니다: {manifest.get('format')}")
+
+        scaler = load_npz_mmap(os.path.join(path, manifest["files"]["scaler"]))
+        n_features = len(manifest["feature_names"])
+        if scaler["mean"].shape != (n_features,) or scaler["std"].shape != (n_features,):
+            raise ValueError("정규화 통계와 변수 개수가 일치하지 않습니다")
+
+        calibration = None
+        if manifest["files"].get("calibration"):
+            calibration = ScoreCalibration.load(os.path.join(path, manifest["files"]["calibration"]))
+
+        print(f"✅ 모델 번들 로드 완료: {path} (version {manifest['version']})")
+        return cls(path, manifest, scaler, calibration)
+
+    @property
+    def lstm_path(self) -> str:
+        return os.path.join(self.path, self.manifest["files"]["lstm"])
+
+    @property
+    def isolation_forest_path(self) -> str:
+        return os.path.join(self.path, self.manifest["files"]["isolation_forest"])
+
+    @property
+    def input_size(self) -> int:
+        return len(self.feature_names)
+
+    def normalize(self, data: np.ndarray) -> np.ndarray:
+        """학습 시와 동일한 정규화 적용 (..., features)"""
+        return (np.asarray(data, dtype=np.float32) - self._mean) / self._scale
+
+    def denormalize(self, data: np.ndarray) -> np.ndarray:
+        """정규화 공간의 값을 원 단위로 복원"""
+        return np.asarray(data, dtype=np.float32) * self._scale + self._mean
+
+    def memory_bytes(self) -> int:
+        return int(self._mean.nbytes + self._scale.nbytes)
+
+    def info(self) -> Dict:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "created_at": self.manifest.get("created_at"),
+            "n_features": self.input_size,
+            "sequence_length": self.sequence_length,
+            "thresholds": self.thresholds,
+            "calibration": self.calibration.info() if self.calibration is not None else None,
+        }
+
+
+def write_bundle(
+    path: str,
+    version: str,
+    lstm_state_dict: Dict[str, torch.Tensor],
+    forest: ForestArrays,
+    mean: np.ndarray,
+    std: np.ndarray,
+    feature_names: List[str],
+    sequence_length: int = 60,
+    hidden_size: int = 64,
+    num_layers: int = 2,
+    thresholds: Optional[Dict[str, float]] = None,
+    extra: Optional[Dict] = None
+) -> str:
+    """
+    모델 번들 저장
+
+    같은 부모 디렉토리의 새 디렉토리에 모두 기록한 뒤 path 심볼릭 링크를 원자적으로 바꾸므로,
+    읽는 쪽은 쓰는 중인 번들이나 번들이 없는 순간을 보지 않는다 (_swap_in 참고).
+
+    Returns:
+        저장된 번들 경로
+    """
+    n_features = len(feature_names)
+    if forest.n_features != n_features:
+        raise ValueError(f"Isolation Forest 변수 개수가 다릅니다: {forest.n_features} != {n_features}")
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".bundle-", dir=parent)
+
+    try:
+        torch.save(lstm_state_dict, os.path.join(staging, LSTM_FILE))
+        forest.save(os.path.join(staging, ISOLATION_FOREST_FILE))
+        np.savez(
+            os.path.join(staging, SCALER_FILE),
+            mean=np.asarray(mean, dtype=np.float64).reshape(n_features),
+            std=np.asarray(std, dtype=np.float64).reshape(n_features)
+        )
+
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "version": version,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "feature_names": list(feature_names),
+            "sequence_length": int(sequence_length),
+            "lstm": {
+                "input_size": n_features,
+                "hidden_size": int(hidden_size),
+                "num_layers": int(num_layers),
+            },
+            "thresholds": {**DEFAULT_THRESHOLDS, **(thresholds or {})},
+            "files": {
+                "lstm": LSTM_FILE,
+                "isolation_forest": ISOLATION_FOREST_FILE,
+                "scaler": SCALER_FILE,
+            },
+            **(extra or {}),
+        }
+        with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # mkdtemp는 0700으로 생성되므로 일반 디렉토리 권한으로 변경
+        os.chmod(staging, 0o755)
+        _swap_in(staging, path)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    print(f"✅ 모델 번들 저장 완료: {path} (version {version})")
+    return path
+
+
+def _swap_in(directory: str, path: str):
+    """
+    path를 directory를 가리키는 심볼릭 링크로 원자적으로 교체 후 이전 번들 디렉토리 삭제
+
+    새 링크를 임시 이름으로 만든 뒤 os.replace로 덮어쓰므로 path는 항상 이전 또는 새 번들을
+    가리킨다. path가 이전 방식의 실제 디렉토리면 한 번만 옆으로 옮긴 뒤 링크로 전환한다.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    previous = None
+    if os.path.islink(path):
+        previous = os.path.realpath(path)
+    elif os.path.isdir(path):
+        previous = tempfile.mkdtemp(prefix=".bundle-old-", dir=parent)
+        os.rmdir(previous)
+        os.rename(path, previous)
+
+    link = os.path.join(parent, f".{os.path.basename(path)}.link-{os.getpid()}-{threading.get_ident()}")
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(directory), link)
+    os.replace(link, path)
+
+    if previous and previous != os.path.realpath(directory) and os.path.dirname(previous) == parent:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def write_calibration(path: str, calibration: ScoreCalibration) -> Dict:
+    """
+    기존 번들에 보정 테이블 추가 (전체 그룹 임계값은 manifest thresholds에도 반영)
+
+    보정 파일을 먼저 교체한 뒤 manifest를 교체하므로, manifest 변경을 감시하는 ModelWatcher가
+    새 보정값이 들어간 번들을 다시 로드한다.
+
+    Returns:
+        갱신된 manifest
+    """
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    staging = os.path.join(path, f".{CALIBRATION_FILE}.tmp")
+    with open(staging, "wb") as f:
+        calibration.save(f)
+    os.replace(staging, os.path.join(path, CALIBRATION_FILE))
+
+    manifest["files"]["calibration"] = CALIBRATION_FILE
+    manifest["thresholds"] = {
+        **manifest.get("thresholds", {}),
+        "lstm": calibration.threshold("lstm"),
+        # IsolationForestDetector offset (score_samples 기준)
+        "isolation_forest": calibration.isolation_forest_offset(),
+    }
+    manifest["calibration"] = {
+        "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **calibration.info(),
+    }
+
+    staging = f"{manifest_path}.tmp"
+    with open(staging, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(staging, manifest_path)
+
+    print(f"✅ 보정 테이블 저장 완료: {path} ({len(calibration.groups)} groups)")
+    return manifest
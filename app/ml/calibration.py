@@ -0,0 +1,396 @@
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.data_processor import TEPDataProcessor
+from app.utils.tep_loader import TEPCache
+
+# 보정 대상 점수 (둘 다 높을수록 이상)
+# - lstm: LSTMPredictor 평균 복원 오차
+# - isolation_forest: IsolationForestDetector.detect_rows 정규화 점수 (0~1)
+SCORE_MODELS = ("lstm", "isolation_forest")
+
+# 모든 설비에 적용되는 기본 그룹 (설비/유형 그룹이 없을 때 사용)
+GLOBAL_GROUP = "__global__"
+
+# 점수 → 확률 매핑 knot 위치 (정상 이력 분포의 누적 확률)
+CDF_LEVELS = np.unique(np.concatenate([np.linspace(0.0, 1.0, 101), [0.995, 0.999, 0.9995, 0.9999]]))
+
+DEFAULT_THRESHOLD_QUANTILE = 0.995
+DEFAULT_BASE_QUANTILE = 0.9
+
+
+def type_group(eq_type: str) -> str:
+    """설비 유형 그룹 이름 (설비 ID와 겹치지 않도록 접두사 사용)"""
+    return f"type:{eq_type}"
+
+
+class QuantileSketch:
+    """
+    상대 오차 보장 분위수 스케치 (DDSketch 방식, 로그 간격 고정 버킷)
+
+    값 x를 ceil(log_gamma(x)) 버킷에 세기만 하므로 관측 수와 무관하게 메모리가 일정하고,
+    같은 설정의 스케치는 버킷 합으로 병합된다. 분위수는 relative_accuracy 이내 상대 오차.
+    min_value 이하 값은 0 버킷, max_value 이상 값은 마지막 버킷에 센다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9, max_value: float = 1e9):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._key_offset = math.ceil(math.log(min_value) / self._log_gamma)
+        n_buckets = math.ceil(math.log(max_value) / self._log_gamma) - self._key_offset + 1
+
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values: np.ndarray) -> "QuantileSketch":
+        """값 배열 누적 (NaN/inf 제외)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+
+        small = values <= self.min_value
+        self.zero_count += int(small.sum())
+
+        large = values[~small]
+        if len(large):
+            keys = np.ceil(np.log(large) / self._log_gamma).astype(np.int64) - self._key_offset
+            np.clip(keys, 0, len(self.counts) - 1, out=keys)
+            self.counts += np.bincount(keys, minlength=len(self.counts))
+
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """같은 설정으로 만든 스케치 병합"""
+        if (other.relative_accuracy, other.min_value, other.max_value) != (
+            self.relative_accuracy, self.min_value, self.max_value
+        ):
+            raise ValueError("설정이 다른 스케치는 병합할 수 없습니다")
+
+        self.counts += other.counts
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q) -> np.ndarray:
+        """분위수 (q는 스칼라 또는 배열, 0~1)"""
+        q = np.asarray(q, dtype=np.float64)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+
+        rank = q * (self.count - 1)
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        bucket = np.searchsorted(cumulative, rank, side="right")
+        bucket = np.minimum(bucket, len(self.counts) - 1)
+
+        # 버킷 (gamma^(k-1), gamma^k]의 대표값 (상대 오차가 최소인 지점)
+        key = bucket + self._key_offset
+        values = 2.0 * np.exp(key * self._log_gamma) / (self.gamma + 1.0)
+        values = np.where(rank < self.zero_count, self.min, values)
+        return np.clip(values, self.min, self.max)
+
+
+class ScoreCalibration:
+    """
+    그룹별 (설비 / 설비 유형 / 전체) 점수 보정 테이블
+
+    정상 이력 점수 분포에서 구한 임계값과 점수 → 확률 knot를 그룹 × knot 배열로 들고 있어,
+    서빙에서는 그룹 행 조회 1회 + 모델별 np.interp 1회로 적용한다.
+
+    확률은 정상 이력 누적 확률 F를 base_quantile 이상 구간에서 0~1로 늘린 값이다:
+    p = clip((F - base_quantile) / (1 - base_quantile), 0, 1)
+    (정상 이력의 base_quantile 이하 점수는 0, 관측된 최대 점수 이상은 1)
+    """
+
+    def __init__(
+        self,
+        groups: Sequence[str],
+        knots: Dict[str, np.ndarray],
+        thresholds: Dict[str, np.ndarray],
+        counts: np.ndarray,
+        levels: np.ndarray = CDF_LEVELS,
+        base_quantile: float = DEFAULT_BASE_QUANTILE,
+        threshold_quantile: float = DEFAULT_THRESHOLD_QUANTILE,
+        eq_types: Optional[Dict[str, str]] = None
+    ):
+        """
+        Args:
+            groups: 그룹 이름 (GLOBAL_GROUP 포함)
+            knots: 모델별 (n_groups, n_levels) 점수 분위수
+            thresholds: 모델별 (n_groups,) 이상 판단 임계값
+            counts: (n_groups,) 보정에 사용한 윈도우 수
+            eq_types: 설비 ID → 유형 (유형 그룹 조회용)
+        """
+        self.groups = list(groups)
+        self.index = {group: i for i, group in enumerate(self.groups)}
+        if GLOBAL_GROUP not in self.index:
+            raise ValueError("전체 그룹 보정값이 없습니다")
+
+        self.knots = {model: np.asarray(knots[model], dtype=np.float64) for model in SCORE_MODELS}
+        self.thresholds = {model: np.asarray(thresholds[model], dtype=np.float64) for model in SCORE_MODELS}
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.levels = np.asarray(levels, dtype=np.float64)
+        self.base_quantile = float(base_quantile)
+        self.threshold_quantile = float(threshold_quantile)
+        self.probabilities = np.clip((self.levels - self.base_quantile) / (1.0 - self.base_quantile), 0.0, 1.0)
+        self.eq_types = dict(eq_types or {})
+
+    def lookup(self, eq_id: Optional[str] = None) -> int:
+        """설비 → 보정 그룹 행 (설비 그룹 > 유형 그룹 > 전체)"""
+        row = self.index.get(eq_id)
+        if row is None and eq_id in self.eq_types:
+            row = self.index.get(type_group(self.eq_types[eq_id]))
+        return self.index[GLOBAL_GROUP] if row is None else row
+
+    def threshold(self, model: str, eq_id: Optional[str] = None) -> float:
+        return float(self.thresholds[model][self.lookup(eq_id)])
+
+    def apply(self, lstm_score: float, if_score: float, eq_id: Optional[str] = None) -> Dict:
+        """
+        두 모델 점수에 그룹 임계값/확률 매핑 적용
+
+        Returns:
+            {"group", "lstm_probability", "if_probability", "is_anomaly_lstm", "is_anomaly_if"}
+        """
+        row = self.lookup(eq_id)
+        lstm_knots, if_knots = self.knots["lstm"][row], self.knots["isolation_forest"][row]
+        return {
+            "group": self.groups[row],
+            "lstm_probability": float(np.interp(lstm_score, lstm_knots, self.probabilities)),
+            "if_probability": float(np.interp(if_score, if_knots, self.probabilities)),
+            "is_anomaly_lstm": bool(lstm_score > self.thresholds["lstm"][row]),
+            "is_anomaly_if": bool(if_score > self.thresholds["isolation_forest"][row])
+        }
+
+    def apply_batch(self, lstm_scores: np.ndarray, if_scores: np.ndarray, eq_ids: Sequence[Optional[str]]) -> Dict[str, np.ndarray]:
+        """여러 설비 점수 일괄 보정 (apply의 배치 버전, 그룹별로 묶어 np.interp)"""
+        lstm_scores = np.asarray(lstm_scores, dtype=np.float64)
+        if_scores = np.asarray(if_scores, dtype=np.float64)
+        rows = np.fromiter((self.lookup(eq_id) for eq_id in eq_ids), dtype=np.int64, count=len(eq_ids))
+
+        lstm_prob = np.empty(len(rows))
+        if_prob = np.empty(len(rows))
+        for row in np.unique(rows):
+            mask = rows == row
+            lstm_prob[mask] = np.interp(lstm_scores[mask], self.knots["lstm"][row], self.probabilities)
+            if_prob[mask] = np.interp(if_scores[mask], self.knots["isolation_forest"][row], self.probabilities)
+
+        return {
+            "lstm_probability": lstm_prob,
+            "if_probability": if_prob,
+            "is_anomaly_lstm": lstm_scores > self.thresholds["lstm"][rows],
+            "is_anomaly_if": if_scores > self.thresholds["isolation_forest"][rows]
+        }
+
+    def isolation_forest_offset(self, eq_id: Optional[str] = None) -> float:
+        """
+        Isolation Forest 정규화 점수 임계값 t를 score_samples 기준 offset으로 변환
+
+        detect_rows 점수는 1 / (1 + exp(score))이므로 점수 > t ⇔ score < log(1/t - 1)
+        """
+        t = float(np.clip(self.threshold("isolation_forest", eq_id), 1e-12, 1 - 1e-12))
+        return math.log(1.0 / t - 1.0)
+
+    def save(self, path: str):
+        """비압축 .npz 저장"""
+        eq_ids = sorted(self.eq_types)
+        np.savez(
+            path,
+            groups=np.asarray(self.groups, dtype=str),
+            counts=self.counts,
+            levels=self.levels,
+            base_quantile=np.float64(self.base_quantile),
+            threshold_quantile=np.float64(self.threshold_quantile),
+            eq_ids=np.asarray(eq_ids, dtype=str),
+            eq_types=np.asarray([self.eq_types[e] for e in eq_ids], dtype=str),
+            **{f"knots_{model}": self.knots[model] for model in SCORE_MODELS},
+            **{f"thresholds_{model}": self.thresholds[model] for model in SCORE_MODELS}
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ScoreCalibration":
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(
+                groups=arrays["groups"].tolist(),
+                knots={model: arrays[f"knots_{model}"] for model in SCORE_MODELS},
+                thresholds={model: arrays[f"thresholds_{model}"] for model in SCORE_MODELS},
+                counts=arrays["counts"],
+                levels=arrays["levels"],
+                base_quantile=float(arrays["base_quantile"]),
+                threshold_quantile=float(arrays["threshold_quantile"]),
+                eq_types=dict(zip(arrays["eq_ids"].tolist(), arrays["eq_types"].tolist()))
+            )
+
+    def info(self) -> Dict:
+        return {
+            "groups": len(self.groups),
+            "threshold_quantile": self.threshold_quantile,
+            "base_quantile": self.base_quantile,
+            "thresholds": {
+                model: round(self.threshold(model), 6) for model in SCORE_MODELS
+            }
+        }
+
+
+class ScoreCalibrator:
+    """
+    이력 윈도우를 모델에 흘려 그룹별 점수 분포를 누적 (보정 작업)
+
+    점수 자체는 저장하지 않고 그룹 × 모델별 QuantileSketch에만 세므로 이력 길이와 무관하게
+    메모리가 일정하다. 워커별로 나눠 돌린 결과는 merge로 합칠 수 있다.
+    """
+
+    def __init__(self, lstm, isolation_forest, relative_accuracy: float = 0.01):
+        """
+        Args:
+            lstm: LSTMPredictor (정규화된 윈도우 입력)
+            isolation_forest: IsolationForestDetector
+        """
+        self.lstm = lstm
+        self.isolation_forest = isolation_forest
+        self.relative_accuracy = relative_accuracy
+        self.sketches: Dict[str, Dict[str, QuantileSketch]] = {}
+        self.eq_types: Dict[str, str] = {}
+
+    def _sketches(self, group: str) -> Dict[str, QuantileSketch]:
+        if group not in self.sketches:
+            self.sketches[group] = {
+                model: QuantileSketch(self.relative_accuracy) for model in SCORE_MODELS
+            }
+        return self.sketches[group]
+
+    def score(self, windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(batch, sequence_length, features) 정규화 윈도우 → (LSTM 점수, IF 점수)"""
+        lstm_scores = self.lstm.infer_batch(windows)["anomaly_score"]
+        _, if_scores = self.isolation_forest.detect_rows(windows[:, -1])
+        return lstm_scores, if_scores
+
+    def add_scores(self, groups: Iterable[str], lstm_scores: np.ndarray, if_scores: np.ndarray):
+        """이미 계산한 점수를 여러 그룹(설비, 유형, 전체)에 누적"""
+        for group in groups:
+            sketches = self._sketches(group)
+            sketches["lstm"].add(lstm_scores)
+            sketches["isolation_forest"].add(if_scores)
+
+    def update(self, windows: np.ndarray, eq_id: Optional[str] = None, eq_type: Optional[str] = None):
+        """
+        한 설비의 윈도우 배치 채점 후 설비/유형/전체 그룹에 누적
+
+        Args:
+            windows: (batch, sequence_length, features) 정규화된 윈도우
+        """
+        groups = [GLOBAL_GROUP]
+        if eq_id is not None:
+            groups.append(eq_id)
+            if eq_type is not None:
+                groups.append(type_group(eq_type))
+                self.eq_types[eq_id] = eq_type
+
+        lstm_scores, if_scores = self.score(windows)
+        self.add_scores(groups, lstm_scores, if_scores)
+
+    def merge(self, other: "ScoreCalibrator") -> "ScoreCalibrator":
+        for group, sketches in other.sketches.items():
+            for model, sketch in sketches.items():
+                self._sketches(group)[model].merge(sketch)
+        self.eq_types.update(other.eq_types)
+        return self
+
+    def build(
+        self,
+        threshold_quantile: float = DEFAULT_THRESHOLD_QUANTILE,
+        base_quantile: float = DEFAULT_BASE_QUANTILE,
+        min_count: int = 100
+    ) -> ScoreCalibration:
+        """
+        누적 분포 → ScoreCalibration
+
+        Args:
+            threshold_quantile: 이상 판단 임계값 분위수 (정상 이력의 오탐 비율 = 1 - q)
+            base_quantile: 확률 0이 되는 분위수
+            min_count: 이보다 적은 윈도우로 만든 설비/유형 그룹은 제외 (상위 그룹 사용)
+        """
+        groups: List[str] = [
+            group for group, sketches in self.sketches.items()
+            if group == GLOBAL_GROUP or sketches["lstm"].count >= min_count
+        ]
+        if GLOBAL_GROUP not in groups or self.sketches[GLOBAL_GROUP]["lstm"].count == 0:
+            raise ValueError("보정에 사용할 점수가 없습니다")
+        groups.sort(key=lambda group: group != GLOBAL_GROUP)
+
+        knots = {
+            model: np.stack([self.sketches[group][model].quantile(CDF_LEVELS) for group in groups])
+            for model in SCORE_MODELS
+        }
+        thresholds = {
+            model: np.asarray([self.sketches[group][model].quantile(threshold_quantile) for group in groups])
+            for model in SCORE_MODELS
+        }
+        counts = np.asarray([self.sketches[group]["lstm"].count for group in groups])
+
+        return ScoreCalibration(
+            groups,
+            knots,
+            thresholds,
+            counts,
+            levels=CDF_LEVELS,
+            base_quantile=base_quantile,
+            threshold_quantile=threshold_quantile,
+            eq_types={eq_id: t for eq_id, t in self.eq_types.items()}
+        )
+
+
+def calibrate_cache(
+    calibrator: ScoreCalibrator,
+    cache: TEPCache,
+    normalize: Callable[[np.ndarray], np.ndarray],
+    sequence_length: int,
+    eq_ids: Optional[Sequence[str]] = None,
+    eq_types: Optional[Dict[str, str]] = None,
+    faults: Optional[Iterable[int]] = (0,),
+    batch_size: int = 512,
+    stride: int = 1,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    캐시의 정상 구간 윈도우를 batch_size개씩 채점해 calibrator에 누적
+
+    윈도우는 memmap 위의 strided view에서 배치 단위로만 복사하므로 메모리 사용량은
+    batch_size에 비례한다.
+
+    Args:
+        normalize: 원 단위 → 모델 입력 정규화 (ModelBundle.normalize)
+        eq_ids: 구간 run 번호 → 설비 ID (tags_timeseries export면 manifest의 eq_ids, None이면 전체 그룹만)
+        eq_types: 설비 ID → 유형 (주면 유형 그룹에도 누적)
+
+    Returns:
+        채점한 윈도우 수
+    """
+    processor = TEPDataProcessor()
+    n_windows = 0
+
+    for _, run, start, stop in cache.select_runs(faults):
+        eq_id = eq_ids[run] if eq_ids is not None and 0 <= run < len(eq_ids) else None
+        eq_type = (eq_types or {}).get(eq_id)
+
+        for batch in processor.iter_sequence_batches(cache.features[start:stop], sequence_length, batch_size, stride):
+            calibrator.update(normalize(batch), eq_id, eq_type)
+            n_windows += len(batch)
+            if on_progress:
+                on_progress(n_windows)
+
+    return n_windows
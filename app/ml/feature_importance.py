@@ -1,46 +1,122 @@
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+# 중요도 계산 방식
+# - reconstruction: LSTM Autoencoder의 변수별 복원 오차 비중 (모델 기반)
+# - std: 입력 윈도우의 변수별 표준편차 비중 (모델 무관, 이전 방식)
+IMPORTANCE_MODES = ("reconstruction", "std")
 
 class FeatureImportanceCalculator:
     """
     Feature Importance 계산 (SHAP 간소화 버전)
     """
     
-    def __init__(self, feature_names: List[str]):
+    def __init__(self, feature_names: List[str], mode: str = "reconstruction"):
+        if mode not in IMPORTANCE_MODES:
+            raise ValueError(f"지원하지 않는 중요도 계산 방식입니다: {mode} (가능: {', '.join(IMPORTANCE_MODES)})")
+        
         self.feature_names = feature_names
+        self.mode = mode
     
     def calculate_importance(
         self,
         data: np.ndarray,
-        anomaly_score: float
+        anomaly_score: float,
+        feature_errors: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None
     ) -> Dict[str, float]:
         """
         간단한 Feature Importance 계산
         
         실제로는 SHAP를 사용하지만, 여기서는 간소화된 버전 사용
+        
+        Args:
+            data: 입력 윈도우 (sequence_length, features)
+            anomaly_score: 중요도 합계로 사용할 이상 점수
+            feature_errors: (features,) 변수별 복원 오차 (reconstruction 모드에서 사용,
+                LSTMPredictor.infer 결과를 그대로 전달하면 추가 연산 없음)
+            top_k: 반환할 변수 수 (None이면 전체 변수)
+        
+        Returns:
+            {변수명: 중요도} (중요도 내림차순)
         """
-        # 데이터의 표준편차 기반 중요도 계산
-        std_devs = np.std(data, axis=0)
+        return self.calculate_importance_batch(
+            data[np.newaxis],
+            np.asarray([anomaly_score]),
+            feature_errors=None if feature_errors is None else np.asarray(feature_errors)[np.newaxis],
+            top_k=top_k
+        )[0]
+    
+    def calculate_importance_batch(
+        self,
+        data: Optional[np.ndarray],
+        anomaly_scores: np.ndarray,
+        feature_errors: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        """
+        여러 윈도우의 Feature Importance 일괄 계산
         
-        # 정규화
-        total = np.sum(std_devs)
-        if total > 0:
-            importances = std_devs / total
-        else:
-            importances = np.ones(len(std_devs)) / len(std_devs)
+        Args:
+            data: (batch, sequence_length, features) 입력 윈도우 (std 모드 또는 feature_errors가 없을 때 사용)
+            anomaly_scores: (batch,) 이상 점수
+            feature_errors: (batch, features) 변수별 복원 오차
+            top_k: 윈도우별 반환할 변수 수 (None이면 전체 변수)
         
-        # Dictionary로 변환
-        importance_dict = {
-            name: float(imp) * anomaly_score
-            for name, imp in zip(self.feature_names, importances)
-        }
+        Returns:
+            윈도우별 {변수명: 중요도} (중요도 내림차순)
+        """
+        indices, values = self.top_k_batch(data, anomaly_scores, feature_errors, top_k)
         
-        # 상위 10개만 반환
-        sorted_importance = dict(
-            sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)[:10]
+        names = np.asarray(self.feature_names, dtype=object)[indices]
+        return [
+            dict(zip(row_names.tolist(), row_values.tolist()))
+            for row_names, row_values in zip(names, values)
+        ]
+    
+    def top_k_batch(
+        self,
+        data: Optional[np.ndarray],
+        anomaly_scores: np.ndarray,
+        feature_errors: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        윈도우별 상위 K개 변수 인덱스와 중요도
+        
+        top_k가 주어지면 전체 변수를 정렬하지 않고 argpartition으로 K개만 고른 뒤 K개만 정렬한다.
+        None이면 전체 변수를 중요도 내림차순으로 반환한다.
+        
+        Returns:
+            indices: (batch, k) 변수 인덱스 (중요도 내림차순)
+            importances: (batch, k) 중요도
+        """
+        if self.mode == "reconstruction" and feature_errors is not None:
+            weights = np.asarray(feature_errors, dtype=np.float64)
+        else:
+            # 데이터의 표준편차 기반 중요도 계산
+            weights = np.std(np.asarray(data, dtype=np.float64), axis=1)
+        
+        # 정규화 (합이 0이면 균등 분배)
+        totals = weights.sum(axis=1, keepdims=True)
+        n_features = weights.shape[1]
+        shares = np.divide(
+            weights,
+            totals,
+            out=np.full_like(weights, 1.0 / n_features),
+            where=totals > 0
         )
+        importances = shares * np.asarray(anomaly_scores, dtype=np.float64)[:, np.newaxis]
+        
+        k = n_features if top_k is None else min(top_k, n_features)
+        if k < n_features:
+            indices = np.argpartition(-importances, k - 1, axis=1)[:, :k]
+        else:
+            indices = np.broadcast_to(np.arange(n_features), importances.shape)
+        top = np.take_along_axis(importances, indices, axis=1)
         
-        return sorted_importance
+        order = np.argsort(-top, axis=1, kind="stable")
+        return np.take_along_axis(indices, order, axis=1), np.take_along_axis(top, order, axis=1)
     
     def get_top_features(
         self,
@@ -50,13 +126,9 @@ class FeatureImportanceCalculator:
         """
         상위 K개 중요 변수 반환
         
+        calculate_importance 결과는 이미 내림차순이므로 다시 정렬하지 않는다.
+        
         Returns:
             List of (feature_name, importance_score)
         """
-        sorted_items = sorted(
-            importance_dict.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        return sorted_items[:top_k]
\ No newline at end of file
+        return list(importance_dict.items())[:top_k]
@@ -0,0 +1,270 @@
+import hashlib
+import os
+import struct
+import zipfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+EULER_GAMMA = np.euler_gamma
+
+
+def average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """
+    n개 샘플의 이진 탐색 트리 평균 경로 길이 c(n) (sklearn과 동일한 정의)
+    """
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n_samples)
+
+    mask_2 = n_samples == 2
+    mask_n = n_samples > 2
+    result[mask_2] = 1.0
+    n = n_samples[mask_n]
+    result[mask_n] = 2.0 * (np.log(n - 1.0) + EULER_GAMMA) - 2.0 * (n - 1.0) / n
+
+    return result
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """파일 내용 sha256 (노드 배열이 어떤 pickle에서 만들어졌는지 확인용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_npz_mmap(path: str) -> Dict[str, np.ndarray]:
+    """
+    비압축 .npz를 멤버별로 memory-map 하여 로드
+
+    np.load는 .npz에 mmap_mode를 적용하지 않으므로 zip 로컬 헤더에서
+    각 .npy 데이터 위치를 찾아 np.memmap으로 연다. (압축된 멤버는 일반 로드)
+    """
+    arrays: Dict[str, np.ndarray] = {}
+
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # 로컬 파일 헤더(30 bytes) + 파일명 + extra 필드 뒤에 .npy 데이터 시작
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if shape == () or dtype.hasobject:
+                # 스칼라는 memmap 대상이 아니므로 그대로 읽음
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            arrays[name] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=f.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C"
+            )
+
+    return arrays
+
+
+class ForestArrays:
+    """
+    학습된 IsolationForest를 평탄화한 NumPy 노드 배열 기반 채점기
+
+    - 모든 트리의 노드를 하나의 배열로 이어 붙이고, 리프는 자기 자신을 가리키게 하여
+      최대 깊이만큼 벡터 연산을 반복하면 모든 (샘플, 트리) 쌍이 리프에 도달한다.
+    - 리프 값은 sklearn의 경로 길이 보정(depth + c(n_node_samples))을 미리 계산해 둔다.
+    - 한 번의 순회로 label(predict)과 score(score_samples)를 함께 반환한다.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        leaf_value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        denominator: float,
+        offset: float,
+        n_features: int,
+        source: Optional[str] = None
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.denominator = float(denominator)
+        self.offset = float(offset)
+        self.n_features = int(n_features)
+        # 원본 pickle sha256 (pickle에서 만들지 않았으면 None)
+        self.source = source
+
+        # 순회 시 left/right를 한 번에 조회하기 위한 (node, 2) 자식 배열
+        self._children = np.stack([left, right], axis=1).ravel()
+
+    @classmethod
+    def from_sklearn(cls, model) -> "ForestArrays":
+        """학습된 sklearn IsolationForest에서 노드 배열 추출"""
+        n_features = model.n_features_in_
+        subsample_features = model._max_features != n_features
+
+        features, thresholds, lefts, rights, leaf_values, roots = [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for estimator, estimator_features in zip(model.estimators_, model.estimators_features_):
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            children_left = tree.children_left
+            children_right = tree.children_right
+            is_leaf = children_left == -1
+
+            # 노드 깊이 계산 (부모 인덱스 < 자식 인덱스)
+            depth = np.zeros(n_nodes, dtype=np.int64)
+            for node in range(n_nodes):
+                if not is_leaf[node]:
+                    depth[children_left[node]] = depth[node] + 1
+                    depth[children_right[node]] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()))
+
+            node_ids = np.arange(n_nodes)
+            feature = np.where(is_leaf, 0, tree.feature)
+            if subsample_features:
+                feature = np.where(is_leaf, 0, np.asarray(estimator_features)[feature])
+
+            features.append(feature)
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, children_right) + offset)
+            leaf_values.append(
+                np.where(is_leaf, depth + average_path_length(tree.n_node_samples), 0.0)
+            )
+            roots.append(offset)
+            offset += n_nodes
+
+        denominator = len(model.estimators_) * average_path_length([model._max_samples])[0]
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            leaf_value=np.concatenate(leaf_values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            denominator=denominator,
+            offset=model.offset_,
+            n_features=n_features
+        )
+
+    def save(self, path: str):
+        """비압축 .npz로 저장 (load 시 memory-map 가능)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        extra = {"source": np.str_(self.source)} if self.source else {}
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            leaf_value=self.leaf_value,
+            roots=self.roots,
+            max_depth=np.int64(self.max_depth),
+            denominator=np.float64(self.denominator),
+            offset=np.float64(self.offset),
+            n_features=np.int64(self.n_features),
+            **extra
+        )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ForestArrays":
+        """저장된 노드 배열 로드"""
+        if mmap:
+            arrays = load_npz_mmap(path)
+        else:
+            with np.load(path) as npz:
+                arrays = {key: npz[key] for key in npz.files}
+
+        return cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            left=arrays["left"],
+            right=arrays["right"],
+            leaf_value=arrays["leaf_value"],
+            roots=arrays["roots"],
+            max_depth=arrays["max_depth"],
+            denominator=arrays["denominator"],
+            offset=arrays["offset"],
+            n_features=arrays["n_features"],
+            source=str(arrays["source"]) if "source" in arrays else None
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            arr.nbytes
+            for arr in (self.feature, self.threshold, self.left, self.right, self.leaf_value, self.roots)
+        )
+
+    def path_lengths(self, data: np.ndarray) -> np.ndarray:
+        """샘플별 전체 트리 경로 길이 합 (n,)"""
+        # sklearn과 동일하게 float32로 변환 후 비교
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        n_samples, n_features = data.shape
+        flat = data.ravel()
+        row_base = (np.arange(n_samples, dtype=np.int64) * n_features)[:, np.newaxis]
+
+        nodes = np.broadcast_to(self.roots, (n_samples, len(self.roots))).astype(np.int64)
+        for _ in range(self.max_depth):
+            values = flat[row_base + self.feature[nodes]]
+            go_right = values > self.threshold[nodes]
+            nodes = self._children[2 * nodes + go_right]
+
+        return self.leaf_value[nodes].sum(axis=1)
+
+    def score_samples(self, data: np.ndarray, chunk_size: int = 512) -> np.ndarray:
+        """sklearn IsolationForest.score_samples와 동일 (-1에 가까울수록 이상)"""
+        data = np.atleast_2d(data)
+        if data.shape[1] != self.n_features:
+            raise ValueError(f"입력 변수 개수가 다릅니다: {data.shape[1]} != {self.n_features}")
+
+        depths = np.concatenate([
+            self.path_lengths(data[start:start + chunk_size])
+            for start in range(0, len(data), chunk_size)
+        ]) if len(data) else np.zeros(0)
+
+        if self.denominator == 0:
+            return -np.ones_like(depths)
+        return -(2.0 ** (-depths / self.denominator))
+
+    def predict_score(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        한 번의 순회로 label과 score 계산
+
+        Returns:
+            predictions: -1 (이상) or 1 (정상)
+            scores: score_samples 결과
+        """
+        scores = self.score_samples(data)
+        predictions = np.where(scores - self.offset < 0, -1, 1)
+        return predictions, scores
@@ -4,35 +4,119 @@ import pickle
 import os
 from typing import Tuple, Optional
 
+from app.ml.iforest_arrays import ForestArrays, file_sha256
+
 class IsolationForestDetector:
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        arrays_path: Optional[str] = None,
+        offset: Optional[float] = None
+    ):
         self.model = IsolationForest(
             contamination=0.1,
             random_state=42,
             n_estimators=100
         )
         
-        if model_path and os.path.exists(model_path):
+        # 배열 기반 채점기 (있으면 sklearn 대신 사용)
+        self.engine: Optional[ForestArrays] = None
+        
+        has_model = bool(model_path) and os.path.exists(model_path)
+        if arrays_path and os.path.exists(arrays_path):
+            # .npz 노드 배열이 있으면 pickle 로드 생략 (pickle과 짝이 맞지 않는 배열이면 pickle 사용)
+            source = file_sha256(model_path) if has_model else None
+            if not self.load_arrays(arrays_path, source=source):
+                self.load_model(model_path)
+        elif has_model:
             self.load_model(model_path)
+        
+        # 보정된 결정 경계 (None이면 학습 시 contamination 기준 offset_ 사용)
+        if offset is not None and self.engine is not None:
+            self.engine.offset = float(offset)
     
     def load_model(self, path: str):
         """저장된 모델 로드"""
         with open(path, 'rb') as f:
             self.model = pickle.load(f)
+        self.engine = ForestArrays.from_sklearn(self.model)
+        self.engine.source = file_sha256(path)
         print(f"✅ Isolation Forest 모델 로드 완료: {path}")
     
-    def save_model(self, path: str):
-        """모델 저장"""
+    def load_arrays(self, path: str, mmap: bool = True, source: Optional[str] = None) -> bool:
+        """
+        노드 배열(.npz) 로드 (memory-map)
+        
+        Args:
+            source: 기대하는 원본 pickle sha256 (다르면 오래된 배열로 보고 로드하지 않음)
+        
+        Returns:
+            로드 여부
+        """
+        engine = ForestArrays.load(path, mmap=mmap)
+        if source is not None and engine.source != source:
+            print(f"⚠️ Isolation Forest 노드 배열이 pickle과 다릅니다 (export_isolation_forest.py로 다시 생성): {path}")
+            return False
+        
+        self.engine = engine
+        print(f"✅ Isolation Forest 노드 배열 로드 완료: {path}")
+        return True
+    
+    def export_arrays(self, path: str):
+        """학습된 모델을 노드 배열(.npz)로 저장"""
+        engine = self.engine or ForestArrays.from_sklearn(self.model)
+        engine.save(path)
+        print(f"✅ Isolation Forest 노드 배열 저장 완료: {path}")
+    
+    def memory_bytes(self) -> int:
+        """학습된 트리 노드 배열 메모리 사용량 (bytes)"""
+        if self.engine is not None:
+            return self.engine.nbytes
+        
+        total = 0
+        for estimator in getattr(self.model, "estimators_", []):
+            tree = estimator.tree_
+            for arr in (
+                tree.children_left,
+                tree.children_right,
+                tree.feature,
+                tree.threshold,
+                tree.n_node_samples,
+                tree.value,
+            ):
+                total += arr.nbytes
+        return total
+    
+    def save_model(self, path: str, arrays_path: Optional[str] = None):
+        """
+        모델 저장
+        
+        Args:
+            arrays_path: 주어지면 노드 배열(.npz)도 새 pickle 기준으로 다시 저장
+        """
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, 'wb') as f:
             pickle.dump(self.model, f)
+        if self.engine is None:
+            self.engine = ForestArrays.from_sklearn(self.model)
+        self.engine.source = file_sha256(path)
         print(f"✅ 모델 저장 완료: {path}")
+        
+        if arrays_path:
+            self.export_arrays(arrays_path)
     
     def fit(self, data: np.ndarray):
         """모델 학습"""
         self.model.fit(data)
+        self.engine = ForestArrays.from_sklearn(self.model)
         return self
     
+    def score_samples(self, data: np.ndarray) -> np.ndarray:
+        """원본 이상 점수 (sklearn score_samples, -1에 가까울수록 이상)"""
+        if self.engine is not None:
+            return self.engine.score_samples(data)
+        return self.model.score_samples(data)
+    
     def detect(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         이상 탐지
@@ -41,6 +125,10 @@ class IsolationForestDetector:
             predictions: -1 (이상) or 1 (정상)
             scores: 이상 점수 (-1에 가까울수록 이상)
         """
+        if self.engine is not None:
+            # 트리 1회 순회로 label + score 계산
+            return self.engine.predict_score(data)
+        
         predictions = self.model.predict(data)
         scores = self.model.score_samples(data)
         
@@ -54,11 +142,23 @@ class IsolationForestDetector:
             is_anomaly: 이상 여부
             score: 이상 점수 (0~1, 높을수록 이상)
         """
-        pred, score = self.detect(data.reshape(1, -1))
+        is_anomaly, normalized_scores = self.detect_rows(data.reshape(1, -1))
+        
+        return bool(is_anomaly[0]), float(normalized_scores[0])
+    
+    def detect_rows(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 샘플 일괄 이상 탐지 (detect_single의 배치 버전)
+        
+        Returns:
+            is_anomaly: (n,) 이상 여부
+            scores: (n,) 이상 점수 (0~1, 높을수록 이상)
+        """
+        pred, score = self.detect(data)
         
-        is_anomaly = pred[0] == -1
+        is_anomaly = pred == -1
         
         # Score를 0~1로 정규화
-        normalized_score = 1.0 / (1.0 + np.exp(score[0]))
+        normalized_scores = 1.0 / (1.0 + np.exp(score))
         
-        return is_anomaly, normalized_score
\ No newline at end of file
+        return is_anomaly, normalized_scores
@@ -0,0 +1,132 @@
+import copy
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+# 선택 가능한 LSTM 추론 백엔드
+# - eager: 기본 PyTorch eager + no_grad
+# - inference_mode: eager + torch.inference_mode
+# - torchscript: TorchScript 컴파일 + freeze
+# - quantized: nn.LSTM / nn.Linear 동적 int8 양자화
+BACKENDS = ("eager", "inference_mode", "torchscript", "quantized")
+
+
+def configure_threads(num_threads: Optional[int] = None, interop_threads: Optional[int] = None):
+    """PyTorch intra-op / inter-op 스레드 수 설정 (0 또는 None이면 기본값 유지)"""
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # 이미 병렬 작업이 시작된 뒤에는 변경 불가
+            pass
+
+
+def inference_context(backend: str):
+    """백엔드별 추론 컨텍스트"""
+    if backend == "eager":
+        return torch.no_grad()
+    return torch.inference_mode()
+
+
+def build_backend(model: nn.Module, backend: str) -> nn.Module:
+    """
+    eager 모델로부터 추론용 모듈 생성
+
+    Args:
+        model: 학습된 LSTMAutoencoder (eval 상태)
+        backend: BACKENDS 중 하나
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 LSTM 백엔드입니다: {backend} (가능: {', '.join(BACKENDS)})")
+
+    if backend in ("eager", "inference_mode"):
+        return model
+
+    if backend == "torchscript":
+        scripted = torch.jit.script(copy.deepcopy(model).eval())
+        return torch.jit.optimize_for_inference(torch.jit.freeze(scripted))
+
+    # quantized
+    return torch.ao.quantization.quantize_dynamic(
+        copy.deepcopy(model).eval(),
+        {nn.LSTM, nn.Linear},
+        dtype=torch.qint8
+    )
+
+
+def _anomaly_scores(data: torch.Tensor, output: torch.Tensor) -> torch.Tensor:
+    return ((data - output) ** 2).mean(dim=(1, 2))
+
+
+def accuracy_delta(
+    reference: nn.Module,
+    candidate: nn.Module,
+    data: np.ndarray,
+    backend: str = "inference_mode"
+) -> Dict[str, float]:
+    """
+    eager 모델 대비 백엔드 출력 오차
+
+    Args:
+        data: 검증 입력 (batch, sequence_length, features)
+
+    Returns:
+        max_output_delta: 복원값 최대 절대 오차
+        mean_output_delta: 복원값 평균 절대 오차
+        max_score_delta: 이상 점수(평균 복원 오차) 최대 절대 오차
+    """
+    data_tensor = torch.as_tensor(data, dtype=torch.float32)
+
+    with torch.no_grad():
+        ref_out = reference(data_tensor)
+    with inference_context(backend):
+        cand_out = candidate(data_tensor)
+
+    output_delta = (ref_out - cand_out).abs()
+    score_delta = (_anomaly_scores(data_tensor, ref_out) - _anomaly_scores(data_tensor, cand_out)).abs()
+
+    return {
+        "max_output_delta": float(output_delta.max()),
+        "mean_output_delta": float(output_delta.mean()),
+        "max_score_delta": float(score_delta.max()),
+    }
+
+
+def benchmark(
+    module: Callable,
+    data: np.ndarray,
+    backend: str = "eager",
+    runs: int = 50,
+    warmup: int = 5
+) -> Dict[str, float]:
+    """
+    추론 지연 시간 측정
+
+    Returns:
+        p50_ms, p95_ms, mean_ms, windows_per_sec
+    """
+    data_tensor = torch.as_tensor(data, dtype=torch.float32)
+    timings = []
+
+    with inference_context(backend):
+        for _ in range(warmup):
+            module(data_tensor)
+        for _ in range(runs):
+            start = time.perf_counter()
+            module(data_tensor)
+            timings.append(time.perf_counter() - start)
+
+    timings_ms = np.array(timings) * 1000
+    mean_ms = float(timings_ms.mean())
+
+    return {
+        "p50_ms": round(float(np.percentile(timings_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings_ms, 95)), 3),
+        "mean_ms": round(mean_ms, 3),
+        "windows_per_sec": round(len(data_tensor) / (mean_ms / 1000), 1) if mean_ms > 0 else 0.0,
+    }
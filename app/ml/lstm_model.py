@@ -1,8 +1,17 @@
 import torch
 import torch.nn as nn
 import numpy as np
-from typing import Tuple, Optional
+from typing import Dict, Hashable, List, Tuple, Optional
 import os
+import threading
+
+from app.ml.streaming import RecurrentStateStore
+from app.ml.lstm_backends import (
+    accuracy_delta,
+    build_backend,
+    configure_threads,
+    inference_context,
+)
 
 class LSTMAutoencoder(nn.Module):
     def __init__(self, input_size: int, hidden_size: int = 64, num_layers: int = 2):
@@ -40,51 +49,213 @@ class LSTMAutoencoder(nn.Module):
         return output
 
 class LSTMPredictor:
-    def __init__(self, model_path: Optional[str] = None, input_size: int = 52):
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        input_size: int = 52,
+        hidden_size: int = 64,
+        num_layers: int = 2,
+        sequence_length: int = 60,
+        threshold: float = 0.05,
+        stream_max_states: int = 1024,
+        stream_state_ttl: Optional[float] = None,
+        backend: str = "eager",
+        num_threads: Optional[int] = None,
+        backend_tolerance: float = 1e-2,
+        mmap: bool = False
+    ):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.model = LSTMAutoencoder(input_size=input_size).to(self.device)
+        self.model = LSTMAutoencoder(
+            input_size=input_size,
+            hidden_size=hidden_size,
+            num_layers=num_layers
+        ).to(self.device)
+        self.sequence_length = sequence_length
+        # 기본 이상 판단 임계값 (모델 번들의 보정값으로 대체 가능)
+        self.threshold = threshold
+        
+        # 백엔드 허용 오차 (가중치를 다시 로드할 때도 같은 기준으로 검증)
+        self.backend_tolerance = backend_tolerance
+        
+        # 스트리밍 추론용 설비별 (h, c) 상태
+        self.stream_states = RecurrentStateStore(
+            max_entries=stream_max_states,
+            ttl_seconds=stream_state_ttl
+        )
+        # 상태 조회 → 스텝 → 저장을 묶는 잠금 (같은 설비 동시 요청이 서로의 스텝을 덮어쓰지 않도록)
+        self._stream_lock = threading.Lock()
         
         if model_path and os.path.exists(model_path):
-            self.load_model(model_path)
+            self.load_model(model_path, mmap=mmap)
         
         self.model.eval()
+        # 여러 요청이 공유하는 읽기 전용 모델
+        self.model.requires_grad_(False)
+        
+        # 추론 백엔드 (스트리밍 추론은 항상 eager 모델 사용)
+        configure_threads(num_threads)
+        self.backend = "eager"
+        self.runner = self.model
+        self.backend_accuracy: Dict[str, float] = {}
+        if backend != "eager":
+            self.set_backend(backend)
     
-    def load_model(self, path: str):
-        """저장된 모델 로드"""
-        self.model.load_state_dict(torch.load(path, map_location=self.device))
+    def load_model(self, path: str, mmap: bool = False):
+        """
+        저장된 모델 로드
+        
+        Args:
+            mmap: True면 파일을 memory-map 하여 텐서 복사 없이 로드 (번들용)
+        """
+        state_dict = torch.load(path, map_location=self.device, mmap=mmap, weights_only=True)
+        self.model.load_state_dict(state_dict, assign=mmap)
         print(f"✅ LSTM 모델 로드 완료: {path}")
+        
+        # 컴파일/양자화 백엔드는 새 가중치로 다시 생성 (검증에 실패하면 이전 가중치의 runner 대신 eager 사용)
+        backend = getattr(self, "backend", "eager")
+        if backend != "eager":
+            self.backend = "eager"
+            self.runner = self.model
+            self.set_backend(backend, tolerance=self.backend_tolerance)
     
-    def predict(self, data: np.ndarray, horizon: int = 30) -> Tuple[np.ndarray, float]:
+    def set_backend(self, backend: str, tolerance: Optional[float] = None) -> Dict[str, float]:
         """
-        예측 수행
+        추론 백엔드 변경
+        
+        eager 모델 대비 이상 점수 오차가 tolerance(None이면 backend_tolerance)를 넘으면
+        eager로 유지한다.
+        
+        Returns:
+            accuracy_delta 결과
+        """
+        tolerance = self.backend_tolerance if tolerance is None else tolerance
+        runner = build_backend(self.model, backend)
+        
+        # 검증용 입력으로 eager 대비 오차 확인
+        generator = torch.Generator().manual_seed(0)
+        sample = torch.randn(
+            8, self.sequence_length, self.model.output_layer.out_features,
+            generator=generator
+        ).numpy()
+        delta = accuracy_delta(self.model, runner, sample, backend)
+        
+        if delta["max_score_delta"] > tolerance:
+            print(
+                f"⚠️ LSTM 백엔드 {backend} 오차 초과 "
+                f"(score delta {delta['max_score_delta']:.2e} > {tolerance:.2e}), eager 사용"
+            )
+            return delta
+        
+        self.backend = backend
+        self.runner = runner
+        self.backend_accuracy = delta
+        print(f"✅ LSTM 백엔드 설정 완료: {backend} (score delta {delta['max_score_delta']:.2e})")
+        return delta
+    
+    def memory_bytes(self) -> int:
+        """모델 파라미터/버퍼 메모리 사용량 (bytes)"""
+        tensors = list(self.model.parameters()) + list(self.model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    
+    def infer(self, data: np.ndarray, threshold: Optional[float] = None) -> Dict:
+        """
+        단일 윈도우 통합 추론 (1회 forward로 예측 + 이상 탐지)
         
         Args:
             data: 입력 데이터 (sequence_length, features)
-            horizon: 예측 시간 (분)
+            threshold: 이상 판단 임계값 (None이면 self.threshold)
             
         Returns:
-            predicted_values: 예측값
-            confidence: 신뢰도
+            infer_batch 결과의 단건 버전
         """
-        with torch.no_grad():
-            # Normalize
-            data_tensor = torch.FloatTensor(data).unsqueeze(0).to(self.device)
+        result = self.infer_batch(data[np.newaxis], threshold)
+        
+        return {
+            "reconstruction": result["reconstruction"][0],
+            "predicted": result["predicted"][0],
+            "timestep_errors": result["timestep_errors"][0],
+            "feature_errors": result["feature_errors"][0],
+            "confidence": float(result["confidence"][0]),
+            "anomaly_score": float(result["anomaly_score"][0]),
+            "is_anomaly": bool(result["is_anomaly"][0]),
+        }
+    
+    def infer_batch(self, data: np.ndarray, threshold: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        배치 통합 추론 (1회 forward)
+        
+        Args:
+            data: 입력 데이터 (batch, sequence_length, features)
+            threshold: 이상 판단 임계값 (None이면 self.threshold)
             
-            # Predict
-            output = self.model(data_tensor)
+        Returns:
+            reconstruction: (batch, sequence_length, features) 복원값
+            predicted: (batch, features) 마지막 시점 예측값
+            timestep_errors: (batch, sequence_length) 시점별 복원 오차
+            feature_errors: (batch, features) 변수별 복원 오차
+            confidence: (batch,) 신뢰도 (1 - 복원 오차)
+            anomaly_score: (batch,) 이상 점수 (평균 복원 오차)
+            is_anomaly: (batch,) 이상 여부
+        """
+        threshold = self.threshold if threshold is None else threshold
+        
+        with inference_context(self.backend):
+            data_tensor = torch.as_tensor(data, dtype=torch.float32).to(self.device)
             
-            # Reconstruction error (이상 탐지용)
-            error = torch.mean((data_tensor - output) ** 2).item()
+            output = self.runner(data_tensor)
             
-            # Get last prediction
-            predicted = output[0, -1, :].cpu().numpy()
+            # Reconstruction error
+            squared_error = (data_tensor - output) ** 2
+            timestep_errors = squared_error.mean(dim=-1)
+            feature_errors = squared_error.mean(dim=1)
+            anomaly_scores = timestep_errors.mean(dim=-1)
             
             # Calculate confidence (1 - normalized error)
-            confidence = max(0.0, min(1.0, 1.0 - error))
+            confidence = torch.clamp(1.0 - anomaly_scores, 0.0, 1.0)
+            
+            anomaly_scores = anomaly_scores.cpu().numpy()
+            reconstruction = output.cpu().numpy()
             
-            return predicted, confidence
+            return {
+                "reconstruction": reconstruction,
+                "predicted": reconstruction[:, -1, :],
+                "timestep_errors": timestep_errors.cpu().numpy(),
+                "feature_errors": feature_errors.cpu().numpy(),
+                "confidence": confidence.cpu().numpy(),
+                "anomaly_score": anomaly_scores,
+                "is_anomaly": anomaly_scores > threshold,
+            }
     
-    def detect_anomaly(self, data: np.ndarray, threshold: float = 0.05) -> Tuple[bool, float]:
+    def predict(self, data: np.ndarray, horizon: int = 30) -> Tuple[np.ndarray, float]:
+        """
+        예측 수행
+        
+        Args:
+            data: 입력 데이터 (sequence_length, features)
+            horizon: 예측 시간 (분)
+            
+        Returns:
+            predicted_values: 예측값
+            confidence: 신뢰도
+        """
+        predicted, confidence = self.predict_batch(data[np.newaxis], horizon)
+        return predicted[0], float(confidence[0])
+    
+    def predict_batch(self, data: np.ndarray, horizon: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        배치 예측 수행 (1회 forward)
+        
+        Args:
+            data: 입력 데이터 (batch, sequence_length, features)
+            
+        Returns:
+            predicted_values: (batch, features)
+            confidence: (batch,)
+        """
+        result = self.infer_batch(data)
+        return result["predicted"], result["confidence"]
+    
+    def detect_anomaly(self, data: np.ndarray, threshold: Optional[float] = None) -> Tuple[bool, float]:
         """
         이상 탐지
         
@@ -92,14 +263,155 @@ class LSTMPredictor:
             is_anomaly: 이상 여부
             score: 이상 점수
         """
+        is_anomaly, scores = self.detect_anomaly_batch(data[np.newaxis], threshold)
+        return bool(is_anomaly[0]), float(scores[0])
+    
+    def detect_anomaly_batch(
+        self,
+        data: np.ndarray,
+        threshold: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        배치 이상 탐지 (1회 forward)
+        
+        Args:
+            data: 입력 데이터 (batch, sequence_length, features)
+            
+        Returns:
+            is_anomaly: (batch,) 이상 여부
+            scores: (batch,) 이상 점수
+        """
+        result = self.infer_batch(data, threshold)
+        return result["is_anomaly"], result["anomaly_score"]
+    
+    def stream_step(self, eq_id: Hashable, sample: np.ndarray, threshold: Optional[float] = None) -> Dict:
+        """
+        스트리밍 추론: 설비의 새 샘플 1개로 LSTM 상태를 한 스텝 진행
+        
+        Args:
+            eq_id: 설비 ID
+            sample: 새 샘플 (features,)
+            
+        Returns:
+            stream_step_batch 결과의 단건 버전
+        """
+        result = self.stream_step_batch([eq_id], sample[np.newaxis], threshold)
+        
+        return {
+            "reconstruction": result["reconstruction"][0],
+            "step_error": float(result["step_error"][0]),
+            "feature_errors": result["feature_errors"][0],
+            "steps": int(result["steps"][0]),
+            "window_score": float(result["window_score"][0]),
+            "window_feature_errors": result["window_feature_errors"][0],
+            "window_complete": bool(result["window_complete"][0]),
+            "is_anomaly": bool(result["is_anomaly"][0]),
+        }
+    
+    def stream_step_batch(
+        self,
+        eq_ids: List[Hashable],
+        samples: np.ndarray,
+        threshold: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        여러 설비의 새 샘플을 한 번에 한 스텝 진행 (설비당 O(1) 연산)
+        
+        encoder/decoder가 모두 단방향 LSTM이므로 캐시된 (h, c)로 한 스텝씩 진행한 결과는
+        같은 구간을 윈도우로 한 번에 추론한 결과와 동일하다.
+        상태는 sequence_length 스텝마다 초기화되며(텀블링 윈도우),
+        블록의 마지막 스텝(window_complete)에서 window_score는
+        해당 구간 윈도우 추론의 anomaly_score와 같다.
+        
+        Args:
+            eq_ids: 설비 ID 목록 (중복 불가)
+            samples: 새 샘플 (batch, features)
+            
+        Returns:
+            reconstruction: (batch, features) 이번 스텝 복원값
+            step_error: (batch,) 이번 스텝 복원 오차
+            feature_errors: (batch, features) 이번 스텝 변수별 복원 오차
+            steps: (batch,) 현재 윈도우 블록 내 누적 스텝 수
+            window_score: (batch,) 블록 내 평균 복원 오차
+            window_feature_errors: (batch, features) 블록 내 변수별 평균 복원 오차
+            window_complete: (batch,) 블록 완료 여부
+            is_anomaly: (batch,) window_score 기준 이상 여부
+        """
+        if len(set(eq_ids)) != len(eq_ids):
+            raise ValueError("eq_ids에 중복된 설비가 있습니다")
+        threshold = self.threshold if threshold is None else threshold
+        
+        with self._stream_lock:
+            return self._stream_step_locked(eq_ids, samples, threshold)
+    
+    def _stream_step_locked(self, eq_ids: List[Hashable], samples: np.ndarray, threshold: float) -> Dict[str, np.ndarray]:
+        """stream_step_batch 본체 (_stream_lock 안에서 호출)"""
+        encoder = self.model.encoder
+        decoder = self.model.decoder
+        
+        # 이전 상태 조회 (블록이 끝난 상태는 초기화)
+        states = []
+        for eq_id in eq_ids:
+            state = self.stream_states.get(eq_id)
+            if state is not None and state["steps"] >= self.sequence_length:
+                state = None
+            states.append(state)
+        
+        def stack(key: str, idx: int, lstm: nn.LSTM) -> torch.Tensor:
+            zeros = torch.zeros(lstm.num_layers, 1, lstm.hidden_size, device=self.device)
+            return torch.cat(
+                [s[key][idx] if s is not None else zeros for s in states],
+                dim=1
+            )
+        
         with torch.no_grad():
-            data_tensor = torch.FloatTensor(data).unsqueeze(0).to(self.device)
-            output = self.model(data_tensor)
+            x = torch.as_tensor(samples, dtype=torch.float32).to(self.device).unsqueeze(1)
             
-            # Reconstruction error
-            error = torch.mean((data_tensor - output) ** 2, dim=-1)
-            anomaly_score = error.mean().item()
+            encoded, (enc_h, enc_c) = encoder(x, (stack("encoder", 0, encoder), stack("encoder", 1, encoder)))
+            decoded, (dec_h, dec_c) = decoder(encoded, (stack("decoder", 0, decoder), stack("decoder", 1, decoder)))
+            output = self.model.output_layer(decoded)[:, 0, :]
             
-            is_anomaly = anomaly_score > threshold
+            squared_error = (x[:, 0, :] - output) ** 2
+            feature_errors = squared_error.cpu().numpy()
+            step_errors = squared_error.mean(dim=-1).cpu().numpy()
+            reconstruction = output.cpu().numpy()
+        
+        n = len(eq_ids)
+        steps = np.zeros(n, dtype=np.int64)
+        window_scores = np.zeros(n, dtype=np.float64)
+        window_feature_errors = np.zeros_like(feature_errors)
+        
+        for i, (eq_id, prev) in enumerate(zip(eq_ids, states)):
+            new_state = {
+                "encoder": (enc_h[:, i:i + 1].clone(), enc_c[:, i:i + 1].clone()),
+                "decoder": (dec_h[:, i:i + 1].clone(), dec_c[:, i:i + 1].clone()),
+                "steps": (prev["steps"] if prev else 0) + 1,
+                "error_sum": (prev["error_sum"] if prev else 0.0) + float(step_errors[i]),
+                "feature_error_sum": (
+                    prev["feature_error_sum"] + feature_errors[i] if prev else feature_errors[i].copy()
+                ),
+            }
+            self.stream_states.put(eq_id, new_state)
             
-            return is_anomaly, anomaly_score
\ No newline at end of file
+            steps[i] = new_state["steps"]
+            window_scores[i] = new_state["error_sum"] / new_state["steps"]
+            window_feature_errors[i] = new_state["feature_error_sum"] / new_state["steps"]
+        
+        return {
+            "reconstruction": reconstruction,
+            "step_error": step_errors,
+            "feature_errors": feature_errors,
+            "steps": steps,
+            "window_score": window_scores,
+            "window_feature_errors": window_feature_errors,
+            "window_complete": steps == self.sequence_length,
+            "is_anomaly": window_scores > threshold,
+        }
+    
+    def reset_stream(self, eq_id: Optional[Hashable] = None):
+        """스트리밍 상태 초기화 (eq_id 없으면 전체)"""
+        with self._stream_lock:
+            if eq_id is None:
+                self.stream_states.clear()
+            else:
+                self.stream_states.reset(eq_id)
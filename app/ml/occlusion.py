@@ -0,0 +1,149 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class OcclusionAttributor:
+    """
+    Isolation Forest 점수에 대한 occlusion 기반 변수 기여도
+
+    샘플의 각 변수를 기준값(baseline)으로 바꿨을 때 score_samples가 얼마나 정상 쪽으로
+    올라가는지를 기여도로 본다. 샘플 하나당 변수 수만큼의 교란 행을 한 행렬로 만들어
+    모든 샘플을 score_samples 1회로 채점한다.
+
+    - 기준값과 같은 변수는 교란해도 점수가 변하지 않으므로 행을 만들지 않음
+    - is_anomaly를 주면 정상 샘플은 교란/채점 없이 건너뜀 (조기 종료)
+    - max_candidates를 주면 기준값에서 가장 많이 벗어난 변수만 교란
+    - 기준값은 입력과 같은 공간이어야 함 (정규화 입력이면 학습 평균 0, 원 단위면 학습/윈도우 평균)
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray], np.ndarray],
+        feature_names: List[str],
+        baseline: Optional[np.ndarray] = None,
+        max_candidates: Optional[int] = None
+    ):
+        """
+        Args:
+            score_fn: (n, features) → (n,) 점수 (높을수록 정상, sklearn score_samples 규약)
+            baseline: (features,) 기준값 (None이면 0, 정규화된 입력의 학습 평균)
+            max_candidates: 샘플당 교란할 최대 변수 수 (None이면 전체)
+        """
+        self.score_fn = score_fn
+        self.feature_names = feature_names
+        n_features = len(feature_names)
+        self.baseline = (
+            np.zeros(n_features) if baseline is None else np.asarray(baseline, dtype=np.float64)
+        )
+        self.max_candidates = max_candidates
+
+    def attribute_batch(
+        self,
+        data: np.ndarray,
+        scores: Optional[np.ndarray] = None,
+        is_anomaly: Optional[np.ndarray] = None,
+        top_k: int = 5,
+        baseline: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 샘플의 변수 기여도 일괄 계산
+
+        Args:
+            data: (batch, features) 샘플 (설비별 최신 샘플 등)
+            scores: (batch,) 원본 score_samples (이미 계산했으면 전달해 재채점 생략)
+            is_anomaly: (batch,) 이상 여부 (주면 False인 샘플은 건너뜀)
+            baseline: (features,) 또는 (batch, features) 샘플별 기준값 (None이면 self.baseline)
+
+        Returns:
+            indices: (batch, k) 기여도 상위 변수 인덱스 (없으면 -1)
+            contributions: (batch, k) 기여도 (교란 후 점수 - 원본 점수, 클수록 이상에 기여)
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+        n_samples, n_features = data.shape
+        k = min(top_k, n_features)
+
+        indices = np.full((n_samples, k), -1, dtype=np.int64)
+        contributions = np.zeros((n_samples, k), dtype=np.float64)
+
+        active = np.arange(n_samples) if is_anomaly is None else np.flatnonzero(is_anomaly)
+        if len(active) == 0:
+            return indices, contributions
+
+        x = data[active]
+        reference = self.baseline if baseline is None else np.asarray(baseline, dtype=np.float64)
+        reference = np.broadcast_to(reference, data.shape)[active]
+
+        # 교란 대상 변수: 기준값과 다른 변수 (max_candidates면 편차 상위만)
+        deviation = np.abs(x - reference)
+        candidate = deviation > 0
+        if self.max_candidates is not None and self.max_candidates < n_features:
+            cutoff = np.partition(deviation, n_features - self.max_candidates, axis=1)[
+                :, n_features - self.max_candidates, np.newaxis
+            ]
+            candidate &= deviation >= cutoff
+
+        rows, cols = np.nonzero(candidate)
+        if len(rows) == 0:
+            return indices, contributions
+
+        # 모든 교란 행을 하나의 행렬로 만들어 1회 채점 (원본 점수가 없으면 원본 행도 함께)
+        perturbed = x[rows]
+        perturbed[np.arange(len(rows)), cols] = reference[rows, cols]
+        if scores is None:
+            all_scores = self.score_fn(np.concatenate([x, perturbed]))
+            base_scores, perturbed_scores = all_scores[:len(x)], all_scores[len(x):]
+        else:
+            base_scores = np.asarray(scores, dtype=np.float64)[active]
+            perturbed_scores = self.score_fn(perturbed)
+
+        delta = np.full((len(active), n_features), -np.inf)
+        delta[rows, cols] = perturbed_scores - base_scores[rows]
+
+        if k < n_features:
+            top = np.argpartition(-delta, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n_features), delta.shape)
+        top_delta = np.take_along_axis(delta, top, axis=1)
+        order = np.argsort(-top_delta, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_delta = np.take_along_axis(top_delta, order, axis=1)
+
+        # 교란하지 않은 변수(-inf)는 결과에서 제외
+        valid = np.isfinite(top_delta)
+        indices[active] = np.where(valid, top, -1)
+        contributions[active] = np.where(valid, top_delta, 0.0)
+        return indices, contributions
+
+    def attribute(
+        self,
+        sample: np.ndarray,
+        score: Optional[float] = None,
+        top_k: int = 5
+    ) -> List[Tuple[str, float]]:
+        """단일 샘플 기여도 상위 K개 [(변수명, 기여도)]"""
+        result = self.explain_batch(
+            np.asarray(sample)[np.newaxis],
+            scores=None if score is None else np.asarray([score]),
+            top_k=top_k
+        )
+        return list(result[0].items())
+
+    def explain_batch(
+        self,
+        data: np.ndarray,
+        scores: Optional[np.ndarray] = None,
+        is_anomaly: Optional[np.ndarray] = None,
+        top_k: int = 5,
+        baseline: Optional[np.ndarray] = None
+    ) -> List[Dict[str, float]]:
+        """attribute_batch 결과를 샘플별 {변수명: 기여도}로 변환 (건너뛴 샘플은 빈 dict)"""
+        indices, contributions = self.attribute_batch(data, scores, is_anomaly, top_k, baseline)
+        return [
+            {
+                self.feature_names[i]: float(c)
+                for i, c in zip(row_indices, row_contributions)
+                if i >= 0
+            }
+            for row_indices, row_contributions in zip(indices, contributions)
+        ]
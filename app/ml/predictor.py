@@ -1,8 +1,11 @@
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, Sequence, Tuple, Optional
 from app.ml.lstm_model import LSTMPredictor
 from app.ml.isolation_forest import IsolationForestDetector
 from app.ml.feature_importance import FeatureImportanceCalculator
+from app.ml.occlusion import OcclusionAttributor
+from app.ml.batching import InferenceScheduler
+from app.ml.bundle import LEGACY_VERSION, ModelBundle
 from app.config import settings
 
 class IntegratedPredictor:
@@ -10,55 +13,131 @@ class IntegratedPredictor:
     LSTM + Isolation Forest 통합 예측기
     """
     
-    def __init__(self):
-        # 모델 초기화
-        self.lstm = LSTMPredictor(
+    def __init__(
+        self,
+        lstm: Optional[LSTMPredictor] = None,
+        isolation_forest: Optional[IsolationForestDetector] = None,
+        scheduler: Optional[InferenceScheduler] = None,
+        bundle: Optional[ModelBundle] = None
+    ):
+        # 모델 초기화 (공유 인스턴스가 주어지면 재사용)
+        self.lstm = lstm or LSTMPredictor(
             model_path=settings.LSTM_MODEL_PATH,
             input_size=52  # TEP 52개 변수
         )
         
-        self.isolation_forest = IsolationForestDetector(
-            model_path=settings.ISOLATION_FOREST_PATH
+        self.isolation_forest = isolation_forest or IsolationForestDetector(
+            model_path=settings.ISOLATION_FOREST_PATH,
+            arrays_path=settings.ISOLATION_FOREST_ARRAYS_PATH
         )
         
-        # TEP 변수 이름
-        self.feature_names = [
-            f"XMEAS_{i}" for i in range(1, 42)
-        ] + [
-            f"XMV_{i}" for i in range(1, 12)
-        ]
+        # 마이크로 배칭 스케줄러 (없으면 요청마다 직접 추론)
+        self.scheduler = scheduler
+        
+        # 모델 번들 (학습 시 정규화 통계, 변수 순서, 임계값)
+        self.bundle = bundle
+        self.model_version = bundle.version if bundle is not None else LEGACY_VERSION
+        
+        # 그룹별 임계값/점수 → 확률 매핑 (보정된 번들만)
+        self.calibration = bundle.calibration if bundle is not None else None
+        
+        # TEP 변수 이름 (번들이 있으면 학습 시 순서 사용)
+        if bundle is not None:
+            self.feature_names = bundle.feature_names
+        else:
+            self.feature_names = [
+                f"XMEAS_{i}" for i in range(1, 42)
+            ] + [
+                f"XMV_{i}" for i in range(1, 12)
+            ]
+        
+        self.feature_calc = FeatureImportanceCalculator(
+            self.feature_names,
+            mode=settings.FEATURE_IMPORTANCE_MODE
+        )
         
-        self.feature_calc = FeatureImportanceCalculator(self.feature_names)
+        # Isolation Forest 점수 기여도 (번들이 있으면 정규화 공간의 학습 평균을 기준값으로 교란,
+        # 없으면 입력이 원 단위이므로 predict_fault에서 윈도우 변수별 평균을 기준값으로 전달)
+        self.if_attributor = OcclusionAttributor(
+            self.isolation_forest.score_samples,
+            self.feature_names,
+            baseline=bundle.normalize(bundle.mean) if bundle is not None else None
+        )
+    
+    @property
+    def feature_defaults(self) -> np.ndarray:
+        """관측이 없는 변수의 대체값 (원 단위, 번들이 있으면 학습 평균)"""
+        if self.bundle is not None:
+            return self.bundle.denormalize(np.zeros(len(self.feature_names)))
+        return np.zeros(len(self.feature_names), dtype=np.float32)
     
     def predict_fault(
         self,
         data: np.ndarray,
-        horizon: int = 30
+        horizon: int = 30,
+        eq_id: Optional[str] = None
     ) -> Dict:
         """
         Fault 발생 예측
         
         Args:
-            data: 최근 시계열 데이터 (sequence_length, 52)
+            data: 최근 시계열 데이터 (sequence_length, 52), 원 단위 (번들 사용 시 feature_names 순서)
             horizon: 예측 시간 (분)
+            eq_id: 설비 ID (보정 테이블이 있으면 설비/유형별 임계값 적용)
             
         Returns:
             prediction_result: 예측 결과 딕셔너리
         """
-        # LSTM 예측
-        lstm_pred, lstm_conf = self.lstm.predict(data, horizon)
+        # std 중요도는 원 단위 윈도우 기준 (번들 도입 전과 같은 값)
+        raw = data
+        if self.bundle is not None:
+            # 학습 시와 동일한 정규화 적용
+            data = self.bundle.normalize(data)
+        
+        if self.scheduler is not None:
+            # 동시 요청과 묶어서 배치 추론
+            lstm_future = self.scheduler.submit_lstm(data)
+            if_future = self.scheduler.submit_isolation_forest(data[-1])
+            lstm_out = lstm_future.result()
+            is_anomaly_if, if_score = if_future.result()
+        else:
+            # LSTM 예측 + 이상 탐지 (1회 forward)
+            lstm_out = self.lstm.infer(data)
+            is_anomaly_if, if_score = self.isolation_forest.detect_single(data[-1])
         
-        # 이상 탐지
-        is_anomaly_lstm, lstm_score = self.lstm.detect_anomaly(data)
-        is_anomaly_if, if_score = self.isolation_forest.detect_single(data[-1])
+        lstm_pred = lstm_out["predicted"]
+        if self.bundle is not None:
+            lstm_pred = self.bundle.denormalize(lstm_pred)
+        lstm_conf = lstm_out["confidence"]
+        is_anomaly_lstm = lstm_out["is_anomaly"]
+        lstm_score = lstm_out["anomaly_score"]
         
-        # 종합 이상 확률
-        combined_prob = (lstm_score + if_score) / 2.0
+        if self.calibration is not None:
+            # 정상 이력 분포 기준 임계값과 점수 → 확률 매핑 (그룹 조회 1회)
+            calibrated = self.calibration.apply(lstm_score, if_score, eq_id)
+            is_anomaly_lstm = calibrated["is_anomaly_lstm"]
+            is_anomaly_if = calibrated["is_anomaly_if"]
+            combined_prob = (calibrated["lstm_probability"] + calibrated["if_probability"]) / 2.0
+        else:
+            # 종합 이상 확률 (정규화되지 않은 입력에서는 복원 오차가 1을 넘을 수 있으므로 0~1로 제한)
+            combined_prob = float(np.clip((lstm_score + if_score) / 2.0, 0.0, 1.0))
         
-        # Feature Importance 계산
-        importance = self.feature_calc.calculate_importance(data, combined_prob)
+        # Feature Importance 계산 (LSTM 변수별 복원 오차 재사용)
+        importance = self.feature_calc.calculate_importance(
+            raw,
+            combined_prob,
+            feature_errors=lstm_out["feature_errors"]
+        )
         top_features = self.feature_calc.get_top_features(importance, top_k=5)
         
+        # 이상으로 판단된 경우에만 Isolation Forest occlusion 기여도 계산
+        if_importance = self.if_attributor.explain_batch(
+            data[-1:],
+            is_anomaly=np.asarray([is_anomaly_lstm or is_anomaly_if]),
+            top_k=5,
+            baseline=None if self.bundle is not None else data.mean(axis=0, keepdims=True)
+        )[0]
+        
         # 해석 생성
         interpretation = self._generate_interpretation(
             combined_prob,
@@ -80,8 +159,75 @@ class IntegratedPredictor:
             "confidence_upper": confidence_interval[1],
             "feature_importance": importance,
             "top_features": top_features,
+            "isolation_forest_importance": if_importance,
             "interpretation": interpretation,
-            "is_anomaly": is_anomaly_lstm or is_anomaly_if
+            "is_anomaly": is_anomaly_lstm or is_anomaly_if,
+            "model_version": self.model_version
+        }
+    
+    def score_windows(
+        self,
+        windows: np.ndarray,
+        eq_ids: Optional[Sequence[Optional[str]]] = None,
+        normalized: bool = False,
+        batch_size: int = 512
+    ) -> Dict[str, np.ndarray]:
+        """
+        여러 윈도우 일괄 채점 (백테스트/백필/주기 탐지용)
+        
+        predict_fault와 같은 임계값/확률 규칙을 배치 단위 벡터 연산으로 적용한다.
+        해석 문구와 변수 중요도는 만들지 않는다.
+        
+        Args:
+            windows: (n, sequence_length, features)
+            eq_ids: (n,) 윈도우별 설비 ID (보정 그룹 조회용, None이면 전체 그룹)
+            normalized: True면 이미 번들 정규화된 입력
+            batch_size: 모델 1회 호출당 윈도우 수
+            
+        Returns:
+            lstm_score, if_score, probability, is_anomaly_lstm, is_anomaly_if, is_anomaly: (n,) 배열
+            feature_errors: (n, features) 변수별 복원 오차 (calculate_importance_batch 입력)
+        """
+        n = len(windows)
+        lstm_scores = np.empty(n, dtype=np.float64)
+        feature_errors = np.empty((n, len(self.feature_names)), dtype=np.float32)
+        if_scores = np.empty(n, dtype=np.float64)
+        lstm_flags = np.empty(n, dtype=bool)
+        if_flags = np.empty(n, dtype=bool)
+        
+        for start in range(0, n, batch_size):
+            batch = windows[start:start + batch_size]
+            if self.bundle is not None and not normalized:
+                batch = self.bundle.normalize(batch)
+            else:
+                # memmap view 등 읽기 전용/비연속 입력은 연속 배열로 복사
+                batch = np.ascontiguousarray(batch, dtype=np.float32)
+            
+            lstm_out = self.lstm.infer_batch(batch)
+            if_flag, if_score = self.isolation_forest.detect_rows(batch[:, -1])
+            
+            lstm_scores[start:start + len(batch)] = lstm_out["anomaly_score"]
+            lstm_flags[start:start + len(batch)] = lstm_out["is_anomaly"]
+            feature_errors[start:start + len(batch)] = lstm_out["feature_errors"]
+            if_scores[start:start + len(batch)] = if_score
+            if_flags[start:start + len(batch)] = if_flag
+        
+        if self.calibration is not None:
+            calibrated = self.calibration.apply_batch(lstm_scores, if_scores, eq_ids if eq_ids is not None else [None] * n)
+            probability = (calibrated["lstm_probability"] + calibrated["if_probability"]) / 2.0
+            lstm_flags = calibrated["is_anomaly_lstm"]
+            if_flags = calibrated["is_anomaly_if"]
+        else:
+            probability = np.clip((lstm_scores + if_scores) / 2.0, 0.0, 1.0)
+        
+        return {
+            "lstm_score": lstm_scores,
+            "if_score": if_scores,
+            "probability": probability,
+            "is_anomaly_lstm": lstm_flags,
+            "is_anomaly_if": if_flags,
+            "is_anomaly": lstm_flags | if_flags,
+            "feature_errors": feature_errors
         }
     
     def _calculate_confidence_interval(
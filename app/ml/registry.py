@@ -0,0 +1,368 @@
+import gc
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.ml.lstm_model import LSTMPredictor
+from app.ml.isolation_forest import IsolationForestDetector
+from app.ml.predictor import IntegratedPredictor
+from app.ml.batching import InferenceScheduler
+from app.ml.bundle import ModelBundle, is_bundle
+from app.ml.watcher import ModelWatcher
+from app.config import settings
+
+# 교체 전 검증용 입력 배치 크기
+CANARY_BATCH_SIZE = 8
+
+
+class ReloadInProgressError(RuntimeError):
+    """이미 모델 교체가 진행 중"""
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 모델 레지스트리
+
+    모델을 최초 요청 시(또는 warmup 시) 한 번만 로드하고,
+    이후에는 공유 인스턴스를 반환한다. 반환된 인스턴스는 읽기 전용으로 사용해야 한다.
+
+    reload()는 새 모델 세트를 별도 레지스트리에 로드/검증한 뒤 참조를 한 번에 교체한다
+    (더블 버퍼링). 이미 이전 모델을 받은 요청은 이전 모델로 끝까지 처리된다.
+    """
+
+    def __init__(self, bundle_path: Optional[str] = None):
+        self.bundle_path = bundle_path
+
+        self._lock = threading.RLock()
+        self._loaders: Dict[str, Callable[["ModelRegistry"], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict] = {}
+
+        # 모델 교체
+        self._reload_lock = threading.Lock()
+        self.generation = 0
+        self.reload_status: Dict = {"state": "idle"}
+
+    def register(self, name: str, loader: Callable[["ModelRegistry"], Any]):
+        """모델 로더 등록 (로드는 get/warmup 시점에 수행, loader(registry) 형태로 호출)"""
+        with self._lock:
+            self._loaders[name] = loader
+
+    def get(self, name: str) -> Any:
+        """공유 모델 인스턴스 반환 (최초 1회만 로드, 로더가 None을 반환해도 캐시)"""
+        models = self._models
+        if name in models:
+            return models[name]
+
+        with self._lock:
+            if name not in self._models:
+                return self._load(name)
+            return self._models[name]
+
+    def _load(self, name: str) -> Any:
+        if name not in self._loaders:
+            raise KeyError(f"등록되지 않은 모델입니다: {name}")
+
+        start = time.perf_counter()
+        model = self._loaders[name](self)
+        load_time_ms = (time.perf_counter() - start) * 1000
+
+        memory_bytes = model.memory_bytes() if hasattr(model, "memory_bytes") else 0
+
+        self._models[name] = model
+        self._stats[name] = {
+            "load_time_ms": round(load_time_ms, 2),
+            "memory_bytes": int(memory_bytes),
+            "loaded_at": time.time(),
+        }
+        if model is None:
+            return None
+        print(f"✅ 모델 레지스트리 로드 완료: {name} ({load_time_ms:.1f} ms, {memory_bytes / 1024:.1f} KiB)")
+        return model
+
+    def warmup(self, names: Optional[List[str]] = None):
+        """서버 시작 시 모델 사전 로드"""
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def stats(self) -> Dict[str, Dict]:
+        """모델별 로드 시간 및 메모리 사용량"""
+        with self._lock:
+            return {
+                name: {
+                    "loaded": self._models.get(name) is not None,
+                    **self._stats.get(name, {}),
+                }
+                for name in self._loaders
+            }
+
+    def clear(self):
+        """로드된 모델 해제 (테스트/재로드용)"""
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+
+    def staged(self, bundle_path: Optional[str] = None) -> "ModelRegistry":
+        """같은 로더를 쓰는 별도 레지스트리 (교체 전 로드, 오프라인 작업용)"""
+        staged = ModelRegistry(bundle_path or self.bundle_path)
+        staged._loaders = dict(self._loaders)
+        return staged
+
+    def reload(
+        self,
+        bundle_path: Optional[str] = None,
+        validator: Optional[Callable[["ModelRegistry"], Dict]] = None,
+        grace_seconds: float = 0.0
+    ) -> Dict:
+        """
+        새 모델 세트를 로드/검증 후 원자적으로 교체
+
+        Args:
+            bundle_path: 새 번들 경로 (None이면 현재 경로를 다시 로드)
+            validator: 교체 전 검증 함수 (예외 발생 시 교체하지 않음)
+            grace_seconds: 이전 모델 정리까지 대기 시간 (진행 중 요청 마무리용)
+
+        Returns:
+            reload_status
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            raise ReloadInProgressError("이미 모델 교체가 진행 중입니다")
+        try:
+            return self._reload(bundle_path, validator, grace_seconds)
+        finally:
+            self._reload_lock.release()
+
+    def start_reload(
+        self,
+        bundle_path: Optional[str] = None,
+        validator: Optional[Callable[["ModelRegistry"], Dict]] = None,
+        grace_seconds: float = 0.0
+    ):
+        """reload()를 백그라운드 스레드에서 실행"""
+        if not self._reload_lock.acquire(blocking=False):
+            raise ReloadInProgressError("이미 모델 교체가 진행 중입니다")
+
+        def run():
+            try:
+                self._reload(bundle_path, validator, grace_seconds)
+            except Exception:
+                # 결과는 reload_status에 기록됨
+                pass
+            finally:
+                self._reload_lock.release()
+
+        self.reload_status = {"state": "loading", "started_at": time.time()}
+        threading.Thread(target=run, name="model-reload", daemon=True).start()
+
+    def _reload(
+        self,
+        bundle_path: Optional[str],
+        validator: Optional[Callable[["ModelRegistry"], Dict]],
+        grace_seconds: float
+    ) -> Dict:
+        started_at = time.time()
+        start = time.perf_counter()
+        self.reload_status = {"state": "loading", "started_at": started_at}
+
+        staged = self.staged(bundle_path)
+        try:
+            # 서비스 중인 모델과 별개로 새 세트 로드 + 검증
+            staged.warmup()
+            validation = validator(staged) if validator else {}
+        except Exception as e:
+            staged._dispose(staged._models)
+            self.reload_status = {
+                "state": "failed",
+                "started_at": started_at,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "error": str(e),
+            }
+            print(f"❌ 모델 교체 실패: {e}")
+            raise
+
+        with self._lock:
+            previous = self._models
+            self._models = staged._models
+            self._stats = staged._stats
+            self.bundle_path = staged.bundle_path
+            self.generation += 1
+
+        # 이전 모델은 진행 중 요청이 끝난 뒤 정리
+        if grace_seconds > 0:
+            timer = threading.Timer(grace_seconds, self._dispose, args=(previous,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._dispose(previous)
+
+        self.reload_status = {
+            "state": "succeeded",
+            "started_at": started_at,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "generation": self.generation,
+            "version": self.version(),
+            "validation": validation,
+        }
+        print(f"✅ 모델 교체 완료: {self.version()} (generation {self.generation})")
+        return self.reload_status
+
+    @staticmethod
+    def _dispose(models: Dict[str, Any]):
+        """교체된 모델 정리 (배칭 워커 종료 + 메모리 해제)"""
+        predictor = models.get("predictor")
+        if predictor is not None and predictor.scheduler is not None:
+            predictor.scheduler.shutdown()
+        models.clear()
+        gc.collect()
+
+    def version(self) -> Optional[str]:
+        """현재 서비스 중인 모델 버전 (로드 전이면 None)"""
+        predictor = self._models.get("predictor")
+        return predictor.model_version if predictor is not None else None
+
+
+registry = ModelRegistry(bundle_path=settings.MODEL_BUNDLE_PATH)
+
+
+def _load_bundle(models: ModelRegistry) -> Optional[ModelBundle]:
+    """bundle_path에 번들이 없으면 None (개별 모델 경로 사용)"""
+    if not is_bundle(models.bundle_path):
+        return None
+    return ModelBundle.load(models.bundle_path)
+
+
+def _build_lstm(models: ModelRegistry) -> LSTMPredictor:
+    bundle = models.get("bundle")
+    common = dict(
+        stream_max_states=settings.LSTM_STREAM_MAX_STATES,
+        stream_state_ttl=settings.LSTM_STREAM_STATE_TTL_SEC,
+        backend=settings.LSTM_BACKEND,
+        num_threads=settings.LSTM_NUM_THREADS,
+        backend_tolerance=settings.LSTM_BACKEND_TOLERANCE
+    )
+
+    if bundle is None:
+        return LSTMPredictor(
+            model_path=settings.LSTM_MODEL_PATH,
+            input_size=52,  # TEP 52개 변수
+            sequence_length=settings.LSTM_SEQUENCE_LENGTH,
+            **common
+        )
+
+    return LSTMPredictor(
+        model_path=bundle.lstm_path,
+        input_size=bundle.lstm_config["input_size"],
+        hidden_size=bundle.lstm_config["hidden_size"],
+        num_layers=bundle.lstm_config["num_layers"],
+        sequence_length=bundle.sequence_length,
+        threshold=bundle.thresholds["lstm"],
+        mmap=True,
+        **common
+    )
+
+
+def _build_isolation_forest(models: ModelRegistry) -> IsolationForestDetector:
+    bundle = models.get("bundle")
+
+    if bundle is None:
+        return IsolationForestDetector(
+            model_path=settings.ISOLATION_FOREST_PATH,
+            arrays_path=settings.ISOLATION_FOREST_ARRAYS_PATH
+        )
+
+    return IsolationForestDetector(
+        arrays_path=bundle.isolation_forest_path,
+        offset=bundle.thresholds.get("isolation_forest")
+    )
+
+
+registry.register("bundle", _load_bundle)
+registry.register("lstm", _build_lstm)
+registry.register("isolation_forest", _build_isolation_forest)
+
+
+def _build_predictor(models: ModelRegistry) -> IntegratedPredictor:
+    lstm = models.get("lstm")
+    isolation_forest = models.get("isolation_forest")
+
+    scheduler = None
+    if settings.INFERENCE_BATCHING:
+        scheduler = InferenceScheduler(
+            lstm,
+            isolation_forest,
+            max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=settings.INFERENCE_MAX_WAIT_MS
+        )
+
+    return IntegratedPredictor(
+        lstm=lstm,
+        isolation_forest=isolation_forest,
+        scheduler=scheduler,
+        bundle=models.get("bundle")
+    )
+
+
+registry.register("predictor", _build_predictor)
+
+
+def get_predictor() -> IntegratedPredictor:
+    """공유 IntegratedPredictor 반환"""
+    return registry.get("predictor")
+
+
+def validate_canary(models: ModelRegistry) -> Dict:
+    """
+    교체 전 검증: 고정 시드 입력 배치로 전체 추론 경로 실행
+
+    이상 점수가 유한한 값이 아니면 예외를 발생시켜 교체를 중단한다.
+    """
+    predictor: IntegratedPredictor = models.get("predictor")
+    lstm = predictor.lstm
+    n_features = lstm.model.output_layer.out_features
+
+    rng = np.random.default_rng(0)
+    windows = rng.standard_normal(
+        (CANARY_BATCH_SIZE, lstm.sequence_length, n_features)
+    ).astype(np.float32)
+
+    lstm_scores = lstm.infer_batch(windows)["anomaly_score"]
+    _, if_scores = predictor.isolation_forest.detect_rows(windows[:, -1])
+
+    # 번들 사용 시 predict_fault는 원 단위 입력을 받음
+    raw = predictor.bundle.denormalize(windows[0]) if predictor.bundle is not None else windows[0]
+    probability = predictor.predict_fault(raw)["probability"]
+
+    if not (np.all(np.isfinite(lstm_scores)) and np.all(np.isfinite(if_scores)) and np.isfinite(probability)):
+        raise ValueError("검증 배치 추론 결과에 유한하지 않은 값이 있습니다")
+
+    return {
+        "canary_batch_size": CANARY_BATCH_SIZE,
+        "lstm_score_mean": round(float(lstm_scores.mean()), 6),
+        "isolation_forest_score_mean": round(float(if_scores.mean()), 6),
+    }
+
+
+def reload_models(bundle_path: Optional[str] = None, background: bool = False) -> Dict:
+    """검증 후 모델 교체 (background=True면 즉시 반환)"""
+    options = dict(
+        bundle_path=bundle_path,
+        validator=validate_canary,
+        grace_seconds=settings.MODEL_SWAP_GRACE_SEC
+    )
+    if background:
+        registry.start_reload(**options)
+        return registry.reload_status
+    return registry.reload(**options)
+
+
+watcher = ModelWatcher(
+    get_path=lambda: registry.bundle_path,
+    on_change=reload_models,
+    interval_seconds=settings.MODEL_WATCH_INTERVAL_SEC,
+    retry_errors=(ReloadInProgressError,)
+)
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+class RecurrentStateStore:
+    """
+    설비별 LSTM 순환 상태 (h, c) 저장소
+
+    - max_entries 초과 시 가장 오래 사용되지 않은 상태부터 제거 (LRU)
+    - ttl_seconds 동안 갱신되지 않은 상태는 만료
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+
+        self._states: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """상태 조회 (만료된 상태는 None)"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return None
+
+            if self.ttl_seconds is not None and time.monotonic() - state["updated_at"] > self.ttl_seconds:
+                del self._states[key]
+                self.evictions += 1
+                return None
+
+            self._states.move_to_end(key)
+            return state
+
+    def put(self, key: Hashable, state: Dict):
+        """상태 저장 (용량 초과 시 LRU 제거)"""
+        state["updated_at"] = time.monotonic()
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+                self.evictions += 1
+
+    def reset(self, key: Hashable):
+        """특정 설비 상태 초기화"""
+        with self._lock:
+            self._states.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._states
+
+    def metrics(self) -> Dict:
+        return {
+            "states": len(self._states),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+        }
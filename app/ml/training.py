@@ -0,0 +1,525 @@
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset, RandomSampler
+
+from app.ml.bundle import SCALER_EPS, write_bundle
+from app.ml.iforest_arrays import ForestArrays, file_sha256
+from app.ml.lstm_backends import configure_threads
+from app.ml.lstm_model import LSTMAutoencoder
+from app.utils.data_processor import OnlineNormalizer
+from app.utils.tep_loader import TEPCache
+
+# 정상 운전 구간 (TEP faultNumber 0, tags_timeseries export도 0으로 기록)
+NORMAL_FAULTS = (0,)
+
+
+def window_starts(segments: np.ndarray, sequence_length: int, stride: int = 1) -> np.ndarray:
+    """
+    구간 경계를 넘지 않는 윈도우 시작 행 번호
+
+    Args:
+        segments: (n, 4) [fault, run, start, stop] (TEPCache.runs 형식)
+    """
+    starts = [
+        np.arange(start, stop - sequence_length + 1, stride, dtype=np.int64)
+        for _, _, start, stop in segments
+        if stop - start >= sequence_length
+    ]
+    return np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+
+
+class WindowDataset(Dataset):
+    """
+    memory-map 시계열에서 (sequence_length, features) 윈도우를 꺼내는 Dataset
+
+    윈도우를 미리 만들지 않고 시작 행 번호만 들고 있다가 요청 시 잘라 정규화한다.
+    cache_path가 있으면 DataLoader 워커로 넘길 때 배열 대신 경로만 전달하고 워커에서 다시 연다
+    (np.memmap은 pickle 시 전체 데이터가 복사됨).
+    """
+
+    def __init__(
+        self,
+        features: Optional[np.ndarray],
+        starts: np.ndarray,
+        sequence_length: int = 60,
+        mean: Optional[np.ndarray] = None,
+        std: Optional[np.ndarray] = None,
+        cache_path: Optional[str] = None
+    ):
+        """
+        Args:
+            features: (n_rows, n_features) 원 단위 값 (None이면 cache_path에서 열기)
+            starts: 윈도우 시작 행 번호
+            mean/std: 정규화 통계 (None이면 정규화하지 않음)
+        """
+        self.features = features
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.sequence_length = sequence_length
+        self.cache_path = cache_path
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        self.scale = None if std is None else (np.asarray(std, dtype=np.float64) + SCALER_EPS).astype(np.float32)
+
+    @classmethod
+    def from_cache(
+        cls,
+        cache: TEPCache,
+        sequence_length: int = 60,
+        stride: int = 1,
+        faults: Optional[Iterable[int]] = NORMAL_FAULTS,
+        runs: Optional[Iterable[int]] = None,
+        mean: Optional[np.ndarray] = None,
+        std: Optional[np.ndarray] = None
+    ) -> "WindowDataset":
+        """TEPCache에서 조건에 맞는 구간의 윈도우 (기본은 정상 운전 구간만)"""
+        starts = window_starts(cache.select_runs(faults, runs), sequence_length, stride)
+        return cls(cache.features, starts, sequence_length, mean, std, cache_path=cache.path)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.cache_path:
+            state["features"] = None
+        return state
+
+    def _data(self) -> np.ndarray:
+        if self.features is None:
+            self.features = TEPCache.open(self.cache_path).features
+        return self.features
+
+    def __getitem__(self, index: int) -> torch.Tensor:
+        start = self.starts[index]
+        window = np.array(self._data()[start:start + self.sequence_length], dtype=np.float32)
+        if self.mean is not None:
+            window -= self.mean
+            window /= self.scale
+        return torch.from_numpy(window)
+
+    def subset(self, starts: np.ndarray) -> "WindowDataset":
+        subset = WindowDataset.__new__(WindowDataset)
+        subset.__dict__.update(self.__dict__)
+        subset.starts = np.asarray(starts, dtype=np.int64)
+        return subset
+
+    def split(self, val_fraction: float = 0.1) -> Tuple["WindowDataset", "WindowDataset"]:
+        """
+        시간 순서 뒤쪽 val_fraction을 검증용으로 분리
+
+        검증 윈도우와 겹치는 학습 윈도우는 제외해 같은 행이 양쪽에 들어가지 않게 한다.
+        """
+        n_val = int(round(len(self.starts) * val_fraction))
+        if n_val == 0:
+            return self, self.subset(self.starts[:0])
+
+        val_starts = self.starts[-n_val:]
+        train_starts = self.starts[:-n_val]
+        train_starts = train_starts[train_starts + self.sequence_length <= val_starts[0]]
+        return self.subset(train_starts), self.subset(val_starts)
+
+
+def fit_normalizer(cache: TEPCache, faults: Optional[Iterable[int]] = NORMAL_FAULTS, chunk_size: int = 100_000) -> OnlineNormalizer:
+    """선택 구간 행의 정규화 통계 (청크 단위 누적)"""
+    normalizer = OnlineNormalizer()
+    for _, _, start, stop in cache.select_runs(faults):
+        for offset in range(start, stop, chunk_size):
+            normalizer.partial_fit(cache.features[offset:min(offset + chunk_size, stop)])
+    return normalizer
+
+
+def _worker_init(_):
+    # DataLoader 워커는 윈도우 복사만 하므로 torch 스레드 1개로 제한 (메인 프로세스와 코어 경합 방지)
+    torch.set_num_threads(1)
+
+
+def fit_isolation_forest(
+    cache_path: str,
+    output_path: str,
+    mean: np.ndarray,
+    std: np.ndarray,
+    faults: Optional[Iterable[int]] = NORMAL_FAULTS,
+    max_rows: int = 200_000,
+    n_estimators: int = 100,
+    contamination: float = 0.1,
+    n_jobs: int = 1,
+    random_state: int = 42,
+    pickle_path: Optional[str] = None
+) -> Dict:
+    """
+    정규화된 정상 구간 행으로 Isolation Forest 학습 후 ForestArrays(.npz) 저장
+
+    별도 프로세스에서 실행할 수 있도록 경로만 받아 캐시를 직접 연다. 행이 max_rows를 넘으면
+    무작위 표본만 사용한다 (트리당 256개 표본이라 전체 행이 필요하지 않음).
+    pickle_path가 주어지면 sklearn 모델도 pickle로 저장하고 노드 배열에 그 sha256을 기록한다.
+    """
+    from sklearn.ensemble import IsolationForest
+
+    started = time.perf_counter()
+    cache = TEPCache.open(cache_path)
+    segments = cache.select_runs(faults)
+    rows = np.concatenate([np.arange(start, stop) for _, _, start, stop in segments]) if len(segments) else np.zeros(0, np.int64)
+    if len(rows) == 0:
+        raise ValueError("Isolation Forest 학습에 사용할 행이 없습니다")
+
+    if len(rows) > max_rows:
+        rows = np.sort(np.random.default_rng(random_state).choice(rows, max_rows, replace=False))
+
+    data = (cache.features[rows] - np.asarray(mean, dtype=np.float32)) / (np.asarray(std, dtype=np.float64) + SCALER_EPS).astype(np.float32)
+
+    model = IsolationForest(
+        n_estimators=n_estimators,
+        contamination=contamination,
+        random_state=random_state,
+        n_jobs=n_jobs
+    )
+    model.fit(data)
+    forest = ForestArrays.from_sklearn(model)
+    if pickle_path:
+        os.makedirs(os.path.dirname(os.path.abspath(pickle_path)), exist_ok=True)
+        with open(pickle_path, "wb") as f:
+            pickle.dump(model, f)
+        forest.source = file_sha256(pickle_path)
+    forest.save(output_path)
+
+    return {
+        "path": output_path,
+        "rows": int(len(rows)),
+        "seconds": time.perf_counter() - started
+    }
+
+
+class LSTMTrainer:
+    """
+    LSTM Autoencoder 학습 (DataLoader, 조기 종료, 재개 가능한 체크포인트)
+
+    체크포인트는 매 epoch 끝에 임시 파일로 쓴 뒤 교체하므로 학습이 중간에 끊겨도
+    마지막으로 끝난 epoch부터 이어서 학습할 수 있다.
+    """
+
+    def __init__(
+        self,
+        input_size: int,
+        hidden_size: int = 64,
+        num_layers: int = 2,
+        learning_rate: float = 1e-3,
+        batch_size: int = 64,
+        max_epochs: int = 50,
+        patience: int = 5,
+        min_delta: float = 1e-5,
+        num_workers: int = 0,
+        num_threads: Optional[int] = None,
+        samples_per_epoch: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        seed: int = 42
+    ):
+        """
+        Args:
+            patience: 검증 손실이 min_delta 이상 줄지 않은 epoch가 이만큼 이어지면 종료
+            num_workers: DataLoader 워커 프로세스 수 (0이면 메인 프로세스에서 로드)
+            num_threads: torch intra-op 스레드 수 (None이면 기본값)
+            samples_per_epoch: epoch당 무작위 표본 윈도우 수 (None이면 전체)
+            checkpoint_path: 체크포인트 파일 (None이면 저장하지 않음)
+        """
+        self.config = {
+            "input_size": input_size,
+            "hidden_size": hidden_size,
+            "num_layers": num_layers
+        }
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.max_epochs = max_epochs
+        self.patience = patience
+        self.min_delta = min_delta
+        self.num_workers = num_workers
+        self.samples_per_epoch = samples_per_epoch
+        self.checkpoint_path = checkpoint_path
+        self.seed = seed
+
+        configure_threads(num_threads)
+        torch.manual_seed(seed)
+
+        self.model = LSTMAutoencoder(input_size=input_size, hidden_size=hidden_size, num_layers=num_layers)
+        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=learning_rate)
+        self.criterion = torch.nn.MSELoss()
+
+        self.epoch = 0
+        self.best_loss = float("inf")
+        self.best_state: Optional[Dict[str, torch.Tensor]] = None
+        self.bad_epochs = 0
+        self.history: List[Dict] = []
+
+    def _loader(self, dataset: WindowDataset, train: bool) -> DataLoader:
+        sampler = None
+        if train:
+            generator = torch.Generator().manual_seed(self.seed + self.epoch)
+            num_samples = min(self.samples_per_epoch, len(dataset)) if self.samples_per_epoch else None
+            sampler = RandomSampler(dataset, num_samples=num_samples, generator=generator)
+
+        return DataLoader(
+            dataset,
+            batch_size=self.batch_size,
+            sampler=sampler,
+            num_workers=self.num_workers,
+            worker_init_fn=_worker_init if self.num_workers else None,
+            prefetch_factor=4 if self.num_workers else None
+        )
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        staging = f"{self.checkpoint_path}.tmp"
+        torch.save({
+            "config": self.config,
+            "epoch": self.epoch,
+            "model": self.model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "best_loss": self.best_loss,
+            "best_state": self.best_state,
+            "bad_epochs": self.bad_epochs,
+            "history": self.history
+        }, staging)
+        os.replace(staging, self.checkpoint_path)
+
+    def load_checkpoint(self) -> bool:
+        """
+        체크포인트가 있으면 이어서 학습할 상태 복원
+
+        Returns:
+            복원 여부
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+
+        checkpoint = torch.load(self.checkpoint_path, map_location="cpu", weights_only=True)
+        if checkpoint["config"] != self.config:
+            raise ValueError(f"체크포인트 모델 구조가 다릅니다: {checkpoint['config']} != {self.config}")
+
+        self.model.load_state_dict(checkpoint["model"])
+        self.optimizer.load_state_dict(checkpoint["optimizer"])
+        self.epoch = checkpoint["epoch"]
+        self.best_loss = checkpoint["best_loss"]
+        self.best_state = checkpoint["best_state"]
+        self.bad_epochs = checkpoint["bad_epochs"]
+        self.history = checkpoint["history"]
+        print(f"  - 체크포인트에서 재개: epoch {self.epoch} (best val {self.best_loss:.6f})")
+        return True
+
+    @property
+    def stopped(self) -> bool:
+        return self.bad_epochs >= self.patience or self.epoch >= self.max_epochs
+
+    def _evaluate(self, loader: DataLoader) -> float:
+        self.model.eval()
+        total, count = 0.0, 0
+        with torch.inference_mode():
+            for batch in loader:
+                loss = self.criterion(self.model(batch), batch)
+                total += loss.item() * len(batch)
+                count += len(batch)
+        return total / max(count, 1)
+
+    def fit(
+        self,
+        train_set: WindowDataset,
+        val_set: Optional[WindowDataset] = None,
+        on_epoch: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        조기 종료 또는 max_epochs까지 학습
+
+        검증 세트가 비어 있으면 학습 손실로 조기 종료를 판단한다.
+
+        Returns:
+            {"state_dict": 최적 가중치, "best_loss", "epochs", "history", "windows_per_sec"}
+        """
+        if len(train_set) == 0:
+            raise ValueError("학습 윈도우가 없습니다 (데이터가 sequence_length보다 짧음)")
+
+        val_loader = self._loader(val_set, train=False) if val_set is not None and len(val_set) else None
+        total_windows, total_seconds = 0, 0.0
+
+        while not self.stopped:
+            train_loader = self._loader(train_set, train=True)
+
+            self.model.train()
+            started = time.perf_counter()
+            train_total, windows = 0.0, 0
+            for batch in train_loader:
+                self.optimizer.zero_grad()
+                loss = self.criterion(self.model(batch), batch)
+                loss.backward()
+                self.optimizer.step()
+
+                train_total += loss.item() * len(batch)
+                windows += len(batch)
+            elapsed = time.perf_counter() - started
+
+            train_loss = train_total / max(windows, 1)
+            val_loss = self._evaluate(val_loader) if val_loader is not None else train_loss
+            self.epoch += 1
+            total_windows += windows
+            total_seconds += elapsed
+
+            if val_loss < self.best_loss - self.min_delta:
+                self.best_loss = val_loss
+                self.best_state = {key: value.detach().clone() for key, value in self.model.state_dict().items()}
+                self.bad_epochs = 0
+            else:
+                self.bad_epochs += 1
+
+            record = {
+                "epoch": self.epoch,
+                "train_loss": train_loss,
+                "val_loss": val_loss,
+                "windows_per_sec": windows / elapsed if elapsed > 0 else 0.0
+            }
+            self.history.append(record)
+            self.save_checkpoint()
+            if on_epoch:
+                on_epoch(record)
+
+        return {
+            "state_dict": self.best_state or self.model.state_dict(),
+            "best_loss": self.best_loss,
+            "epochs": self.epoch,
+            "history": self.history,
+            "windows_per_sec": total_windows / total_seconds if total_seconds > 0 else 0.0
+        }
+
+
+def train_pipeline(
+    cache: TEPCache,
+    output: str,
+    version: str,
+    sequence_length: int = 60,
+    stride: int = 1,
+    val_fraction: float = 0.1,
+    hidden_size: int = 64,
+    num_layers: int = 2,
+    learning_rate: float = 1e-3,
+    batch_size: int = 64,
+    max_epochs: int = 50,
+    patience: int = 5,
+    samples_per_epoch: Optional[int] = None,
+    num_workers: int = 0,
+    torch_threads: Optional[int] = None,
+    if_jobs: int = 1,
+    if_max_rows: int = 200_000,
+    if_estimators: int = 100,
+    lstm_threshold: float = 0.05,
+    checkpoint_path: Optional[str] = None,
+    on_epoch: Optional[Callable[[Dict], None]] = None,
+    legacy_paths: Optional[Dict[str, str]] = None
+) -> Dict:
+    """
+    정상 구간 데이터로 LSTM Autoencoder + Isolation Forest 학습 후 모델 번들 저장
+
+    1. 정상 구간 행의 정규화 통계 (OnlineNormalizer, 청크 단위)
+    2. Isolation Forest를 별도 프로세스에서 n_jobs=if_jobs로 학습 시작
+    3. 그동안 메인 프로세스에서 LSTM 학습 (torch_threads, DataLoader 워커)
+    4. 두 모델과 정규화 통계를 write_bundle로 저장
+
+    legacy_paths(키: lstm, isolation_forest, isolation_forest_arrays)가 주어지면 번들 없이 로드하던
+    기존 개별 모델 파일도 함께 저장한다. 두 모델 모두 정규화된 입력으로 학습되었으므로
+    정규화 통계가 없는 개별 파일은 이전 버전과의 호환용이다.
+
+    Returns:
+        학습 요약 (epoch, 손실, windows/sec, 소요 시간)
+    """
+    started = time.perf_counter()
+    feature_names = cache.feature_names
+
+    stats = fit_normalizer(cache).stats()
+    mean, std = stats["mean"], stats["std"]
+
+    dataset = WindowDataset.from_cache(cache, sequence_length, stride, mean=mean, std=std)
+    train_set, val_set = dataset.split(val_fraction)
+    print(f"  - 윈도우: 학습 {len(train_set)}, 검증 {len(val_set)} (sequence_length {sequence_length}, stride {stride})")
+
+    # Isolation Forest는 LSTM과 코어를 나눠 별도 프로세스에서 동시에 학습
+    forest_path = os.path.join(os.path.dirname(os.path.abspath(output)), f".isolation_forest-{version}.npz")
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        forest_future = pool.submit(
+            fit_isolation_forest,
+            cache.path,
+            forest_path,
+            mean,
+            std,
+            max_rows=if_max_rows,
+            n_estimators=if_estimators,
+            n_jobs=if_jobs,
+            pickle_path=(legacy_paths or {}).get("isolation_forest")
+        )
+
+        trainer = LSTMTrainer(
+            input_size=len(feature_names),
+            hidden_size=hidden_size,
+            num_layers=num_layers,
+            learning_rate=learning_rate,
+            batch_size=batch_size,
+            max_epochs=max_epochs,
+            patience=patience,
+            num_workers=num_workers,
+            num_threads=torch_threads,
+            samples_per_epoch=samples_per_epoch,
+            checkpoint_path=checkpoint_path
+        )
+        trainer.load_checkpoint()
+        lstm_result = trainer.fit(train_set, val_set, on_epoch=on_epoch)
+
+        forest_result = forest_future.result()
+    finally:
+        pool.shutdown()
+
+    try:
+        forest = ForestArrays.load(forest_path, mmap=False)
+        write_bundle(
+            output,
+            version=version,
+            lstm_state_dict=lstm_result["state_dict"],
+            forest=forest,
+            mean=mean,
+            std=std,
+            feature_names=feature_names,
+            sequence_length=sequence_length,
+            hidden_size=hidden_size,
+            num_layers=num_layers,
+            thresholds={"lstm": lstm_threshold},
+            extra={
+                "training": {
+                    "source": cache.manifest["source"],
+                    "windows": len(train_set),
+                    "epochs": lstm_result["epochs"],
+                    "best_val_loss": lstm_result["best_loss"],
+                    "isolation_forest_rows": forest_result["rows"]
+                }
+            }
+        )
+        if legacy_paths:
+            os.makedirs(os.path.dirname(os.path.abspath(legacy_paths["lstm"])), exist_ok=True)
+            torch.save(lstm_result["state_dict"], legacy_paths["lstm"])
+            forest.save(legacy_paths["isolation_forest_arrays"])
+    finally:
+        if os.path.exists(forest_path):
+            os.remove(forest_path)
+
+    return {
+        "bundle": output,
+        "version": version,
+        "train_windows": len(train_set),
+        "val_windows": len(val_set),
+        "epochs": lstm_result["epochs"],
+        "best_val_loss": lstm_result["best_loss"],
+        "windows_per_sec": lstm_result["windows_per_sec"],
+        "isolation_forest_seconds": forest_result["seconds"],
+        "total_seconds": time.perf_counter() - started
+    }
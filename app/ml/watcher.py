@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Callable, Optional, Tuple, Type
+
+from app.ml.bundle import MANIFEST_NAME
+
+
+class ModelWatcher:
+    """
+    모델 번들 manifest 변경 감시 (폴링)
+
+    write_bundle은 디렉토리를 통째로 교체하므로 manifest의 (mtime, size)가 바뀌면
+    새 버전이 완전히 기록된 것으로 보고 on_change를 호출한다. on_change가 retry_errors
+    (예: 다른 교체가 진행 중)로 실패하면 변경을 기록하지 않고 다음 확인에서 다시 시도한다.
+    """
+
+    def __init__(
+        self,
+        get_path: Callable[[], Optional[str]],
+        on_change: Callable[[], object],
+        interval_seconds: float = 10.0,
+        retry_errors: Tuple[Type[BaseException], ...] = ()
+    ):
+        self.get_path = get_path
+        self.on_change = on_change
+        self.retry_errors = retry_errors
+        self.interval = max(0.5, interval_seconds)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = None
+
+        self.checks = 0
+        self.triggers = 0
+        self.last_error: Optional[str] = None
+
+    def _current_signature(self) -> Optional[Tuple[int, int, int]]:
+        path = self.get_path()
+        if not path:
+            return None
+        try:
+            stat = os.stat(os.path.join(path, MANIFEST_NAME))
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._signature = self._current_signature()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        변경 여부 확인 후 변경 시 on_change 호출
+
+        교체에 성공하거나 검증에 실패한 버전은 기록해 다시 시도하지 않고, retry_errors로
+        실패한 경우에만 다음 확인에서 다시 시도한다.
+        """
+        self.checks += 1
+        signature = self._current_signature()
+        if signature is None or signature == self._signature:
+            return False
+
+        self.triggers += 1
+        try:
+            self.on_change()
+            self.last_error = None
+        except self.retry_errors as e:
+            self.last_error = str(e)
+            return False
+        except Exception as e:
+            self.last_error = str(e)
+        self._signature = signature
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def status(self):
+        return {
+            "running": self._thread is not None,
+            "interval_seconds": self.interval,
+            "checks": self.checks,
+            "triggers": self.triggers,
+            "last_error": self.last_error,
+        }
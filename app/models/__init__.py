@@ -1,9 +1,11 @@
 from app.models.equipment import Equipment, EquipmentType
 from app.models.lot import Lot, LotStatus
-from app.models.timeseries import TimeSeriesTag
+from app.models.timeseries import TimeSeriesTag, TagSeries, TagPoint, TagChunk
 from app.models.anomaly import Anomaly, Severity, AnomalyStatus
 from app.models.prediction import Prediction
 from app.models.report import Report, ReportRole
+from app.models.backfill import BackfillJob, BackfillStatus
+from app.models.rollup import TagRollup1m, TagRollup5m, TagRollup1h, ROLLUP_MODELS
 
 __all__ = [
     "Equipment",
@@ -11,10 +13,19 @@ __all__ = [
     "Lot",
     "LotStatus",
     "TimeSeriesTag",
+    "TagSeries",
+    "TagPoint",
+    "TagChunk",
     "Anomaly",
     "Severity",
     "AnomalyStatus",
     "Prediction",
     "Report",
     "ReportRole",
+    "BackfillJob",
+    "BackfillStatus",
+    "TagRollup1m",
+    "TagRollup5m",
+    "TagRollup1h",
+    "ROLLUP_MODELS",
 ]
\ No newline at end of file
@@ -26,5 +26,7 @@ class Anomaly(Base):
     isolation_score = Column(Float)
     prediction_prob = Column(Float)
     feature_importance = Column(Text)  # MySQL TEXT 타입
+    model_version = Column(String(50), nullable=True, index=True)  # 탐지에 사용한 모델 번들 버전
+    backfill_job_id = Column(String(50), nullable=True, index=True)  # 백필로 기록한 이벤트의 작업 ID (실시간 탐지는 NULL)
     detected_at = Column(DateTime, default=func.now(), index=True)
     resolved_at = Column(DateTime, nullable=True)
\ No newline at end of file
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Enum as SQLEnum
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+class BackfillStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class BackfillJob(Base):
+    __tablename__ = "backfill_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(50), unique=True, nullable=False)
+    eq_ids = Column(Text, nullable=False)  # JSON 배열
+    start_time = Column(DateTime, nullable=False)  # 첫 윈도우 끝 시각
+    end_time = Column(DateTime, nullable=False)
+    step_seconds = Column(Float, nullable=False)   # 윈도우 간격
+    chunk_windows = Column(Integer, nullable=False)  # 청크당 설비별 윈도우 수
+    total_windows = Column(Integer, nullable=False)  # 설비별 전체 윈도우 수
+    next_window = Column(Integer, default=0)  # 체크포인트: 다음에 처리할 윈도우 번호 (재개 지점)
+    status = Column(SQLEnum(BackfillStatus), default=BackfillStatus.PENDING, index=True)
+    windows_scored = Column(Integer, default=0)
+    anomalies_created = Column(Integer, default=0)
+    model_version = Column(String(50), nullable=True)
+    error = Column(Text, nullable=True)
+    claimed_by = Column(String(50), nullable=True)  # 실행 중인 러너의 claim 토큰 (체크포인트 갱신 조건)
+    heartbeat_at = Column(DateTime, nullable=True)  # 마지막 claim/체크포인트 시각
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -16,4 +16,5 @@ class Prediction(Base):
     confidence_upper = Column(Float)
     feature_importance = Column(Text)  # MySQL TEXT
     interpretation = Column(String(500))
+    model_version = Column(String(50), nullable=True, index=True)  # 예측에 사용한 모델 번들 버전
     created_at = Column(DateTime, default=func.now())
\ No newline at end of file
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from app.database import Base
+
+class RollupMixin:
+    """
+    tags_timeseries 시간 구간 집계 (eq_id, tag_name, bucket)
+    
+    count/sum/sumsq로 평균·표준편차를, min/max로 envelope를, first/last(+시각)로 구간 병합을 계산한다.
+    """
+    
+    eq_id = Column(String(50), primary_key=True)
+    tag_name = Column(String(50), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)  # 구간 시작 시각 (UTC)
+    n_points = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_sumsq = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+    value_first = Column(Float, nullable=False)
+    value_last = Column(Float, nullable=False)
+    first_at = Column(DateTime, nullable=False)  # 구간 첫 관측 시각
+    last_at = Column(DateTime, nullable=False)   # 구간 마지막 관측 시각
+
+class TagRollup1m(RollupMixin, Base):
+    __tablename__ = "tags_rollup_1m"
+
+class TagRollup5m(RollupMixin, Base):
+    __tablename__ = "tags_rollup_5m"
+
+class TagRollup1h(RollupMixin, Base):
+    __tablename__ = "tags_rollup_1h"
+
+# 구간 길이(초) → 집계 테이블 (세밀한 순서)
+ROLLUP_MODELS = {
+    60: TagRollup1m,
+    300: TagRollup5m,
+    3600: TagRollup1h,
+}
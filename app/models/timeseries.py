@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -12,7 +12,59 @@ class TimeSeriesTag(Base):
     value = Column(Float, nullable=False)
     unit = Column(String(20))
     
-    # MySQL 복합 인덱스
+    # MySQL 복합 인덱스 (고유: 같은 시점 재전송은 insert 시 무시)
     __table_args__ = (
-        Index('ix_timeseries_eq_tag_time', 'eq_id', 'tag_name', 'timestamp'),
-    )
\ No newline at end of file
+        Index('ix_timeseries_eq_tag_time', 'eq_id', 'tag_name', 'timestamp', unique=True),
+    )
+class TagSeries(Base):
+    """
+    시계열 사전 테이블: compact 스키마는 설비/태그/단위 문자열을 한 번만 저장 (tag_points.series_id)
+    
+    dirty_from/revision은 두 스키마 공통 집계 테이블 갱신 추적용 (적재 시 가장 이른 미반영 시각 기록, 집계기가 재계산 후 비움)
+    """
+    __tablename__ = "tag_series"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    eq_id = Column(String(50), ForeignKey("equipments.eq_id"), nullable=False)
+    tag_name = Column(String(50), nullable=False)
+    unit = Column(String(20))
+    dirty_from = Column(DateTime, nullable=True)
+    revision = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('ix_tag_series_eq_tag', 'eq_id', 'tag_name', unique=True),
+    )
+
+class TagPoint(Base):
+    """
+    시계열 관측 (compact 스키마): (series_id, timestamp) 클러스터드 기본 키
+    
+    문자열/대리 키/보조 인덱스 없이 한 행에 (series_id, timestamp, value)만 저장한다.
+    MySQL InnoDB는 기본 키 순서로 저장되고, SQLite는 WITHOUT ROWID 테이블로 만든다.
+    """
+    __tablename__ = "tag_points"
+    
+    series_id = Column(Integer, ForeignKey("tag_series.id"), primary_key=True)
+    timestamp = Column(DateTime, primary_key=True)
+    value = Column(Float, nullable=False)
+    
+    __table_args__ = {"sqlite_with_rowid": False}
+
+class TagChunk(Base):
+    """
+    봉인된 1시간 구간 시계열 (두 스키마 공통): (eq_id, tag_name, hour)당 압축 BLOB 하나
+    
+    data는 app.utils.gorilla 인코딩 (delta-of-delta 시각 + XOR 실수). 봉인된 구간의 원본 행은 삭제되고
+    조회 시 청크를 풀어 최근 원본 행과 합친다.
+    """
+    __tablename__ = "tag_chunks"
+    
+    eq_id = Column(String(50), ForeignKey("equipments.eq_id"), primary_key=True)
+    tag_name = Column(String(50), primary_key=True)
+    hour = Column(DateTime, primary_key=True)  # 구간 시작 시각 (UTC, 정시)
+    unit = Column(String(20))
+    n_points = Column(Integer, nullable=False)
+    first_at = Column(DateTime, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+    data = Column(LargeBinary(length=2**24 - 1), nullable=False)  # MySQL MEDIUMBLOB
+    sealed_at = Column(DateTime, default=func.now())
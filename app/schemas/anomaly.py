@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AnomalyBase(BaseModel):
@@ -13,6 +13,7 @@ class AnomalyCreate(AnomalyBase):
     isolation_score: Optional[float] = None
     prediction_prob: Optional[float] = None
     feature_importance: Optional[str] = None
+    model_version: Optional[str] = None
 
 class AnomalyResponse(AnomalyBase):
     id: int
@@ -21,6 +22,8 @@ class AnomalyResponse(AnomalyBase):
     z_score: Optional[float]
     isolation_score: Optional[float]
     prediction_prob: Optional[float]
+    model_version: Optional[str] = None
+    backfill_job_id: Optional[str] = None
     detected_at: datetime
     
     class Config:
@@ -32,4 +35,31 @@ class AnomalyFilter(BaseModel):
     eq_id: Optional[str] = None
     fault_codes: Optional[list[str]] = None
     severities: Optional[list[str]] = None
-    statuses: Optional[list[str]] = None
\ No newline at end of file
+    statuses: Optional[list[str]] = None
+
+class BackfillRequest(BaseModel):
+    eq_ids: Optional[List[str]] = None  # None이면 전체 설비
+    start_time: datetime
+    end_time: datetime
+    step_seconds: Optional[float] = None   # 윈도우 간격 (기본 BACKFILL_STEP_SEC)
+    chunk_seconds: Optional[float] = None  # 청크 길이 (기본 BACKFILL_CHUNK_SEC)
+
+class BackfillJobResponse(BaseModel):
+    job_id: str
+    eq_ids: List[str]
+    start_time: datetime
+    end_time: datetime
+    step_seconds: float
+    status: str
+    progress: float
+    cursor: Optional[datetime] = None  # 처리 완료한 마지막 윈도우 끝 시각 (체크포인트)
+    next_window: int
+    total_windows: int
+    windows_scored: int
+    anomalies_created: int
+    model_version: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -18,6 +18,7 @@ class PredictionResponse(BaseModel):
     confidence_upper: float
     feature_importance: dict
     interpretation: str
+    model_version: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -1,23 +1,31 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Sequence
 from datetime import datetime, timedelta
 import json
 import numpy as np
 
 from app.models.anomaly import Anomaly, Severity, AnomalyStatus
-from app.models.timeseries import TimeSeriesTag
 from app.schemas.anomaly import AnomalyCreate, AnomalyFilter
 from app.ml.predictor import IntegratedPredictor
+from app.ml.registry import get_predictor
+from app.services.window_service import WindowAssembler
 
 class AnomalyService:
     def __init__(self, db: Session):
         self.db = db
-        self.predictor = IntegratedPredictor()
+    
+    @property
+    def predictor(self) -> IntegratedPredictor:
+        """공유 예측기 (조회 전용 API에서는 로드하지 않음)"""
+        return get_predictor()
     
     def create_anomaly(self, anomaly_data: AnomalyCreate) -> Anomaly:
         """이상 이벤트 생성"""
-        db_anomaly = Anomaly(**anomaly_data.dict())
+        values = anomaly_data.dict()
+        # SQLEnum은 멤버 이름으로 저장하므로 값("warning")을 Enum으로 변환
+        values["severity"] = Severity(values["severity"])
+        db_anomaly = Anomaly(**values)
         self.db.add(db_anomaly)
         self.db.commit()
         self.db.refresh(db_anomaly)
@@ -76,29 +84,14 @@ class AnomalyService:
         실시간 이상 탐지
         최근 데이터를 기반으로 이상 여부 판단
         """
-        # 최근 1시간 데이터 가져오기
-        time_ago = datetime.utcnow() - timedelta(hours=1)
-        
-        timeseries_data = self.db.query(TimeSeriesTag).filter(
-            and_(
-                TimeSeriesTag.eq_id == eq_id,
-                TimeSeriesTag.timestamp >= time_ago
-            )
-        ).order_by(TimeSeriesTag.timestamp).all()
+        # 최근 데이터로 모델 입력 윈도우 조립 (sequence_length, 52)
+        predictor = self.predictor
+        batch = WindowAssembler.for_predictor(self.db, predictor).assemble(eq_id)
         
-        if len(timeseries_data) < 10:
+        if batch.n_observations[0] < 10:
             return None
         
-        # 데이터를 배열로 변환 (간단한 버전)
-        # 실제로는 52개 변수를 모두 사용
-        values = np.array([d.value for d in timeseries_data[-60:]])  # 최근 60개
-        data_matrix = values.reshape(-1, 1)  # (60, 1)
-        
-        # 예측 수행 (실제로는 52차원 데이터 사용)
-        # 여기서는 더미 데이터 생성
-        dummy_data = np.random.randn(60, 52)
-        
-        result = self.predictor.predict_fault(dummy_data, horizon=30)
+        result = predictor.predict_fault(batch.windows[0], horizon=30, eq_id=eq_id)
         
         if result["is_anomaly"]:
             # 이상 이벤트 생성
@@ -108,7 +101,8 @@ class AnomalyService:
                 z_score=None,
                 isolation_score=result["probability"],
                 prediction_prob=result["probability"],
-                feature_importance=json.dumps(result["feature_importance"])
+                feature_importance=json.dumps(result["feature_importance"]),
+                model_version=result["model_version"]
             )
             
             anomaly = self.create_anomaly(anomaly_create)
@@ -157,4 +151,49 @@ class AnomalyService:
             key = f"{day}_{hour_block}"
             heatmap[key] = heatmap.get(key, 0) + 1
         
-        return heatmap
\ No newline at end of file
+        return heatmap
+
+
+def anomaly_rows(
+    predictor: IntegratedPredictor,
+    windows: np.ndarray,
+    scores: Dict[str, np.ndarray],
+    eq_ids: Sequence[str],
+    detected_at: Sequence[datetime]
+) -> List[Dict]:
+    """
+    score_windows 결과 중 이상 윈도우 → anomalies bulk insert 행 (백필/주기 탐지)
+    
+    detect_realtime_anomaly와 같은 심각도/확률 규칙을 쓰고, 변수 중요도는 이상 윈도우만 계산한다.
+    
+    Args:
+        windows: (n, sequence_length, features) 원 단위 윈도우
+        scores: predictor.score_windows(windows) 결과
+        eq_ids: (n,) 윈도우별 설비 ID
+        detected_at: (n,) 윈도우 끝 시각
+    """
+    flagged = np.flatnonzero(scores["is_anomaly"])
+    if len(flagged) == 0:
+        return []
+    
+    probability = scores["probability"][flagged]
+    importances = predictor.feature_calc.calculate_importance_batch(
+        windows[flagged],
+        probability,
+        feature_errors=scores["feature_errors"][flagged]
+    )
+    
+    return [
+        {
+            "eq_id": eq_ids[i],
+            "severity": Severity.CRITICAL if prob > 0.8 else Severity.WARNING,
+            "status": AnomalyStatus.UNCONFIRMED,
+            "z_score": None,
+            "isolation_score": prob,
+            "prediction_prob": prob,
+            "feature_importance": json.dumps(importance),
+            "model_version": predictor.model_version,
+            "detected_at": detected_at[i]
+        }
+        for i, prob, importance in zip(flagged.tolist(), probability.tolist(), importances)
+    ]
@@ -0,0 +1,504 @@
+from sqlalchemy import select, insert, delete, update, func, or_, and_
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import json
+import threading
+import uuid
+import numpy as np
+
+from app.config import settings
+from app.models.anomaly import Anomaly, AnomalyStatus, Severity
+from app.models.backfill import BackfillJob, BackfillStatus
+from app.models.equipment import Equipment
+from app.schemas.anomaly import BackfillRequest
+from app.ml.registry import get_predictor
+from app.services.anomaly_service import anomaly_rows
+from app.services.window_service import WindowAssembler
+from app.utils.data_processor import TEPDataProcessor
+
+# 재개 가능한 상태 (RUNNING은 하트비트가 BACKFILL_STALE_SEC보다 오래됐을 때만)
+RESUMABLE_STATUSES = (BackfillStatus.FAILED, BackfillStatus.CANCELLED, BackfillStatus.PENDING)
+
+
+def _resumable():
+    """재개 가능 조건 (다른 프로세스가 실행 중인 작업은 하트비트가 갱신되므로 제외)"""
+    stale = datetime.utcnow() - timedelta(seconds=settings.BACKFILL_STALE_SEC)
+    return or_(
+        BackfillJob.status.in_(RESUMABLE_STATUSES),
+        and_(
+            BackfillJob.status == BackfillStatus.RUNNING,
+            or_(BackfillJob.heartbeat_at.is_(None), BackfillJob.heartbeat_at < stale)
+        )
+    )
+
+
+class BackfillService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(self, request: BackfillRequest) -> BackfillJob:
+        """
+        백필 작업 생성 (실행은 backfill_runner.submit)
+
+        윈도우 끝 시각은 start_time부터 step_seconds 간격이며, step_seconds는 윈도우 격자
+        간격(WINDOW_INTERVAL_SEC)의 배수로 맞춘다.
+        """
+        if request.end_time <= request.start_time:
+            raise ValueError("end_time은 start_time 이후여야 합니다")
+
+        known = [eq_id for (eq_id,) in self.db.query(Equipment.eq_id).order_by(Equipment.eq_id).all()]
+        eq_ids = list(dict.fromkeys(request.eq_ids)) if request.eq_ids else known
+        unknown = sorted(set(eq_ids) - set(known))
+        if unknown:
+            raise ValueError(f"존재하지 않는 설비입니다: {', '.join(unknown)}")
+        if not eq_ids:
+            raise ValueError("백필할 설비가 없습니다")
+
+        interval = settings.WINDOW_INTERVAL_SEC
+        step_steps = max(1, round((request.step_seconds or settings.BACKFILL_STEP_SEC) / interval))
+        step_seconds = step_steps * interval
+        chunk_seconds = request.chunk_seconds or settings.BACKFILL_CHUNK_SEC
+
+        job = BackfillJob(
+            job_id=str(uuid.uuid4()),
+            eq_ids=json.dumps(eq_ids),
+            start_time=request.start_time,
+            end_time=request.end_time,
+            step_seconds=step_seconds,
+            chunk_windows=max(1, int(chunk_seconds // step_seconds)),
+            total_windows=int((request.end_time - request.start_time).total_seconds() // step_seconds) + 1,
+            next_window=0,
+            status=BackfillStatus.PENDING,
+            windows_scored=0,
+            anomalies_created=0
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BackfillJob]:
+        """백필 작업 조회"""
+        return self.db.query(BackfillJob).filter(BackfillJob.job_id == job_id).first()
+
+    def list_jobs(self, limit: int = 20) -> List[BackfillJob]:
+        """백필 작업 목록 (최근 생성 순)"""
+        return self.db.query(BackfillJob).order_by(BackfillJob.id.desc()).limit(limit).all()
+
+    def cancel_job(self, job_id: str) -> BackfillJob:
+        """
+        백필 작업 취소
+
+        실행 중이면 현재 청크를 마친 뒤 멈추고 (체크포인트 유지), 실행 스레드가 없으면
+        바로 CANCELLED로 기록한다.
+        """
+        job = self.get_job(job_id)
+        if not job:
+            raise LookupError("Backfill job not found")
+        if job.status in (BackfillStatus.SUCCEEDED, BackfillStatus.CANCELLED):
+            return job
+
+        if not backfill_runner.cancel(job_id):
+            job.status = BackfillStatus.CANCELLED
+            job.finished_at = datetime.utcnow()
+            self.db.commit()
+            self.db.refresh(job)
+        return job
+
+    def resume_job(self, job_id: str) -> BackfillJob:
+        """
+        실패/취소/중단된 작업을 체크포인트(next_window)부터 재실행
+
+        상태 확인과 PENDING 전환을 조건부 UPDATE 하나로 처리하므로, 다른 프로세스가 실행 중인
+        (하트비트가 살아 있는) 작업은 재개되지 않는다.
+        """
+        job = self.get_job(job_id)
+        if not job:
+            raise LookupError("Backfill job not found")
+        if backfill_runner.is_active(job_id):
+            return job
+
+        resumed = self.db.execute(
+            update(BackfillJob)
+            .where(BackfillJob.job_id == job_id, _resumable())
+            .values(status=BackfillStatus.PENDING, error=None, finished_at=None)
+        ).rowcount
+        self.db.commit()
+        self.db.refresh(job)
+        if not resumed:
+            if job.status == BackfillStatus.RUNNING:
+                raise ValueError("다른 프로세스에서 실행 중인 작업입니다")
+            raise ValueError(f"재개할 수 없는 상태입니다: {job.status.value}")
+
+        backfill_runner.submit(job.job_id)
+        return job
+
+    @staticmethod
+    def to_response(job: BackfillJob) -> Dict:
+        """BackfillJobResponse 형식 (진행률, 처리 완료 시점 포함)"""
+        step = timedelta(seconds=job.step_seconds)
+        return {
+            "job_id": job.job_id,
+            "eq_ids": json.loads(job.eq_ids),
+            "start_time": job.start_time,
+            "end_time": job.end_time,
+            "step_seconds": job.step_seconds,
+            "status": job.status.value,
+            "progress": job.next_window / job.total_windows if job.total_windows else 1.0,
+            "cursor": job.start_time + step * (job.next_window - 1) if job.next_window else None,
+            "next_window": job.next_window,
+            "total_windows": job.total_windows,
+            "windows_scored": job.windows_scored,
+            "anomalies_created": job.anomalies_created,
+            "model_version": job.model_version,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "heartbeat_at": job.heartbeat_at,
+            "finished_at": job.finished_at
+        }
+
+
+def _score_chunk(
+    db: Session,
+    job: BackfillJob,
+    eq_ids: List[str],
+    first: int,
+    stop: int
+) -> Dict[str, int]:
+    """
+    윈도우 번호 [first, stop) 구간 채점 후 이상 윈도우를 bulk insert (커밋은 호출자)
+
+    이 작업이 같은 구간에 남긴 미확인 이벤트(재개 전 실행분)는 체크포인트와 같은 트랜잭션에서
+    지운다. 실시간 탐지/다른 작업이 기록한 이벤트는 지우지 않는다.
+
+    이상 윈도우는 주기 탐지(run_detection_cycle)와 같은 규칙으로 기록한다: 윈도우 끝 시각에
+    열려 있던 이벤트 (그 이전에 감지되고 아직 해결되지 않은 이벤트)가 있으면 새 행 없이
+    그 이벤트를 이어가고 (CRITICAL이면 심각도 상향), 없을 때만 새 이벤트를 만든다.
+
+    설비 BACKFILL_EQ_BATCH개씩 한 번의 쿼리로 구간 전체를 격자 정렬하고, 설비별 슬라이딩
+    윈도우(복사 없는 view)를 score_windows로 일괄 채점한다. 청크 크기와 설비 묶음 크기로
+    메모리 사용량이 정해지므로 전체 기간 길이와 무관하다.
+    """
+    # 청크마다 조회해 모델 교체(hot-swap)를 반영
+    predictor = get_predictor()
+    assembler = WindowAssembler.for_predictor(db, predictor)
+    processor = TEPDataProcessor()
+
+    sequence_length = assembler.sequence_length
+    step = timedelta(seconds=job.step_seconds)
+    step_steps = max(1, round(step / assembler.interval))
+    first_end = job.start_time + step * first
+    last_end = job.start_time + step * (stop - 1)
+
+    scored = created = continued = 0
+    rows: List[Dict] = []
+
+    def flush(final: bool = False):
+        # BACKFILL_INSERT_BATCH행씩 executemany (마지막에는 남은 행 전부)
+        batch = settings.BACKFILL_INSERT_BATCH
+        while len(rows) >= batch or (final and rows):
+            db.execute(insert(Anomaly), rows[:batch])
+            del rows[:batch]
+
+    for offset in range(0, len(eq_ids), settings.BACKFILL_EQ_BATCH):
+        group = eq_ids[offset:offset + settings.BACKFILL_EQ_BATCH]
+        # 첫 윈도우도 sequence_length 전체를 채우도록 앞쪽 격자를 함께 정렬
+        grid, series, counts = assembler.assemble_range(
+            group,
+            first_end - assembler.interval * (sequence_length - 1),
+            last_end
+        )
+        end_steps = np.arange(stop - first) * step_steps + sequence_length - 1
+
+        # 이 작업의 이전 실행(재개)이 남긴 이벤트 교체
+        chunk_start, chunk_end = grid[end_steps[0]].tolist(), grid[end_steps[-1]].tolist()
+        db.execute(
+            delete(Anomaly)
+            .where(
+                Anomaly.eq_id.in_(group),
+                Anomaly.backfill_job_id == job.job_id,
+                Anomaly.status == AnomalyStatus.UNCONFIRMED,
+                Anomaly.detected_at >= chunk_start,
+                Anomaly.detected_at <= chunk_end
+            )
+            .execution_options(synchronize_session=False)
+        )
+        events = _open_events(db, group, chunk_start, chunk_end)
+
+        for pos, eq_id in enumerate(group):
+            # 윈도우 구간 원본 관측 수 (실시간 탐지와 같은 최소 관측 기준)
+            cumulative = np.concatenate([[0], np.cumsum(counts[pos])])
+            observed = cumulative[end_steps + 1] - cumulative[end_steps + 1 - sequence_length]
+            valid = observed >= settings.DETECTION_MIN_OBSERVATIONS
+            if not valid.any():
+                continue
+
+            windows = processor.create_sequences(series[pos], sequence_length, step_steps)
+            if not valid.all():
+                windows = windows[valid]
+            ends = grid[end_steps[valid]]
+
+            result = predictor.score_windows(windows, [eq_id] * len(windows))
+            scored += len(windows)
+
+            new_rows = anomaly_rows(predictor, windows, result, [eq_id] * len(windows), ends.tolist())
+            for row in new_rows:
+                row["backfill_job_id"] = job.job_id
+            new_rows, escalated, count = _continue_events(new_rows, events.get(eq_id, []))
+            if escalated:
+                db.execute(
+                    update(Anomaly)
+                    .where(Anomaly.id.in_(escalated))
+                    .values(severity=Severity.CRITICAL)
+                    .execution_options(synchronize_session=False)
+                )
+            rows.extend(new_rows)
+            created += len(new_rows)
+            continued += count
+            flush()
+
+    flush(final=True)
+    return {
+        "windows": scored,
+        "anomalies": created,
+        "continued": continued,
+        "model_version": predictor.model_version
+    }
+
+
+def _open_events(db: Session, eq_ids: List[str], start: datetime, end: datetime) -> Dict[str, List[Dict]]:
+    """
+    설비별로 [start, end] 중 한 시점이라도 열려 있던 이상 이벤트 (감지 시각 순)
+
+    열린 구간은 detected_at부터 해결 시각(resolved_at, RESOLVED가 아니면 열린 채)까지다.
+    """
+    rows = db.execute(
+        select(Anomaly.id, Anomaly.eq_id, Anomaly.detected_at, Anomaly.severity, Anomaly.status, Anomaly.resolved_at)
+        .where(
+            Anomaly.eq_id.in_(eq_ids),
+            Anomaly.detected_at <= end,
+            or_(
+                Anomaly.status.is_(None),
+                Anomaly.status != AnomalyStatus.RESOLVED,
+                Anomaly.resolved_at > start
+            )
+        )
+        .order_by(Anomaly.detected_at)
+    ).all()
+
+    events: Dict[str, List[Dict]] = {}
+    for event_id, eq_id, detected_at, severity, status, resolved_at in rows:
+        events.setdefault(eq_id, []).append({
+            "id": event_id,
+            "detected_at": detected_at,
+            "until": resolved_at if status == AnomalyStatus.RESOLVED else None,
+            "severity": severity
+        })
+    return events
+
+
+def _continue_events(rows: List[Dict], events: List[Dict]) -> Tuple[List[Dict], List[int], int]:
+    """
+    한 설비의 이상 윈도우 행(시간순)에 주기 탐지의 이벤트 이어가기 규칙 적용
+
+    윈도우 끝 시각에 열려 있던 가장 최근 이벤트가 있으면 행을 버리고 그 이벤트를 이어가며
+    (CRITICAL이면 상향), 없으면 행을 새 이벤트로 남긴다. 새 이벤트는 해결되기 전까지 열려 있으므로
+    이후 윈도우가 이어간다. events는 이 함수 안에서 갱신된다.
+
+    Returns:
+        (새로 기록할 행, 심각도를 CRITICAL로 올릴 기존 이벤트 ID, 이어간 윈도우 수)
+    """
+    kept: List[Dict] = []
+    escalated: List[int] = []
+    continued = 0
+    for row in rows:
+        at = row["detected_at"]
+        opened = [
+            event for event in events
+            if event["detected_at"] <= at and (event["until"] is None or event["until"] > at)
+        ]
+        if not opened:
+            kept.append(row)
+            events.append({"id": None, "detected_at": at, "until": None, "severity": row["severity"], "row": row})
+            continue
+
+        continued += 1
+        event = max(opened, key=lambda e: e["detected_at"])
+        if row["severity"] == Severity.CRITICAL and event["severity"] != Severity.CRITICAL:
+            event["severity"] = Severity.CRITICAL
+            if event.get("row") is not None:
+                event["row"]["severity"] = Severity.CRITICAL
+            else:
+                escalated.append(event["id"])
+    return kept, escalated, continued
+
+
+def _claim(db: Session, job_id: str, token: str) -> bool:
+    """PENDING 작업을 조건부 UPDATE로 선점 (다른 프로세스와 동시에 시도해도 한 곳만 성공)"""
+    now = datetime.utcnow()
+    claimed = db.execute(
+        update(BackfillJob)
+        .where(BackfillJob.job_id == job_id, BackfillJob.status == BackfillStatus.PENDING)
+        .values(
+            status=BackfillStatus.RUNNING,
+            claimed_by=token,
+            heartbeat_at=now,
+            started_at=func.coalesce(BackfillJob.started_at, now)
+        )
+    ).rowcount
+    db.commit()
+    return claimed == 1
+
+
+def _update_claimed(db: Session, job_id: str, token: str, **values) -> bool:
+    """선점한 작업이 아직 RUNNING이고 토큰이 같을 때만 갱신 (커밋은 호출자)"""
+    return db.execute(
+        update(BackfillJob)
+        .where(
+            BackfillJob.job_id == job_id,
+            BackfillJob.claimed_by == token,
+            BackfillJob.status == BackfillStatus.RUNNING
+        )
+        .values(heartbeat_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+
+def run_backfill(db: Session, job_id: str, cancel: Optional[threading.Event] = None) -> BackfillJob:
+    """
+    체크포인트(next_window)부터 청크 단위로 백필 실행
+
+    청크마다 이상 이벤트 insert와 체크포인트 갱신을 한 트랜잭션으로 커밋하므로, 중단 후
+    재개해도 같은 윈도우가 두 번 기록되지 않는다.
+
+    작업은 PENDING → RUNNING 조건부 UPDATE로 선점하고, 체크포인트는 선점 토큰이 같고 RUNNING일
+    때만 갱신한다. 선점에 실패하거나 (다른 프로세스가 실행 중) 도중에 취소/재선점되면 현재 청크를
+    롤백하고 멈춘다.
+    """
+    token = str(uuid.uuid4())
+    if not _claim(db, job_id, token):
+        return db.query(BackfillJob).filter(BackfillJob.job_id == job_id).one()
+
+    job = db.query(BackfillJob).filter(BackfillJob.job_id == job_id).one()
+    eq_ids = json.loads(job.eq_ids)
+    status = BackfillStatus.SUCCEEDED
+    error = None
+
+    try:
+        while job.next_window < job.total_windows:
+            if cancel is not None and cancel.is_set():
+                status = BackfillStatus.CANCELLED
+                break
+
+            stop = min(job.next_window + job.chunk_windows, job.total_windows)
+            chunk = _score_chunk(db, job, eq_ids, job.next_window, stop)
+
+            claimed = _update_claimed(
+                db, job_id, token,
+                next_window=stop,
+                windows_scored=BackfillJob.windows_scored + chunk["windows"],
+                anomalies_created=BackfillJob.anomalies_created + chunk["anomalies"],
+                model_version=chunk["model_version"]
+            )
+            if not claimed:
+                db.rollback()
+                db.refresh(job)
+                return job
+            db.commit()
+            db.refresh(job)
+    except Exception as e:
+        # 실패한 청크만 롤백 (이전 청크와 체크포인트는 유지)
+        db.rollback()
+        status = BackfillStatus.FAILED
+        error = str(e)
+
+    _update_claimed(db, job_id, token, status=status, error=error, finished_at=datetime.utcnow())
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+class BackfillRunner:
+    """
+    백필 작업 백그라운드 실행기
+
+    작업마다 데몬 스레드와 전용 DB 세션을 사용하고, 동시 실행 수는 BACKFILL_MAX_JOBS로
+    제한한다 (초과분은 대기). 취소는 청크 경계에서 반영된다.
+    """
+
+    def __init__(self, max_jobs: int = 1):
+        self._slots = threading.BoundedSemaphore(max(1, max_jobs))
+        self._lock = threading.Lock()
+        self._cancel: Dict[str, threading.Event] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+
+    def submit(self, job_id: str) -> bool:
+        """작업 실행 (이미 실행/대기 중이면 False)"""
+        with self._lock:
+            if job_id in self._threads:
+                return False
+            cancel = threading.Event()
+            thread = threading.Thread(target=self._run, args=(job_id, cancel), name=f"backfill-{job_id[:8]}", daemon=True)
+            self._cancel[job_id] = cancel
+            self._threads[job_id] = thread
+        thread.start()
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """취소 요청 (실행/대기 중인 작업이 없으면 False)"""
+        with self._lock:
+            cancel = self._cancel.get(job_id)
+        if cancel is None:
+            return False
+        cancel.set()
+        return True
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._threads
+
+    def shutdown(self, timeout: float = 10.0):
+        """모든 작업에 취소 요청 후 현재 청크 종료 대기 (재시작 후 resume 가능)"""
+        with self._lock:
+            threads = list(self._threads.values())
+            for cancel in self._cancel.values():
+                cancel.set()
+        for thread in threads:
+            thread.join(timeout=timeout)
+
+    def _run(self, job_id: str, cancel: threading.Event):
+        from app.database import SessionLocal
+
+        # 실행 슬롯 대기 중에도 취소 확인
+        acquired = False
+        while not cancel.is_set() and not acquired:
+            acquired = self._slots.acquire(timeout=1.0)
+
+        db = SessionLocal()
+        try:
+            if acquired:
+                run_backfill(db, job_id, cancel)
+            else:
+                # 선점 전이므로 PENDING일 때만 취소 (다른 프로세스가 선점했으면 그대로 둠)
+                db.execute(
+                    update(BackfillJob)
+                    .where(BackfillJob.job_id == job_id, BackfillJob.status == BackfillStatus.PENDING)
+                    .values(status=BackfillStatus.CANCELLED, finished_at=datetime.utcnow())
+                )
+                db.commit()
+        finally:
+            db.close()
+            if acquired:
+                self._slots.release()
+            with self._lock:
+                self._cancel.pop(job_id, None)
+                self._threads.pop(job_id, None)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {"active_jobs": list(self._threads)}
+
+
+backfill_runner = BackfillRunner(settings.BACKFILL_MAX_JOBS)
@@ -0,0 +1,220 @@
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.models.timeseries import TagChunk
+from app.services.timeseries_store import TimeSeriesStore, get_timeseries_store
+from app.utils import gorilla
+
+# 청크 1개 구간
+CHUNK_SPAN = timedelta(hours=1)
+
+
+def seal_hour(db: Session, store: TimeSeriesStore, eq_id: str, tag_name: str, hour: datetime) -> int:
+    """
+    [hour, hour + 1시간) 원본 행을 청크로 봉인 (커밋은 호출자)
+
+    이미 청크가 있으면 (봉인 후 늦게 도착한 행) 기존 청크 값을 우선해 합친 뒤 다시 인코딩한다.
+    청크 저장과 원본 행 삭제는 같은 트랜잭션이므로 중간에 실패해도 관측이 사라지거나 겹치지 않는다.
+
+    Returns:
+        봉인한 원본 행 수
+    """
+    end = hour + CHUNK_SPAN
+    raw = store.fetch_raw([eq_id], [tag_name], hour, end, for_update=True)
+    if raw.empty:
+        return 0
+
+    chunk = db.get(TagChunk, (eq_id, tag_name, hour))
+    points = raw
+    if chunk is not None:
+        timestamps, values = gorilla.decode(chunk.data)
+        points = pd.concat([pd.DataFrame({"timestamp": timestamps, "value": values}), raw[["timestamp", "value"]]])
+        points = points[~points.duplicated("timestamp", keep="first")]
+    points = points.sort_values("timestamp", kind="stable")
+
+    timestamps = points["timestamp"].to_numpy()
+    if chunk is None:
+        chunk = TagChunk(eq_id=eq_id, tag_name=tag_name, hour=hour)
+        db.add(chunk)
+    chunk.unit = store.unit(eq_id, tag_name)
+    chunk.n_points = len(points)
+    chunk.first_at = pd.Timestamp(timestamps[0]).to_pydatetime()
+    chunk.last_at = pd.Timestamp(timestamps[-1]).to_pydatetime()
+    chunk.data = gorilla.encode(timestamps, points["value"].to_numpy(dtype=np.float64))
+    chunk.sealed_at = datetime.utcnow()
+    db.flush()
+
+    store.delete_range(eq_id, tag_name, hour, end)
+    return len(raw)
+
+
+def seal_closed_hours(db: Session, max_chunks: Optional[int] = None) -> Dict:
+    """
+    CHUNK_SEAL_AFTER_SEC 이전에 끝난 1시간 구간의 원본 행을 series별로 오래된 구간부터 봉인 (청크마다 커밋)
+
+    봉인 여부는 구간이 끝난 뒤 지난 시간으로만 정한다. 집계기는 청크와 원본 행을 함께 읽으므로
+    (fetch_points) 집계 반영 전에 봉인해도 관측이 빠지지 않는다.
+
+    Returns:
+        봉인한 청크 수, 원본 행 수, 봉인 기준 시각
+    """
+    max_chunks = max_chunks or settings.CHUNK_SEAL_MAX_CHUNKS
+    store = get_timeseries_store(db)
+    cutoff = pd.Timestamp(datetime.utcnow() - timedelta(seconds=settings.CHUNK_SEAL_AFTER_SEC)).floor("h").to_pydatetime()
+
+    chunks = rows = 0
+    try:
+        for eq_id, tag_name in store.series_keys():
+            since = None
+            while chunks < max_chunks:
+                conditions = [store.c.eq_id == eq_id, store.c.tag_name == tag_name, store.c.timestamp < cutoff]
+                if since is not None:
+                    conditions.append(store.c.timestamp >= since)
+                first = db.execute(store.select(func.min(store.c.timestamp)).where(*conditions)).scalar()
+                if first is None:
+                    break
+
+                hour = pd.Timestamp(first).floor("h").to_pydatetime()
+                since = hour + CHUNK_SPAN
+                rows += seal_hour(db, store, eq_id, tag_name, hour)
+                db.commit()
+                chunks += 1
+            if chunks >= max_chunks:
+                break
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"chunks": chunks, "rows": rows, "cutoff": cutoff}
+
+
+class ChunkSealInProgressError(RuntimeError):
+    """이전 봉인 작업이 아직 실행 중"""
+
+
+class ChunkSealer:
+    """
+    닫힌 1시간 구간 청크 봉인 (백그라운드 스레드)
+
+    - interval_seconds마다 봉인할 구간이 없을 때까지 max_chunks개씩 봉인 (seal_closed_hours 참고)
+    - 수동 실행(run_once)과 겹치면 나중 호출을 건너뜀
+    """
+
+    def __init__(self, interval_seconds: float = 300.0, max_chunks: int = 500):
+        self.interval = max(1.0, interval_seconds)
+        self.max_chunks = max(1, max_chunks)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.chunks = 0
+        self.failures = 0
+        self.last_run: Optional[Dict] = None
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="chunk-sealer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def run_once(self) -> Dict:
+        """
+        봉인할 구간이 없을 때까지 seal_closed_hours 반복 (자체 DB 세션)
+
+        Raises:
+            ChunkSealInProgressError: 이전 실행이 진행 중
+        """
+        from app.database import SessionLocal
+
+        if not self._lock.acquire(blocking=False):
+            raise ChunkSealInProgressError("이전 청크 봉인 작업이 아직 실행 중입니다")
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            chunks = rows = 0
+            while not self._stop.is_set():
+                result = seal_closed_hours(db, self.max_chunks)
+                chunks += result["chunks"]
+                rows += result["rows"]
+                if result["chunks"] < self.max_chunks:
+                    break
+
+            self.runs += 1
+            self.chunks += chunks
+            self.last_error = None
+            self.last_run = {
+                "finished_at": datetime.utcnow(),
+                "chunks": chunks,
+                "rows": rows,
+                "cutoff": result["cutoff"],
+                "total_ms": (time.perf_counter() - started) * 1000
+            }
+            return self.last_run
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+        finally:
+            db.close()
+            self._lock.release()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                # 실패한 청크는 롤백되어 원본 행이 남으므로 다음 주기에 다시 봉인
+                pass
+
+    def status(self) -> Dict:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            n_chunks, n_points, n_bytes = db.execute(
+                select(func.count(), func.sum(TagChunk.n_points), func.sum(func.length(TagChunk.data)))
+            ).one()
+        finally:
+            db.close()
+
+        n_points, n_bytes = int(n_points or 0), int(n_bytes or 0)
+        return {
+            "running": self._thread is not None,
+            "in_run": self._lock.locked(),
+            "interval_seconds": self.interval,
+            "max_chunks": self.max_chunks,
+            "seal_after_seconds": settings.CHUNK_SEAL_AFTER_SEC,
+            "sealed_chunks": n_chunks,
+            "sealed_points": n_points,
+            "sealed_bytes": n_bytes,
+            "bytes_per_point": n_bytes / n_points if n_points else None,
+            "runs": self.runs,
+            "chunks": self.chunks,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+
+chunk_sealer = ChunkSealer(
+    interval_seconds=settings.CHUNK_SEAL_INTERVAL_SEC,
+    max_chunks=settings.CHUNK_SEAL_MAX_CHUNKS
+)
@@ -0,0 +1,222 @@
+from collections import deque
+from sqlalchemy import select, insert, or_
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from datetime import datetime
+import random
+import threading
+import time
+import numpy as np
+
+from app.config import settings
+from app.models.anomaly import Anomaly, AnomalyStatus, Severity
+from app.models.equipment import Equipment
+from app.ml.registry import get_predictor
+from app.services.anomaly_service import anomaly_rows
+from app.services.window_service import WindowAssembler
+
+
+def active_equipment_ids(db: Session) -> List[str]:
+    """탐지 대상 설비 (DETECTION_INACTIVE_STATUSES 상태 제외, status가 없는 설비는 포함)"""
+    query = db.query(Equipment.eq_id)
+    if settings.DETECTION_INACTIVE_STATUSES:
+        query = query.filter(or_(
+            Equipment.status.is_(None),
+            Equipment.status.notin_(settings.DETECTION_INACTIVE_STATUSES)
+        ))
+    return [eq_id for (eq_id,) in query.order_by(Equipment.eq_id).all()]
+
+
+def open_anomalies(db: Session, eq_ids: List[str]) -> Dict[str, Anomaly]:
+    """설비별 가장 최근의 해결되지 않은 (RESOLVED 외) 이상 이벤트"""
+    if not eq_ids:
+        return {}
+    rows = db.execute(
+        select(Anomaly)
+        .where(
+            Anomaly.eq_id.in_(eq_ids),
+            or_(Anomaly.status.is_(None), Anomaly.status != AnomalyStatus.RESOLVED)
+        )
+        .order_by(Anomaly.detected_at)
+    ).scalars().all()
+    return {anomaly.eq_id: anomaly for anomaly in rows}
+
+
+def run_detection_cycle(db: Session, end: Optional[datetime] = None) -> Dict:
+    """
+    전체 설비 1회 탐지
+
+    활성 설비 윈도우를 한 번의 쿼리로 조립(assemble_batch)하고, 관측이 충분한 설비만
+    score_windows 한 번으로 채점한 뒤 이상 윈도우를 bulk insert한다.
+
+    해결되지 않은 이상 이벤트가 이미 있는 설비는 새 행을 만들지 않고 기존 이벤트를 이어간다
+    (심각도가 올라가면 기존 이벤트에 반영). 이상 상태가 계속되는 동안 주기마다 이벤트가 쌓이지 않는다.
+
+    Args:
+        end: 윈도우 끝 시각 (None이면 현재 UTC)
+
+    Returns:
+        주기 메트릭 (설비/채점/이상 수, 단계별 소요 시간 ms)
+    """
+    started = time.perf_counter()
+    end = end or datetime.utcnow()
+
+    eq_ids = active_equipment_ids(db)
+    predictor = get_predictor()
+    batch = WindowAssembler.for_predictor(db, predictor).assemble_batch(eq_ids, end)
+    assembled = time.perf_counter()
+
+    ready = np.flatnonzero(batch.n_observations >= settings.DETECTION_MIN_OBSERVATIONS)
+    windows = batch.windows[ready]
+    ready_ids = [eq_ids[i] for i in ready.tolist()]
+    rows: List[Dict] = []
+    if len(ready):
+        scores = predictor.score_windows(windows, ready_ids)
+        rows = anomaly_rows(predictor, windows, scores, ready_ids, [end] * len(ready_ids))
+    scored = time.perf_counter()
+
+    continued = 0
+    if rows:
+        opened = open_anomalies(db, [row["eq_id"] for row in rows])
+        new_rows = []
+        for row in rows:
+            anomaly = opened.get(row["eq_id"])
+            if anomaly is None:
+                new_rows.append(row)
+                continue
+            continued += 1
+            if row["severity"] == Severity.CRITICAL:
+                anomaly.severity = Severity.CRITICAL
+        rows = new_rows
+    if rows:
+        db.execute(insert(Anomaly), rows)
+    db.commit()
+    finished = time.perf_counter()
+
+    return {
+        "end": end,
+        "equipments": len(eq_ids),
+        "scored": len(ready_ids),
+        "anomalies": len(rows),
+        "anomaly_eq_ids": [row["eq_id"] for row in rows],
+        "continued": continued,
+        "leading_filled": int((batch.leading_filled[ready] > 0).sum()),
+        "model_version": predictor.model_version,
+        "assemble_ms": (assembled - started) * 1000,
+        "score_ms": (scored - assembled) * 1000,
+        "write_ms": (finished - scored) * 1000,
+        "total_ms": (finished - started) * 1000
+    }
+
+
+class CycleInProgressError(RuntimeError):
+    """이전 탐지 주기가 아직 실행 중"""
+
+
+class DetectionScheduler:
+    """
+    주기 이상 탐지 (백그라운드 스레드)
+
+    - interval_seconds 고정 주기로 run_detection_cycle 실행 (주기마다 0~jitter_seconds 지연)
+    - 주기가 interval보다 오래 걸리면 밀린 주기는 실행하지 않고 skipped로 기록
+    - 수동 실행(run_once)과 겹치면 나중 호출을 건너뜀
+    - 최근 history개 주기의 단계별 소요 시간 보관
+    """
+
+    def __init__(self, interval_seconds: float = 60.0, jitter_seconds: float = 0.0, history: int = 100):
+        self.interval = max(1.0, interval_seconds)
+        self.jitter = max(0.0, jitter_seconds)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cycle_lock = threading.Lock()
+        self._history = deque(maxlen=max(1, history))
+
+        self.cycles = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="detection-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def run_once(self, end: Optional[datetime] = None) -> Dict:
+        """
+        1회 탐지 (자체 DB 세션)
+
+        Raises:
+            CycleInProgressError: 이전 주기가 실행 중
+        """
+        from app.database import SessionLocal
+
+        if not self._cycle_lock.acquire(blocking=False):
+            self.skipped += 1
+            raise CycleInProgressError("이전 탐지 주기가 아직 실행 중입니다")
+
+        started_at = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            metrics = run_detection_cycle(db, end)
+            self.cycles += 1
+            self.last_error = None
+            self._history.append({"started_at": started_at, **metrics})
+            return metrics
+        except Exception as e:
+            db.rollback()
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+        finally:
+            db.close()
+            self._cycle_lock.release()
+
+    def _run(self):
+        next_run = time.monotonic()
+        while not self._stop.wait(max(0.0, next_run - time.monotonic()) + random.uniform(0.0, self.jitter)):
+            try:
+                self.run_once()
+            except Exception:
+                # 실패/중복은 status에 기록하고 다음 주기 계속
+                pass
+
+            next_run += self.interval
+            behind = time.monotonic() - next_run
+            if behind > 0:
+                missed = int(behind // self.interval) + 1
+                self.skipped += missed
+                next_run += missed * self.interval
+
+    def status(self) -> Dict:
+        history = list(self._history)
+        totals = np.asarray([cycle["total_ms"] for cycle in history], dtype=np.float64)
+        return {
+            "running": self._thread is not None,
+            "in_cycle": self._cycle_lock.locked(),
+            "interval_seconds": self.interval,
+            "jitter_seconds": self.jitter,
+            "cycles": self.cycles,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_cycle": history[-1] if history else None,
+            "total_ms_avg": float(totals.mean()) if len(totals) else None,
+            "total_ms_p95": float(np.percentile(totals, 95)) if len(totals) else None,
+            "total_ms_max": float(totals.max()) if len(totals) else None,
+        }
+
+
+detection_scheduler = DetectionScheduler(
+    interval_seconds=settings.DETECTION_INTERVAL_SEC,
+    jitter_seconds=settings.DETECTION_JITTER_SEC,
+    history=settings.DETECTION_HISTORY
+)
@@ -1,10 +1,15 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 import numpy as np
+import pandas as pd
 
 from app.models.equipment import Equipment
-from app.models.timeseries import TimeSeriesTag
+from app.config import settings
+from app.models.rollup import ROLLUP_MODELS
+from app.services.rollup_service import merge_rollups, read_rollups
+from app.services.timeseries_store import get_timeseries_store
+from app.utils.downsampling import DOWNSAMPLE_METHODS, bucket_envelope, lttb
 
 class EquipmentService:
     def __init__(self, db: Session):
@@ -23,37 +28,180 @@ class EquipmentService:
         self,
         eq_id: str,
         tag_name: str,
-        hours: int = 24
-    ) -> Dict:
-        """시계열 데이터 조회"""
-        time_ago = datetime.utcnow() - timedelta(hours=hours)
+        hours: int = 24,
+        max_points: Optional[int] = None,
+        method: str = "lttb"
+    ) -> Optional[Dict]:
+        """
+        시계열 데이터 조회 (max_points 이하로 다운샘플링)
+        
+        정상 범위는 다운샘플링 전 전체 해상도 데이터로 계산한다. 조회 범위를 max_points로 나눈
+        구간 폭보다 작거나 같은 집계 해상도 중 가장 큰 것(tags_rollup_1m/5m/1h)이 있으면 원본 대신
+        집계 행을 읽는다 (원본 수백만 행 → 집계 수천 행). 집계가 비었거나 범위 안 첫/마지막 관측에
+        닿지 않으면 (IngestService를 거치지 않아 집계 대상으로 표시되지 않은 행) 원본을 읽는다.
+        
+        Args:
+            max_points: 응답 점 수 상한 (None이면 TIMESERIES_MAX_POINTS)
+            method: lttb (모양 보존), minmax (구간별 최소/최대/평균)
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"지원하지 않는 다운샘플링 방식입니다: {method} (가능: {', '.join(DOWNSAMPLE_METHODS)})")
         
-        data = self.db.query(TimeSeriesTag).filter(
-            TimeSeriesTag.eq_id == eq_id,
-            TimeSeriesTag.tag_name == tag_name,
-            TimeSeriesTag.timestamp >= time_ago
-        ).order_by(TimeSeriesTag.timestamp).all()
+        end = datetime.utcnow()
+        start = end - timedelta(hours=hours)
+        max_points = max_points or settings.TIMESERIES_MAX_POINTS
         
-        if not data:
+        resolution = self._rollup_resolution((end - start).total_seconds() / max_points)
+        if resolution:
+            rollups = read_rollups(self.db, eq_id, tag_name, start, resolution)
+            if self._rollups_cover(eq_id, tag_name, start, rollups) and int(rollups["n_points"].sum()) > max_points:
+                return self._rollup_timeseries(eq_id, tag_name, rollups, resolution, start, end, max_points, method)
+        
+        timestamps, values, unit = self._fetch_series(eq_id, tag_name, start)
+        if len(values) == 0:
             return None
         
-        # 정상 범위 계산
-        values = [d.value for d in data]
-        mean = np.mean(values)
-        std = np.std(values)
+        # 정상 범위 계산 (전체 해상도)
+        mean = float(values.mean())
+        std = float(values.std())
+        
+        if method == "minmax" and len(values) > max_points:
+            buckets = bucket_envelope(timestamps, values, max_points, start, end)
+            data = self._envelope_points(buckets)
+        else:
+            seconds = (timestamps - timestamps[0]) / np.timedelta64(1, "s")
+            keep = lttb(seconds, values, max_points)
+            data = [
+                {"timestamp": ts.isoformat(), "value": value}
+                for ts, value in zip(timestamps[keep].tolist(), values[keep].tolist())
+            ]
+        
+        return self._timeseries_response(
+            eq_id, tag_name, unit, data, mean, std,
+            method if len(values) > max_points else "none", max_points, len(values),
+            get_timeseries_store(self.db).points_table.name
+        )
+    
+    def _rollup_timeseries(
+        self,
+        eq_id: str,
+        tag_name: str,
+        rollups: pd.DataFrame,
+        resolution: int,
+        start: datetime,
+        end: datetime,
+        max_points: int,
+        method: str
+    ) -> Dict:
+        """
+        집계 행 기반 응답 (정상 범위는 count/sum/sumsq 합으로 전체 해상도와 같게 계산)
+        
+        - minmax: 집계 구간을 max_points개 같은 폭 구간으로 다시 묶음
+        - lttb: 집계 구간 평균(구간 첫 관측 시각)에 LTTB 적용
+        """
+        n_points = int(rollups["n_points"].sum())
+        mean = float(rollups["value_sum"].sum() / n_points)
+        std = float(np.sqrt(max(rollups["value_sumsq"].sum() / n_points - mean * mean, 0.0)))
         
+        if method == "minmax":
+            ticks = rollups["bucket"].to_numpy(dtype="datetime64[us]").astype(np.int64)
+            lo = np.datetime64(start, "us").astype(np.int64)
+            span = max(int(np.datetime64(end, "us").astype(np.int64) - lo) + 1, 1)
+            frame = rollups.assign(slot=np.clip((ticks - lo) * max_points // span, 0, max_points - 1))
+            merged = merge_rollups(frame, keys=("slot",))
+            data = self._envelope_points({
+                "timestamp": merged["first_at"].to_numpy(dtype="datetime64[us]"),
+                "count": merged["n_points"].to_numpy(),
+                "min": merged["value_min"].to_numpy(),
+                "max": merged["value_max"].to_numpy(),
+                "mean": (merged["value_sum"] / merged["n_points"]).to_numpy()
+            })
+        else:
+            timestamps = rollups["first_at"].to_numpy(dtype="datetime64[us]")
+            values = (rollups["value_sum"] / rollups["n_points"]).to_numpy(dtype=np.float64)
+            seconds = (timestamps - timestamps[0]) / np.timedelta64(1, "s")
+            keep = lttb(seconds, values, max_points)
+            data = [
+                {"timestamp": ts.isoformat(), "value": value}
+                for ts, value in zip(timestamps[keep].tolist(), values[keep].tolist())
+            ]
+        
+        return self._timeseries_response(
+            eq_id, tag_name, self._fetch_unit(eq_id, tag_name), data, mean, std,
+            method, max_points, n_points, ROLLUP_MODELS[resolution].__tablename__
+        )
+    
+    def _rollups_cover(self, eq_id: str, tag_name: str, start: datetime, rollups: pd.DataFrame) -> bool:
+        """집계가 start 이후 첫 관측부터 마지막 관측까지 포함하는지 (아니면 집계되지 않은 원본 행이 있음)"""
+        if rollups.empty:
+            return False
+        store = get_timeseries_store(self.db)
+        first, last = store.first_timestamp(eq_id, tag_name, start), store.last_timestamp(eq_id, tag_name)
+        return (
+            first is not None and last is not None
+            and rollups["first_at"].min() <= pd.Timestamp(first)
+            and rollups["last_at"].max() >= pd.Timestamp(last)
+        )
+    
+    @staticmethod
+    def _rollup_resolution(bucket_seconds: float) -> Optional[int]:
+        """구간 폭 이하인 가장 큰 집계 해상도 (초, 없거나 집계 조회를 끄면 None)"""
+        if not settings.ROLLUP_READS_ENABLED:
+            return None
+        candidates = [seconds for seconds in ROLLUP_MODELS if seconds <= bucket_seconds]
+        return max(candidates) if candidates else None
+    
+    @staticmethod
+    def _envelope_points(buckets: Dict[str, np.ndarray]) -> List[Dict]:
+        return [
+            {"timestamp": ts.isoformat(), "value": avg, "min": low, "max": high, "count": count}
+            for ts, avg, low, high, count in zip(
+                buckets["timestamp"].tolist(),
+                buckets["mean"].tolist(),
+                buckets["min"].tolist(),
+                buckets["max"].tolist(),
+                buckets["count"].tolist()
+            )
+        ]
+    
+    @staticmethod
+    def _timeseries_response(
+        eq_id: str,
+        tag_name: str,
+        unit: Optional[str],
+        data: List[Dict],
+        mean: float,
+        std: float,
+        method: str,
+        max_points: int,
+        raw_points: int,
+        source: str
+    ) -> Dict:
         return {
             "eq_id": eq_id,
             "tag_name": tag_name,
-            "unit": data[0].unit,
-            "data": [
-                {"timestamp": d.timestamp.isoformat(), "value": d.value}
-                for d in data
-            ],
+            "unit": unit or "",
+            "data": data,
             "normal_range": {
-                "lower": float(mean - 3 * std),
-                "upper": float(mean + 3 * std),
-                "mean": float(mean),
-                "std": float(std)
+                "lower": mean - 3 * std,
+                "upper": mean + 3 * std,
+                "mean": mean,
+                "std": std
+            },
+            "downsampling": {
+                "method": method,
+                "max_points": max_points,
+                "raw_points": int(raw_points),
+                "returned_points": len(data),
+                "source": source
             }
-        }
\ No newline at end of file
+        }
+    
+    def _fetch_series(self, eq_id: str, tag_name: str, start: datetime) -> Tuple[np.ndarray, np.ndarray, Optional[str]]:
+        """(timestamp, value) 배열과 단위 (TIMESERIES_SCHEMA 저장소)"""
+        store = get_timeseries_store(self.db)
+        timestamps, values = store.fetch_series(eq_id, tag_name, start)
+        return timestamps, values, store.unit(eq_id, tag_name) if len(values) else None
+    
+    def _fetch_unit(self, eq_id: str, tag_name: str) -> Optional[str]:
+        return get_timeseries_store(self.db).unit(eq_id, tag_name)
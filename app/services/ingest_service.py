@@ -0,0 +1,197 @@
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+import io
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.models.equipment import Equipment
+from app.models.timeseries import TimeSeriesTag
+from app.services.timeseries_store import get_timeseries_store
+
+# 필수/선택 컬럼
+INGEST_COLUMNS = ("eq_id", "tag_name", "timestamp", "value")
+OPTIONAL_COLUMNS = ("unit",)
+# 중복 판단 키 (tags_timeseries 고유 인덱스)
+POINT_KEY = ("eq_id", "tag_name", "timestamp")
+
+# Content-Type → 입력 형식
+INGEST_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/json": "json",
+}
+
+
+class IngestError(ValueError):
+    """해석할 수 없는 입력 (형식 오류, 필수 컬럼 누락, strict 모드 거부)"""
+
+
+def resolve_format(content_type: Optional[str]) -> str:
+    """Content-Type 또는 형식 이름(ndjson, csv, json) → 입력 형식"""
+    name = (content_type or "").split(";")[0].strip().lower()
+    if name in INGEST_FORMATS.values():
+        return name
+    if name in INGEST_FORMATS:
+        return INGEST_FORMATS[name]
+    raise IngestError(f"지원하지 않는 형식입니다: {content_type} (가능: ndjson, csv, json)")
+
+
+def parse_payload(body: bytes, fmt: str) -> pd.DataFrame:
+    """
+    요청 본문 → 컬럼 DataFrame (값 검증 전)
+
+    - ndjson: 한 줄에 {"eq_id", "tag_name", "timestamp", "value", "unit"?} 하나
+    - csv: eq_id, tag_name, timestamp, value[, unit] 헤더
+    - json (컬럼형): {"eq_id": [...], "tag_name": [...], "timestamp": [...], "value": [...]},
+      eq_id/tag_name/unit은 문자열 하나로 주면 모든 행에 적용
+    """
+    if not body.strip():
+        return pd.DataFrame(columns=list(INGEST_COLUMNS))
+
+    try:
+        if fmt == "csv":
+            frame = pd.read_csv(
+                io.BytesIO(body),
+                dtype={"eq_id": str, "tag_name": str, "unit": str, "timestamp": str},
+                skipinitialspace=True
+            )
+        elif fmt == "ndjson":
+            frame = pd.read_json(io.BytesIO(body), lines=True, dtype=False, convert_dates=False)
+        else:
+            payload = json.loads(body)
+            if not isinstance(payload, dict):
+                raise IngestError("컬럼형 JSON은 {컬럼: 배열} 객체여야 합니다")
+            lengths = {len(v) for v in payload.values() if isinstance(v, list)}
+            if len(lengths) > 1:
+                raise IngestError("컬럼 배열 길이가 서로 다릅니다")
+            n_rows = lengths.pop() if lengths else 0
+            frame = pd.DataFrame({
+                key: value if isinstance(value, list) else [value] * n_rows
+                for key, value in payload.items()
+            })
+    except IngestError:
+        raise
+    except ValueError as e:
+        raise IngestError(f"{fmt} 형식을 해석할 수 없습니다: {e}")
+
+    missing = [column for column in INGEST_COLUMNS if column not in frame.columns]
+    if missing:
+        raise IngestError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    return frame
+
+
+def _clean_strings(column: pd.Series, max_length: int) -> Tuple[pd.Series, np.ndarray]:
+    """문자열 컬럼 공백 제거 후 (값, 유효 여부)"""
+    values = column.astype("string").str.strip()
+    valid = (values.notna() & (values.str.len() > 0) & (values.str.len() <= max_length)).to_numpy(dtype=bool)
+    return values, valid
+
+
+def _parse_timestamps(column: pd.Series) -> pd.Series:
+    """ISO 8601 문자열 또는 epoch 초 → tz 없는 UTC datetime64 (해석 실패는 NaT)"""
+    if pd.api.types.is_numeric_dtype(column):
+        parsed = pd.to_datetime(column, unit="s", utc=True, errors="coerce")
+    else:
+        parsed = pd.to_datetime(column, utc=True, errors="coerce", format="ISO8601")
+    # DB는 UTC를 tz 없이 저장
+    return parsed.dt.tz_convert(None)
+
+
+def validate_points(frame: pd.DataFrame, known_eq_ids) -> Tuple[pd.DataFrame, List[Dict], int]:
+    """
+    행 단위 벡터 검증 후 유효 행만 반환
+
+    - eq_id: equipments에 등록된 설비
+    - tag_name / unit: 빈 문자열이 아니고 컬럼 길이 이내
+    - timestamp: ISO 8601 또는 epoch 초
+    - value: 유한한 숫자
+
+    같은 요청 안의 중복 (eq_id, tag_name, timestamp)은 첫 행만 남긴다.
+
+    Returns:
+        유효 행 DataFrame, 거부 사유 (앞쪽 INGEST_MAX_ERRORS개), 거부 행 수
+    """
+    eq_id, eq_valid = _clean_strings(frame["eq_id"], TimeSeriesTag.eq_id.type.length)
+    tag_name, tag_valid = _clean_strings(frame["tag_name"], TimeSeriesTag.tag_name.type.length)
+    timestamp = _parse_timestamps(frame["timestamp"])
+    value = pd.to_numeric(frame["value"], errors="coerce").astype(np.float64)
+
+    checks = [
+        ("unknown eq_id", eq_valid & eq_id.isin(list(known_eq_ids)).fillna(False).to_numpy(dtype=bool)),
+        ("invalid tag_name", tag_valid),
+        ("invalid timestamp", timestamp.notna().to_numpy()),
+        ("invalid value", np.isfinite(value.to_numpy())),
+    ]
+
+    points = pd.DataFrame({"eq_id": eq_id, "tag_name": tag_name, "timestamp": timestamp, "value": value})
+    if "unit" in frame.columns:
+        unit = frame["unit"].astype("string").str.strip()
+        unit_length = TimeSeriesTag.unit.type.length
+        checks.append(("invalid unit", (unit.isna() | (unit.str.len() <= unit_length)).fillna(False).to_numpy(dtype=bool)))
+        points["unit"] = unit.mask(unit.str.len() == 0)
+
+    valid = np.logical_and.reduce([mask for _, mask in checks])
+
+    errors = []
+    for row in np.flatnonzero(~valid)[:settings.INGEST_MAX_ERRORS].tolist():
+        reason = next(name for name, mask in checks if not mask[row])
+        errors.append({"row": row, "reason": reason})
+
+    points = points[valid]
+    points = points[~points.duplicated(subset=list(POINT_KEY), keep="first")]
+    return points, errors, int((~valid).sum())
+
+
+class IngestService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ingest(self, body: bytes, content_type: Optional[str], strict: bool = False) -> Dict:
+        """
+        센서 데이터 일괄 적재
+
+        Args:
+            body: 요청 본문 (ndjson, csv, 컬럼형 json)
+            content_type: Content-Type 또는 형식 이름
+            strict: True면 거부 행이 하나라도 있을 때 아무것도 저장하지 않음
+
+        Returns:
+            received/accepted/inserted/duplicates/rejected 행 수, 거부 사유, 처리량
+        """
+        started = time.perf_counter()
+        fmt = resolve_format(content_type)
+        frame = parse_payload(body, fmt)
+        result = self.ingest_frame(frame, strict)
+        elapsed = time.perf_counter() - started
+
+        return {
+            "format": fmt,
+            **result,
+            "seconds": elapsed,
+            "points_per_sec": result["received"] / elapsed if elapsed > 0 else 0.0
+        }
+
+    def ingest_frame(self, frame: pd.DataFrame, strict: bool = False) -> Dict:
+        """검증 + 저장 (parse_payload 결과 또는 eq_id/tag_name/timestamp/value[/unit] DataFrame)"""
+        known = {eq_id for (eq_id,) in self.db.query(Equipment.eq_id).all()}
+        points, errors, rejected = validate_points(frame, known)
+
+        if strict and rejected:
+            raise IngestError(f"{rejected}개 행이 유효하지 않습니다: {errors}")
+
+        inserted = get_timeseries_store(self.db).write(points)
+        return {
+            "received": len(frame),
+            "accepted": len(points),
+            "inserted": inserted,
+            "duplicates": len(points) - inserted,
+            "rejected": rejected,
+            "errors": errors
+        }
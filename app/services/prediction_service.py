@@ -6,14 +6,19 @@ import numpy as np
 from datetime import datetime, timedelta
 
 from app.models.prediction import Prediction
-from app.models.timeseries import TimeSeriesTag
 from app.schemas.prediction import PredictionRequest
 from app.ml.predictor import IntegratedPredictor
+from app.ml.registry import get_predictor
+from app.services.window_service import WindowAssembler
 
 class PredictionService:
     def __init__(self, db: Session):
         self.db = db
-        self.predictor = IntegratedPredictor()
+    
+    @property
+    def predictor(self) -> IntegratedPredictor:
+        """공유 예측기 (조회 전용 API에서는 로드하지 않음)"""
+        return get_predictor()
     
     def create_prediction(
         self,
@@ -22,25 +27,18 @@ class PredictionService:
         """
         예측 수행 및 결과 저장
         """
-        # 최근 데이터 가져오기
-        time_ago = datetime.utcnow() - timedelta(hours=2)
-        
-        timeseries_data = self.db.query(TimeSeriesTag).filter(
-            TimeSeriesTag.eq_id == request.eq_id,
-            TimeSeriesTag.timestamp >= time_ago
-        ).order_by(TimeSeriesTag.timestamp).all()
+        # 최근 데이터로 모델 입력 윈도우 조립 (sequence_length, 52)
+        predictor = self.predictor
+        batch = WindowAssembler.for_predictor(self.db, predictor).assemble(request.eq_id)
         
-        if len(timeseries_data) < 60:
+        if batch.n_observations[0] < 60:
             raise ValueError("충분한 데이터가 없습니다 (최소 60개 필요)")
         
-        # 데이터 준비 (실제로는 52차원)
-        # 여기서는 더미 데이터 사용
-        dummy_data = np.random.randn(60, 52)
-        
         # 예측 수행
-        result = self.predictor.predict_fault(
-            dummy_data,
-            horizon=request.prediction_horizon
+        result = predictor.predict_fault(
+            batch.windows[0],
+            horizon=request.prediction_horizon,
+            eq_id=request.eq_id
         )
         
         # 결과 저장
@@ -56,7 +54,8 @@ class PredictionService:
             confidence_lower=result["confidence_lower"],
             confidence_upper=result["confidence_upper"],
             feature_importance=json.dumps(result["feature_importance"]),
-            interpretation=result["interpretation"]
+            interpretation=result["interpretation"],
+            model_version=result["model_version"]
         )
         
         self.db.add(db_prediction)
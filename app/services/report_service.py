@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
 import json
 from datetime import datetime, timedelta
@@ -19,6 +19,16 @@ from app.models.equipment import Equipment
 from app.models.prediction import Prediction
 from app.schemas.report import ReportRequest
 
+
+def render_report(role: str, file_path: str, data: Dict):
+    """
+    역할별 PDF 렌더링 (DB 세션 불필요 → 프로세스 풀에서 실행 가능)
+    """
+    if role == "operator":
+        ReportService._generate_operator_report(file_path, data)
+    else:
+        ReportService._generate_manager_report(file_path, data)
+
 class ReportService:
     def __init__(self, db: Session):
         self.db = db
@@ -29,27 +39,45 @@ class ReportService:
         """
         보고서 생성
         """
+        # 데이터 수집
+        job_id, file_path, report_data = self.prepare_report(request)
+        
+        # PDF 생성
+        render_report(request.role, file_path, report_data)
+        
+        # DB에 저장
+        return self.save_report(job_id, request, file_path, report_data)
+    
+    def prepare_report(self, request: ReportRequest) -> Tuple[str, str, Dict]:
+        """
+        보고서 데이터 수집 (DB 작업)
+        
+        Returns:
+            job_id, PDF 파일 경로, 보고서 데이터
+        """
         job_id = str(uuid.uuid4())
         
-        # 데이터 수집
         report_data = self._collect_report_data(
             request.start_date,
             request.end_date,
             request.role
         )
         
-        # PDF 생성
         file_path = os.path.join(
             self.report_dir,
             f"{datetime.now().strftime('%Y%m%d')}_{request.role}_Report_{job_id[:8]}.pdf"
         )
         
-        if request.role == "operator":
-            self._generate_operator_report(file_path, report_data)
-        else:
-            self._generate_manager_report(file_path, report_data)
-        
-        # DB에 저장
+        return job_id, file_path, report_data
+    
+    def save_report(
+        self,
+        job_id: str,
+        request: ReportRequest,
+        file_path: str,
+        report_data: Dict
+    ) -> Report:
+        """생성된 보고서 정보 DB 저장"""
         db_report = Report(
             job_id=job_id,
             role=ReportRole(request.role),
@@ -143,7 +171,8 @@ class ReportService:
         
         return [{"fault_code": code, "count": count} for code, count in sorted_faults]
     
-    def _generate_operator_report(self, file_path: str, data: Dict):
+    @staticmethod
+    def _generate_operator_report(file_path: str, data: Dict):
         """현장 엔지니어용 보고서 생성"""
         doc = SimpleDocTemplate(file_path, pagesize=A4)
         story = []
@@ -275,7 +304,8 @@ class ReportService:
         doc.build(story)
         print(f"✅ 현장 엔지니어용 보고서 생성 완료: {file_path}")
     
-    def _generate_manager_report(self, file_path: str, data: Dict):
+    @staticmethod
+    def _generate_manager_report(file_path: str, data: Dict):
         """관리자용 보고서 생성"""
         doc = SimpleDocTemplate(file_path, pagesize=A4)
         story = []
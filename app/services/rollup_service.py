@@ -0,0 +1,374 @@
+from sqlalchemy import select, delete, insert, update, func
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Sequence
+from datetime import datetime, timedelta
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.models.rollup import ROLLUP_MODELS
+from app.models.timeseries import TagSeries, TagChunk
+from app.services.timeseries_store import get_timeseries_store
+
+# 집계 테이블 키/값 컬럼
+ROLLUP_KEY = ("eq_id", "tag_name", "bucket")
+ROLLUP_COLUMNS = (
+    "n_points", "value_sum", "value_sumsq", "value_min", "value_max",
+    "value_first", "value_last", "first_at", "last_at",
+)
+# 재계산 1회 구간 (가장 큰 해상도의 배수)
+RECOMPUTE_SPAN = timedelta(hours=24)
+
+
+def points_to_rollups(points: pd.DataFrame, seconds: int) -> pd.DataFrame:
+    """원본 점 (eq_id, tag_name, timestamp, value) → seconds 구간 집계"""
+    timestamps = pd.to_datetime(points["timestamp"])
+    values = points["value"].to_numpy(dtype=np.float64)
+    frame = pd.DataFrame({
+        "eq_id": points["eq_id"].to_numpy(dtype=object),
+        "tag_name": points["tag_name"].to_numpy(dtype=object),
+        "bucket": timestamps.dt.floor(f"{seconds}s").to_numpy(),
+        "n_points": np.ones(len(values), dtype=np.int64),
+        "value_sum": values,
+        "value_sumsq": values * values,
+        "value_min": values,
+        "value_max": values,
+        "value_first": values,
+        "value_last": values,
+        "first_at": timestamps.to_numpy(),
+        "last_at": timestamps.to_numpy(),
+    })
+    return merge_rollups(frame)
+
+
+def rebucket(rollups: pd.DataFrame, seconds: int) -> pd.DataFrame:
+    """세밀한 구간 집계 → 더 큰 seconds 구간 집계 (seconds는 원래 구간 길이의 배수)"""
+    frame = rollups.copy()
+    frame["bucket"] = frame["bucket"].dt.floor(f"{seconds}s")
+    return merge_rollups(frame)
+
+
+def merge_rollups(frame: pd.DataFrame, keys: Sequence[str] = ROLLUP_KEY) -> pd.DataFrame:
+    """
+    같은 키의 집계 행 병합
+
+    count/sum/sumsq는 합, min/max는 최소/최대, first/last는 first_at/last_at이 가장 이른/늦은 행의 값.
+    """
+    keys = list(keys)
+    if frame.empty:
+        return frame[keys + list(ROLLUP_COLUMNS)].reset_index(drop=True)
+
+    merged = frame.groupby(keys, sort=True).agg(
+        n_points=("n_points", "sum"),
+        value_sum=("value_sum", "sum"),
+        value_sumsq=("value_sumsq", "sum"),
+        value_min=("value_min", "min"),
+        value_max=("value_max", "max"),
+        first_at=("first_at", "min"),
+        last_at=("last_at", "max"),
+    )
+    merged["value_first"] = frame.sort_values("first_at", kind="stable").groupby(keys, sort=True)["value_first"].first()
+    merged["value_last"] = frame.sort_values("last_at", kind="stable").groupby(keys, sort=True)["value_last"].last()
+    return merged.reset_index()[keys + list(ROLLUP_COLUMNS)]
+
+
+def _rollup_frame(rows) -> pd.DataFrame:
+    """집계 테이블 조회 결과 → DataFrame (datetime64 컬럼)"""
+    frame = pd.DataFrame(rows, columns=list(ROLLUP_KEY) + list(ROLLUP_COLUMNS))
+    for column in ("bucket", "first_at", "last_at"):
+        frame[column] = pd.to_datetime(frame[column])
+    return frame
+
+
+def _records(frame: pd.DataFrame):
+    """DataFrame → insert 파라미터 (numpy/pandas 타입 → 파이썬 기본 타입)"""
+    columns = {column: frame[column].to_numpy(dtype=object).tolist() for column in ROLLUP_KEY + ROLLUP_COLUMNS}
+    for column in ("bucket", "first_at", "last_at"):
+        columns[column] = frame[column].dt.to_pydatetime().tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def compact(db: Session, batch_rows: Optional[int] = None) -> Dict:
+    """
+    tag_series.dirty_from 이후 구간을 series별로 약 batch_rows개 원본 점까지 모든 해상도 집계에 다시 계산
+
+    dirty_from은 적재와 같은 트랜잭션에서 기록되므로, 동시에 실행된 적재의 커밋 순서와 무관하게
+    커밋된 점은 모두 다음 실행에서 반영된다.
+
+    Returns:
+        처리 점 수, 정리된 series 수, 해상도별 갱신 행 수
+    """
+    return _recompute_dirty_series(db, batch_rows or settings.ROLLUP_COMPACT_BATCH_ROWS)
+
+
+def mark_all_dirty(db: Session) -> int:
+    """
+    모든 series를 가장 이른 관측부터 다시 계산하도록 표시 (기존 dirty_from이 더 이르면 유지)
+
+    dirty_from 추적 전에 쌓인 원본 행을 집계에 반영할 때 한 번 실행한다 (scripts/compact_rollups.py).
+
+    Returns:
+        표시한 series 수
+    """
+    store = get_timeseries_store(db)
+    raw = db.execute(
+        store.select(store.c.eq_id, store.c.tag_name, func.min(store.c.timestamp))
+        .group_by(store.c.eq_id, store.c.tag_name)
+    ).all()
+    sealed = db.execute(
+        select(TagChunk.eq_id, TagChunk.tag_name, func.min(TagChunk.first_at))
+        .group_by(TagChunk.eq_id, TagChunk.tag_name)
+    ).all()
+
+    earliest = pd.DataFrame(raw + sealed, columns=["eq_id", "tag_name", "timestamp"])
+    if earliest.empty:
+        return 0
+    earliest["timestamp"] = pd.to_datetime(earliest["timestamp"])
+    earliest = earliest.groupby(["eq_id", "tag_name"], as_index=False)["timestamp"].min()
+
+    try:
+        store.mark_dirty(store.series_ids(earliest), earliest["timestamp"])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(earliest)
+
+
+def _replace_range(db: Session, eq_id: str, tag_name: str, start: datetime, stop: datetime, points: pd.DataFrame) -> Dict:
+    """[start, stop) 구간 집계를 원본 점으로 다시 계산해 교체 (start/stop은 가장 큰 해상도 경계)"""
+    updated = {}
+    rollups = None
+    for seconds, model in sorted(ROLLUP_MODELS.items()):
+        table = model.__table__
+        db.execute(
+            delete(table).where(
+                table.c.eq_id == eq_id,
+                table.c.tag_name == tag_name,
+                table.c.bucket >= start,
+                table.c.bucket < stop
+            )
+        )
+        if points.empty:
+            continue
+        rollups = points_to_rollups(points, seconds) if rollups is None else rebucket(rollups, seconds)
+        db.execute(insert(table), _records(rollups))
+        updated[table.name] = len(rollups)
+    return updated
+
+
+def _recompute_dirty_series(db: Session, batch_rows: int) -> Dict:
+    """
+    dirty_from이 있는 series의 집계를 그 시각(1시간 경계로 내림)부터 RECOMPUTE_SPAN씩 다시 계산 (청크 + 원본 행)
+
+    구간마다 집계 교체와 dirty_from 전진을 같은 트랜잭션으로 커밋한다. dirty_from/revision은
+    읽은 값과 같을 때만 바꾸므로(compare-and-set), 그 사이 적재된 series는 다음 실행에서 다시 계산한다.
+    """
+    series = db.execute(
+        select(TagSeries.id, TagSeries.eq_id, TagSeries.tag_name, TagSeries.dirty_from, TagSeries.revision)
+        .where(TagSeries.dirty_from.isnot(None))
+        .order_by(TagSeries.dirty_from)
+    ).all()
+
+    store = get_timeseries_store(db)
+    table = TagSeries.__table__
+    rows = cleaned = 0
+    updated: Dict[str, int] = {}
+    try:
+        for series_id, eq_id, tag_name, dirty_from, revision in series:
+            if rows >= batch_rows:
+                break
+            owned = (table.c.id == series_id) & (table.c.revision == revision)
+            last = store.last_timestamp(eq_id, tag_name)
+            frontier = _floor(dirty_from, max(ROLLUP_MODELS))
+
+            while True:
+                if last is None or frontier > last:
+                    cleaned += db.execute(update(table).where(owned).values(dirty_from=None)).rowcount
+                    db.commit()
+                    break
+                if rows >= batch_rows:
+                    break
+
+                stop = frontier + RECOMPUTE_SPAN
+                points = store.fetch_points([eq_id], [tag_name], frontier, stop)
+                for name, count in _replace_range(db, eq_id, tag_name, frontier, stop, points).items():
+                    updated[name] = updated.get(name, 0) + count
+                rows += len(points)
+                frontier = stop
+
+                still_owned = db.execute(update(table).where(owned).values(dirty_from=frontier)).rowcount
+                db.commit()
+                if not still_owned:
+                    break
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"rows": rows, "cleaned_series": cleaned, "updated": updated}
+
+
+def _floor(value: datetime, seconds: int) -> datetime:
+    return pd.Timestamp(value).floor(f"{seconds}s").to_pydatetime()
+
+
+def read_rollups(db: Session, eq_id: str, tag_name: str, start: datetime, seconds: int) -> pd.DataFrame:
+    """
+    start 이후 seconds 구간 집계 (원본과 같은 결과)
+
+    - start가 걸친 첫 구간은 start 이후 관측(청크 + 원본 행)으로 다시 집계
+    - 아직 다시 계산되지 않은 구간 (tag_series.dirty_from 이후)은 조회 시 관측으로 집계해 병합
+
+    Returns:
+        bucket 순 집계 DataFrame (ROLLUP_KEY + ROLLUP_COLUMNS)
+    """
+    table = ROLLUP_MODELS[seconds].__table__
+    aligned = pd.Timestamp(start).ceil(f"{seconds}s").to_pydatetime()
+    store = get_timeseries_store(db)
+
+    stored = (
+        select(*(table.c[column] for column in ROLLUP_KEY + ROLLUP_COLUMNS))
+        .where(table.c.eq_id == eq_id, table.c.tag_name == tag_name, table.c.bucket >= aligned)
+    )
+    # start가 걸친 첫 구간
+    frames = [store.fetch_points([eq_id], [tag_name], start, aligned)]
+
+    # dirty_from(1시간 경계로 내림) 이후 집계는 아직 다시 계산되지 않았으므로 원본으로 대체
+    dirty_from = db.execute(
+        select(TagSeries.dirty_from).where(TagSeries.eq_id == eq_id, TagSeries.tag_name == tag_name)
+    ).scalar()
+    if dirty_from is not None:
+        boundary = _floor(dirty_from, max(ROLLUP_MODELS))
+        stored = stored.where(table.c.bucket < boundary)
+        frames.append(store.fetch_points([eq_id], [tag_name], max(aligned, boundary)))
+
+    rollups = [_rollup_frame(db.execute(stored).all())]
+    points = [frame for frame in frames if not frame.empty]
+    if points:
+        rollups.append(points_to_rollups(pd.concat(points, ignore_index=True), seconds))
+    return merge_rollups(pd.concat(rollups, ignore_index=True))
+
+
+class CompactionInProgressError(RuntimeError):
+    """이전 집계 작업이 아직 실행 중"""
+
+
+class RollupCompactor:
+    """
+    집계 테이블 증분 갱신 (백그라운드 스레드)
+
+    - interval_seconds마다 미반영 원본 행을 batch_rows씩, 따라잡을 때까지 반영 (compact 참고)
+    - 수동 실행(run_once)과 겹치면 나중 호출을 건너뜀 (같은 배치 이중 반영 방지)
+    """
+
+    def __init__(self, interval_seconds: float = 30.0, batch_rows: int = 200000):
+        self.interval = max(1.0, interval_seconds)
+        self.batch_rows = max(1, batch_rows)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.rows = 0
+        self.failures = 0
+        self.last_run: Optional[Dict] = None
+        self.last_error: Optional[str] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rollup-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def run_once(self) -> Dict:
+        """
+        미반영 원본 행이 없을 때까지 compact 반복 (자체 DB 세션)
+
+        Raises:
+            CompactionInProgressError: 이전 실행이 진행 중
+        """
+        from app.database import SessionLocal
+
+        if not self._lock.acquire(blocking=False):
+            raise CompactionInProgressError("이전 집계 작업이 아직 실행 중입니다")
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            rows = batches = cleaned = 0
+            while not self._stop.is_set():
+                result = compact(db, self.batch_rows)
+                rows += result["rows"]
+                cleaned += result["cleaned_series"]
+                batches += 1 if result["rows"] else 0
+                if result["rows"] < self.batch_rows:
+                    break
+
+            self.runs += 1
+            self.rows += rows
+            self.last_error = None
+            self.last_run = {
+                "finished_at": datetime.utcnow(),
+                "rows": rows,
+                "batches": batches,
+                "cleaned_series": cleaned,
+                "total_ms": (time.perf_counter() - started) * 1000
+            }
+            return self.last_run
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+        finally:
+            db.close()
+            self._lock.release()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                # 실패는 status에 기록하고 다음 주기에 남은 dirty_from부터 다시 시도
+                pass
+
+    def status(self) -> Dict:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            dirty_series = db.execute(
+                select(func.count()).select_from(TagSeries).where(TagSeries.dirty_from.isnot(None))
+            ).scalar()
+        finally:
+            db.close()
+
+        return {
+            "running": self._thread is not None,
+            "in_run": self._lock.locked(),
+            "interval_seconds": self.interval,
+            "batch_rows": self.batch_rows,
+            "resolutions": {model.__tablename__: seconds for seconds, model in sorted(ROLLUP_MODELS.items())},
+            "schema": settings.TIMESERIES_SCHEMA,
+            "dirty_series": dirty_series,
+            "runs": self.runs,
+            "rows": self.rows,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+
+rollup_compactor = RollupCompactor(
+    interval_seconds=settings.ROLLUP_COMPACT_INTERVAL_SEC,
+    batch_rows=settings.ROLLUP_COMPACT_BATCH_ROWS
+)
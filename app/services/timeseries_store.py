@@ -0,0 +1,486 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import select, insert, update, delete, bindparam, case, or_, func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.models.timeseries import TimeSeriesTag, TagSeries, TagPoint, TagChunk
+from app.utils import gorilla
+
+# 원본 시계열 저장 스키마 (TIMESERIES_SCHEMA)
+# - wide: tags_timeseries 한 테이블 (행마다 eq_id/tag_name/unit 문자열 + 대리 키)
+# - compact: tag_series 사전 + tag_points (series_id, timestamp, value)
+# 두 스키마 모두 tag_series.dirty_from/revision으로 집계 재계산 구간을 추적한다.
+TIMESERIES_SCHEMAS = ("wide", "compact")
+
+
+def insert_ignore(table, dialect_name: str):
+    """고유 키가 이미 있는 행은 건너뛰는 INSERT (재전송 시 멱등)"""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return postgresql_insert(table).on_conflict_do_nothing()
+    if dialect_name in ("mysql", "mariadb"):
+        return insert(table).prefix_with("IGNORE")
+    return insert(table)
+
+
+def _in_range(column, start, end, start_inclusive: bool, end_inclusive: bool) -> List:
+    """시각 구간 조건 (None인 경계는 생략)"""
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start if start_inclusive else column > start)
+    if end is not None:
+        conditions.append(column <= end if end_inclusive else column < end)
+    return conditions
+
+
+def _points_frame(eq_ids, tag_names, timestamps: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({
+        "eq_id": np.asarray(eq_ids, dtype=object),
+        "tag_name": np.asarray(tag_names, dtype=object),
+        "timestamp": timestamps,
+        "value": values,
+    })
+
+
+def _empty_points() -> pd.DataFrame:
+    return _points_frame([], [], np.zeros(0, dtype="datetime64[us]"), np.zeros(0, dtype=np.float64))
+
+
+class TimeSeriesStore(ABC):
+    """
+    원본 시계열 저장/조회 (스키마별 구현)
+
+    조회 코드는 store.c의 eq_id, tag_name, timestamp, value, unit 컬럼과 store.select()만 사용하므로
+    스키마가 바뀌어도 같은 쿼리를 쓴다. 관측 조회(fetch_points)는 봉인된 청크(tag_chunks)와 원본 행을 합친다.
+
+    적재 시 series별 가장 이른 시각을 같은 트랜잭션에서 tag_series.dirty_from에 기록해 집계기가
+    그 구간부터 재계산한다 (커밋 순서와 무관하게 늦게 커밋된 행도 빠지지 않음).
+    """
+
+    schema = ""
+    points_table = None
+    c = SimpleNamespace()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @abstractmethod
+    def select(self, *columns) -> Select:
+        """store.c 컬럼 조회 (FROM/JOIN 포함)"""
+
+    def fetch_series(self, eq_id: str, tag_name: str, start: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """start 이후 (timestamp, value) 배열 (시간순, ORM 객체 생성 없음)"""
+        points = self.fetch_points([eq_id], [tag_name], start)
+        timestamps = points["timestamp"].to_numpy()
+        order = np.argsort(timestamps, kind="stable")
+        return timestamps[order], points["value"].to_numpy()[order]
+
+    def fetch_points(
+        self,
+        eq_ids: Iterable[str],
+        tag_names: Iterable[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        start_inclusive: bool = True,
+        end_inclusive: bool = False
+    ) -> pd.DataFrame:
+        """
+        eq_ids × tag_names 구간 관측 (봉인된 청크 + 원본 행, 순서 없음)
+
+        같은 시각이 청크와 원본 행에 모두 있으면 청크 값을 쓴다 (봉인 중 재전송된 행).
+
+        Returns:
+            eq_id, tag_name, timestamp (datetime64[us]), value DataFrame
+        """
+        bounds = (start, end, start_inclusive, end_inclusive)
+        eq_ids, tag_names = list(eq_ids), list(tag_names)
+        sealed = self.fetch_sealed(eq_ids, tag_names, *bounds)
+        raw = self.fetch_raw(eq_ids, tag_names, *bounds)
+        if sealed.empty:
+            return raw
+        if raw.empty:
+            return sealed
+
+        points = pd.concat([sealed, raw], ignore_index=True)
+        return points[~points.duplicated(["eq_id", "tag_name", "timestamp"], keep="first")].reset_index(drop=True)
+
+    def fetch_raw(
+        self,
+        eq_ids: Iterable[str],
+        tag_names: Iterable[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        start_inclusive: bool = True,
+        end_inclusive: bool = False,
+        for_update: bool = False
+    ) -> pd.DataFrame:
+        """원본 행만 조회 (for_update: 봉인하는 동안 같은 구간 적재를 막는 잠금, MySQL/PostgreSQL)"""
+        stmt = self.select(self.c.eq_id, self.c.tag_name, self.c.timestamp, self.c.value).where(
+            self.c.eq_id.in_(list(eq_ids)),
+            self.c.tag_name.in_(list(tag_names)),
+            *_in_range(self.c.timestamp, start, end, start_inclusive, end_inclusive)
+        )
+        if for_update:
+            stmt = stmt.with_for_update()
+        rows = self.db.execute(stmt).all()
+        if not rows:
+            return _empty_points()
+
+        # 열 단위 변환 (datetime 객체 → datetime64는 pandas가 numpy보다 훨씬 빠름)
+        row_eq, row_tag, row_ts, row_value = zip(*rows)
+        return _points_frame(
+            row_eq,
+            row_tag,
+            pd.DatetimeIndex(row_ts).values.astype("datetime64[us]"),
+            np.fromiter(row_value, dtype=np.float64, count=len(rows))
+        )
+
+    def fetch_sealed(
+        self,
+        eq_ids: Iterable[str],
+        tag_names: Iterable[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        start_inclusive: bool = True,
+        end_inclusive: bool = False
+    ) -> pd.DataFrame:
+        """구간에 걸친 청크를 풀어 구간 안 관측만 반환"""
+        conditions = [TagChunk.eq_id.in_(list(eq_ids)), TagChunk.tag_name.in_(list(tag_names))]
+        if start is not None:
+            conditions.append(TagChunk.hour >= pd.Timestamp(start).floor("h").to_pydatetime())
+        if end is not None:
+            conditions.append(TagChunk.hour <= end)
+        chunks = self.db.execute(select(TagChunk.eq_id, TagChunk.tag_name, TagChunk.data).where(*conditions)).all()
+        if not chunks:
+            return _empty_points()
+
+        decoded = [gorilla.decode(data) for _, _, data in chunks]
+        counts = [len(timestamps) for timestamps, _ in decoded]
+        timestamps = np.concatenate([timestamps for timestamps, _ in decoded])
+        values = np.concatenate([values for _, values in decoded])
+
+        keep = np.ones(len(timestamps), dtype=bool)
+        if start is not None:
+            bound = np.datetime64(pd.Timestamp(start).to_datetime64(), "us")
+            keep &= timestamps >= bound if start_inclusive else timestamps > bound
+        if end is not None:
+            bound = np.datetime64(pd.Timestamp(end).to_datetime64(), "us")
+            keep &= timestamps <= bound if end_inclusive else timestamps < bound
+
+        return _points_frame(
+            np.repeat(np.array([eq_id for eq_id, _, _ in chunks], dtype=object), counts)[keep],
+            np.repeat(np.array([tag_name for _, tag_name, _ in chunks], dtype=object), counts)[keep],
+            timestamps[keep],
+            values[keep]
+        )
+
+    def first_timestamp(self, eq_id: str, tag_name: str, start: datetime) -> Optional[datetime]:
+        """원본 행과 청크를 합친 start 이후 첫 관측 시각 (start가 걸친 청크만 디코딩)"""
+        key = (TagChunk.eq_id == eq_id, TagChunk.tag_name == tag_name)
+        raw = self.db.execute(
+            self.select(func.min(self.c.timestamp))
+            .where(self.c.eq_id == eq_id, self.c.tag_name == tag_name, self.c.timestamp >= start)
+        ).scalar()
+        sealed = self.db.execute(select(func.min(TagChunk.first_at)).where(*key, TagChunk.first_at >= start)).scalar()
+        straddling = self.db.execute(
+            select(func.max(TagChunk.last_at)).where(*key, TagChunk.first_at < start, TagChunk.last_at >= start)
+        ).scalar()
+        if straddling is not None:
+            points = self.fetch_sealed([eq_id], [tag_name], start, straddling, True, True)
+            if not points.empty:
+                sealed = pd.Timestamp(points["timestamp"].min()).to_pydatetime()
+        return min((ts for ts in (raw, sealed) if ts is not None), default=None)
+
+    def last_timestamp(self, eq_id: str, tag_name: str) -> Optional[datetime]:
+        """원본 행과 청크를 합친 마지막 관측 시각"""
+        raw = self.db.execute(
+            self.select(func.max(self.c.timestamp)).where(self.c.eq_id == eq_id, self.c.tag_name == tag_name)
+        ).scalar()
+        sealed = self.db.execute(
+            select(func.max(TagChunk.last_at)).where(TagChunk.eq_id == eq_id, TagChunk.tag_name == tag_name)
+        ).scalar()
+        return max((ts for ts in (raw, sealed) if ts is not None), default=None)
+
+    @abstractmethod
+    def series_keys(self) -> List[Tuple[str, str]]:
+        """원본 행이 있을 수 있는 (eq_id, tag_name) 목록"""
+
+    @abstractmethod
+    def delete_range(self, eq_id: str, tag_name: str, start: datetime, end: datetime) -> int:
+        """[start, end) 원본 행 삭제 (청크로 봉인한 구간)"""
+
+    @abstractmethod
+    def unit(self, eq_id: str, tag_name: str) -> Optional[str]:
+        """태그 단위 (없으면 None)"""
+
+    def write(self, points: pd.DataFrame) -> int:
+        """
+        검증된 점 (eq_id, tag_name, timestamp, value[, unit]) 저장, 이미 있는 시점은 건너뜀
+
+        INGEST_COMMIT_ROWS행마다 커밋하고, 실패하면 진행 중인 트랜잭션만 롤백한다.
+
+        Returns:
+            새로 저장된 행 수
+        """
+        if points.empty:
+            return 0
+
+        inserted = 0
+        try:
+            points = self._drop_sealed(points)
+            for start in range(0, len(points), settings.INGEST_COMMIT_ROWS):
+                inserted += self._write_chunk(points.iloc[start:start + settings.INGEST_COMMIT_ROWS])
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return inserted
+
+    def _drop_sealed(self, points: pd.DataFrame) -> pd.DataFrame:
+        """이미 청크에 봉인된 시각은 제외 (봉인 후 재전송도 원본 행과 같이 중복으로 처리)"""
+        sealed = self.fetch_sealed(
+            points["eq_id"].unique(),
+            points["tag_name"].unique(),
+            points["timestamp"].min().to_pydatetime(),
+            points["timestamp"].max().to_pydatetime(),
+            end_inclusive=True
+        )
+        if sealed.empty:
+            return points
+
+        key = ["eq_id", "tag_name", "timestamp"]
+        sealed = sealed[key].astype({"timestamp": points["timestamp"].dtype})
+        duplicated = pd.MultiIndex.from_frame(points[key]).isin(pd.MultiIndex.from_frame(sealed))
+        return points[~duplicated]
+
+    def series_ids(self, points: pd.DataFrame) -> np.ndarray:
+        """
+        점마다 series_id (처음 보는 설비/태그는 사전에 추가)
+
+        단위는 사전에 단위가 없을 때만 처음 들어온 값으로 채운다.
+        """
+        frame = pd.DataFrame({
+            "eq_id": points["eq_id"].to_numpy(dtype=object),
+            "tag_name": points["tag_name"].to_numpy(dtype=object),
+            "unit": _units(points)
+        })
+        pairs = pd.concat([frame[frame["unit"].notna()], frame]).drop_duplicates(["eq_id", "tag_name"])
+
+        known = self._load_series(pairs)
+        missing = pairs.merge(known, on=["eq_id", "tag_name"], how="left", indicator=True)
+        missing = missing[missing["_merge"] == "left_only"]
+        if not missing.empty:
+            dialect_name = self.db.get_bind().dialect.name
+            self.db.execute(insert_ignore(TagSeries.__table__, dialect_name), [
+                {"eq_id": eq_id, "tag_name": tag_name, "unit": unit, "revision": 0}
+                for eq_id, tag_name, unit in zip(missing["eq_id"], missing["tag_name"], missing["unit_x"])
+            ])
+            known = self._load_series(pairs)
+
+        fill = pairs.merge(known, on=["eq_id", "tag_name"], suffixes=("", "_stored"))
+        fill = fill[fill["unit"].notna() & fill["unit_stored"].isna()]
+        if not fill.empty:
+            self.db.execute(
+                update(TagSeries.__table__)
+                .where(TagSeries.id == bindparam("s_id"), TagSeries.unit.is_(None))
+                .values(unit=bindparam("s_unit")),
+                [{"s_id": int(series_id), "s_unit": unit} for series_id, unit in zip(fill["id"], fill["unit"])]
+            )
+
+        ids = frame[["eq_id", "tag_name"]].merge(known, on=["eq_id", "tag_name"], how="left")["id"]
+        return ids.to_numpy(dtype=np.int64)
+
+    def _load_series(self, pairs: pd.DataFrame) -> pd.DataFrame:
+        rows = self.db.execute(
+            select(TagSeries.id, TagSeries.eq_id, TagSeries.tag_name, TagSeries.unit).where(
+                TagSeries.eq_id.in_(pairs["eq_id"].unique().tolist()),
+                TagSeries.tag_name.in_(pairs["tag_name"].unique().tolist())
+            )
+        ).all()
+        return pd.DataFrame(rows, columns=["id", "eq_id", "tag_name", "unit"])
+
+    def mark_dirty(self, series_ids: np.ndarray, timestamps: pd.Series):
+        """series별 가장 이른 적재 시각을 dirty_from에 반영하고 revision 증가 (집계 재계산 대상)"""
+        earliest = pd.Series(timestamps.to_numpy(), index=series_ids).groupby(level=0).min()
+        dirty_from = bindparam("s_from")
+        self.db.execute(
+            update(TagSeries.__table__)
+            .where(TagSeries.id == bindparam("s_id"))
+            .values(
+                dirty_from=case(
+                    (or_(TagSeries.dirty_from.is_(None), TagSeries.dirty_from > dirty_from), dirty_from),
+                    else_=TagSeries.dirty_from
+                ),
+                revision=TagSeries.revision + 1
+            ),
+            [
+                {"s_id": int(series_id), "s_from": ts}
+                for series_id, ts in zip(earliest.index.tolist(), earliest.dt.to_pydatetime().tolist())
+            ]
+        )
+
+    @abstractmethod
+    def _write_chunk(self, points: pd.DataFrame) -> int:
+        """커밋 단위 하나 저장 (커밋은 write), 새로 저장된 행 수"""
+
+    def _executemany(self, table, columns: Dict[str, List]) -> int:
+        """
+        insert-ignore executemany (INGEST_BATCH_ROWS행씩)
+
+        ORM 객체 없이 Core insert를 한 번만 컴파일하고, 컬럼 타입 변환(bind processor)은 열 단위로
+        적용한 뒤 드라이버 executemany에 바로 넘긴다 (행마다 SQLAlchemy 파라미터 처리 생략).
+        """
+        dialect = self.db.get_bind().dialect
+        for name, values in columns.items():
+            processor = table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+            if processor is not None:
+                columns[name] = list(map(processor, values))
+
+        compiled = insert_ignore(table, dialect.name).compile(dialect=dialect, column_keys=list(columns))
+        if compiled.positional:
+            rows = list(zip(*(columns[key] for key in compiled.positiontup)))
+        else:
+            rows = [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+        inserted = 0
+        connection = self.db.connection()
+        for start in range(0, len(rows), settings.INGEST_BATCH_ROWS):
+            result = connection.exec_driver_sql(compiled.string, rows[start:start + settings.INGEST_BATCH_ROWS])
+            inserted += max(result.rowcount, 0)
+        return inserted
+
+
+def _units(points: pd.DataFrame) -> List[Optional[str]]:
+    if "unit" not in points.columns:
+        return [None] * len(points)
+    return points["unit"].astype(object).where(points["unit"].notna(), None).tolist()
+
+
+class WideTimeSeriesStore(TimeSeriesStore):
+    """tags_timeseries (행마다 설비/태그/단위 문자열, tag_series는 집계 재계산 추적용)"""
+
+    schema = "wide"
+    points_table = TimeSeriesTag.__table__
+    c = SimpleNamespace(
+        eq_id=TimeSeriesTag.eq_id,
+        tag_name=TimeSeriesTag.tag_name,
+        timestamp=TimeSeriesTag.timestamp,
+        value=TimeSeriesTag.value,
+        unit=TimeSeriesTag.unit,
+    )
+
+    def select(self, *columns) -> Select:
+        return select(*columns)
+
+    def unit(self, eq_id: str, tag_name: str) -> Optional[str]:
+        unit = self.db.execute(
+            select(TimeSeriesTag.unit)
+            .where(TimeSeriesTag.eq_id == eq_id, TimeSeriesTag.tag_name == tag_name)
+            .limit(1)
+        ).scalar()
+        if unit is None:
+            # 원본 행이 모두 봉인된 태그
+            unit = self.db.execute(
+                select(TagChunk.unit)
+                .where(TagChunk.eq_id == eq_id, TagChunk.tag_name == tag_name)
+                .limit(1)
+            ).scalar()
+        return unit
+
+    def series_keys(self) -> List[Tuple[str, str]]:
+        return [tuple(row) for row in self.db.execute(select(TimeSeriesTag.eq_id, TimeSeriesTag.tag_name).distinct()).all()]
+
+    def delete_range(self, eq_id: str, tag_name: str, start: datetime, end: datetime) -> int:
+        return self.db.execute(
+            delete(TimeSeriesTag).where(
+                TimeSeriesTag.eq_id == eq_id,
+                TimeSeriesTag.tag_name == tag_name,
+                TimeSeriesTag.timestamp >= start,
+                TimeSeriesTag.timestamp < end
+            )
+        ).rowcount
+
+    def _write_chunk(self, points: pd.DataFrame) -> int:
+        inserted = self._executemany(self.points_table, {
+            "eq_id": points["eq_id"].to_numpy(dtype=object).tolist(),
+            "tag_name": points["tag_name"].to_numpy(dtype=object).tolist(),
+            "timestamp": points["timestamp"].dt.to_pydatetime().tolist(),
+            "value": points["value"].to_numpy(dtype=np.float64).tolist(),
+            "unit": _units(points),
+        })
+        # 같은 트랜잭션에서 기록해야 집계기가 커밋된 점을 놓치지 않음
+        self.mark_dirty(self.series_ids(points), points["timestamp"])
+        return inserted
+
+
+class CompactTimeSeriesStore(TimeSeriesStore):
+    """
+    tag_series 사전 + tag_points 관측
+
+    조회는 사전 테이블에서 series_id를 찾은 뒤 (series_id, timestamp) 기본 키 범위를 읽는다.
+    """
+
+    schema = "compact"
+    points_table = TagPoint.__table__
+    c = SimpleNamespace(
+        eq_id=TagSeries.eq_id,
+        tag_name=TagSeries.tag_name,
+        timestamp=TagPoint.timestamp,
+        value=TagPoint.value,
+        unit=TagSeries.unit,
+    )
+
+    def select(self, *columns) -> Select:
+        return select(*columns).select_from(TagPoint).join(TagSeries, TagPoint.series_id == TagSeries.id)
+
+    def unit(self, eq_id: str, tag_name: str) -> Optional[str]:
+        return self.db.execute(
+            select(TagSeries.unit).where(TagSeries.eq_id == eq_id, TagSeries.tag_name == tag_name)
+        ).scalar()
+
+    def series_keys(self) -> List[Tuple[str, str]]:
+        return [tuple(row) for row in self.db.execute(select(TagSeries.eq_id, TagSeries.tag_name)).all()]
+
+    def delete_range(self, eq_id: str, tag_name: str, start: datetime, end: datetime) -> int:
+        series_id = (
+            select(TagSeries.id)
+            .where(TagSeries.eq_id == eq_id, TagSeries.tag_name == tag_name)
+            .scalar_subquery()
+        )
+        return self.db.execute(
+            delete(TagPoint).where(
+                TagPoint.series_id == series_id,
+                TagPoint.timestamp >= start,
+                TagPoint.timestamp < end
+            )
+        ).rowcount
+
+    def _write_chunk(self, points: pd.DataFrame) -> int:
+        series_ids = self.series_ids(points)
+        inserted = self._executemany(self.points_table, {
+            "series_id": series_ids.tolist(),
+            "timestamp": points["timestamp"].dt.to_pydatetime().tolist(),
+            "value": points["value"].to_numpy(dtype=np.float64).tolist(),
+        })
+        # 같은 트랜잭션에서 기록해야 집계기가 커밋된 점을 놓치지 않음
+        self.mark_dirty(series_ids, points["timestamp"])
+        return inserted
+
+
+def get_timeseries_store(db: Session) -> TimeSeriesStore:
+    """TIMESERIES_SCHEMA에 맞는 저장소"""
+    if settings.TIMESERIES_SCHEMA == "compact":
+        return CompactTimeSeriesStore(db)
+    if settings.TIMESERIES_SCHEMA == "wide":
+        return WideTimeSeriesStore(db)
+    raise ValueError(f"지원하지 않는 TIMESERIES_SCHEMA입니다: {settings.TIMESERIES_SCHEMA} (가능: {', '.join(TIMESERIES_SCHEMAS)})")
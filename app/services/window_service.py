@@ -0,0 +1,331 @@
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+import numpy as np
+
+from app.config import settings
+from app.services.timeseries_store import get_timeseries_store
+from app.utils.tag_mapping import TagFeatureMap
+from app.utils.tep_loader import TEPCache, write_cache
+from app.utils.time_alignment import AGGREGATIONS, align_to_grid, make_grid
+
+
+class WindowBatch:
+    """
+    설비별 모델 입력 윈도우
+
+    Attributes:
+        eq_ids: 설비 ID 목록 (windows 첫 축 순서)
+        windows: (n_equipments, sequence_length, n_features) float32
+        grid: (sequence_length,) 시간 격자 (datetime64[us])
+        n_observations: (n_equipments,) 조회 구간의 원본 관측 수
+        observed_features: (n_equipments,) 한 번이라도 관측된 변수 수
+        leading_filled: (n_equipments,) 윈도우 앞쪽에서 관측된 변수 중 일부가 아직 첫 관측
+            전이라 fill_values로 채운 격자 시점 수 (0이면 윈도우 전체가 실제 관측 기반)
+    """
+
+    def __init__(
+        self,
+        eq_ids: List[str],
+        windows: np.ndarray,
+        grid: np.ndarray,
+        n_observations: np.ndarray,
+        observed_features: np.ndarray,
+        leading_filled: Optional[np.ndarray] = None
+    ):
+        self.eq_ids = eq_ids
+        self.windows = windows
+        self.grid = grid
+        self.n_observations = n_observations
+        self.observed_features = observed_features
+        self.leading_filled = (
+            np.zeros(len(eq_ids), dtype=np.int64) if leading_filled is None else leading_filled
+        )
+
+    def __len__(self) -> int:
+        return len(self.eq_ids)
+
+    def window(self, eq_id: str) -> np.ndarray:
+        return self.windows[self.eq_ids.index(eq_id)]
+
+    def observations(self, eq_id: str) -> int:
+        return int(self.n_observations[self.eq_ids.index(eq_id)])
+
+
+class WindowAssembler:
+    """
+    tags_timeseries → (sequence_length, n_features) 모델 입력 조립
+
+    - ORM 객체 없이 (eq_id, timestamp, tag_name, value) 튜플만 조회
+    - 여러 설비를 IN 조건 한 번의 쿼리로 조회 (eq_id, tag_name, timestamp 인덱스 범위 스캔)
+    - TagFeatureMap으로 tag_name을 모델 변수에 매핑
+    - align_to_grid로 모든 (설비, 변수) 시계열을 고정 시간 격자에 한 번에 정렬 (last/mean)
+    - assemble_range로 연속 구간 전체를 정렬 (백필), export로 긴 기간을 학습용 memory-map
+      캐시(TEPCache 형식)로 저장
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        feature_names: List[str],
+        sequence_length: int = 60,
+        interval_seconds: float = 120.0,
+        fill_values: Optional[np.ndarray] = None,
+        lookback_seconds: float = 900.0,
+        aggregation: str = "last",
+        tag_map: Optional[TagFeatureMap] = None
+    ):
+        """
+        Args:
+            feature_names: 모델 입력 변수 순서
+            interval_seconds: 시간 격자 간격
+            fill_values: (n_features,) 관측이 전혀 없는 변수의 대체값 (None이면 0)
+            lookback_seconds: 첫 격자 시점 값을 채우기 위해 추가로 조회할 과거 구간
+            aggregation: 격자 구간 집계 방식 (last, mean)
+            tag_map: tag_name → 변수 매핑 (None이면 설정값)
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"지원하지 않는 집계 방식입니다: {aggregation} (가능: {', '.join(AGGREGATIONS)})")
+
+        self.db = db
+        self.feature_names = list(feature_names)
+        self.sequence_length = sequence_length
+        self.interval = timedelta(seconds=interval_seconds)
+        self.lookback = timedelta(seconds=lookback_seconds)
+        self.aggregation = aggregation
+        self.tag_map = tag_map or TagFeatureMap.from_settings()
+
+        n_features = len(self.feature_names)
+        self.fill_values = (
+            np.zeros(n_features, dtype=np.float32)
+            if fill_values is None
+            else np.asarray(fill_values, dtype=np.float32).reshape(n_features)
+        )
+
+    @classmethod
+    def for_predictor(cls, db: Session, predictor) -> "WindowAssembler":
+        """IntegratedPredictor의 변수 순서/윈도우 길이/기본값에 맞춘 조립기"""
+        return cls(
+            db,
+            feature_names=predictor.feature_names,
+            sequence_length=predictor.lstm.sequence_length,
+            interval_seconds=settings.WINDOW_INTERVAL_SEC,
+            fill_values=predictor.feature_defaults,
+            aggregation=settings.WINDOW_AGGREGATION
+        )
+
+    def time_grid(self, end: datetime) -> np.ndarray:
+        """end로 끝나는 sequence_length개 격자 시점"""
+        return make_grid(np.datetime64(end, "us"), self.sequence_length, np.timedelta64(self.interval))
+
+    def assemble(self, eq_id: str, end: Optional[datetime] = None) -> WindowBatch:
+        """단일 설비 윈도우"""
+        return self.assemble_batch([eq_id], end)
+
+    def assemble_batch(self, eq_ids: List[str], end: Optional[datetime] = None) -> WindowBatch:
+        """
+        여러 설비 윈도우를 한 번의 쿼리로 조립
+
+        Args:
+            eq_ids: 설비 ID 목록
+            end: 마지막 격자 시점 (None이면 현재 UTC)
+        """
+        eq_ids = list(eq_ids)
+        end = end or datetime.utcnow()
+        grid = self.time_grid(end)
+        # 첫 격자 시점의 값을 채우기 위해 lookback만큼 앞부터 조회
+        start = end - self.interval * (self.sequence_length - 1) - self.lookback
+
+        series, timestamps, values, n_observations = self._fetch(eq_ids, start, end)
+        windows, observed_features, leading_filled = self._align(len(eq_ids), grid, series, timestamps, values)
+
+        return WindowBatch(eq_ids, windows, grid, n_observations, observed_features, leading_filled)
+
+    def assemble_range(self, eq_ids: List[str], start: datetime, end: datetime):
+        """
+        start~end 격자 전체를 한 번의 쿼리로 정렬 (백필/export용 연속 구간)
+
+        Args:
+            start: 첫 격자 시점
+            end: 마지막 격자 시점 (start부터 interval 간격)
+
+        Returns:
+            grid (n_steps,), series (n_eq, n_steps, n_features) float32,
+            counts (n_eq, n_steps) 격자 구간 (grid - interval, grid]별 원본 관측 수
+        """
+        eq_ids = list(eq_ids)
+        interval = np.timedelta64(self.interval)
+        n_steps = int((end - start) / self.interval) + 1
+        grid = make_grid(np.datetime64(start, "us") + interval * (n_steps - 1), n_steps, interval)
+
+        # 첫 격자 시점의 값을 채우기 위해 lookback만큼 앞부터 조회
+        series, timestamps, values, _ = self._fetch(eq_ids, start - self.lookback, start + self.interval * (n_steps - 1))
+        aligned, _, _ = self._align(len(eq_ids), grid, series, timestamps, values)
+
+        # lookback 구간 관측은 첫 격자 값만 채우고 관측 수에는 넣지 않음
+        slot = np.searchsorted(grid, timestamps, side="left")
+        in_grid = timestamps > grid[0] - interval
+        eq_pos = series[in_grid] // len(self.feature_names)
+        counts = np.bincount(
+            eq_pos * n_steps + slot[in_grid],
+            minlength=len(eq_ids) * n_steps
+        ).reshape(len(eq_ids), n_steps)
+
+        return grid, aligned, counts
+
+    def export(
+        self,
+        eq_ids: List[str],
+        start: datetime,
+        end: datetime,
+        cache_path: str,
+        chunk_steps: int = 10_000
+    ) -> TEPCache:
+        """
+        기간 전체를 시간 격자에 정렬해 학습용 memory-map 캐시로 저장 (tags_timeseries export)
+
+        설비별로 chunk_steps 격자 시점씩 조회/정렬해 이어 쓰므로 기간 길이와 무관하게 메모리
+        사용량이 일정하다. 설비마다 하나의 구간 (fault 0, run = 설비 순번)으로 기록하며,
+        설비 순서는 manifest의 eq_ids에 남긴다.
+
+        Args:
+            start: 첫 격자 시점
+            end: 마지막 격자 시점 (start부터 interval 간격)
+            cache_path: 캐시 디렉토리 (TEPCache 형식)
+        """
+        eq_ids = list(eq_ids)
+        n_steps = int((end - start) / self.interval) + 1
+
+        def blocks():
+            for pos, eq_id in enumerate(eq_ids):
+                for offset in range(0, n_steps, chunk_steps):
+                    steps = min(chunk_steps, n_steps - offset)
+                    chunk_start = start + self.interval * offset
+                    _, aligned, _ = self.assemble_range([eq_id], chunk_start, chunk_start + self.interval * (steps - 1))
+                    yield 0, pos, aligned[0]
+
+        return write_cache(
+            cache_path,
+            blocks(),
+            self.feature_names,
+            source={
+                "eq_ids": eq_ids,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "interval_seconds": self.interval.total_seconds(),
+                "aggregation": self.aggregation
+            }
+        )
+
+    def _fetch(self, eq_ids: List[str], start: datetime, end: datetime):
+        """
+        (start, end] 관측을 (series, timestamps, values) 배열로 조회
+
+        series는 설비 순번 × 변수 수 + 변수 열 번호이며, 매핑되지 않는 태그는 제외한다.
+
+        Returns:
+            series, timestamps, values, n_observations (설비별 원본 관측 수)
+        """
+        n_eq, n_features = len(eq_ids), len(self.feature_names)
+
+        points = get_timeseries_store(self.db).fetch_points(
+            eq_ids,
+            self.tag_map.tags(eq_ids, self.feature_names),
+            start,
+            end,
+            start_inclusive=False,
+            end_inclusive=True
+        )
+
+        n_observations = np.zeros(n_eq, dtype=np.int64)
+        series = np.zeros(0, dtype=np.int64)
+        timestamps = np.zeros(0, dtype="datetime64[us]")
+        values = np.zeros(0, dtype=np.float64)
+
+        if not points.empty:
+            row_eq = points["eq_id"].to_numpy()
+            row_tag = points["tag_name"].to_numpy()
+
+            eq_index = {eq_id: i for i, eq_id in enumerate(eq_ids)}
+            eq_pos = np.fromiter((eq_index[e] for e in row_eq), dtype=np.int64, count=len(row_eq))
+            n_observations = np.bincount(eq_pos, minlength=n_eq)
+
+            # (설비, 태그) 고유 쌍만 매핑 조회 후 관측 전체에 펼침
+            tags, tag_code = np.unique(row_tag, return_inverse=True)
+            pair_code = eq_pos * len(tags) + tag_code
+            pairs, pair_inverse = np.unique(pair_code, return_inverse=True)
+            lookup = self.tag_map.columns(eq_ids, self.feature_names)
+            pair_col = np.array(
+                [lookup.get((int(p) // len(tags), tags[int(p) % len(tags)]), -1) for p in pairs],
+                dtype=np.int64
+            )
+            col_pos = pair_col[pair_inverse]
+
+            known = col_pos >= 0
+            series = (eq_pos * n_features + col_pos)[known]
+            timestamps = points["timestamp"].to_numpy()[known]
+            values = points["value"].to_numpy()[known]
+
+        return series, timestamps, values, n_observations
+
+    def _align(self, n_eq: int, grid: np.ndarray, series, timestamps, values):
+        """
+        관측을 격자에 정렬하고 관측이 없는 칸은 fill_values로 채움
+
+        첫 관측 이전 칸은 이후 값으로 채우지 않고 (미래 정보 누출 방지) 관측이 전혀 없는 변수와
+        같이 fill_values를 쓴다.
+
+        Returns:
+            windows (n_eq, n_steps, n_features) float32, observed_features (n_eq,),
+            leading_filled (n_eq,) 관측된 변수의 첫 관측 이전이라 fill_values로 채운 앞쪽 격자 시점 수
+        """
+        n_features, n_steps = len(self.feature_names), len(grid)
+
+        # (설비 × 변수, 격자) → (설비, 격자, 변수)
+        aligned = align_to_grid(
+            series,
+            timestamps,
+            values,
+            grid,
+            n_series=n_eq * n_features,
+            how=self.aggregation,
+            interval=np.timedelta64(self.interval)
+        ).reshape(n_eq, n_features, n_steps)
+
+        missing = np.isnan(aligned)
+        observed_features = (~missing[:, :, -1]).sum(axis=1)
+        # forward-fill 후 남은 NaN은 첫 관측 이전 칸뿐이므로 앞쪽 연속 구간
+        leading_filled = (missing & ~missing.all(axis=2, keepdims=True)).any(axis=1).sum(axis=1)
+        windows = np.where(missing, self.fill_values[np.newaxis, :, np.newaxis], aligned)
+        windows = np.ascontiguousarray(windows.transpose(0, 2, 1), dtype=np.float32)
+
+        return windows, observed_features, leading_filled
+
+
+def export_tags_cache(
+    eq_ids: List[str],
+    start: datetime,
+    end: datetime,
+    cache_path: str,
+    feature_names: Optional[List[str]] = None
+) -> TEPCache:
+    """
+    오프라인 작업(학습/보정/백테스트)용 tags_timeseries export (자체 세션 사용)
+
+    Args:
+        feature_names: 변수 순서 (None이면 TEP 52개 변수)
+    """
+    from app.database import SessionLocal
+    from app.utils.data_processor import TEPDataProcessor
+
+    db = SessionLocal()
+    try:
+        assembler = WindowAssembler(
+            db,
+            feature_names=feature_names or TEPDataProcessor().feature_names,
+            interval_seconds=settings.WINDOW_INTERVAL_SEC,
+            aggregation=settings.WINDOW_AGGREGATION
+        )
+        return assembler.export(eq_ids, start, end, cache_path)
+    finally:
+        db.close()
@@ -1,6 +1,90 @@
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Iterable, Iterator, Tuple, Optional
+
+from app.config import settings
+from app.utils.tep_loader import TEPCache, default_cache_dir, load_cache
+
+# 표준편차 분모 보정값
+NORMALIZE_EPS = 1e-8
+
+class OnlineNormalizer:
+    """
+    청크 단위 평균/표준편차 누적 (Welford / Chan 병렬 병합)
+    
+    전체 데이터를 메모리에 올리지 않고 partial_fit으로 통계를 누적한 뒤
+    transform으로 청크별 정규화를 적용한다. 결과는 normalize_data와 같다 (모분산 기준).
+    """
+    
+    def __init__(self, eps: float = NORMALIZE_EPS):
+        self.eps = eps
+        self.n_samples_seen_ = 0
+        self.mean_: Optional[np.ndarray] = None
+        self._m2: Optional[np.ndarray] = None  # 편차 제곱합
+    
+    def partial_fit(self, chunk: np.ndarray) -> "OnlineNormalizer":
+        """청크 (n, features) 통계 누적"""
+        chunk = np.asarray(chunk, dtype=np.float64)
+        n = chunk.shape[0]
+        if n == 0:
+            return self
+        
+        chunk_mean = chunk.mean(axis=0)
+        chunk_m2 = ((chunk - chunk_mean) ** 2).sum(axis=0)
+        return self._merge(n, chunk_mean, chunk_m2)
+    
+    def merge(self, other: "OnlineNormalizer") -> "OnlineNormalizer":
+        """다른 워커에서 누적한 통계 병합"""
+        if other.n_samples_seen_ == 0:
+            return self
+        return self._merge(other.n_samples_seen_, other.mean_, other._m2)
+    
+    def _merge(self, n_b: int, mean_b: np.ndarray, m2_b: np.ndarray) -> "OnlineNormalizer":
+        n_a = self.n_samples_seen_
+        if n_a == 0:
+            self.n_samples_seen_ = n_b
+            self.mean_ = mean_b.copy()
+            self._m2 = m2_b.copy()
+            return self
+        
+        n = n_a + n_b
+        delta = mean_b - self.mean_
+        self.mean_ = self.mean_ + delta * (n_b / n)
+        self._m2 = self._m2 + m2_b + delta ** 2 * (n_a * n_b / n)
+        self.n_samples_seen_ = n
+        return self
+    
+    @property
+    def var_(self) -> np.ndarray:
+        return self._m2 / self.n_samples_seen_
+    
+    @property
+    def std_(self) -> np.ndarray:
+        return np.sqrt(self.var_)
+    
+    def fit_chunks(self, chunks: Iterable[np.ndarray]) -> "OnlineNormalizer":
+        """청크 이터레이터 전체 통계 누적"""
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+    
+    def transform(self, chunk: np.ndarray, dtype=np.float32) -> np.ndarray:
+        """누적된 통계로 청크 정규화"""
+        if self.n_samples_seen_ == 0:
+            raise ValueError("partial_fit으로 통계를 먼저 누적해야 합니다")
+        scale = self.std_ + self.eps
+        return ((np.asarray(chunk, dtype=np.float64) - self.mean_) / scale).astype(dtype, copy=False)
+    
+    def inverse_transform(self, chunk: np.ndarray) -> np.ndarray:
+        return np.asarray(chunk, dtype=np.float64) * (self.std_ + self.eps) + self.mean_
+    
+    def stats(self) -> Dict[str, np.ndarray]:
+        """normalize_data와 같은 형식의 통계 {'mean', 'std'}"""
+        return {
+            'mean': self.mean_,
+            'std': self.std_
+        }
 
 class TEPDataProcessor:
     """Tennessee Eastman Process 데이터 전처리"""
@@ -13,12 +97,27 @@ class TEPDataProcessor:
         df = pd.read_csv(file_path)
         return df
     
+    def load_tep_cache(
+        self,
+        file_path: str,
+        cache_dir: Optional[str] = None,
+        rebuild: bool = False
+    ) -> TEPCache:
+        """
+        TEP 데이터를 memory-map 캐시로 로드 (최초 1회만 CSV 파싱)
+        
+        Args:
+            cache_dir: 캐시 디렉토리 (None이면 TEP_CACHE_DIR/<CSV 이름>)
+        """
+        cache_dir = cache_dir or default_cache_dir(file_path, settings.TEP_CACHE_DIR)
+        return load_cache(file_path, cache_dir, self.feature_names, rebuild=rebuild)
+    
     def normalize_data(self, data: np.ndarray) -> Tuple[np.ndarray, dict]:
         """데이터 정규화"""
         mean = np.mean(data, axis=0)
         std = np.std(data, axis=0)
         
-        normalized = (data - mean) / (std + 1e-8)
+        normalized = (data - mean) / (std + NORMALIZE_EPS)
         
         stats = {
             'mean': mean,
@@ -27,18 +126,48 @@ class TEPDataProcessor:
         
         return normalized, stats
     
+    def fit_normalizer(self, chunks: Iterable[np.ndarray]) -> OnlineNormalizer:
+        """메모리에 다 올릴 수 없는 데이터의 정규화 통계 (청크 단위)"""
+        return OnlineNormalizer().fit_chunks(chunks)
+    
     def create_sequences(
         self,
         data: np.ndarray,
-        sequence_length: int = 60
+        sequence_length: int = 60,
+        step: int = 1
     ) -> np.ndarray:
-        """시계열 시퀀스 생성"""
-        sequences = []
+        """
+        시계열 시퀀스 생성 (복사 없는 strided view)
+        
+        Returns:
+            (n_windows, sequence_length, features) 읽기 전용 view
+            (수정이 필요하거나 연속 메모리가 필요하면 np.ascontiguousarray로 복사)
+        """
+        data = np.asarray(data)
+        if len(data) < sequence_length:
+            return np.empty((0, sequence_length) + data.shape[1:], dtype=data.dtype)
+        
+        # (n_windows, features, sequence_length) → (n_windows, sequence_length, features)
+        windows = sliding_window_view(data, sequence_length, axis=0)
+        windows = np.moveaxis(windows, -1, 1)
         
-        for i in range(len(data) - sequence_length + 1):
-            sequences.append(data[i:i+sequence_length])
+        return windows[::step]
+    
+    def iter_sequence_batches(
+        self,
+        data: np.ndarray,
+        sequence_length: int = 60,
+        batch_size: int = 256,
+        step: int = 1
+    ) -> Iterator[np.ndarray]:
+        """
+        시퀀스를 batch_size개씩 연속 메모리 배치로 생성
         
-        return np.array(sequences)
+        한 번에 batch_size개 윈도우만 복사하므로 memmap 등 큰 배열에서도 메모리 사용량이 일정하다.
+        """
+        windows = self.create_sequences(data, sequence_length, step)
+        for start in range(0, len(windows), batch_size):
+            yield np.ascontiguousarray(windows[start:start + batch_size])
     
     def detect_outliers(self, data: np.ndarray, threshold: float = 3.0) -> np.ndarray:
         """이상치 탐지 (Z-score 방법)"""
@@ -0,0 +1,104 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+# 다운샘플링 방식
+# - lttb: Largest-Triangle-Three-Buckets (모양 보존, 원본 점 중 선택)
+# - minmax: 시간 구간별 최소/최대/평균 (envelope 차트)
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링
+
+    첫/마지막 점을 고정하고 나머지를 n_out - 2개 구간으로 나눈 뒤, 구간마다 (직전 선택 점,
+    다음 구간 평균)과 이루는 삼각형 넓이가 가장 큰 점을 고른다. 다음 구간 평균은 누적합으로
+    한 번에 계산하고, 직전 선택 점에 의존하는 구간 순회만 구간 수만큼 반복한다.
+
+    Args:
+        x: (n,) 정렬된 x 값 (시간은 float 초로 변환해서 전달)
+        y: (n,) 값
+        n_out: 출력 점 수
+
+    Returns:
+        선택된 점 인덱스 (오름차순, 길이 min(n, n_out))
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.int64)[:max(n_out, 0)]
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 가운데 점 [1, n-1)을 n_out - 2개 구간으로 분할 (구간 크기 >= 1)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    edges[-1] = n - 1
+
+    # 구간별 평균 (누적합), 마지막 구간의 "다음 구간"은 마지막 점
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = np.diff(edges)
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / sizes
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / sizes
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        # 삼각형 넓이 x2 (상수배는 비교에 영향 없음)
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def bucket_envelope(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    n_buckets: int,
+    start: Optional[np.datetime64] = None,
+    end: Optional[np.datetime64] = None
+) -> Dict[str, np.ndarray]:
+    """
+    같은 시간 폭 구간별 최소/최대/평균 (빈 구간은 제외)
+
+    Args:
+        timestamps: (n,) 정렬된 datetime64
+        values: (n,) 값
+        n_buckets: 구간 수
+        start, end: 구간 분할 범위 (None이면 첫/마지막 관측 시각)
+
+    Returns:
+        timestamp (구간 첫 관측 시각), count, min, max, mean: (n_nonempty,) 배열
+    """
+    timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+    values = np.asarray(values, dtype=np.float64)
+    if len(timestamps) == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return {"timestamp": timestamps, "count": np.zeros(0, dtype=np.int64), "min": empty, "max": empty, "mean": empty}
+
+    ticks = timestamps.astype(np.int64)
+    lo = ticks[0] if start is None else np.datetime64(start, "us").astype(np.int64)
+    hi = ticks[-1] if end is None else np.datetime64(end, "us").astype(np.int64)
+    span = max(int(hi - lo) + 1, 1)
+
+    bucket = np.clip((ticks - lo) * n_buckets // span, 0, n_buckets - 1)
+    starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+    count = np.diff(np.append(starts, len(values)))
+
+    return {
+        "timestamp": timestamps[starts],
+        "count": count,
+        "min": np.minimum.reduceat(values, starts),
+        "max": np.maximum.reduceat(values, starts),
+        "mean": np.add.reduceat(values, starts) / count
+    }
@@ -0,0 +1,181 @@
+import struct
+from typing import Tuple
+
+import numpy as np
+
+# Gorilla 방식 시계열 청크 인코딩 (delta-of-delta 시각 + XOR 실수)
+#
+# 원래 Gorilla는 점마다 가변 길이 제어 비트를 이어 쓰므로 한 점씩 순서대로만 풀 수 있다.
+# 여기서는 같은 정보를 고정 폭 헤더 스트림과 가변 폭 값 스트림으로 나눠 저장해서,
+# 헤더를 먼저 벡터로 풀고, 헤더로 구한 비트 위치에서 값 스트림을 한 번에 읽어 복원한다.
+#
+# 레이아웃 (little-endian 헤더 + 5개 비트 스트림)
+#   version u8, n u32, 첫 시각 i64 (us), 첫 간격 i64 (us), 첫 값 비트 u64, 스트림 길이 u32 x 5
+#   1) 시각 구간 (점당 2비트, 모든 delta-of-delta가 0이면 생략)
+#   2) 시각 값 (zigzag delta-of-delta, 구간별 DOD_WIDTHS 비트)
+#   3) 실수 변경 여부 (점당 1비트, 직전 값과 같으면 0)
+#   4) 실수 헤더 (바뀐 점만 13비트: 앞쪽 0 비트 수 6 + 유효 비트 수 7)
+#   5) 실수 값 (바뀐 점만 직전 값과 XOR한 유효 비트)
+CHUNK_VERSION = 1
+_HEADER = struct.Struct("<BIqqQIIIII")
+
+# delta-of-delta 구간별 zigzag 비트 수 (0: 일정 간격, 8/24: 지터, 64: 결측/불규칙)
+DOD_WIDTHS = np.array([0, 8, 24, 64], dtype=np.int64)
+DOD_CLASS_BITS = 2
+LEADING_BITS = 6
+LENGTH_BITS = 7
+
+_COLUMNS = np.arange(64, dtype=np.int8)
+
+
+def _bits(words: np.ndarray) -> np.ndarray:
+    """uint64 → (n, 64) 비트 행렬 (최상위 비트 먼저)"""
+    return np.unpackbits(words.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+
+
+def _words(bits: np.ndarray) -> np.ndarray:
+    """(n, 64) 비트 행렬 → uint64"""
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def _field_mask(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """점마다 비트 [start, start + length) 위치 (최상위 비트 = 0, 비교는 int8로)"""
+    starts = starts.astype(np.int8)
+    stops = starts + lengths.astype(np.int8)
+    return (_COLUMNS >= starts[:, None]) & (_COLUMNS < stops[:, None])
+
+
+def _pack_fields(words: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> bytes:
+    """word마다 비트 [start, start + length)를 순서대로 이어 붙인 바이트열"""
+    if not len(words):
+        return b""
+    return np.packbits(_bits(words)[_field_mask(starts, lengths)]).tobytes()
+
+
+def _unpack_fields(buffer, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    _pack_fields의 역변환 (지정 위치 밖의 비트는 0)
+
+    필드마다 시작 비트가 든 바이트부터 9바이트를 모아 64비트로 맞춘 뒤 시프트한다
+    (비트 행렬 없이 점당 9바이트만 읽음).
+    """
+    n = len(starts)
+    if not n:
+        return np.zeros(0, dtype=np.uint64)
+    starts = starts.astype(np.uint64)
+    lengths = lengths.astype(np.uint64)
+    offsets = np.cumsum(lengths) - lengths
+
+    stream = np.concatenate([np.frombuffer(buffer, dtype=np.uint8), np.zeros(9, dtype=np.uint8)])
+    first_byte = (offsets >> np.uint64(3)).astype(np.int64)
+    shift = offsets & np.uint64(7)
+    window = np.lib.stride_tricks.sliding_window_view(stream, 8)[first_byte].copy().view(">u8").ravel().astype(np.uint64)
+    spill = stream[first_byte + 8].astype(np.uint64)
+    aligned = (window << shift) | (spill >> (np.uint64(8) - shift))
+
+    # 길이 0 필드는 64비트 시프트(정의되지 않음) 대신 0
+    present = lengths > 0
+    field = aligned >> np.where(present, np.uint64(64) - lengths, np.uint64(0))
+    placed = field << np.where(present, np.uint64(64) - starts - lengths, np.uint64(0))
+    return np.where(present, placed, np.uint64(0))
+
+
+def _fixed(n: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """하위 width비트 고정 폭 필드의 (start, length)"""
+    return np.full(n, 64 - width, dtype=np.int64), np.full(n, width, dtype=np.int64)
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64)
+    return ((values >> np.uint64(1)) ^ (np.uint64(0) - (values & np.uint64(1)))).view(np.int64)
+
+
+def encode(timestamps: np.ndarray, values: np.ndarray) -> bytes:
+    """
+    시간순 (timestamp, value) → 청크 바이트열
+
+    Args:
+        timestamps: (n,) datetime64 또는 int64 epoch 마이크로초 (오름차순)
+        values: (n,) float64
+    """
+    ticks = np.asarray(timestamps).astype("datetime64[us]").astype(np.int64)
+    words = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    n = len(ticks)
+
+    deltas = np.diff(ticks)
+    dod = _zigzag(np.diff(deltas))
+    dod_class = (
+        (dod >= np.uint64(1)).astype(np.int64)
+        + (dod >= np.uint64(1 << 8))
+        + (dod >= np.uint64(1 << 24))
+    )
+    widths = DOD_WIDTHS[dod_class]
+    ts_classes = _pack_fields(dod_class.astype(np.uint64), *_fixed(len(dod), DOD_CLASS_BITS)) if dod_class.any() else b""
+    ts_payload = _pack_fields(dod, 64 - widths, widths)
+
+    xor = words[1:] ^ words[:-1]
+    changed = xor != 0
+    xor = xor[changed]
+    xor_bits = _bits(xor)
+    leading = np.argmax(xor_bits, axis=1)
+    lengths = 64 - leading - np.argmax(xor_bits[:, ::-1], axis=1)
+    headers = ((leading << LENGTH_BITS) | lengths).astype(np.uint64)
+    value_flags = np.packbits(changed).tobytes()
+    value_headers = _pack_fields(headers, *_fixed(len(headers), LEADING_BITS + LENGTH_BITS))
+    value_payload = _pack_fields(xor, leading, lengths)
+
+    header = _HEADER.pack(
+        CHUNK_VERSION,
+        n,
+        int(ticks[0]) if n else 0,
+        int(deltas[0]) if n > 1 else 0,
+        int(words[0]) if n else 0,
+        len(ts_classes),
+        len(ts_payload),
+        len(value_flags),
+        len(value_headers),
+        len(value_payload)
+    )
+    return header + ts_classes + ts_payload + value_flags + value_headers + value_payload
+
+
+def decode(buffer) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    청크 바이트열 → (timestamps datetime64[us], values float64)
+
+    점 단위 반복 없이 비트 스트림을 행렬로 복원한 뒤 누적합/누적 XOR로 값을 되돌린다.
+    """
+    buffer = memoryview(buffer)
+    version, n, first_tick, first_delta, first_word, *sizes = _HEADER.unpack_from(buffer)
+    if version != CHUNK_VERSION:
+        raise ValueError(f"지원하지 않는 청크 버전입니다: {version}")
+    if n == 0:
+        return np.zeros(0, dtype="datetime64[us]"), np.zeros(0, dtype=np.float64)
+
+    offsets = np.cumsum([_HEADER.size] + sizes)
+    ts_classes, ts_payload, value_flags, value_headers, value_payload = (
+        buffer[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])
+    )
+
+    n_dod = max(n - 2, 0)
+    if len(ts_classes):
+        dod_class = _unpack_fields(ts_classes, *_fixed(n_dod, DOD_CLASS_BITS)).astype(np.int64)
+    else:
+        dod_class = np.zeros(n_dod, dtype=np.int64)
+    widths = DOD_WIDTHS[dod_class]
+    dod = _unzigzag(_unpack_fields(ts_payload, 64 - widths, widths))
+    deltas = first_delta + np.concatenate([[0], np.cumsum(dod)]) if n > 1 else np.zeros(0, dtype=np.int64)
+    ticks = first_tick + np.concatenate([[0], np.cumsum(deltas)])
+
+    changed = np.unpackbits(np.frombuffer(value_flags, dtype=np.uint8), count=n - 1).astype(bool)
+    headers = _unpack_fields(value_headers, *_fixed(int(changed.sum()), LEADING_BITS + LENGTH_BITS)).astype(np.int64)
+    xor = np.zeros(n - 1, dtype=np.uint64)
+    xor[changed] = _unpack_fields(value_payload, headers >> LENGTH_BITS, headers & ((1 << LENGTH_BITS) - 1))
+    words = np.bitwise_xor.accumulate(np.concatenate([np.array([first_word], dtype=np.uint64), xor]))
+
+    return ticks.astype("datetime64[us]"), words.view(np.float64)
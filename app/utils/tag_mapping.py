@@ -0,0 +1,69 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from app.config import settings
+
+
+class TagFeatureMap:
+    """
+    설비별 tag_name → 모델 변수명 매핑
+
+    - default: 모든 설비에 적용되는 매핑 (None이면 settings.TAG_FEATURE_MAP)
+    - equipments: 설비별 덮어쓰기 ({eq_id: {tag_name: feature_name}})
+    - 모델 변수명과 같은 tag_name(XMEAS_1 등)은 매핑 없이 그대로 사용
+    """
+
+    def __init__(
+        self,
+        default: Optional[Dict[str, str]] = None,
+        equipments: Optional[Dict[str, Dict[str, str]]] = None
+    ):
+        self.default = dict(settings.TAG_FEATURE_MAP if default is None else default)
+        self.equipments = {eq_id: dict(mapping) for eq_id, mapping in (equipments or {}).items()}
+
+    @classmethod
+    def from_file(cls, path: str) -> "TagFeatureMap":
+        """
+        JSON 파일에서 로드
+
+        {"default": {"temperature": "XMEAS_9", ...}, "equipments": {"R-01": {...}}}
+        """
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config.get("default"), config.get("equipments"))
+
+    @classmethod
+    def from_settings(cls) -> "TagFeatureMap":
+        """TAG_FEATURE_MAP_PATH가 있으면 파일, 없으면 TAG_FEATURE_MAP 사용"""
+        if settings.TAG_FEATURE_MAP_PATH and os.path.exists(settings.TAG_FEATURE_MAP_PATH):
+            return cls.from_file(settings.TAG_FEATURE_MAP_PATH)
+        return cls()
+
+    def for_equipment(self, eq_id: str) -> Dict[str, str]:
+        """설비에 적용되는 tag_name → 변수명 매핑"""
+        overrides = self.equipments.get(eq_id)
+        if not overrides:
+            return self.default
+        return {**self.default, **overrides}
+
+    def tags(self, eq_ids: Iterable[str], feature_names: List[str]) -> List[str]:
+        """조회 대상 tag_name 목록 (매핑된 태그 + 변수명과 같은 태그)"""
+        features = set(feature_names)
+        tags = set(features)
+        for eq_id in eq_ids:
+            tags.update(tag for tag, feature in self.for_equipment(eq_id).items() if feature in features)
+        return sorted(tags)
+
+    def columns(self, eq_ids: List[str], feature_names: List[str]) -> Dict[tuple, int]:
+        """(설비 순번, tag_name) → 변수 열 번호"""
+        index = {name: i for i, name in enumerate(feature_names)}
+        lookup = {}
+        for pos, eq_id in enumerate(eq_ids):
+            mapping = self.for_equipment(eq_id)
+            for name, col in index.items():
+                lookup[(pos, name)] = col
+            for tag, feature in mapping.items():
+                if feature in index:
+                    lookup[(pos, tag)] = index[feature]
+        return lookup
@@ -0,0 +1,315 @@
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 캐시 디렉토리 구성 (CSV 파일마다 하나)
+# cache/<csv 이름>/
+#   manifest.json   원본 CSV 정보(크기/수정 시각), 행 수, 변수 순서
+#   features.f32    (n_rows, n_features) float32 행 우선 배열 (np.memmap)
+#   runs.npy        (n_runs, 4) int64 [faultNumber, simulationRun, start, stop] 연속 구간
+CACHE_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+FEATURES_FILE = "features.f32"
+RUNS_FILE = "runs.npy"
+
+FAULT_COLUMN = "faultNumber"
+RUN_COLUMN = "simulationRun"
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def _source_signature(csv_path: str) -> Dict:
+    stat = os.stat(csv_path)
+    return {
+        "path": os.path.abspath(csv_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+
+def default_cache_dir(csv_path: str, cache_root: str) -> str:
+    """cache_root/<CSV 파일명(확장자 제외)>"""
+    return os.path.join(cache_root, os.path.splitext(os.path.basename(csv_path))[0])
+
+
+class TEPCache:
+    """
+    TEP CSV를 변환한 memory-map 캐시
+
+    변수 값은 float32 2-D 배열 하나로 두고 np.memmap으로 열기 때문에 여는 비용은
+    manifest/runs 읽기뿐이며, 행 슬라이스는 실제로 접근한 페이지만 읽는다.
+    """
+
+    def __init__(self, path: str, manifest: Dict, features: np.ndarray, runs: np.ndarray):
+        self.path = path
+        self.manifest = manifest
+        self.feature_names: List[str] = list(manifest["feature_names"])
+        self.features = features
+        self.runs = runs
+
+    @classmethod
+    def open(cls, path: str) -> "TEPCache":
+        """캐시 디렉토리 열기 (변수 배열은 읽기 전용 memory-map)"""
+        with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format") != CACHE_FORMAT:
+            raise ValueError(f"지원하지 않는 캐시 형식입니다: {manifest.get('format')}")
+
+        shape = (int(manifest["n_rows"]), len(manifest["feature_names"]))
+        if shape[0] == 0:
+            features = np.zeros(shape, dtype=np.float32)
+        else:
+            features = np.memmap(
+                os.path.join(path, manifest["files"]["features"]),
+                dtype=np.float32,
+                mode="r",
+                shape=shape
+            )
+        runs = np.load(os.path.join(path, manifest["files"]["runs"]))
+        return cls(path, manifest, features, runs)
+
+    @property
+    def n_rows(self) -> int:
+        return self.features.shape[0]
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def is_fresh(self, csv_path: str) -> bool:
+        """원본 CSV가 캐시 생성 이후 바뀌지 않았는지 확인"""
+        source = self.manifest["source"]
+        current = _source_signature(csv_path)
+        return source.get("size") == current["size"] and source.get("mtime_ns") == current["mtime_ns"]
+
+    def rows(self, start: int = 0, stop: Optional[int] = None, columns: Optional[List[str]] = None) -> np.ndarray:
+        """
+        행 범위 슬라이스 (columns를 주지 않으면 복사 없는 memmap view)
+
+        Args:
+            columns: 변수명 목록 (주면 해당 열만 복사해 반환)
+        """
+        block = self.features[start:stop]
+        if columns is None:
+            return block
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        return block[:, [index[name] for name in columns]]
+
+    def select_runs(
+        self,
+        faults: Optional[Iterable[int]] = None,
+        runs: Optional[Iterable[int]] = None
+    ) -> np.ndarray:
+        """
+        조건에 맞는 (faultNumber, simulationRun, start, stop) 구간
+
+        Args:
+            faults: 고장 번호 목록 (None이면 전체, 0은 정상 운전)
+            runs: 시뮬레이션 번호 목록 (None이면 전체)
+        """
+        mask = np.ones(len(self.runs), dtype=bool)
+        if faults is not None:
+            mask &= np.isin(self.runs[:, 0], list(faults))
+        if runs is not None:
+            mask &= np.isin(self.runs[:, 1], list(runs))
+        return self.runs[mask]
+
+    def iter_runs(
+        self,
+        faults: Optional[Iterable[int]] = None,
+        runs: Optional[Iterable[int]] = None
+    ) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """조건에 맞는 구간별 (faultNumber, simulationRun, (rows, features) memmap view)"""
+        for fault, run, start, stop in self.select_runs(faults, runs):
+            yield int(fault), int(run), self.features[start:stop]
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+        """전체 행을 chunk_size 단위 view로 순회 (OnlineNormalizer.partial_fit 등)"""
+        for start in range(0, self.n_rows, chunk_size):
+            yield self.features[start:start + chunk_size]
+
+    def labels(self) -> np.ndarray:
+        """(n_rows,) 행별 faultNumber (runs 구간에서 펼침)"""
+        lengths = self.runs[:, 3] - self.runs[:, 2]
+        return np.repeat(self.runs[:, 0], lengths)
+
+    def info(self) -> Dict:
+        return {
+            "path": self.path,
+            "source": self.manifest["source"].get("path"),
+            "n_rows": self.n_rows,
+            "n_features": len(self.feature_names),
+            "n_runs": len(self.runs),
+            "faults": sorted(set(int(f) for f in self.runs[:, 0]))
+        }
+
+
+def _resolve_columns(header: List[str], feature_names: List[str]) -> Dict[str, str]:
+    """CSV 헤더에서 변수/라벨 열 찾기 (대소문자 무시, xmeas_1 ↔ XMEAS_1)"""
+    by_lower = {column.lower(): column for column in header}
+
+    missing = [name for name in feature_names if name.lower() not in by_lower]
+    if missing:
+        raise ValueError(f"CSV에 없는 변수가 있습니다: {', '.join(missing[:5])} ({len(missing)}개)")
+
+    resolved = {name: by_lower[name.lower()] for name in feature_names}
+    for column in (FAULT_COLUMN, RUN_COLUMN):
+        if column.lower() in by_lower:
+            resolved[column] = by_lower[column.lower()]
+    return resolved
+
+
+def write_cache(
+    cache_path: str,
+    blocks: Iterable[Tuple[int, int, np.ndarray]],
+    feature_names: List[str],
+    source: Optional[Dict] = None
+) -> TEPCache:
+    """
+    (faultNumber, simulationRun, (rows, features)) 블록을 순서대로 이어 써서 캐시 생성
+
+    블록 하나씩만 메모리에 두므로 전체 크기와 무관하게 변환할 수 있다. 같은 (fault, run)
+    블록이 연달아 오면 하나의 구간으로 합친다. 임시 디렉토리에 만든 뒤 교체하므로
+    변환 도중 실패해도 기존 캐시는 유지된다.
+
+    Args:
+        source: manifest에 기록할 원본 정보 (CSV면 _source_signature)
+    """
+    n_features = len(feature_names)
+    parent = os.path.dirname(os.path.abspath(cache_path))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".tep_cache_", dir=parent)
+
+    try:
+        n_rows = 0
+        segments: List[List[int]] = []  # [fault, run, start, stop]
+
+        with open(os.path.join(staging, FEATURES_FILE), "wb") as out:
+            for fault, run, block in blocks:
+                block = np.ascontiguousarray(block, dtype=np.float32)
+                if block.ndim != 2 or block.shape[1] != n_features:
+                    raise ValueError(f"블록 shape이 올바르지 않습니다: {block.shape} (변수 {n_features}개)")
+                if len(block) == 0:
+                    continue
+                out.write(block.tobytes())
+
+                key = [int(fault), int(run)]
+                if segments and segments[-1][:2] == key and segments[-1][3] == n_rows:
+                    segments[-1][3] = n_rows + len(block)
+                else:
+                    segments.append(key + [n_rows, n_rows + len(block)])
+                n_rows += len(block)
+
+        np.save(os.path.join(staging, RUNS_FILE), np.asarray(segments, dtype=np.int64).reshape(-1, 4))
+
+        manifest = {
+            "format": CACHE_FORMAT,
+            "source": source or {},
+            "n_rows": n_rows,
+            "feature_names": list(feature_names),
+            "dtype": "float32",
+            "files": {
+                "features": FEATURES_FILE,
+                "runs": RUNS_FILE
+            }
+        }
+        with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        os.chmod(staging, 0o755)
+        if os.path.isdir(cache_path):
+            shutil.rmtree(cache_path)
+        os.replace(staging, cache_path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    print(f"✅ TEP 캐시 생성 완료: {cache_path} ({n_rows} rows, {len(segments)} runs)")
+    return TEPCache.open(cache_path)
+
+
+def _csv_blocks(
+    csv_path: str,
+    columns: Dict[str, str],
+    feature_names: List[str],
+    chunk_size: int
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """CSV 청크를 (fault, run)이 바뀌는 행에서 나눈 블록"""
+    feature_columns = [columns[name] for name in feature_names]
+    label_columns = [columns[c] for c in (FAULT_COLUMN, RUN_COLUMN) if c in columns]
+
+    dtype = {column: np.float32 for column in feature_columns}
+    dtype.update({column: np.int64 for column in label_columns})
+
+    reader = pd.read_csv(
+        csv_path,
+        usecols=feature_columns + label_columns,
+        dtype=dtype,
+        chunksize=chunk_size
+    )
+    for chunk in reader:
+        values = chunk[feature_columns].to_numpy(dtype=np.float32)
+
+        n = len(chunk)
+        fault = chunk[columns[FAULT_COLUMN]].to_numpy() if FAULT_COLUMN in columns else np.zeros(n, np.int64)
+        run = chunk[columns[RUN_COLUMN]].to_numpy() if RUN_COLUMN in columns else np.zeros(n, np.int64)
+
+        change = np.flatnonzero((fault[1:] != fault[:-1]) | (run[1:] != run[:-1])) + 1
+        starts = np.concatenate([[0], change])
+        stops = np.concatenate([change, [n]])
+        for start, stop in zip(starts, stops):
+            yield int(fault[start]), int(run[start]), values[start:stop]
+
+
+def build_cache(
+    csv_path: str,
+    cache_path: str,
+    feature_names: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> TEPCache:
+    """
+    TEP CSV → memory-map 캐시 변환
+
+    CSV를 chunk_size 행씩 float32로 읽어 이어 쓰므로 메모리 사용량은 청크 하나 크기로 일정하다.
+    faultNumber/simulationRun 열이 없으면 모두 (0, 0) 구간으로 본다.
+    """
+    try:
+        header = list(pd.read_csv(csv_path, nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        raise ValueError(f"빈 CSV 파일입니다: {csv_path}")
+
+    columns = _resolve_columns(header, feature_names)
+    return write_cache(
+        cache_path,
+        _csv_blocks(csv_path, columns, feature_names, chunk_size),
+        feature_names,
+        source=_source_signature(csv_path)
+    )
+
+
+def load_cache(
+    csv_path: str,
+    cache_path: str,
+    feature_names: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    rebuild: bool = False
+) -> TEPCache:
+    """
+    캐시가 있고 원본 CSV와 일치하면 memory-map으로 열고, 아니면 CSV에서 다시 변환
+
+    Args:
+        rebuild: True면 캐시 상태와 무관하게 다시 변환
+    """
+    if not rebuild and os.path.isfile(os.path.join(cache_path, MANIFEST_NAME)):
+        cache = TEPCache.open(cache_path)
+        if not os.path.exists(csv_path):
+            return cache
+        if cache.is_fresh(csv_path) and cache.feature_names == list(feature_names):
+            return cache
+
+    return build_cache(csv_path, cache_path, feature_names, chunk_size)
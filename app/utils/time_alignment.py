@@ -0,0 +1,120 @@
+import numpy as np
+from typing import Optional
+
+# 격자 구간 집계 방식
+# - last: 격자 시점 이전의 가장 최근 값 (as-of join)
+# - mean: (격자 시점 - interval, 격자 시점] 구간 평균 (빈 구간은 forward-fill)
+# 첫 관측 이전 격자 칸은 NaN으로 남김 (이후 값으로 채우면 미래 정보가 앞 시점으로 샘)
+AGGREGATIONS = ("last", "mean")
+
+
+def make_grid(end: np.datetime64, n_steps: int, interval: np.timedelta64) -> np.ndarray:
+    """end로 끝나는 n_steps개 등간격 시간 격자 (datetime64[us])"""
+    end = np.datetime64(end, "us")
+    interval = np.timedelta64(interval, "us")
+    return end + np.arange(-(n_steps - 1), 1) * interval
+
+
+def forward_fill(data: np.ndarray, backfill: bool = False) -> np.ndarray:
+    """
+    마지막 축 기준 NaN forward-fill
+
+    Args:
+        data: (..., n_steps)
+        backfill: True면 앞쪽 결측을 첫 관측값으로 채움 (이후 값을 앞 시점에 쓰므로 시점별
+            추론/채점 입력에는 사용하지 않음). False면 첫 관측 이전은 NaN 유지
+    """
+    observed = ~np.isnan(data)
+    steps = np.arange(data.shape[-1])
+
+    source = np.maximum.accumulate(np.where(observed, steps, -1), axis=-1)
+    if backfill:
+        first_seen = np.argmax(observed, axis=-1)[..., np.newaxis]
+        source = np.where(source >= 0, source, first_seen)
+    else:
+        source = np.maximum(source, 0)
+
+    filled = np.take_along_axis(data, source, axis=-1)
+    if not backfill:
+        filled = np.where(np.maximum.accumulate(observed, axis=-1), filled, np.nan)
+    return filled
+
+
+def align_to_grid(
+    series: np.ndarray,
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    grid: np.ndarray,
+    n_series: int,
+    how: str = "last",
+    interval: Optional[np.timedelta64] = None,
+    fill: bool = True
+) -> np.ndarray:
+    """
+    여러 불규칙 시계열을 공통 시간 격자에 한 번에 정렬
+
+    (series, timestamp, value) 관측을 격자 칸 (series, step)에 벡터 연산으로 배치한다.
+    첫 격자 구간 이전의 관측은 첫 시점 값을 채우는 용도로만 사용한다.
+
+    Args:
+        series: (n,) 관측별 시계열 번호 (0 ~ n_series-1)
+        timestamps: (n,) 관측 시각 (datetime64, 정렬 불필요)
+        values: (n,) 관측값
+        grid: (n_steps,) 격자 시점 (오름차순, 등간격)
+        how: "last" 또는 "mean"
+        interval: 격자 간격 (None이면 grid에서 계산)
+        fill: True면 빈 칸을 forward-fill (첫 관측 이전 칸은 NaN 유지)
+
+    Returns:
+        (n_series, n_steps) float32, 관측이 없는 시계열과 첫 관측 이전 칸은 NaN
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"지원하지 않는 집계 방식입니다: {how} (가능: {', '.join(AGGREGATIONS)})")
+
+    grid = np.asarray(grid, dtype="datetime64[us]")
+    n_steps = len(grid)
+    if interval is None:
+        interval = grid[1] - grid[0] if n_steps > 1 else np.timedelta64(0, "us")
+
+    # 0번 칸은 첫 격자 구간 이전 관측 (seed), 1~n_steps번 칸이 격자 시점
+    edges = np.concatenate([[grid[0] - np.timedelta64(interval, "us")], grid])
+    out = np.full((n_series, n_steps + 1), np.nan, dtype=np.float64)
+
+    timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+    in_range = timestamps <= grid[-1]
+    series = np.asarray(series, dtype=np.int64)[in_range]
+    timestamps = timestamps[in_range]
+    values = np.asarray(values, dtype=np.float64)[in_range]
+
+    if len(values):
+        slot = np.searchsorted(edges, timestamps, side="left")
+        cell = series * (n_steps + 1) + slot
+        flat = out.reshape(-1)
+
+        if how == "last":
+            # 시각 순으로 정렬 후 칸별 마지막 관측만 남김
+            order = np.argsort(timestamps, kind="stable")
+            cell, values = cell[order], values[order]
+            _, first_in_reversed = np.unique(cell[::-1], return_index=True)
+            latest = len(cell) - 1 - first_in_reversed
+            flat[cell[latest]] = values[latest]
+        else:
+            size = n_series * (n_steps + 1)
+            counts = np.bincount(cell, minlength=size)
+            sums = np.bincount(cell, weights=values, minlength=size)
+            has = counts > 0
+            flat[has] = sums[has] / counts[has]
+
+            # seed 칸은 구간 평균이 아니라 마지막 값 사용
+            seed = slot == 0
+            if seed.any():
+                seed_cell, seed_values = cell[seed], values[seed]
+                order = np.argsort(timestamps[seed], kind="stable")
+                seed_cell, seed_values = seed_cell[order], seed_values[order]
+                _, first_in_reversed = np.unique(seed_cell[::-1], return_index=True)
+                latest = len(seed_cell) - 1 - first_in_reversed
+                flat[seed_cell[latest]] = seed_values[latest]
+
+    if fill:
+        out = forward_fill(out, backfill=False)
+    return out[:, 1:].astype(np.float32)
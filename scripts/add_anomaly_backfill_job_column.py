@@ -0,0 +1,31 @@
+import sys
+sys.path.append('.')
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+# 기존 DB에 백필 작업 ID 컬럼 추가 (create_all은 기존 테이블을 변경하지 않음)
+def add_anomaly_backfill_job_column():
+    """anomalies 테이블에 backfill_job_id 컬럼 추가 (기존 행은 NULL: 실시간 탐지 이벤트로 취급)"""
+    
+    print("🗄️  anomalies.backfill_job_id 컬럼 추가 중...")
+    
+    inspector = inspect(engine)
+    if not inspector.has_table("anomalies"):
+        print("  - anomalies: 테이블 없음 (init_db.py로 생성)")
+        return
+    
+    columns = {col["name"] for col in inspector.get_columns("anomalies")}
+    if "backfill_job_id" in columns:
+        print("  - backfill_job_id: 이미 존재")
+    else:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE anomalies ADD COLUMN backfill_job_id VARCHAR(50)"))
+            conn.execute(text("CREATE INDEX ix_anomalies_backfill_job_id ON anomalies (backfill_job_id)"))
+        print("  - backfill_job_id: 추가 완료")
+    
+    print("✅ 완료")
+
+if __name__ == "__main__":
+    add_anomaly_backfill_job_column()
@@ -0,0 +1,37 @@
+import sys
+sys.path.append('.')
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+# 기존 DB에 백필 작업 선점 컬럼 추가 (create_all은 기존 테이블을 변경하지 않음)
+COLUMNS = {
+    "claimed_by": "VARCHAR(50)",
+    "heartbeat_at": "DATETIME",
+}
+
+def add_backfill_claim_columns():
+    """backfill_jobs 테이블에 claimed_by / heartbeat_at 컬럼 추가"""
+    
+    print("🗄️  backfill_jobs 선점 컬럼 추가 중...")
+    
+    inspector = inspect(engine)
+    if not inspector.has_table("backfill_jobs"):
+        print("  - backfill_jobs: 테이블 없음 (init_db.py로 생성)")
+        return
+    
+    existing = {col["name"] for col in inspector.get_columns("backfill_jobs")}
+    with engine.begin() as conn:
+        for column, sql_type in COLUMNS.items():
+            if column in existing:
+                print(f"  - {column}: 이미 존재")
+                continue
+            
+            conn.execute(text(f"ALTER TABLE backfill_jobs ADD COLUMN {column} {sql_type}"))
+            print(f"  - {column}: 추가 완료")
+    
+    print("✅ 완료")
+
+if __name__ == "__main__":
+    add_backfill_claim_columns()
@@ -0,0 +1,36 @@
+import sys
+sys.path.append('.')
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+# 기존 DB에 model_version 컬럼 추가 (create_all은 기존 테이블을 변경하지 않음)
+TABLES = ["predictions", "anomalies"]
+
+def add_model_version_columns():
+    """predictions / anomalies 테이블에 model_version 컬럼 추가"""
+    
+    print("🗄️  model_version 컬럼 추가 중...")
+    
+    inspector = inspect(engine)
+    
+    with engine.begin() as conn:
+        for table in TABLES:
+            if not inspector.has_table(table):
+                print(f"  - {table}: 테이블 없음 (init_db.py로 생성)")
+                continue
+            
+            columns = {col["name"] for col in inspector.get_columns(table)}
+            if "model_version" in columns:
+                print(f"  - {table}: 이미 존재")
+                continue
+            
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN model_version VARCHAR(50)"))
+            conn.execute(text(f"CREATE INDEX ix_{table}_model_version ON {table} (model_version)"))
+            print(f"  - {table}: 추가 완료")
+    
+    print("✅ 완료")
+
+if __name__ == "__main__":
+    add_model_version_columns()
@@ -0,0 +1,49 @@
+import sys
+sys.path.append('.')
+
+from sqlalchemy import inspect, text
+
+from app.database import engine
+
+# 기존 DB의 tags_timeseries 복합 인덱스를 고유 인덱스로 교체 (create_all은 기존 인덱스를 변경하지 않음)
+TABLE = "tags_timeseries"
+INDEX = "ix_timeseries_eq_tag_time"
+
+def add_timeseries_unique_index():
+    """중복 (eq_id, tag_name, timestamp) 정리 후 고유 인덱스 생성"""
+    
+    print("🗄️  tags_timeseries 고유 인덱스 생성 중...")
+    
+    inspector = inspect(engine)
+    if not inspector.has_table(TABLE):
+        print(f"  - {TABLE}: 테이블 없음 (init_db.py로 생성)")
+        return
+    
+    indexes = {index["name"]: index for index in inspector.get_indexes(TABLE)}
+    if INDEX in indexes and indexes[INDEX]["unique"]:
+        print(f"  - {INDEX}: 이미 고유 인덱스")
+        return
+    
+    with engine.begin() as conn:
+        # 같은 키는 가장 먼저 저장된 행만 남김 (MySQL은 같은 테이블 서브쿼리를 한 번 감싸야 함)
+        deleted = conn.execute(text(f"""
+            DELETE FROM {TABLE}
+            WHERE id NOT IN (
+                SELECT id FROM (
+                    SELECT MIN(id) AS id FROM {TABLE} GROUP BY eq_id, tag_name, timestamp
+                ) AS keep
+            )
+        """)).rowcount
+        print(f"  - 중복 행 삭제: {deleted}")
+        
+        if INDEX in indexes:
+            if engine.dialect.name in ("mysql", "mariadb"):
+                conn.execute(text(f"DROP INDEX {INDEX} ON {TABLE}"))
+            else:
+                conn.execute(text(f"DROP INDEX {INDEX}"))
+        conn.execute(text(f"CREATE UNIQUE INDEX {INDEX} ON {TABLE} (eq_id, tag_name, timestamp)"))
+    
+    print("✅ 완료")
+
+if __name__ == "__main__":
+    add_timeseries_unique_index()
@@ -0,0 +1,107 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+from app.config import settings
+from app.ml.backtest import TEP_FAULT_ONSET, TEP_SAMPLE_SECONDS, run_backtest
+from app.services.window_service import export_tags_cache
+from app.utils.data_processor import TEPDataProcessor
+from app.utils.tep_loader import TEPCache
+
+def resolve_fault_onset(args):
+    """--fault-onset > --split > --data가 설정된 TEP 학습/테스트 CSV인 경우 순서로 고장 주입 행 결정"""
+    if args.fault_onset is not None:
+        return args.fault_onset
+
+    split = args.split
+    if split is None and not (args.cache or args.export_eq):
+        splits = {
+            os.path.abspath(settings.TEP_TRAIN_PATH): "train",
+            os.path.abspath(settings.TEP_TEST_PATH): "test"
+        }
+        split = splits.get(os.path.abspath(args.data))
+    return TEP_FAULT_ONSET[split] if split else None
+
+def backtest(args):
+    """이력 데이터 재생으로 탐지 성능/탐지 지연/처리량 측정"""
+
+    print("⏪ 백테스트 실행 중...")
+
+    if args.cache:
+        cache = TEPCache.open(args.cache)
+    elif args.export_eq:
+        cache = export_tags_cache(
+            args.export_eq.split(","),
+            datetime.fromisoformat(args.start),
+            datetime.fromisoformat(args.end),
+            os.path.join(settings.TEP_CACHE_DIR, "backtest")
+        )
+    else:
+        cache = TEPDataProcessor().load_tep_cache(args.data)
+
+    faults = [int(f) for f in args.faults.split(",")] if args.faults else None
+    # TEP CSV는 3분 간격, export는 manifest의 격자 간격
+    sample_seconds = args.sample_seconds
+    if sample_seconds is None and "interval_seconds" not in cache.manifest["source"]:
+        sample_seconds = TEP_SAMPLE_SECONDS
+
+    summary = run_backtest(
+        cache,
+        bundle_path=args.bundle,
+        faults=faults,
+        fault_onset=args.fault_onset,
+        sample_seconds=sample_seconds,
+        stride=args.stride,
+        batch_size=args.batch_size,
+        workers=args.workers
+    )
+
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    print(f"  - 구간 {summary['segments']}개, 윈도우 {summary['windows']}개 (고장 주입 행 {args.fault_onset})")
+    print(f"  - precision {fmt(summary['precision'])}, recall {fmt(summary['recall'])}, false alarm rate {fmt(summary['false_alarm_rate'])}")
+    for fault, stats in summary["faults"].items():
+        print(
+            f"  - fault {fault}: 탐지 {stats['detected']}/{stats['runs']} runs, "
+            f"recall {fmt(stats['recall'])}, 지연 평균 {fmt(stats['delay_mean_sec'])}s / 중앙값 {fmt(stats['delay_median_sec'])}s"
+        )
+    print(
+        f"  - 처리량: {summary['windows_per_sec']:.0f} windows/s, "
+        f"실시간 대비 {summary['replay_speedup']:.0f}배 ({summary['seconds']:.1f}s)"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="탐지 모델 백테스트")
+    parser.add_argument("--bundle", default=settings.MODEL_BUNDLE_PATH)
+    parser.add_argument("--data", default=settings.TEP_TEST_PATH, help="고장 라벨이 있는 TEP CSV")
+    parser.add_argument("--cache", default=None, help="이미 만든 캐시 디렉토리")
+    parser.add_argument("--export-eq", default=None, help="tags_timeseries에서 재생할 설비 ID (쉼표 구분)")
+    parser.add_argument("--start", default=None, help="--export-eq 시작 시각 (ISO 8601)")
+    parser.add_argument("--end", default=None, help="--export-eq 종료 시각 (ISO 8601)")
+    parser.add_argument("--faults", default=None, help="재생할 고장 번호 (쉼표 구분, 기본 전체)")
+    parser.add_argument("--split", choices=sorted(TEP_FAULT_ONSET), default=None, help="TEP 데이터 구분 (고장 주입 행: 학습 20, 테스트 160)")
+    parser.add_argument("--fault-onset", type=int, default=None, help="구간 내 고장 주입 행 (기본: --split 또는 --data로 결정)")
+    parser.add_argument("--sample-seconds", type=float, default=None, help="행 간격 (기본: export 격자 간격 또는 TEP 180초)")
+    parser.add_argument("--stride", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (0이면 단일 프로세스)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    if args.export_eq and not (args.start and args.end):
+        parser.error("--export-eq에는 --start와 --end가 필요합니다")
+    args.fault_onset = resolve_fault_onset(args)
+    if args.fault_onset is None:
+        parser.error("고장 주입 행을 알 수 없습니다: --fault-onset 또는 --split을 지정하세요")
+
+    backtest(args)
@@ -0,0 +1,50 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import numpy as np
+import torch
+
+from app.config import settings
+from app.ml.lstm_model import LSTMPredictor
+from app.ml.lstm_backends import BACKENDS, accuracy_delta, benchmark, build_backend, configure_threads
+
+def benchmark_backends(batch_sizes, runs: int, num_threads: int):
+    """LSTM 추론 백엔드별 정확도 오차 및 지연 시간 비교"""
+    
+    print("⏱️  LSTM 백엔드 벤치마크")
+    configure_threads(num_threads)
+    print(f"  - torch threads: {torch.get_num_threads()}")
+    
+    predictor = LSTMPredictor(model_path=settings.LSTM_MODEL_PATH, input_size=52)
+    eager = predictor.model
+    
+    rng = np.random.default_rng(0)
+    validation = rng.standard_normal((64, predictor.sequence_length, 52)).astype(np.float32)
+    
+    for backend in BACKENDS:
+        module = build_backend(eager, backend)
+        delta = accuracy_delta(eager, module, validation, backend)
+        
+        print(f"\n[{backend}]")
+        print(
+            f"  정확도: max output delta {delta['max_output_delta']:.2e}, "
+            f"max score delta {delta['max_score_delta']:.2e}"
+        )
+        
+        for batch_size in batch_sizes:
+            data = rng.standard_normal((batch_size, predictor.sequence_length, 52)).astype(np.float32)
+            result = benchmark(module, data, backend, runs=runs)
+            print(
+                f"  batch={batch_size:<4d} p50 {result['p50_ms']:8.3f} ms  "
+                f"p95 {result['p95_ms']:8.3f} ms  {result['windows_per_sec']:10.1f} windows/s"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LSTM 추론 백엔드 벤치마크")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=settings.LSTM_NUM_THREADS)
+    args = parser.parse_args()
+    
+    benchmark_backends(args.batch_sizes, args.runs, args.threads)
@@ -0,0 +1,104 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import time
+import numpy as np
+import torch
+
+from app.config import settings
+from app.ml.bundle import ModelBundle, write_bundle
+from app.ml.iforest_arrays import ForestArrays
+from app.ml.isolation_forest import IsolationForestDetector
+from app.ml.lstm_model import LSTMPredictor
+from app.utils.data_processor import TEPDataProcessor
+
+def build_model_bundle(
+    output: str,
+    version: str,
+    lstm_path: str,
+    isolation_forest_path: str,
+    data_path: str = None,
+    lstm_threshold: float = 0.05
+):
+    """기존 모델 파일 + 정규화 통계 → 모델 번들"""
+    
+    print("📦 모델 번들 생성 중...")
+    
+    processor = TEPDataProcessor()
+    feature_names = processor.feature_names
+    
+    # 정규화 통계 (학습 데이터가 없으면 항등 변환)
+    if data_path:
+        cache = processor.load_tep_cache(data_path)
+        stats = processor.fit_normalizer(cache.iter_chunks()).stats()
+        mean, std = stats['mean'], stats['std']
+        print(f"  - 정규화 통계: {data_path} ({cache.n_rows} rows)")
+    else:
+        mean = np.zeros(len(feature_names))
+        std = np.ones(len(feature_names))
+        print("  - 정규화 통계: 학습 데이터 미지정, 항등 변환 사용")
+    
+    # Isolation Forest 노드 배열
+    if isolation_forest_path.endswith(".npz"):
+        forest = ForestArrays.load(isolation_forest_path, mmap=False)
+    else:
+        detector = IsolationForestDetector(model_path=isolation_forest_path)
+        forest = ForestArrays.from_sklearn(detector.model)
+    
+    state_dict = torch.load(lstm_path, map_location="cpu", weights_only=True)
+    
+    write_bundle(
+        output,
+        version=version,
+        lstm_state_dict=state_dict,
+        forest=forest,
+        mean=mean,
+        std=std,
+        feature_names=feature_names,
+        sequence_length=settings.LSTM_SEQUENCE_LENGTH,
+        hidden_size=state_dict["encoder.weight_hh_l0"].shape[1],
+        num_layers=sum(1 for key in state_dict if key.startswith("encoder.weight_ih_l")),
+        thresholds={"lstm": lstm_threshold}
+    )
+    
+    # 번들 로드 검증 (기존 가중치와 출력 일치)
+    bundle = ModelBundle.load(output)
+    reference = LSTMPredictor(model_path=lstm_path, input_size=len(feature_names))
+    bundled = LSTMPredictor(
+        model_path=bundle.lstm_path,
+        input_size=bundle.input_size,
+        hidden_size=bundle.lstm_config["hidden_size"],
+        num_layers=bundle.lstm_config["num_layers"],
+        mmap=True
+    )
+    sample = np.random.default_rng(0).standard_normal((4, bundle.sequence_length, bundle.input_size))
+    delta = np.abs(
+        reference.infer_batch(sample)["anomaly_score"] - bundled.infer_batch(sample)["anomaly_score"]
+    ).max()
+    print(f"  - LSTM 이상 점수 최대 오차: {delta:.2e}")
+    
+    if delta > 1e-6:
+        print("❌ 번들 가중치가 원본과 일치하지 않습니다")
+        sys.exit(1)
+    
+    print("✅ 번들 생성 완료")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델 번들 생성")
+    parser.add_argument("--output", default=settings.MODEL_BUNDLE_PATH)
+    parser.add_argument("--version", default=time.strftime("%Y%m%d%H%M%S"))
+    parser.add_argument("--lstm", default=settings.LSTM_MODEL_PATH)
+    parser.add_argument("--isolation-forest", default=settings.ISOLATION_FOREST_ARRAYS_PATH)
+    parser.add_argument("--data", default=None, help="정규화 통계 계산용 TEP CSV")
+    parser.add_argument("--lstm-threshold", type=float, default=0.05)
+    args = parser.parse_args()
+    
+    build_model_bundle(
+        args.output,
+        args.version,
+        args.lstm,
+        args.isolation_forest,
+        data_path=args.data,
+        lstm_threshold=args.lstm_threshold
+    )
@@ -0,0 +1,35 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import time
+
+from app.config import settings
+from app.utils.data_processor import TEPDataProcessor
+
+def build_tep_cache(paths, rebuild: bool = False):
+    """TEP CSV → memory-map 캐시 변환 (이미 최신이면 그대로 사용)"""
+    
+    print("🗄️  TEP 캐시 생성 중...")
+    
+    processor = TEPDataProcessor()
+    
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            cache = processor.load_tep_cache(path, rebuild=rebuild)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            continue
+        
+        info = cache.info()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"  - {path} → {cache.path}: {info['n_rows']} rows, {info['n_runs']} runs, faults {info['faults']} ({elapsed:.1f} ms)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TEP CSV memory-map 캐시 생성")
+    parser.add_argument("paths", nargs="*", default=[settings.TEP_TRAIN_PATH, settings.TEP_TEST_PATH])
+    parser.add_argument("--rebuild", action="store_true", help="캐시가 최신이어도 다시 변환")
+    args = parser.parse_args()
+    
+    build_tep_cache(args.paths, rebuild=args.rebuild)
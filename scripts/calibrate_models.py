@@ -0,0 +1,116 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from app.config import settings
+from app.ml.bundle import write_calibration
+from app.ml.calibration import (
+    DEFAULT_BASE_QUANTILE,
+    DEFAULT_THRESHOLD_QUANTILE,
+    GLOBAL_GROUP,
+    ScoreCalibrator,
+    calibrate_cache,
+)
+from app.ml.registry import registry
+from app.services.window_service import export_tags_cache
+from app.utils.data_processor import TEPDataProcessor
+from app.utils.tep_loader import TEPCache
+
+def equipment_types(eq_ids):
+    """설비 ID → 유형 (equipments 테이블)"""
+    from app.database import SessionLocal
+    from app.models.equipment import Equipment
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Equipment.eq_id, Equipment.type).filter(Equipment.eq_id.in_(list(eq_ids))).all()
+        return {eq_id: eq_type.value for eq_id, eq_type in rows}
+    finally:
+        db.close()
+
+def calibrate_models(args):
+    """이력 윈도우 점수 분포로 임계값/확률 매핑 보정 후 번들에 저장"""
+
+    print("📏 모델 임계값 보정 중...")
+
+    models = registry.staged(args.bundle)
+    bundle = models.get("bundle")
+    if bundle is None:
+        print(f"❌ 모델 번들이 없습니다: {args.bundle}")
+        sys.exit(1)
+
+    if args.cache:
+        cache = TEPCache.open(args.cache)
+    elif args.export_eq:
+        cache = export_tags_cache(
+            args.export_eq.split(","),
+            datetime.fromisoformat(args.start),
+            datetime.fromisoformat(args.end),
+            os.path.join(settings.TEP_CACHE_DIR, "calibration")
+        )
+    else:
+        cache = TEPDataProcessor().load_tep_cache(args.data)
+
+    if cache.feature_names != bundle.feature_names:
+        print("❌ 캐시 변수 순서가 번들과 다릅니다")
+        sys.exit(1)
+
+    # tags_timeseries export는 run 번호 = 설비 순번
+    eq_ids = cache.manifest["source"].get("eq_ids") if args.group_by != "global" else None
+    eq_types = equipment_types(eq_ids) if eq_ids and args.group_by == "type" else None
+
+    calibrator = ScoreCalibrator(models.get("lstm"), models.get("isolation_forest"))
+
+    started = time.perf_counter()
+    n_windows = calibrate_cache(
+        calibrator,
+        cache,
+        bundle.normalize,
+        bundle.sequence_length,
+        eq_ids=eq_ids,
+        eq_types=eq_types,
+        batch_size=args.batch_size,
+        stride=args.stride
+    )
+    elapsed = time.perf_counter() - started
+    print(f"  - 채점 윈도우: {n_windows} ({n_windows / max(elapsed, 1e-9):.0f} windows/s)")
+
+    calibration = calibrator.build(
+        threshold_quantile=args.quantile,
+        base_quantile=args.base_quantile,
+        min_count=args.min_count
+    )
+    for group, count in zip(calibration.groups, calibration.counts):
+        row = calibration.index[group]
+        print(
+            f"  - {'전체' if group == GLOBAL_GROUP else group}: {count} windows, "
+            f"LSTM {calibration.thresholds['lstm'][row]:.6f}, "
+            f"IF {calibration.thresholds['isolation_forest'][row]:.4f}"
+        )
+
+    write_calibration(bundle.path, calibration)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이력 점수 분포 기반 임계값 보정")
+    parser.add_argument("--bundle", default=settings.MODEL_BUNDLE_PATH)
+    parser.add_argument("--data", default=settings.TEP_TRAIN_PATH, help="TEP CSV (정상 운전 구간 사용)")
+    parser.add_argument("--cache", default=None, help="이미 만든 캐시 디렉토리")
+    parser.add_argument("--export-eq", default=None, help="tags_timeseries에서 내보낼 설비 ID (쉼표 구분)")
+    parser.add_argument("--start", default=None, help="--export-eq 시작 시각 (ISO 8601)")
+    parser.add_argument("--end", default=None, help="--export-eq 종료 시각 (ISO 8601)")
+    parser.add_argument("--group-by", choices=["equipment", "type", "global"], default="equipment")
+    parser.add_argument("--quantile", type=float, default=DEFAULT_THRESHOLD_QUANTILE, help="임계값 분위수")
+    parser.add_argument("--base-quantile", type=float, default=DEFAULT_BASE_QUANTILE, help="확률 0 기준 분위수")
+    parser.add_argument("--min-count", type=int, default=100, help="그룹별 최소 윈도우 수")
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--stride", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.export_eq and not (args.start and args.end):
+        parser.error("--export-eq에는 --start와 --end가 필요합니다")
+
+    calibrate_models(args)
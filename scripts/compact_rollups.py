@@ -0,0 +1,41 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import time
+
+from app.database import engine, Base, SessionLocal
+from app.config import settings
+from app.services.rollup_service import compact, mark_all_dirty
+
+# 기존 시계열 전체를 1m/5m/1h 집계 테이블에 반영 (최초 1회, 이후는 백그라운드 집계기)
+def compact_rollups(batch_rows: int):
+    """모든 series를 가장 이른 관측부터 재계산 대상으로 표시한 뒤 dirty series가 없을 때까지 batch_rows씩 집계"""
+    
+    print("🗄️  시계열 집계 테이블 생성/갱신 중...")
+    Base.metadata.create_all(bind=engine)
+    
+    started = time.perf_counter()
+    total = 0
+    db = SessionLocal()
+    try:
+        print(f"  - 재계산 대상 series: {mark_all_dirty(db)}개")
+        while True:
+            result = compact(db, batch_rows)
+            if not result["rows"]:
+                break
+            total += result["rows"]
+            print(f"  - {total:,}행 반영 (정리된 series {result['cleaned_series']}, 갱신 {result['updated']})")
+            if result["rows"] < batch_rows:
+                break
+    finally:
+        db.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ 완료: {total:,}행, {elapsed:.1f}초")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 시계열 → tags_rollup_1m/5m/1h 집계")
+    parser.add_argument("--batch-rows", type=int, default=settings.ROLLUP_COMPACT_BATCH_ROWS)
+    args = parser.parse_args()
+    compact_rollups(args.batch_rows)
@@ -0,0 +1,45 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import numpy as np
+
+from app.config import settings
+from app.ml.isolation_forest import IsolationForestDetector
+
+def export_isolation_forest(model_path: str, arrays_path: str):
+    """Isolation Forest pickle → 노드 배열(.npz) 변환 및 검증"""
+    
+    print("🌲 Isolation Forest 노드 배열 변환 중...")
+    
+    detector = IsolationForestDetector()
+    detector.load_model(model_path)
+    detector.export_arrays(arrays_path)
+    
+    # sklearn 결과와 일치 여부 확인
+    exported = IsolationForestDetector(arrays_path=arrays_path)
+    sample = np.random.default_rng(0).standard_normal((1000, detector.model.n_features_in_))
+    
+    expected_labels = detector.model.predict(sample)
+    expected_scores = detector.model.score_samples(sample)
+    labels, scores = exported.detect(sample)
+    
+    max_delta = float(np.max(np.abs(scores - expected_scores)))
+    label_match = float(np.mean(labels == expected_labels))
+    
+    print(f"  - score 최대 오차: {max_delta:.2e}")
+    print(f"  - label 일치율: {label_match * 100:.2f}%")
+    
+    if max_delta > 1e-9 or label_match < 1.0:
+        print("❌ sklearn 결과와 일치하지 않습니다")
+        sys.exit(1)
+    
+    print("✅ 변환 완료")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Isolation Forest 노드 배열 변환")
+    parser.add_argument("--model", default=settings.ISOLATION_FOREST_PATH)
+    parser.add_argument("--output", default=settings.ISOLATION_FOREST_ARRAYS_PATH)
+    args = parser.parse_args()
+    
+    export_isolation_forest(args.model, args.output)
@@ -4,9 +4,11 @@ sys.path.append('.')
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Equipment, Lot, TimeSeriesTag, Anomaly, EquipmentType, LotStatus, Severity, AnomalyStatus
+from app.services.ingest_service import IngestService
 from datetime import datetime, timedelta
 import random
 import numpy as np
+import pandas as pd
 
 def load_dummy_data():
     """더미 데이터 로드"""
@@ -63,7 +65,7 @@ def load_dummy_data():
         # 3. 시계열 데이터 (최근 24시간, 1분 간격)
         print("📈 시계열 데이터 생성 중 (시간이 걸릴 수 있습니다)...")
         
-        timeseries_data = []
+        timeseries_data = {"eq_id": [], "tag_name": [], "timestamp": [], "value": [], "unit": []}
         base_values = {
             "temperature": 450.0,
             "pressure": 1.0,
@@ -90,21 +92,15 @@ def load_dummy_data():
                         "level": "%"
                     }[tag_name]
                     
-                    ts_data = TimeSeriesTag(
-                        timestamp=timestamp,
-                        eq_id=eq.eq_id,
-                        tag_name=tag_name,
-                        value=value,
-                        unit=unit
-                    )
-                    timeseries_data.append(ts_data)
+                    timeseries_data["eq_id"].append(eq.eq_id)
+                    timeseries_data["tag_name"].append(tag_name)
+                    timeseries_data["timestamp"].append(timestamp)
+                    timeseries_data["value"].append(value)
+                    timeseries_data["unit"].append(unit)
         
-        # 배치로 저장
-        batch_size = 1000
-        for i in range(0, len(timeseries_data), batch_size):
-            db.add_all(timeseries_data[i:i+batch_size])
-            db.commit()
-            print(f"  - {i + batch_size}/{len(timeseries_data)} 저장됨")
+        # 일괄 적재 (ingest API와 같은 경로, 다시 실행해도 같은 시점은 중복 저장되지 않음)
+        result = IngestService(db).ingest_frame(pd.DataFrame(timeseries_data))
+        print(f"  - {result['inserted']}/{result['received']} 저장됨")
         
         print("✅ 시계열 데이터 생성 완료")
         
@@ -138,7 +134,7 @@ def load_dummy_data():
         print("\n📊 데이터 요약:")
         print(f"  - 설비: {len(equipments)}개")
         print(f"  - LOT: {len(lots)}개")
-        print(f"  - 시계열 데이터: {len(timeseries_data)}개")
+        print(f"  - 시계열 데이터: {len(timeseries_data['value'])}개")
         print(f"  - 이상 이벤트: {len(anomalies)}개")
         
     except Exception as e:
@@ -0,0 +1,71 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import time
+
+from sqlalchemy import select, func, inspect, literal
+
+from app.database import engine, Base
+from app.models.timeseries import TimeSeriesTag, TagSeries, TagPoint
+from app.services.timeseries_store import insert_ignore
+
+# tags_timeseries(wide) → tag_series 사전 + tag_points(compact) 복사
+# 복사 후 TIMESERIES_SCHEMA=compact로 전환 (tags_timeseries는 확인 후 직접 삭제)
+def migrate_timeseries_compact(batch_rows: int):
+    """
+    사전 생성 → id 구간별 관측 복사 (다시 실행해도 중복 복사되지 않음)
+    
+    집계 재계산 표시(tag_series.dirty_from)는 두 스키마가 같은 행을 쓰므로 그대로 이어진다.
+    """
+    
+    print("🗄️  compact 시계열 스키마로 복사 중...")
+    Base.metadata.create_all(bind=engine)
+    if not inspect(engine).has_table(TimeSeriesTag.__tablename__):
+        print(f"  - {TimeSeriesTag.__tablename__}: 테이블 없음")
+        return
+    
+    started = time.perf_counter()
+    dialect_name = engine.dialect.name
+    
+    with engine.begin() as conn:
+        # 설비/태그 사전 (단위는 기존 행 중 하나)
+        created = conn.execute(
+            insert_ignore(TagSeries.__table__, dialect_name).from_select(
+                ["eq_id", "tag_name", "unit", "revision"],
+                select(TimeSeriesTag.eq_id, TimeSeriesTag.tag_name, func.max(TimeSeriesTag.unit), literal(0))
+                .where(TimeSeriesTag.id > 0)  # SQLite: INSERT ... SELECT ... ON CONFLICT 구문 모호성 회피 (WHERE 필요)
+                .group_by(TimeSeriesTag.eq_id, TimeSeriesTag.tag_name)
+            )
+        ).rowcount
+        print(f"  - tag_series: {created}개 추가")
+        
+        first_id, last_id = conn.execute(select(func.min(TimeSeriesTag.id), func.max(TimeSeriesTag.id))).one()
+    
+    copied = 0
+    if last_id is not None:
+        join = TimeSeriesTag.__table__.join(
+            TagSeries.__table__,
+            (TagSeries.eq_id == TimeSeriesTag.eq_id) & (TagSeries.tag_name == TimeSeriesTag.tag_name)
+        )
+        for lo in range(first_id - 1, last_id, batch_rows):
+            # id 구간마다 커밋 (중단 후 다시 실행하면 이미 복사된 (series_id, timestamp)는 건너뜀)
+            with engine.begin() as conn:
+                copied += max(conn.execute(
+                    insert_ignore(TagPoint.__table__, dialect_name).from_select(
+                        ["series_id", "timestamp", "value"],
+                        select(TagSeries.id, TimeSeriesTag.timestamp, TimeSeriesTag.value)
+                        .select_from(join)
+                        .where(TimeSeriesTag.id > lo, TimeSeriesTag.id <= lo + batch_rows)
+                    )
+                ).rowcount, 0)
+            print(f"  - tag_points: id {min(lo + batch_rows, last_id):,}/{last_id:,} ({copied:,}행 복사)")
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ 완료: {copied:,}행, {elapsed:.1f}초 (TIMESERIES_SCHEMA=compact로 전환)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="tags_timeseries → tag_series + tag_points 복사")
+    parser.add_argument("--batch-rows", type=int, default=200000, help="트랜잭션 1개당 원본 id 구간 크기")
+    args = parser.parse_args()
+    migrate_timeseries_compact(args.batch_rows)
@@ -0,0 +1,39 @@
+import sys
+sys.path.append('.')
+
+import argparse
+import time
+
+from app.database import engine, Base, SessionLocal
+from app.config import settings
+from app.services.chunk_service import seal_closed_hours
+
+# 기존 원본 행 중 닫힌 1시간 구간을 tag_chunks로 봉인 (최초 1회, 이후는 백그라운드 봉인)
+def seal_chunks(max_chunks: int):
+    """봉인할 구간이 없을 때까지 max_chunks개씩 봉인"""
+
+    print("🗄️  시계열 청크 테이블 생성/봉인 중...")
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    chunks = rows = 0
+    db = SessionLocal()
+    try:
+        while True:
+            result = seal_closed_hours(db, max_chunks)
+            chunks += result["chunks"]
+            rows += result["rows"]
+            print(f"  - 청크 {chunks:,}개, 원본 {rows:,}행 봉인 (기준 {result['cutoff']})")
+            if result["chunks"] < max_chunks:
+                break
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ 완료: 청크 {chunks:,}개, {rows:,}행, {elapsed:.1f}초")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 시계열 → tag_chunks (Gorilla 압축 1시간 청크)")
+    parser.add_argument("--max-chunks", type=int, default=settings.CHUNK_SEAL_MAX_CHUNKS)
+    args = parser.parse_args()
+    seal_chunks(args.max_chunks)
@@ -1,76 +1,141 @@
 import sys
 sys.path.append('.')
 
-import numpy as np
-import torch
-import pickle
+import argparse
 import os
-from sklearn.ensemble import IsolationForest
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from app.config import settings
+from app.ml.training import train_pipeline
+from app.services.window_service import export_tags_cache
+from app.utils.data_processor import TEPDataProcessor
+from app.utils.tep_loader import TEPCache, write_cache
+
+def dummy_cache(feature_names, n_rows: int = 20_000, n_runs: int = 4) -> TEPCache:
+    """학습 데이터가 없을 때 사용할 정상 구간 더미 캐시 (정규분포)"""
+    rng = np.random.default_rng(42)
+    rows_per_run = n_rows // n_runs
+    blocks = (
+        (0, run, rng.standard_normal((rows_per_run, len(feature_names))).astype(np.float32))
+        for run in range(1, n_runs + 1)
+    )
+    path = os.path.join(tempfile.mkdtemp(prefix="tep_dummy_"), "cache")
+    return write_cache(path, blocks, feature_names, source={"path": "dummy"})
+
+def load_training_cache(args) -> TEPCache:
+    """--cache > --export-eq > --data(TEP CSV) 순서로 학습 데이터 선택 (없으면 더미)"""
+    processor = TEPDataProcessor()
+
+    if args.cache:
+        return TEPCache.open(args.cache)
+
+    if args.export_eq:
+        return export_tags_cache(
+            args.export_eq.split(","),
+            datetime.fromisoformat(args.start),
+            datetime.fromisoformat(args.end),
+            os.path.join(settings.TEP_CACHE_DIR, "tags_timeseries")
+        )
+
+    try:
+        return processor.load_tep_cache(args.data)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"  - 학습 데이터를 사용할 수 없어 더미 데이터로 학습합니다 ({e})")
+        return dummy_cache(processor.feature_names)
 
-from app.ml.lstm_model import LSTMAutoencoder
+def train_models(args):
+    """ML 모델 학습 및 번들 저장"""
 
-def train_dummy_models():
-    """더미 ML 모델 학습 및 저장"""
-    
     print("🤖 ML 모델 학습 중...")
-    
-    # 디렉토리 생성
-    os.makedirs('./data/models', exist_ok=True)
-    
-    # 1. LSTM Autoencoder 학습
-    print("\n1. LSTM Autoencoder 학습...")
-    
-    # 더미 데이터 생성 (실제로는 TEP 데이터 사용)
-    dummy_data = np.random.randn(1000, 60, 52)  # (samples, sequence_length, features)
-    
-    model = LSTMAutoencoder(input_size=52)
-    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
-    criterion = torch.nn.MSELoss()
-    
-    model.train()
-    for epoch in range(10):
-        total_loss = 0
-        for i in range(0, len(dummy_data), 32):
-            batch = torch.FloatTensor(dummy_data[i:i+32])
-            
-            optimizer.zero_grad()
-            output = model(batch)
-            loss = criterion(output, batch)
-            loss.backward()
-            optimizer.step()
-            
-            total_loss += loss.item()
-        
-        print(f"  Epoch {epoch+1}/10, Loss: {total_loss/len(dummy_data):.6f}")
-    
-    # 모델 저장
-    torch.save(model.state_dict(), './data/models/lstm_model.pt')
-    print("✅ LSTM 모델 저장 완료")
-    
-    # 2. Isolation Forest 학습
-    print("\n2. Isolation Forest 학습...")
-    
-    # 더미 데이터 생성
-    dummy_data_2d = np.random.randn(1000, 52)
-    
-    iso_forest = IsolationForest(
-        contamination=0.1,
-        random_state=42,
-        n_estimators=100
+
+    cache = load_training_cache(args)
+    info = cache.info()
+    print(f"  - 데이터: {info['source']} ({info['n_rows']} rows, {info['n_runs']} runs)")
+
+    if args.checkpoint and not args.resume and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    def on_epoch(record):
+        print(
+            f"  Epoch {record['epoch']}/{args.epochs}, "
+            f"Loss: {record['train_loss']:.6f}, Val: {record['val_loss']:.6f}, "
+            f"{record['windows_per_sec']:.0f} windows/s"
+        )
+
+    summary = train_pipeline(
+        cache,
+        output=args.output,
+        version=args.version,
+        sequence_length=settings.LSTM_SEQUENCE_LENGTH,
+        stride=args.stride,
+        val_fraction=args.val_fraction,
+        batch_size=args.batch_size,
+        max_epochs=args.epochs,
+        patience=args.patience,
+        samples_per_epoch=args.samples_per_epoch,
+        num_workers=args.workers,
+        torch_threads=args.torch_threads,
+        if_jobs=args.if_jobs,
+        lstm_threshold=args.lstm_threshold,
+        checkpoint_path=args.checkpoint,
+        on_epoch=on_epoch,
+        legacy_paths={
+            "lstm": settings.LSTM_MODEL_PATH,
+            "isolation_forest": settings.ISOLATION_FOREST_PATH,
+            "isolation_forest_arrays": settings.ISOLATION_FOREST_ARRAYS_PATH
+        } if args.legacy_artifacts else None
     )
-    
-    iso_forest.fit(dummy_data_2d)
-    
-    # 모델 저장
-    with open('./data/models/isolation_forest.pkl', 'wb') as f:
-        pickle.dump(iso_forest, f)
-    
-    print("✅ Isolation Forest 모델 저장 완료")
-    
+
+    if cache.manifest["source"].get("path") == "dummy":
+        shutil.rmtree(os.path.dirname(cache.path), ignore_errors=True)
+
     print("\n🎉 모든 모델 학습 완료!")
-    print("\n저장된 모델:")
-    print("  - ./data/models/lstm_model.pt")
-    print("  - ./data/models/isolation_forest.pkl")
+    print(f"  - 번들: {summary['bundle']} (version {summary['version']})")
+    if args.legacy_artifacts:
+        print(f"  - 개별 모델 파일: {settings.LSTM_MODEL_PATH}, {settings.ISOLATION_FOREST_PATH}, {settings.ISOLATION_FOREST_ARRAYS_PATH}")
+    print(f"  - 학습/검증 윈도우: {summary['train_windows']} / {summary['val_windows']}")
+    print(f"  - epochs: {summary['epochs']}, best val loss: {summary['best_val_loss']:.6f}")
+    print(f"  - LSTM 처리량: {summary['windows_per_sec']:.0f} windows/s")
+    print(f"  - Isolation Forest: {summary['isolation_forest_seconds']:.1f}s (LSTM과 병렬)")
+    print(f"  - 전체 소요 시간: {summary['total_seconds']:.1f}s")
 
 if __name__ == "__main__":
-    train_dummy_models()
\ No newline at end of file
+    cpus = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="LSTM / Isolation Forest 학습 및 모델 번들 저장")
+    parser.add_argument("--data", default=settings.TEP_TRAIN_PATH, help="TEP CSV (memory-map 캐시로 변환)")
+    parser.add_argument("--cache", default=None, help="이미 만든 캐시 디렉토리")
+    parser.add_argument("--export-eq", default=None, help="tags_timeseries에서 내보낼 설비 ID (쉼표 구분)")
+    parser.add_argument("--start", default=None, help="--export-eq 시작 시각 (ISO 8601)")
+    parser.add_argument("--end", default=None, help="--export-eq 종료 시각 (ISO 8601)")
+    parser.add_argument("--output", default=settings.MODEL_BUNDLE_PATH)
+    parser.add_argument("--version", default=time.strftime("%Y%m%d%H%M%S"))
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--patience", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--stride", type=int, default=1, help="윈도우 시작 간격 (행)")
+    parser.add_argument("--val-fraction", type=float, default=0.1)
+    parser.add_argument("--samples-per-epoch", type=int, default=None, help="epoch당 무작위 표본 윈도우 수")
+    parser.add_argument("--workers", type=int, default=min(4, max(cpus - 2, 0)), help="DataLoader 워커 프로세스 수")
+    parser.add_argument("--if-jobs", type=int, default=max(cpus // 4, 1), help="Isolation Forest n_jobs")
+    parser.add_argument("--torch-threads", type=int, default=None, help="LSTM 학습 torch 스레드 수 (기본: 남는 코어)")
+    parser.add_argument("--lstm-threshold", type=float, default=0.05)
+    parser.add_argument("--checkpoint", default="./data/models/checkpoints/lstm.ckpt")
+    parser.add_argument("--resume", action="store_true", help="체크포인트에서 이어서 학습")
+    parser.add_argument(
+        "--legacy-artifacts", action="store_true",
+        help="번들과 함께 기존 개별 모델 파일(lstm_model.pt, isolation_forest.pkl/.npz)도 저장 (정규화된 입력 기준)"
+    )
+    args = parser.parse_args()
+
+    if args.export_eq and not (args.start and args.end):
+        parser.error("--export-eq에는 --start와 --end가 필요합니다")
+    if args.torch_threads is None:
+        args.torch_threads = max(cpus - args.if_jobs - args.workers, 1)
+
+    train_models(args)
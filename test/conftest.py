@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+# app.database는 import 시점의 DATABASE_URL로 엔진을 만들므로 app보다 먼저 설정
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.models  # noqa: F401 (모든 테이블 등록)
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.models.equipment import Equipment, EquipmentType
+from app.services.ingest_service import IngestService
+from app.services.timeseries_store import TIMESERIES_SCHEMAS
+
+
+@pytest.fixture
+def db():
+    """테스트마다 빈 테이블 + 설비 R-01, R-02"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    session.add_all([
+        Equipment(eq_id="R-01", name="Reactor-01", type=EquipmentType.REACTOR),
+        Equipment(eq_id="R-02", name="Reactor-02", type=EquipmentType.REACTOR),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture(params=TIMESERIES_SCHEMAS)
+def schema(request, monkeypatch):
+    """wide/compact 스키마 각각 실행"""
+    monkeypatch.setattr(settings, "TIMESERIES_SCHEMA", request.param)
+    return request.param
+
+
+def _points(eq_id, tag_name, timestamps, seed=0, decimals=None):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.DatetimeIndex(timestamps)
+    values = rng.normal(50.0, 5.0, len(timestamps))
+    return pd.DataFrame({
+        "eq_id": eq_id,
+        "tag_name": tag_name,
+        "timestamp": timestamps,
+        "value": values if decimals is None else np.round(values, decimals),
+    })
+
+
+@pytest.fixture
+def make_points():
+    """(eq_id, tag_name, timestamps) 관측 DataFrame 생성 (정규분포 값, decimals로 반올림)"""
+    return _points
+
+
+@pytest.fixture
+def ingest(db):
+    """관측 DataFrame을 IngestService로 적재 (timestamp는 ISO 문자열로 변환)"""
+    def ingest(points, unit=None):
+        frame = points.assign(timestamp=[ts.isoformat() for ts in points["timestamp"]])
+        if unit is not None:
+            frame = frame.assign(unit=unit)
+        return IngestService(db).ingest_frame(frame)
+    return ingest
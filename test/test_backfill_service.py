@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.ml.registry import get_predictor
+from app.models.anomaly import Anomaly, AnomalyStatus, Severity
+from app.models.backfill import BackfillJob, BackfillStatus
+from app.schemas.anomaly import BackfillRequest
+from app.services import backfill_service
+from app.services.backfill_service import BackfillService, _claim, _update_claimed, run_backfill
+
+
+@pytest.fixture
+def job(db, monkeypatch):
+    monkeypatch.setattr(backfill_service.backfill_runner, "submit", lambda job_id: True)
+    request = BackfillRequest(eq_ids=["R-01"], start_time=datetime(2026, 3, 1), end_time=datetime(2026, 3, 2))
+    return BackfillService(db).create_job(request)
+
+
+def _set(db, job, **values):
+    db.query(BackfillJob).filter(BackfillJob.job_id == job.job_id).update(values)
+    db.commit()
+    db.refresh(job)
+
+
+def test_only_one_claim_wins(db, job):
+    assert _claim(db, job.job_id, "first")
+    assert not _claim(db, job.job_id, "second")
+    db.refresh(job)
+    assert job.status == BackfillStatus.RUNNING
+    assert job.claimed_by == "first"
+    assert job.heartbeat_at is not None
+
+
+def test_checkpoint_requires_claim(db, job):
+    _claim(db, job.job_id, "first")
+    assert not _update_claimed(db, job.job_id, "second", next_window=5)
+    assert _update_claimed(db, job.job_id, "first", next_window=5)
+
+    # 다른 프로세스에서 취소하면 실행 중인 러너의 체크포인트 갱신이 실패
+    _set(db, job, status=BackfillStatus.CANCELLED)
+    assert not _update_claimed(db, job.job_id, "first", next_window=10)
+    db.refresh(job)
+    assert job.next_window == 5
+
+
+def test_running_job_is_not_claimed_again(db, job):
+    _set(db, job, status=BackfillStatus.RUNNING, claimed_by="other", heartbeat_at=datetime.utcnow(), next_window=job.total_windows)
+    job = run_backfill(db, job.job_id)
+    assert job.status == BackfillStatus.RUNNING
+    assert job.claimed_by == "other"
+
+
+def test_resume_respects_heartbeat(db, job):
+    _set(db, job, status=BackfillStatus.RUNNING, heartbeat_at=datetime.utcnow())
+    with pytest.raises(ValueError):
+        BackfillService(db).resume_job(job.job_id)
+
+    stale = datetime.utcnow() - timedelta(seconds=settings.BACKFILL_STALE_SEC + 60)
+    _set(db, job, heartbeat_at=stale)
+    assert BackfillService(db).resume_job(job.job_id).status == BackfillStatus.PENDING
+
+
+def test_finished_job_is_not_resumed(db, job):
+    _set(db, job, next_window=job.total_windows)
+    assert run_backfill(db, job.job_id).status == BackfillStatus.SUCCEEDED
+    with pytest.raises(ValueError):
+        BackfillService(db).resume_job(job.job_id)
+
+
+@pytest.fixture
+def scored(db, make_points, ingest, monkeypatch):
+    """R-01 관측 8시간 + 모든 윈도우를 이상으로 채점하는 예측기 (probability는 scored["probability"])"""
+    predictor = get_predictor()
+    ingest(make_points("R-01", predictor.feature_names[0], pd.date_range("2026-03-01", "2026-03-01 08:00", freq="min")))
+
+    state = {"probability": 0.6, "model_version": predictor.model_version}
+
+    def score_windows(windows, eq_ids=None, **kwargs):
+        n = len(windows)
+        return {
+            "probability": np.full(n, state["probability"]),
+            "is_anomaly": np.ones(n, dtype=bool),
+            "feature_errors": np.ones((n, windows.shape[2]), dtype=np.float32),
+        }
+
+    monkeypatch.setattr(predictor, "score_windows", score_windows)
+    return state
+
+
+def _backfill(db):
+    request = BackfillRequest(
+        eq_ids=["R-01"],
+        start_time=datetime(2026, 3, 1, 3),
+        end_time=datetime(2026, 3, 1, 6),
+        chunk_seconds=3600
+    )
+    job = BackfillService(db).create_job(request)
+    return run_backfill(db, job.job_id)
+
+
+def _anomalies(db):
+    return db.query(Anomaly).order_by(Anomaly.detected_at).all()
+
+
+def test_backfill_keeps_live_events_and_continues_open_events(db, scored):
+    live = Anomaly(
+        eq_id="R-01", status=AnomalyStatus.UNCONFIRMED, severity=Severity.WARNING,
+        model_version=scored["model_version"], detected_at=datetime(2026, 3, 1, 5)
+    )
+    db.add(live)
+    db.commit()
+
+    job = _backfill(db)
+    assert job.status == BackfillStatus.SUCCEEDED
+    assert job.windows_scored == job.total_windows
+
+    # 첫 이상 윈도우에서 이벤트 1개, 이후 윈도우 (청크 경계 포함)는 이어감
+    anomalies = _anomalies(db)
+    assert [(a.detected_at, a.backfill_job_id) for a in anomalies] == [
+        (datetime(2026, 3, 1, 3), job.job_id),
+        (datetime(2026, 3, 1, 5), None),
+    ]
+    assert job.anomalies_created == 1
+
+    # 다른 작업으로 같은 구간을 다시 백필해도 열린 이벤트를 이어가고 실시간 이벤트는 유지
+    again = _backfill(db)
+    assert again.anomalies_created == 0
+    assert [a.id for a in _anomalies(db)] == [a.id for a in anomalies]
+
+
+def test_backfill_resumes_after_resolved_event(db, scored):
+    resolved = Anomaly(
+        eq_id="R-01", status=AnomalyStatus.RESOLVED, severity=Severity.WARNING,
+        detected_at=datetime(2026, 3, 1, 2), resolved_at=datetime(2026, 3, 1, 4)
+    )
+    db.add(resolved)
+    db.commit()
+    scored["probability"] = 0.9
+
+    job = _backfill(db)
+    anomalies = _anomalies(db)
+    assert [(a.detected_at, a.severity) for a in anomalies] == [
+        (datetime(2026, 3, 1, 2), Severity.CRITICAL),  # 해결 전 윈도우가 이어가며 상향
+        (datetime(2026, 3, 1, 4), Severity.CRITICAL),
+    ]
+    assert anomalies[1].backfill_job_id == job.job_id
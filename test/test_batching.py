@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.executor import BoundedPool, inference_workers
+from app.ml.batching import MicroBatcher
+
+
+def _forward(items):
+    time.sleep(0.02)  # 배치 크기와 무관한 1회 forward 비용
+    return [float(np.sum(item)) for item in items]
+
+
+def _serve(workers, n_requests=32, max_batch_size=32):
+    """추론 풀 스레드에서 배처 결과를 기다리는 엔드포인트 n_requests개 동시 호출"""
+    batcher = MicroBatcher("test", _forward, max_batch_size=max_batch_size, max_wait_ms=20.0)
+    pool = BoundedPool("inference", "thread", workers, max_queue=n_requests)
+
+    async def main():
+        return await asyncio.gather(*(pool.run(batcher, np.full(4, i)) for i in range(n_requests)))
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        batcher.shutdown()
+        pool.shutdown()
+    assert results == [4.0 * i for i in range(n_requests)]
+    return batcher.metrics()
+
+
+def test_pool_size_caps_batch_size():
+    assert _serve(workers=2)["max_batch_size"] <= 2
+
+
+@pytest.mark.parametrize("batching, expected", [(False, 2), (True, 32)])
+def test_inference_workers_follow_batch_size(monkeypatch, batching, expected):
+    monkeypatch.setattr(settings, "EXECUTOR_INFERENCE_WORKERS", 2)
+    monkeypatch.setattr(settings, "INFERENCE_BATCHING", batching)
+    monkeypatch.setattr(settings, "INFERENCE_MAX_BATCH_SIZE", 32)
+    assert inference_workers() == expected
+
+
+def test_batches_fill_beyond_default_pool_size(monkeypatch):
+    monkeypatch.setattr(settings, "EXECUTOR_INFERENCE_WORKERS", 2)
+    monkeypatch.setattr(settings, "INFERENCE_BATCHING", True)
+    monkeypatch.setattr(settings, "INFERENCE_MAX_BATCH_SIZE", 32)
+
+    metrics = _serve(workers=inference_workers())
+    assert metrics["max_batch_size"] > 2
+    assert metrics["avg_batch_size"] > 2
+
+
+def test_short_batch_result_fails_every_request():
+    batcher = MicroBatcher("short", lambda items: items[:-1], max_batch_size=8, max_wait_ms=20.0)
+    try:
+        futures = [batcher.submit(i) for i in range(4)]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+    finally:
+        batcher.shutdown()
+
+
+def test_shutdown_resolves_every_submitted_request():
+    batcher = MicroBatcher("shutdown", _forward, max_batch_size=4, max_wait_ms=1.0)
+    futures = []
+
+    def client():
+        for i in range(200):
+            try:
+                futures.append(batcher.submit(np.full(2, i)))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    batcher.shutdown()
+    for thread in threads:
+        thread.join()
+
+    # 종료 전에 등록된 요청은 모두 결과를 받음 (무한 대기 없음)
+    for future in futures:
+        assert future.result(timeout=10) is not None
+    with pytest.raises(RuntimeError):
+        batcher.submit(np.zeros(2))
@@ -0,0 +1,70 @@
+import os
+import threading
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from app.ml.bundle import ModelBundle, is_bundle, write_bundle
+from app.ml.iforest_arrays import ForestArrays
+from app.ml.lstm_model import LSTMAutoencoder
+
+FEATURES = ["a", "b", "c"]
+
+
+def _write(path, version):
+    forest = ForestArrays.from_sklearn(
+        IsolationForest(n_estimators=2, random_state=0).fit(np.random.default_rng(0).normal(size=(64, 3)))
+    )
+    return write_bundle(
+        str(path),
+        version=version,
+        lstm_state_dict=LSTMAutoencoder(input_size=3, hidden_size=4, num_layers=1).state_dict(),
+        forest=forest,
+        mean=np.zeros(3),
+        std=np.ones(3),
+        feature_names=FEATURES,
+        hidden_size=4,
+        num_layers=1
+    )
+
+
+def _entries(parent):
+    return sorted(os.listdir(parent))
+
+
+def test_rewrite_never_exposes_missing_bundle(tmp_path):
+    path = tmp_path / "bundle"
+    _write(path, "0")
+    missing = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            if not is_bundle(str(path)):
+                missing.append(True)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for version in range(1, 20):
+            _write(path, str(version))
+    finally:
+        done.set()
+        thread.join()
+
+    assert not missing
+    assert ModelBundle.load(str(path)).version == "19"
+    # 링크 + 현재 번들 디렉토리만 남음
+    assert len(_entries(tmp_path)) == 2
+
+
+def test_directory_bundle_is_converted_to_link(tmp_path):
+    path = tmp_path / "bundle"
+    os.makedirs(path)
+    with open(path / "manifest.json", "w", encoding="utf-8") as f:
+        f.write("{}")
+
+    _write(path, "1")
+    assert os.path.islink(path)
+    assert ModelBundle.load(str(path)).version == "1"
+    assert len(_entries(tmp_path)) == 2
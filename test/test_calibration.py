@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from app.ml.calibration import GLOBAL_GROUP, QuantileSketch, ScoreCalibration, ScoreCalibrator, type_group
+
+QUANTILES = [0.01, 0.1, 0.5, 0.9, 0.99, 0.995]
+
+
+class _MeanScorer:
+    """윈도우 평균을 LSTM 점수, 마지막 행 평균의 sigmoid를 IF 점수로 쓰는 대역"""
+
+    def infer_batch(self, windows):
+        return {"anomaly_score": windows.mean(axis=(1, 2))}
+
+    def detect_rows(self, rows):
+        scores = 1.0 / (1.0 + np.exp(-rows.mean(axis=1)))
+        return scores > 0.5, scores
+
+
+def _scores(seed, n=20000):
+    return np.random.default_rng(seed).lognormal(-2.0, 1.0, n)
+
+
+def _windows(seed, n, offset):
+    return np.random.default_rng(seed).normal(offset, 1.0, (n, 4, 3))
+
+
+@pytest.fixture
+def calibration():
+    calibrator = ScoreCalibrator(_MeanScorer(), _MeanScorer())
+    calibrator.update(_windows(0, 300, 1.0), "R-01", "REACTOR")
+    calibrator.update(_windows(1, 50, 3.0), "R-02", "REACTOR")   # min_count 미만 → 유형 그룹
+    calibrator.update(_windows(2, 300, 0.0), "P-01", "PUMP")
+    return calibrator.build(threshold_quantile=0.99, base_quantile=0.9, min_count=100)
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    values = _scores(0)
+    sketch = QuantileSketch(relative_accuracy=0.01).add(values)
+
+    expected = np.quantile(values, QUANTILES, method="lower")
+    np.testing.assert_allclose(sketch.quantile(QUANTILES), expected, rtol=0.01)
+    assert sketch.count == len(values)
+    assert sketch.quantile(0.0) == pytest.approx(values.min(), rel=0.01)
+    assert sketch.quantile(1.0) == pytest.approx(values.max(), rel=0.01)
+
+
+def test_sketch_merge_equals_single_pass():
+    values = _scores(1)
+    single = QuantileSketch().add(values)
+    merged = QuantileSketch().add(values[:7000]).merge(QuantileSketch().add(values[7000:]))
+
+    np.testing.assert_array_equal(merged.counts, single.counts)
+    assert (merged.count, merged.zero_count, merged.min, merged.max) == (single.count, single.zero_count, single.min, single.max)
+    np.testing.assert_array_equal(merged.quantile(QUANTILES), single.quantile(QUANTILES))
+
+    with pytest.raises(ValueError):
+        single.merge(QuantileSketch(relative_accuracy=0.02))
+
+
+def test_calibrator_merge_equals_single_pass():
+    single = ScoreCalibrator(_MeanScorer(), _MeanScorer())
+    single.update(_windows(0, 400, 1.0), "R-01", "REACTOR")
+
+    first = ScoreCalibrator(_MeanScorer(), _MeanScorer())
+    second = ScoreCalibrator(_MeanScorer(), _MeanScorer())
+    first.update(_windows(0, 400, 1.0)[:150], "R-01", "REACTOR")
+    second.update(_windows(0, 400, 1.0)[150:], "R-01", "REACTOR")
+    merged = first.merge(second).build()
+
+    expected = single.build()
+    assert merged.groups == expected.groups
+    for model in ("lstm", "isolation_forest"):
+        np.testing.assert_array_equal(merged.knots[model], expected.knots[model])
+        np.testing.assert_array_equal(merged.thresholds[model], expected.thresholds[model])
+
+
+def test_lookup_falls_back_from_equipment_to_type_to_global(calibration):
+    assert calibration.groups[0] == GLOBAL_GROUP
+    assert "R-02" not in calibration.index
+
+    assert calibration.groups[calibration.lookup("R-01")] == "R-01"
+    assert calibration.groups[calibration.lookup("R-02")] == type_group("REACTOR")
+    assert calibration.groups[calibration.lookup("X-99")] == GLOBAL_GROUP
+    assert calibration.groups[calibration.lookup(None)] == GLOBAL_GROUP
+    assert calibration.apply(0.5, 0.5, "R-02")["group"] == type_group("REACTOR")
+
+
+def test_build_requires_scores():
+    with pytest.raises(ValueError):
+        ScoreCalibrator(_MeanScorer(), _MeanScorer()).build()
+
+
+def test_apply_batch_matches_apply(calibration):
+    rng = np.random.default_rng(3)
+    eq_ids = ["R-01", "R-02", "P-01", "X-99", None] * 20
+    lstm_scores = rng.normal(1.0, 1.5, len(eq_ids))
+    if_scores = rng.uniform(0.3, 1.0, len(eq_ids))
+
+    batch = calibration.apply_batch(lstm_scores, if_scores, eq_ids)
+    for i, eq_id in enumerate(eq_ids):
+        single = calibration.apply(lstm_scores[i], if_scores[i], eq_id)
+        for key in ("lstm_probability", "if_probability", "is_anomaly_lstm", "is_anomaly_if"):
+            assert batch[key][i] == single[key]
+
+
+def test_save_load_round_trip(calibration, tmp_path):
+    path = str(tmp_path / "calibration.npz")
+    calibration.save(path)
+    loaded = ScoreCalibration.load(path)
+
+    assert loaded.groups == calibration.groups
+    assert loaded.eq_types == calibration.eq_types
+    assert (loaded.base_quantile, loaded.threshold_quantile) == (calibration.base_quantile, calibration.threshold_quantile)
+    np.testing.assert_array_equal(loaded.counts, calibration.counts)
+    np.testing.assert_array_equal(loaded.levels, calibration.levels)
+    for model in ("lstm", "isolation_forest"):
+        np.testing.assert_array_equal(loaded.knots[model], calibration.knots[model])
+        np.testing.assert_array_equal(loaded.thresholds[model], calibration.thresholds[model])
+    assert loaded.apply(1.2, 0.7, "R-02") == calibration.apply(1.2, 0.7, "R-02")
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+
+from app.models.timeseries import TagChunk, TagSeries
+from app.services.chunk_service import seal_closed_hours
+from app.services.rollup_service import compact, read_rollups, points_to_rollups
+from app.services.timeseries_store import get_timeseries_store
+
+
+def _sorted(points):
+    return points.sort_values(["eq_id", "tag_name", "timestamp"]).reset_index(drop=True)
+
+
+def _assert_points_equal(got, expected):
+    got, expected = _sorted(got), _sorted(expected)
+    assert got["eq_id"].tolist() == expected["eq_id"].tolist()
+    assert got["tag_name"].tolist() == expected["tag_name"].tolist()
+    np.testing.assert_array_equal(
+        got["timestamp"].to_numpy(dtype="datetime64[us]"), expected["timestamp"].to_numpy(dtype="datetime64[us]")
+    )
+    np.testing.assert_array_equal(got["value"].to_numpy(dtype=float), expected["value"].to_numpy(dtype=float))
+
+
+def _raw_rows(store):
+    return len(store.fetch_raw(["R-01", "R-02"], ["temperature", "pressure"]))
+
+
+def _history(make_points):
+    # 6시간 1초 간격 + 다른 태그 (불규칙 간격)
+    temperature = make_points("R-01", "temperature", pd.date_range("2026-03-01 00:00:00", periods=6 * 3600, freq="s"))
+    rng = np.random.default_rng(1)
+    offsets = np.cumsum(rng.integers(1, 30_000_000, 1500))
+    pressure = make_points("R-02", "pressure", np.datetime64("2026-03-01T00:00:00.5", "us") + offsets, seed=2)
+    return pd.concat([temperature, pressure], ignore_index=True)
+
+
+def test_seal_round_trip(db, schema, make_points, ingest):
+    points = _history(make_points)
+    ingest(points, unit="degC")
+    store = get_timeseries_store(db)
+
+    result = seal_closed_hours(db)
+    assert result["chunks"] > 0
+    assert result["rows"] == len(points)
+    assert _raw_rows(store) == 0
+    assert db.execute(select(func.sum(TagChunk.n_points))).scalar() == len(points)
+
+    _assert_points_equal(store.fetch_points(["R-01", "R-02"], ["temperature", "pressure"]), points)
+
+    # 시각 경계 (포함/제외)
+    start, end = datetime(2026, 3, 1, 1, 30), datetime(2026, 3, 1, 3, 0)
+    window = store.fetch_points(["R-01"], ["temperature"], start, end, start_inclusive=False, end_inclusive=True)
+    expected = points[(points["tag_name"] == "temperature") & (points["timestamp"] > start) & (points["timestamp"] <= end)]
+    _assert_points_equal(window, expected)
+
+    timestamps, values = store.fetch_series("R-01", "temperature", start)
+    assert timestamps[0] == np.datetime64(start, "us")
+    assert len(values) == int(((points["tag_name"] == "temperature") & (points["timestamp"] >= start)).sum())
+    assert store.unit("R-01", "temperature") == "degC"
+
+
+def test_recent_hours_stay_raw(db, schema, make_points, ingest):
+    now = datetime.utcnow().replace(microsecond=0)
+    recent = make_points("R-01", "temperature", pd.date_range(now - timedelta(minutes=30), periods=60, freq="s"))
+    ingest(recent, unit="degC")
+
+    assert seal_closed_hours(db)["chunks"] == 0
+    assert _raw_rows(get_timeseries_store(db)) == len(recent)
+
+
+def test_late_rows_after_sealing(db, schema, make_points, ingest):
+    points = _history(make_points)
+    ingest(points, unit="degC")
+    seal_closed_hours(db)
+    store = get_timeseries_store(db)
+
+    # 재전송은 중복, 봉인된 구간의 새 시각은 원본 행으로 저장
+    resend = points.iloc[100:200]
+    late = make_points("R-01", "temperature", pd.date_range("2026-03-01 02:00:00.5", periods=10, freq="s"), seed=3)
+    result = ingest(pd.concat([resend, late], ignore_index=True), unit="degC")
+    assert result["duplicates"] == len(resend)
+    assert result["inserted"] == len(late)
+
+    everything = pd.concat([points, late], ignore_index=True)
+    _assert_points_equal(store.fetch_points(["R-01", "R-02"], ["temperature", "pressure"]), everything)
+
+    # 다시 봉인하면 기존 청크에 합쳐짐
+    assert seal_closed_hours(db)["rows"] == len(late)
+    assert _raw_rows(store) == 0
+    hour = db.get(TagChunk, ("R-01", "temperature", datetime(2026, 3, 1, 2)))
+    assert hour.n_points == 3600 + len(late)
+    _assert_points_equal(store.fetch_points(["R-01", "R-02"], ["temperature", "pressure"]), everything)
+
+
+def test_rollups_include_sealed_rows(db, schema, make_points, ingest):
+    points = _history(make_points)
+    ingest(points, unit="degC")
+    seal_closed_hours(db)  # 집계기 실행 전에 봉인
+
+    late = make_points("R-01", "temperature", pd.date_range("2026-03-01 04:10:00.25", periods=20, freq="7s"), seed=4)
+    ingest(late, unit="degC")
+    while compact(db, 5000)["rows"]:
+        pass
+    assert db.execute(select(func.count()).select_from(TagSeries).where(TagSeries.dirty_from.isnot(None))).scalar() == 0
+
+    everything = pd.concat([points, late], ignore_index=True)
+    series = everything[everything["tag_name"] == "temperature"]
+    start = datetime(2026, 3, 1, 0, 0, 30)
+    got = read_rollups(db, "R-01", "temperature", start, 300)
+    expected = points_to_rollups(series[series["timestamp"] >= start], 300)
+    np.testing.assert_array_equal(got["n_points"].to_numpy(), expected["n_points"].to_numpy())
+    np.testing.assert_allclose(got["value_sum"].to_numpy(), expected["value_sum"].to_numpy(), rtol=1e-9)
+    np.testing.assert_array_equal(got["value_max"].to_numpy(), expected["value_max"].to_numpy())
+    np.testing.assert_array_equal(got["value_last"].to_numpy(), expected["value_last"].to_numpy())
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from app.config import settings
+from app.models.anomaly import Anomaly, AnomalyStatus
+from app.models.equipment import Equipment
+from app.services.detection_service import active_equipment_ids, open_anomalies
+
+
+def test_inactive_statuses_keep_equipment_without_status(db, monkeypatch):
+    db.query(Equipment).filter(Equipment.eq_id == "R-01").update({"status": None})
+    db.query(Equipment).filter(Equipment.eq_id == "R-02").update({"status": "maintenance"})
+    db.commit()
+
+    monkeypatch.setattr(settings, "DETECTION_INACTIVE_STATUSES", [])
+    assert active_equipment_ids(db) == ["R-01", "R-02"]
+    monkeypatch.setattr(settings, "DETECTION_INACTIVE_STATUSES", ["maintenance"])
+    assert active_equipment_ids(db) == ["R-01"]
+
+
+def test_open_anomalies_skip_resolved(db):
+    db.add_all([
+        Anomaly(eq_id="R-01", status=AnomalyStatus.UNCONFIRMED, detected_at=datetime(2026, 3, 1, 0, 0)),
+        Anomaly(eq_id="R-01", status=AnomalyStatus.IN_PROGRESS, detected_at=datetime(2026, 3, 1, 1, 0)),
+        Anomaly(eq_id="R-02", status=AnomalyStatus.RESOLVED, detected_at=datetime(2026, 3, 1, 2, 0)),
+    ])
+    db.commit()
+
+    opened = open_anomalies(db, ["R-01", "R-02"])
+    assert list(opened) == ["R-01"]
+    assert opened["R-01"].detected_at == datetime(2026, 3, 1, 1, 0)
+    assert open_anomalies(db, []) == {}
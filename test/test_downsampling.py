@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.downsampling import bucket_envelope, lttb
+
+
+def _series(n, seed=0):
+    """불규칙 간격 시계열 (timestamp datetime64[us], value)"""
+    rng = np.random.default_rng(seed)
+    seconds = np.cumsum(rng.integers(1, 120, n))
+    timestamps = np.datetime64("2024-01-01T00:00:00", "us") + seconds.astype("timedelta64[s]")
+    values = np.cumsum(rng.normal(0.0, 1.0, n)) + 10.0 * np.sin(np.arange(n) / 50.0)
+    return timestamps, values
+
+
+def _envelope_reference(timestamps, values, n_buckets, start=None, end=None):
+    """pandas groupby 기준 구간별 min/max/mean/count"""
+    ticks = timestamps.astype("datetime64[us]").astype(np.int64)
+    lo = ticks[0] if start is None else np.datetime64(start, "us").astype(np.int64)
+    hi = ticks[-1] if end is None else np.datetime64(end, "us").astype(np.int64)
+    span = hi - lo + 1
+    # 구간 i = [lo + i * span / n_buckets, lo + (i + 1) * span / n_buckets), 정수 비교를 위해 n_buckets배
+    bucket = pd.cut((ticks - lo) * n_buckets, bins=np.arange(n_buckets + 1) * span, right=False, labels=False)
+    frame = pd.DataFrame({"bucket": bucket, "timestamp": timestamps, "value": values})
+    return frame.groupby("bucket").agg(
+        timestamp=("timestamp", "first"),
+        count=("value", "size"),
+        min=("value", "min"),
+        max=("value", "max"),
+        mean=("value", "mean"),
+    )
+
+
+@pytest.mark.parametrize("n, n_out", [(5000, 500), (5000, 3), (1001, 1000), (300, 300), (100, 2000), (10, 2), (10, 1), (10, 0)])
+def test_lttb_indices(n, n_out):
+    timestamps, values = _series(n)
+    x = (timestamps - timestamps[0]) / np.timedelta64(1, "s")
+
+    indices = lttb(x, values, n_out)
+    assert len(indices) == min(n, n_out)
+    assert np.all(np.diff(indices) > 0)
+    if n_out >= 2:
+        assert indices[0] == 0
+        assert indices[-1] == n - 1
+
+
+def test_lttb_keeps_spike():
+    x = np.arange(10000, dtype=np.float64)
+    y = np.zeros(10000)
+    y[4321] = 100.0
+    assert 4321 in lttb(x, y, 100)
+
+
+@pytest.mark.parametrize("n_buckets", [1, 7, 200, 10000])
+def test_envelope_matches_groupby(n_buckets):
+    timestamps, values = _series(5000, seed=1)
+    envelope = bucket_envelope(timestamps, values, n_buckets)
+    expected = _envelope_reference(timestamps, values, n_buckets)
+
+    np.testing.assert_array_equal(envelope["timestamp"], expected["timestamp"].to_numpy())
+    np.testing.assert_array_equal(envelope["count"], expected["count"].to_numpy())
+    np.testing.assert_array_equal(envelope["min"], expected["min"].to_numpy())
+    np.testing.assert_array_equal(envelope["max"], expected["max"].to_numpy())
+    np.testing.assert_allclose(envelope["mean"], expected["mean"].to_numpy(), rtol=1e-12)
+    assert envelope["count"].sum() == len(values)
+
+
+def test_envelope_with_explicit_range():
+    timestamps, values = _series(2000, seed=2)
+    start = timestamps[0] - np.timedelta64(6, "h")
+    end = timestamps[-1] + np.timedelta64(1, "h")
+
+    envelope = bucket_envelope(timestamps, values, 100, start=start, end=end)
+    expected = _envelope_reference(timestamps, values, 100, start=start, end=end)
+
+    # 관측이 없는 앞쪽 구간은 제외
+    assert len(envelope["count"]) == len(expected) < 100
+    np.testing.assert_array_equal(envelope["count"], expected["count"].to_numpy())
+    np.testing.assert_allclose(envelope["mean"], expected["mean"].to_numpy(), rtol=1e-12)
+
+
+def test_envelope_empty():
+    envelope = bucket_envelope(np.zeros(0, dtype="datetime64[us]"), np.zeros(0), 10)
+    assert all(len(column) == 0 for column in envelope.values())
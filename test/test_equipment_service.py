@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import update
+
+from app.config import settings
+from app.models.timeseries import TagSeries, TimeSeriesTag
+from app.services.equipment_service import EquipmentService
+from app.services.rollup_service import compact
+
+
+@pytest.fixture
+def recent(make_points):
+    """지난 50시간 1분 간격 관측 3000개"""
+    end = pd.Timestamp(datetime.utcnow()).floor("min") - pd.Timedelta(minutes=1)
+    return make_points("R-01", "temperature", pd.date_range(end=end, periods=3000, freq="min"))
+
+
+def _orm_insert(db, points):
+    db.add_all([
+        TimeSeriesTag(eq_id=row.eq_id, tag_name=row.tag_name, timestamp=row.timestamp.to_pydatetime(), value=row.value)
+        for row in points.itertuples()
+    ])
+    db.commit()
+
+
+def _expected_points(points, hours):
+    return int((points["timestamp"] >= pd.Timestamp(datetime.utcnow() - timedelta(hours=hours))).sum())
+
+
+def test_rows_written_without_ingest_service(db, recent, monkeypatch):
+    # IngestService 이전 / 다른 경로로 적재된 행: tag_series 항목 없음
+    monkeypatch.setattr(settings, "TIMESERIES_SCHEMA", "wide")
+    _orm_insert(db, recent)
+    service = EquipmentService(db)
+
+    for hours in (24, 48):
+        result = service.get_timeseries_data("R-01", "temperature", hours=hours, max_points=2000)
+        assert result is not None
+        assert result["downsampling"]["source"] == "tags_timeseries"
+        assert result["downsampling"]["raw_points"] == _expected_points(recent, hours)
+
+
+def test_rows_never_marked_dirty(db, schema, recent, ingest):
+    ingest(recent)
+    db.execute(update(TagSeries).values(dirty_from=None))
+    db.commit()
+
+    result = EquipmentService(db).get_timeseries_data("R-01", "temperature", hours=48, max_points=2000)
+    assert result is not None
+    assert result["downsampling"]["raw_points"] == _expected_points(recent, 48)
+
+
+def test_compacted_rows_use_rollups(db, schema, recent, ingest):
+    ingest(recent)
+    while compact(db, 5000)["rows"]:
+        pass
+    service = EquipmentService(db)
+
+    result = service.get_timeseries_data("R-01", "temperature", hours=48, max_points=2000)
+    assert result["downsampling"]["source"] == "tags_rollup_1m"
+    assert result["downsampling"]["raw_points"] == _expected_points(recent, 48)
+
+    values = recent.loc[recent["timestamp"] >= pd.Timestamp(datetime.utcnow() - timedelta(hours=48)), "value"]
+    np.testing.assert_allclose(result["normal_range"]["mean"], values.mean(), rtol=1e-9)
+
+
+def test_rows_after_compaction_without_dirty_mark(db, recent, ingest, monkeypatch):
+    monkeypatch.setattr(settings, "TIMESERIES_SCHEMA", "wide")
+    ingest(recent.iloc[:-100])
+    while compact(db, 5000)["rows"]:
+        pass
+    _orm_insert(db, recent.iloc[-100:])
+
+    result = EquipmentService(db).get_timeseries_data("R-01", "temperature", hours=48, max_points=2000)
+    assert result["downsampling"]["source"] == "tags_timeseries"
+    assert result["downsampling"]["raw_points"] == _expected_points(recent, 48)
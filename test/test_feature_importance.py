@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from app.ml.feature_importance import FeatureImportanceCalculator
+
+FEATURE_NAMES = [f"XMEAS_{i}" for i in range(1, 42)] + [f"XMV_{i}" for i in range(1, 12)]
+
+
+def _std_reference(window, anomaly_score):
+    """변수별 표준편차 비중 × 이상 점수, 내림차순 (기존 std 계산)"""
+    std_devs = np.std(window, axis=0)
+    importances = std_devs / np.sum(std_devs)
+    importance = {name: float(imp) * anomaly_score for name, imp in zip(FEATURE_NAMES, importances)}
+    return dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
+
+
+@pytest.fixture
+def windows():
+    rng = np.random.default_rng(0)
+    return rng.normal(50, rng.uniform(0.1, 5.0, len(FEATURE_NAMES)), (8, 60, len(FEATURE_NAMES)))
+
+
+@pytest.mark.parametrize("mode", ["reconstruction", "std"])
+def test_returns_every_feature_by_default(windows, mode):
+    calc = FeatureImportanceCalculator(FEATURE_NAMES, mode=mode)
+    errors = np.random.default_rng(1).uniform(0, 1, len(FEATURE_NAMES))
+
+    importance = calc.calculate_importance(windows[0], 0.7, feature_errors=errors)
+    values = list(importance.values())
+    assert set(importance) == set(FEATURE_NAMES)
+    assert values == sorted(values, reverse=True)
+    assert sum(values) == pytest.approx(0.7)
+
+
+def test_std_mode_matches_reference(windows):
+    calc = FeatureImportanceCalculator(FEATURE_NAMES, mode="std")
+    for window, score in zip(windows, np.linspace(0.1, 0.9, len(windows))):
+        importance = calc.calculate_importance(window, float(score))
+        expected = _std_reference(window, float(score))
+        assert list(importance) == list(expected)
+        np.testing.assert_allclose(list(importance.values()), list(expected.values()), rtol=1e-12)
+
+
+@pytest.mark.parametrize("top_k", [None, 5])
+def test_batch_matches_single(windows, top_k):
+    calc = FeatureImportanceCalculator(FEATURE_NAMES)
+    scores = np.linspace(0.2, 0.9, len(windows))
+    errors = np.random.default_rng(2).uniform(0, 1, (len(windows), len(FEATURE_NAMES)))
+
+    batch = calc.calculate_importance_batch(windows, scores, feature_errors=errors, top_k=top_k)
+    for i, importance in enumerate(batch):
+        assert importance == calc.calculate_importance(windows[i], scores[i], feature_errors=errors[i], top_k=top_k)
+    assert len(batch[0]) == (top_k or len(FEATURE_NAMES))
+
+
+def test_top_k_selects_largest(windows):
+    calc = FeatureImportanceCalculator(FEATURE_NAMES)
+    errors = np.random.default_rng(3).uniform(0, 1, len(FEATURE_NAMES))
+
+    full = calc.calculate_importance(windows[0], 0.5, feature_errors=errors)
+    top = calc.calculate_importance(windows[0], 0.5, feature_errors=errors, top_k=5)
+    assert list(top.items()) == list(full.items())[:5]
+    assert calc.get_top_features(full, top_k=5) == list(top.items())
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.utils import gorilla
+
+START = np.datetime64("2026-03-01T00:00:00", "us")
+
+
+def _assert_round_trip(timestamps, values):
+    timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+    values = np.asarray(values, dtype=np.float64)
+    decoded_ts, decoded_values = gorilla.decode(gorilla.encode(timestamps, values))
+    assert decoded_ts.dtype == np.dtype("datetime64[us]")
+    np.testing.assert_array_equal(decoded_ts, timestamps)
+    # 비트 단위 비교 (NaN, -0.0 포함)
+    np.testing.assert_array_equal(decoded_values.view(np.uint64), values.view(np.uint64))
+
+
+@pytest.mark.parametrize("n", range(0, 11))
+def test_short_chunks(n):
+    rng = np.random.default_rng(n)
+    _assert_round_trip(START + np.arange(n) * 1_000_000, rng.normal(size=n))
+
+
+@pytest.mark.parametrize("values", [
+    np.full(3600, 3.5),
+    np.repeat([1.0, 2.0, 3.0], 1200),
+    np.round(np.random.default_rng(0).normal(50, 2, 3600), 2),
+    np.cumsum(np.random.default_rng(1).normal(size=3600)),
+    np.random.default_rng(2).normal(size=3600) * 1e300,
+    np.array([np.nan, np.inf, -np.inf, -0.0, 0.0, 1.0, np.finfo(float).tiny, -np.finfo(float).max] * 450),
+], ids=["constant", "step", "rounded", "random-walk", "huge", "special"])
+def test_values(values):
+    _assert_round_trip(START + np.arange(len(values)) * 1_000_000, values)
+
+
+@pytest.mark.parametrize("offsets", [
+    np.sort(np.arange(3600) * 1_000_000 + np.random.default_rng(3).integers(-5_000, 5_000, 3600)),
+    np.cumsum(np.random.default_rng(4).integers(1, 10**9, 3600)),
+    np.array([0, 1, 2, 10**6, 10**6 + 1, 400 * 86_400 * 10**6, 400 * 86_400 * 10**6 + 7]),
+    np.array([0, 0, 0, 5, 5]),
+], ids=["jitter", "irregular", "large-gaps", "repeated"])
+def test_timestamps(offsets):
+    values = np.random.default_rng(5).normal(size=len(offsets))
+    _assert_round_trip(START + offsets, values)
+
+
+def test_regular_constant_series_is_compact():
+    n = 3600
+    buffer = gorilla.encode(START + np.arange(n) * 1_000_000, np.full(n, 7.25))
+    assert len(buffer) / n < 0.5
+
+
+def test_unknown_version_is_rejected():
+    buffer = bytearray(gorilla.encode(START + np.arange(3), np.ones(3)))
+    buffer[0] = gorilla.CHUNK_VERSION + 1
+    with pytest.raises(ValueError):
+        gorilla.decode(bytes(buffer))
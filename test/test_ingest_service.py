@@ -0,0 +1,133 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.ingest_service import IngestError, IngestService, parse_payload, resolve_format, validate_points
+from app.services.timeseries_store import get_timeseries_store
+
+TIMESTAMPS = ["2024-01-01T00:00:00", "2024-01-01T00:01:00", "2024-01-01T00:02:00"]
+VALUES = [1.5, 2.5, 3.5]
+
+
+def _ndjson(rows):
+    return "\n".join(json.dumps(row) for row in rows).encode()
+
+
+def _rows(eq_id="R-01", tag_name="temperature"):
+    return [
+        {"eq_id": eq_id, "tag_name": tag_name, "timestamp": ts, "value": value, "unit": "degC"}
+        for ts, value in zip(TIMESTAMPS, VALUES)
+    ]
+
+
+def _stored(db, eq_id="R-01", tag_name="temperature"):
+    store = get_timeseries_store(db)
+    timestamps, values = store.fetch_series(eq_id, tag_name, datetime(2000, 1, 1))
+    return pd.DatetimeIndex(timestamps), values, store.unit(eq_id, tag_name)
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("application/x-ndjson", _ndjson(_rows())),
+    ("text/csv; charset=utf-8", (
+        "eq_id,tag_name,timestamp,value,unit\n"
+        + "".join(f"R-01, temperature, {ts}, {value}, degC\n" for ts, value in zip(TIMESTAMPS, VALUES))
+    ).encode()),
+    ("application/json", json.dumps({
+        "eq_id": "R-01",
+        "tag_name": "temperature",
+        "unit": "degC",
+        "timestamp": TIMESTAMPS,
+        "value": VALUES,
+    }).encode()),
+])
+def test_formats_store_the_same_points(db, schema, content_type, body):
+    result = IngestService(db).ingest(body, content_type)
+
+    assert result["format"] == resolve_format(content_type)
+    assert (result["received"], result["accepted"], result["inserted"], result["rejected"]) == (3, 3, 3, 0)
+
+    timestamps, values, unit = _stored(db)
+    assert timestamps.equals(pd.DatetimeIndex(TIMESTAMPS))
+    np.testing.assert_array_equal(values, VALUES)
+    assert unit == "degC"
+
+
+def test_columnar_json_broadcasts_scalars():
+    frame = parse_payload(json.dumps({"eq_id": "R-01", "tag_name": "t", "timestamp": TIMESTAMPS, "value": VALUES}).encode(), "json")
+    assert frame["eq_id"].tolist() == ["R-01"] * 3
+    assert frame["tag_name"].tolist() == ["t"] * 3
+
+
+@pytest.mark.parametrize("body, fmt", [
+    (json.dumps({"eq_id": "R-01", "tag_name": "t", "timestamp": TIMESTAMPS, "value": VALUES[:2]}).encode(), "json"),
+    (json.dumps([{"eq_id": "R-01"}]).encode(), "json"),
+    (b"eq_id,tag_name,value\nR-01,t,1.0\n", "csv"),
+    (b"{not json", "ndjson"),
+])
+def test_unreadable_payloads_raise(body, fmt):
+    with pytest.raises(IngestError):
+        parse_payload(body, fmt)
+
+
+def test_unknown_format_raises():
+    with pytest.raises(IngestError):
+        resolve_format("application/xml")
+
+
+def test_rejection_reasons():
+    frame = pd.DataFrame({
+        "eq_id": ["R-01", "X-99", "R-01", "R-01", "R-01", "R-01", "R-01", "R-01"],
+        "tag_name": ["t", "t", "  ", "t", "t", "t", "t", "t"],
+        "timestamp": ["2024-01-01T00:00:00", "2024-01-01T00:01:00", "2024-01-01T00:02:00", "yesterday",
+                      "2024-01-01T00:04:00", "2024-01-01T00:05:00", "2024-01-01T00:06:00", "2024-01-01T00:00:00"],
+        "value": ["1.0", "2.0", "3.0", "4.0", "abc", "inf", "7.0", "8.0"],
+        "unit": ["degC", "degC", "degC", "degC", "degC", "degC", "x" * 100, "degC"],
+    })
+    points, errors, rejected = validate_points(frame, {"R-01"})
+
+    assert errors == [
+        {"row": 1, "reason": "unknown eq_id"},
+        {"row": 2, "reason": "invalid tag_name"},
+        {"row": 3, "reason": "invalid timestamp"},
+        {"row": 4, "reason": "invalid value"},
+        {"row": 5, "reason": "invalid value"},
+        {"row": 6, "reason": "invalid unit"},
+    ]
+    assert rejected == 6
+    # 같은 요청 안의 중복 키는 첫 행만 남김
+    assert points["value"].tolist() == [1.0]
+
+
+def test_epoch_seconds_timestamps():
+    frame = pd.DataFrame({"eq_id": ["R-01"], "tag_name": ["t"], "timestamp": [1704067200], "value": [1.0]})
+    points, _, rejected = validate_points(frame, {"R-01"})
+    assert rejected == 0
+    assert points["timestamp"].iloc[0] == pd.Timestamp("2024-01-01T00:00:00")
+
+
+def test_strict_mode_stores_nothing(db, schema):
+    rows = _rows() + [{"eq_id": "X-99", "tag_name": "temperature", "timestamp": TIMESTAMPS[0], "value": 1.0}]
+    service = IngestService(db)
+
+    with pytest.raises(IngestError):
+        service.ingest(_ndjson(rows), "ndjson", strict=True)
+    assert len(_stored(db)[0]) == 0
+
+    result = service.ingest(_ndjson(rows), "ndjson")
+    assert (result["inserted"], result["rejected"]) == (3, 1)
+    assert result["errors"] == [{"row": 3, "reason": "unknown eq_id"}]
+
+
+def test_resent_batch_is_reported_as_duplicates(db, schema, make_points):
+    points = make_points("R-01", "temperature", pd.date_range("2024-01-01", periods=500, freq="min"))
+    body = points.assign(timestamp=[ts.isoformat() for ts in points["timestamp"]]).to_csv(index=False).encode()
+    service = IngestService(db)
+
+    first = service.ingest(body, "csv")
+    second = service.ingest(body, "csv")
+    assert (first["inserted"], first["duplicates"]) == (500, 0)
+    assert (second["accepted"], second["inserted"], second["duplicates"]) == (500, 0, 500)
+    assert len(_stored(db)[0]) == 500
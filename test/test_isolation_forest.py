@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.ml.isolation_forest import IsolationForestDetector
+
+
+def _fit(seed):
+    data = np.random.default_rng(seed).normal(size=(300, 5))
+    detector = IsolationForestDetector()
+    detector.model.set_params(n_estimators=20, random_state=seed)
+    return detector.fit(data)
+
+
+def test_arrays_match_pickle(tmp_path):
+    model_path, arrays_path = str(tmp_path / "isolation_forest.pkl"), str(tmp_path / "isolation_forest.npz")
+    detector = _fit(0)
+    detector.save_model(model_path, arrays_path=arrays_path)
+
+    loaded = IsolationForestDetector(model_path=model_path, arrays_path=arrays_path)
+    sample = np.random.default_rng(1).normal(size=(50, 5))
+    np.testing.assert_allclose(loaded.score_samples(sample), detector.model.score_samples(sample))
+    assert not hasattr(loaded.model, "estimators_")  # pickle을 읽지 않고 배열 사용
+
+
+def test_stale_arrays_are_rejected(tmp_path):
+    model_path, arrays_path = str(tmp_path / "isolation_forest.pkl"), str(tmp_path / "isolation_forest.npz")
+    _fit(0).save_model(model_path, arrays_path=arrays_path)
+    newer = _fit(1)
+    newer.save_model(model_path)  # 배열은 갱신하지 않음
+
+    loaded = IsolationForestDetector(model_path=model_path, arrays_path=arrays_path)
+    sample = np.random.default_rng(2).normal(size=(50, 5))
+    np.testing.assert_allclose(loaded.score_samples(sample), newer.model.score_samples(sample))
+
+
+def test_arrays_without_pickle_still_load(tmp_path):
+    arrays_path = str(tmp_path / "isolation_forest.npz")
+    detector = _fit(0)
+    detector.export_arrays(arrays_path)
+
+    loaded = IsolationForestDetector(model_path=str(tmp_path / "missing.pkl"), arrays_path=arrays_path)
+    sample = np.random.default_rng(3).normal(size=(50, 5))
+    np.testing.assert_allclose(loaded.score_samples(sample), detector.model.score_samples(sample))
@@ -0,0 +1,52 @@
+import threading
+
+import numpy as np
+import torch
+
+from app.ml import lstm_model
+from app.ml.lstm_model import LSTMAutoencoder, LSTMPredictor
+
+
+def test_concurrent_stream_steps_are_not_lost():
+    predictor = LSTMPredictor(input_size=4, hidden_size=8, num_layers=1, sequence_length=10_000)
+    samples = np.random.default_rng(0).normal(size=(8, 25, 4)).astype(np.float32)
+    barrier = threading.Barrier(len(samples))
+
+    def run(rows):
+        barrier.wait()
+        for row in rows:
+            predictor.stream_step("R-01", row)
+
+    threads = [threading.Thread(target=run, args=(rows,)) for rows in samples]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert predictor.stream_states.get("R-01")["steps"] == samples.shape[0] * samples.shape[1]
+
+
+def test_stream_steps_match_window_inference():
+    predictor = LSTMPredictor(input_size=4, hidden_size=8, num_layers=2, sequence_length=12)
+    window = np.random.default_rng(1).normal(size=(12, 4)).astype(np.float32)
+    for row in window:
+        result = predictor.stream_step("R-01", row)
+
+    assert result["window_complete"]
+    np.testing.assert_allclose(result["window_score"], predictor.infer(window)["anomaly_score"], rtol=1e-5)
+
+
+def test_reload_rebuilds_backend_with_configured_tolerance(tmp_path, monkeypatch):
+    # eager 대비 오차 0.05: 설정 허용 오차(0.1) 이내, 기본값(1e-2) 초과
+    monkeypatch.setattr(lstm_model, "accuracy_delta", lambda *args, **kwargs: {"max_score_delta": 0.05})
+    predictor = LSTMPredictor(input_size=4, hidden_size=8, num_layers=1, sequence_length=6, backend="torchscript", backend_tolerance=0.1)
+    assert predictor.backend == "torchscript"
+
+    path = tmp_path / "lstm_model.pt"
+    torch.manual_seed(1)
+    torch.save(LSTMAutoencoder(input_size=4, hidden_size=8, num_layers=1).state_dict(), path)
+    predictor.load_model(str(path))
+
+    window = torch.randn(2, 6, 4)
+    with torch.no_grad():
+        np.testing.assert_allclose(predictor.runner(window).numpy(), predictor.model(window).numpy(), rtol=1e-5, atol=1e-6)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from app.ml.occlusion import OcclusionAttributor
+
+MEAN = np.array([100.0, 50.0, 0.0, -20.0])
+
+
+def _score(data):
+    # 원 단위 학습 평균에서 멀수록 낮은 점수 (score_samples 규약)
+    return -np.abs(data - MEAN).sum(axis=1)
+
+
+def test_baseline_in_input_units_finds_deviating_feature():
+    attributor = OcclusionAttributor(_score, ["a", "b", "c", "d"], baseline=MEAN)
+    sample = MEAN + np.array([0.0, 8.0, 0.0, 0.0])
+    assert [name for name, _ in attributor.attribute(sample)] == ["b"]
+
+
+def test_per_sample_baseline():
+    attributor = OcclusionAttributor(_score, ["a", "b", "c", "d"])
+    data = np.stack([MEAN + [0.0, 0.0, 3.0, 0.0], MEAN + [0.0, 0.0, 0.0, -6.0]])
+    windows_mean = np.stack([MEAN, MEAN])
+
+    explained = attributor.explain_batch(data, baseline=windows_mean)
+    assert list(explained[0]) == ["c"]
+    assert list(explained[1]) == ["d"]
+    assert explained[1]["d"] == 6.0
+
+    # 원 단위 입력에 0 기준값을 쓰면 평균 그대로인 변수까지 교란되어 기여도에 섞임
+    assert set(attributor.explain_batch(data[:1])[0]) == {"a", "b", "c", "d"}
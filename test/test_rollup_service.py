@@ -0,0 +1,176 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import select, func
+
+from app.models.rollup import ROLLUP_MODELS
+from app.models.timeseries import TagSeries
+from app.services.rollup_service import (
+    ROLLUP_COLUMNS,
+    ROLLUP_KEY,
+    _rollup_frame,
+    compact,
+    mark_all_dirty,
+    merge_rollups,
+    points_to_rollups,
+    read_rollups,
+    rebucket,
+)
+
+RESOLUTIONS = sorted(ROLLUP_MODELS)
+
+
+def _reference(points, seconds):
+    """집계 코드와 독립적인 기준값 (시간순 정렬 후 groupby)"""
+    frame = points.sort_values("timestamp").assign(bucket=points["timestamp"].dt.floor(f"{seconds}s"))
+    grouped = frame.groupby(["eq_id", "tag_name", "bucket"])["value"]
+    timestamps = frame.groupby(["eq_id", "tag_name", "bucket"])["timestamp"]
+    return pd.DataFrame({
+        "n_points": grouped.size(),
+        "value_sum": grouped.sum(),
+        "value_sumsq": frame.assign(sq=frame["value"] ** 2).groupby(["eq_id", "tag_name", "bucket"])["sq"].sum(),
+        "value_min": grouped.min(),
+        "value_max": grouped.max(),
+        "value_first": grouped.first(),
+        "value_last": grouped.last(),
+        "first_at": timestamps.min(),
+        "last_at": timestamps.max(),
+    }).reset_index()
+
+
+def _assert_rollups_equal(got, expected):
+    key = list(ROLLUP_KEY)
+    got = got.sort_values(key).reset_index(drop=True)
+    expected = expected.sort_values(key).reset_index(drop=True)
+    assert len(got) == len(expected)
+    assert got["eq_id"].tolist() == expected["eq_id"].tolist()
+    assert got["tag_name"].tolist() == expected["tag_name"].tolist()
+    for column in ("bucket", "first_at", "last_at"):
+        np.testing.assert_array_equal(
+            got[column].to_numpy(dtype="datetime64[us]"), expected[column].to_numpy(dtype="datetime64[us]")
+        )
+    np.testing.assert_array_equal(got["n_points"].to_numpy(dtype=np.int64), expected["n_points"].to_numpy(dtype=np.int64))
+    for column in ("value_sum", "value_sumsq"):
+        np.testing.assert_allclose(got[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float), rtol=1e-9)
+    for column in ("value_min", "value_max", "value_first", "value_last"):
+        np.testing.assert_array_equal(got[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float))
+
+
+def _stored(db, seconds):
+    table = ROLLUP_MODELS[seconds].__table__
+    return _rollup_frame(db.execute(select(*(table.c[c] for c in ROLLUP_KEY + ROLLUP_COLUMNS))).all())
+
+
+def _dirty_series(db):
+    return db.execute(select(func.count()).select_from(TagSeries).where(TagSeries.dirty_from.isnot(None))).scalar()
+
+
+def _compact_all(db, batch_rows=1000):
+    for _ in range(1000):
+        compact(db, batch_rows)
+        if not _dirty_series(db):
+            return
+    raise AssertionError("dirty series가 남아 있음")
+
+
+def _irregular_points(make_points, seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2026-03-01T00:00:00", "us")
+    offsets = np.cumsum(rng.integers(200_000, 9_000_000, 4000))
+    frames = [
+        make_points("R-01", "temperature", start + offsets, seed, decimals=3),
+        make_points("R-01", "pressure", start + offsets[::3] + 500_000, seed + 1, decimals=3),
+        make_points("R-02", "temperature", start + offsets[::2], seed + 2, decimals=3),
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("seconds", RESOLUTIONS)
+def test_points_to_rollups_matches_groupby(seconds, make_points):
+    points = _irregular_points(make_points).sample(frac=1.0, random_state=1)  # 입력 순서와 무관
+    _assert_rollups_equal(points_to_rollups(points, seconds), _reference(points, seconds))
+
+
+def test_merge_rollups_is_independent_of_batching(make_points):
+    points = _irregular_points(make_points)
+    batch = np.random.default_rng(2).integers(0, 3, len(points))
+    for seconds in RESOLUTIONS:
+        partial = [points_to_rollups(points[batch == i], seconds) for i in range(3)]
+        merged = merge_rollups(pd.concat(partial[::-1], ignore_index=True))
+        _assert_rollups_equal(merged, _reference(points, seconds))
+
+
+def test_rebucket_matches_direct_rollup(make_points):
+    points = _irregular_points(make_points)
+    minutes = points_to_rollups(points, 60)
+    for seconds in RESOLUTIONS[1:]:
+        _assert_rollups_equal(rebucket(minutes, seconds), _reference(points, seconds))
+
+
+def test_compact_matches_full_resolution(db, schema, make_points, ingest):
+    points = _irregular_points(make_points)
+    ingest(points)
+    _compact_all(db)
+
+    for seconds in RESOLUTIONS:
+        _assert_rollups_equal(_stored(db, seconds), _reference(points, seconds))
+
+
+def test_read_rollups_merges_uncompacted_rows(db, schema, make_points, ingest):
+    points = _irregular_points(make_points)
+    ingest(points)
+    _compact_all(db)
+
+    # 압축 이후: 이미 집계된 구간에 늦게 도착한 행 + 새 구간 행 (집계기 실행 전)
+    late = make_points("R-01", "temperature", pd.date_range("2026-03-01 02:00:00.25", periods=300, freq="13s"), seed=7, decimals=3)
+    fresh = make_points("R-01", "temperature", pd.date_range("2026-03-03 00:00:00", periods=500, freq="5s"), seed=8, decimals=3)
+    ingest(pd.concat([late, fresh], ignore_index=True))
+    assert _dirty_series(db) == 1
+
+    everything = pd.concat([points, late, fresh], ignore_index=True)
+    series = everything[(everything["eq_id"] == "R-01") & (everything["tag_name"] == "temperature")]
+    start = datetime(2026, 3, 1, 0, 17, 41, 500000)  # 구간 경계가 아닌 시작 시각
+    for seconds in RESOLUTIONS:
+        got = read_rollups(db, "R-01", "temperature", start, seconds)
+        _assert_rollups_equal(got, _reference(series[series["timestamp"] >= start], seconds))
+
+
+def test_late_rows_are_recomputed(db, schema, make_points, ingest):
+    points = _irregular_points(make_points)
+    ingest(points)
+    _compact_all(db)
+
+    # 늦게 도착한 행이 가장 이른 구간을 바꿈 (새 최솟값/첫 값 포함)
+    late = make_points("R-02", "temperature", pd.date_range("2026-02-28 23:59:30", periods=200, freq="3s"), seed=9, decimals=3)
+    late.loc[0, "value"] = -1000.0
+    ingest(late)
+    _compact_all(db, batch_rows=700)  # 여러 배치에 걸쳐 재계산
+
+    everything = pd.concat([points, late], ignore_index=True)
+    for seconds in RESOLUTIONS:
+        _assert_rollups_equal(_stored(db, seconds), _reference(everything, seconds))
+
+
+def test_dirty_from_keeps_earliest_pending_time(db, schema, make_points, ingest):
+    ingest(make_points("R-01", "flow", pd.date_range("2026-03-02", periods=10, freq="1min"), decimals=3))
+    ingest(make_points("R-01", "flow", pd.date_range("2026-03-01", periods=10, freq="1min"), decimals=3))
+    ingest(make_points("R-01", "flow", pd.date_range("2026-03-05", periods=10, freq="1min"), decimals=3))
+
+    dirty_from = db.execute(select(TagSeries.dirty_from).where(TagSeries.tag_name == "flow")).scalar()
+    assert dirty_from == datetime(2026, 3, 1)
+
+
+def test_mark_all_dirty_covers_rows_without_dirty_marks(db, schema, make_points, ingest):
+    points = _irregular_points(make_points)
+    ingest(points)
+    _compact_all(db)
+    for model in ROLLUP_MODELS.values():
+        db.execute(model.__table__.delete())
+    db.commit()
+
+    assert mark_all_dirty(db) == 3
+    _compact_all(db)
+    for seconds in RESOLUTIONS:
+        _assert_rollups_equal(_stored(db, seconds), _reference(points, seconds))
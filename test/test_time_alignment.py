@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.services.window_service import WindowAssembler
+from app.utils.time_alignment import align_to_grid, forward_fill
+
+NAN = np.nan
+
+
+def test_forward_fill_keeps_leading_gaps():
+    data = np.array([
+        [NAN, NAN, 3.0, NAN, 5.0, NAN],
+        [1.0, NAN, NAN, 4.0, NAN, NAN],
+        [NAN, NAN, NAN, NAN, NAN, NAN],
+    ])
+    expected = np.array([
+        [NAN, NAN, 3.0, 3.0, 5.0, 5.0],
+        [1.0, 1.0, 1.0, 4.0, 4.0, 4.0],
+        [NAN, NAN, NAN, NAN, NAN, NAN],
+    ])
+    np.testing.assert_array_equal(forward_fill(data), expected)
+
+
+def test_forward_fill_never_uses_later_values():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(4, 3, 50))
+    data[rng.random(data.shape) < 0.6] = NAN
+    filled = forward_fill(data)
+
+    # 각 시점의 값은 그 시점까지의 데이터만으로 결정됨
+    for stop in (1, 7, 25, 50):
+        np.testing.assert_array_equal(forward_fill(data[..., :stop]), filled[..., :stop])
+
+
+def test_forward_fill_backfill_is_opt_in():
+    data = np.array([[NAN, NAN, 3.0, NAN]])
+    np.testing.assert_array_equal(forward_fill(data, backfill=True), [[3.0, 3.0, 3.0, 3.0]])
+
+
+def test_align_to_grid_leaves_steps_before_first_observation_empty():
+    grid = np.datetime64("2026-03-01T00:10", "us") + np.arange(5) * np.timedelta64(60, "s")
+    timestamps = np.array(["2026-03-01T00:12:30", "2026-03-01T00:09:50", "2026-03-01T00:14:00"], dtype="datetime64[us]")
+    aligned = align_to_grid(np.array([0, 1, 0]), timestamps, np.array([1.0, 2.0, 3.0]), grid, n_series=3)
+
+    np.testing.assert_array_equal(aligned[0], [NAN, NAN, NAN, 1.0, 3.0])
+    np.testing.assert_array_equal(aligned[1], [2.0, 2.0, 2.0, 2.0, 2.0])  # 격자 이전 관측은 첫 시점 값
+    assert np.isnan(aligned[2]).all()
+
+
+def test_window_masks_leading_gaps_with_fill_values():
+    assembler = WindowAssembler(None, feature_names=["a", "b"], sequence_length=4, interval_seconds=60, fill_values=[10.0, 20.0])
+    grid = assembler.time_grid(datetime(2026, 3, 1, 0, 3))
+    timestamps = np.array(["2026-03-01T00:00", "2026-03-01T00:02"], dtype="datetime64[us]")
+    windows, observed, leading = assembler._align(2, grid, np.array([0, 1]), timestamps, np.array([1.0, 2.0]))
+
+    np.testing.assert_array_equal(windows[0], [[1.0, 20.0], [1.0, 20.0], [1.0, 2.0], [1.0, 2.0]])
+    np.testing.assert_array_equal(windows[1], [[10.0, 20.0]] * 4)
+    np.testing.assert_array_equal(observed, [2, 0])
+    np.testing.assert_array_equal(leading, [2, 0])
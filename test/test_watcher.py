@@ -0,0 +1,48 @@
+import os
+
+from app.ml.bundle import MANIFEST_NAME
+from app.ml.registry import ReloadInProgressError
+from app.ml.watcher import ModelWatcher
+
+
+def _write_manifest(path, text):
+    with open(os.path.join(path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _watcher(path, outcomes):
+    calls = []
+
+    def on_change():
+        calls.append(len(calls))
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    watcher = ModelWatcher(lambda: str(path), on_change, retry_errors=(ReloadInProgressError,))
+    _write_manifest(path, "{}")
+    watcher.start()
+    watcher.stop()
+    return watcher, calls
+
+
+def test_change_is_retried_after_reload_conflict(tmp_path):
+    watcher, calls = _watcher(tmp_path, [ReloadInProgressError("busy"), None])
+    _write_manifest(tmp_path, '{"version": "2"}')
+
+    assert not watcher.check()
+    assert watcher.last_error == "busy"
+    assert watcher.check()
+    assert watcher.last_error is None
+    assert not watcher.check()
+    assert len(calls) == 2
+
+
+def test_failed_validation_is_not_retried(tmp_path):
+    watcher, calls = _watcher(tmp_path, [ValueError("invalid")])
+    _write_manifest(tmp_path, '{"version": "2"}')
+
+    assert watcher.check()
+    assert watcher.last_error == "invalid"
+    assert not watcher.check()
+    assert len(calls) == 1